@@ -9,6 +9,8 @@
         - 6% go to each of the 4 team members;
         - 0.5% go to each of the 2 advisors;
         - 1% goes to the BobaBAR.
+     The emissions share is sent on every distribution, everything else
+     accrues against a cumulative index and is pulled with `claim`.
 """
 
 
@@ -33,6 +35,9 @@ event MintAvailable:
     ts: uint256
 event Distribute:
     amount: uint256
+event Claim:
+    recipient: indexed(address)
+    amount: uint256
 
 event CommitOwnership:
     owner: indexed(address)
@@ -48,6 +53,9 @@ SHARE_TEAM_MEMBER: constant(uint256) = 600_000_000 # 6% - 24% total (4 members)
 SHARE_ADVISOR: constant(uint256) = 50_000_000 # 0.5% - 1% total (2 advisors)
 SHARE_BOBA_BAR: constant(uint256) = 100_000_000 # 1%
 
+# Recipients which pull their share: treasury, 4 team members, 2 advisors, BobaBAR
+N_RECIPIENTS: constant(uint256) = 8
+
 
 token: public(address)
 
@@ -57,6 +65,15 @@ addresses_team_members: public(address[4])
 addresses_advisors: public(address[2])
 addresses_boba_bar: public(address[1])
 
+# KYO distributed so far, the index recipients accrue against
+distributed_index: public(uint256)
+# `distributed_index` each recipient slot last accrued at
+recipient_index: public(uint256[8])  # N_RECIPIENTS
+# Accrued and not yet claimed per recipient, up to their slots' last accrual
+accrued: public(HashMap[address, uint256])
+# KYO held for recipients, the rest of the balance has not been distributed
+reserved: public(uint256)
+
 owner: public(address)  # Can and will be a smart contract
 future_owner: public(address)
 
@@ -102,38 +119,88 @@ def assert_is_owner(addr: address):
     assert addr == self.owner  # dev: owner only
 
 
+@internal
+@view
+def _recipient(i: uint256) -> (address, uint256):
+    """
+    @notice Address and share of recipient slot `i`.
+    """
+    if i == 0:
+        return self.addresses_treasury[0], SHARE_TREASURY
+    elif i < 5:
+        return self.addresses_team_members[i - 1], SHARE_TEAM_MEMBER
+    elif i < 7:
+        return self.addresses_advisors[i - 5], SHARE_ADVISOR
+    return self.addresses_boba_bar[0], SHARE_BOBA_BAR
+
+
+@internal
+@view
+def _pending(i: uint256, share: uint256) -> uint256:
+    """
+    @notice Amount recipient slot `i` with `share` accrued since its last accrual.
+    """
+    return (self.distributed_index - self.recipient_index[i]) * share / SHARE__DENOMINATOR
+
+
+@internal
+def _accrue(i: uint256):
+    """
+    @notice Book what recipient slot `i` accrued to its current address.
+    """
+    recipient: address = ZERO_ADDRESS
+    share: uint256 = 0
+    recipient, share = self._recipient(i)
+
+    self.accrued[recipient] += self._pending(i, share)
+    self.recipient_index[i] = self.distributed_index
+
+
 @internal
 def _distribute_balance():
     """
-    @notice Distributes the "Minter" contracts KYO balance
-            to addresses_emission, addresses_treasury, addresses_team_members, addresses_advisors,
-            and addresses_boba_bar.
+    @notice Distributes the part of the "Minter" contracts KYO balance which
+            is not reserved yet: sends the emissions share to addresses_emission
+            and reserves the rest for addresses_treasury, addresses_team_members,
+            addresses_advisors and addresses_boba_bar.
     """
     _token: ERC20 = ERC20(self.token)
-    _balance: uint256 = _token.balanceOf(self)
+    _reserved: uint256 = self.reserved
+    _amount: uint256 = _token.balanceOf(self) - _reserved
+    if _amount == 0:
+        return
 
-    emission_amount: uint256 = _balance * SHARE_EMISSIONS / SHARE__DENOMINATOR
-    treasury_amount: uint256 = _balance * SHARE_TREASURY / SHARE__DENOMINATOR
-    team_member_amount: uint256 = _balance * SHARE_TEAM_MEMBER / SHARE__DENOMINATOR
-    advisor_amount: uint256 = _balance * SHARE_ADVISOR / SHARE__DENOMINATOR
-    boba_bar_amount: uint256 = _balance * SHARE_BOBA_BAR / SHARE__DENOMINATOR
+    emission_amount: uint256 = _amount * SHARE_EMISSIONS / SHARE__DENOMINATOR
 
     for emission_address in self.addresses_emission:
         assert _token.transfer(emission_address, emission_amount)
 
-    for treasury_address in self.addresses_treasury:
-        assert _token.transfer(treasury_address, treasury_amount)
+    self.reserved = _reserved + _amount - emission_amount
+    self.distributed_index += _amount
+
+    log Distribute(_amount)
 
-    for team_member_address in self.addresses_team_members:
-        assert _token.transfer(team_member_address, team_member_amount)
 
-    for advisor_address in self.addresses_advisors:
-        assert _token.transfer(advisor_address, advisor_amount)
+@internal
+def _claim(_recipient: address) -> uint256:
+    """
+    @notice Send everything `_recipient` accrued over all of its slots.
+    """
+    recipient: address = ZERO_ADDRESS
+    share: uint256 = 0
+    for i in range(N_RECIPIENTS):
+        recipient, share = self._recipient(i)
+        if recipient == _recipient:
+            self._accrue(i)
 
-    for boba_bar_address in self.addresses_boba_bar:
-        assert _token.transfer(boba_bar_address, boba_bar_amount)
+    amount: uint256 = self.accrued[_recipient]
+    if amount != 0:
+        self.accrued[_recipient] = 0
+        self.reserved -= amount
+        assert ERC20(self.token).transfer(_recipient, amount)
 
-    log Distribute(_balance)
+        log Claim(_recipient, amount)
+    return amount
 
 
 @internal
@@ -178,12 +245,44 @@ def mint_and_distribute():
             and distribute the "Minter" contracts balance to addresses_emission, addresses_treasury,
             addresses_team_members, addresses_advisors, and addresses_boba_bar.
     @dev Anyone is allowed to trigger this as the mint target is the "Minter" contract itself
-         and distribution targets are stored in the contract.
+         and distribution targets are stored in the contract. Only the
+         emissions share is transferred, the others are claimed.
     """
     self._mint_available()
     self._distribute_balance()
 
 
+@external
+@view
+def claimable(_recipient: address) -> uint256:
+    """
+    @notice Amount `claim` would currently send to `_recipient`.
+    @param _recipient Address of a treasury, team member, advisor or BobaBAR recipient.
+    @return Claimable KYO.
+    """
+    amount: uint256 = self.accrued[_recipient]
+    recipient: address = ZERO_ADDRESS
+    share: uint256 = 0
+    for i in range(N_RECIPIENTS):
+        recipient, share = self._recipient(i)
+        if recipient == _recipient:
+            amount += self._pending(i, share)
+    return amount
+
+
+@external
+def claim(_recipient: address = msg.sender) -> uint256:
+    """
+    @notice Send everything `_recipient` accrued to them.
+    @dev Anyone is allowed to trigger this, e.g. a keeper, as the tokens
+         always go to `_recipient`. Does not mint, call `mint_and_distribute`
+         first to include emissions which have not been minted yet.
+    @param _recipient Address of a treasury, team member, advisor or BobaBAR recipient.
+    @return Claimed KYO.
+    """
+    return self._claim(_recipient)
+
+
 @external
 def set_addresses(
     _addresses_emission: address[1],
@@ -203,6 +302,10 @@ def set_addresses(
     """
     self.assert_is_owner(msg.sender)
 
+    # what was accrued so far stays claimable by the previous addresses
+    for i in range(N_RECIPIENTS):
+        self._accrue(i)
+
     self.addresses_emission = _addresses_emission
     self.addresses_treasury = _addresses_treasury
     self.addresses_team_members = _addresses_team_members
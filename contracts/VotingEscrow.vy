@@ -25,6 +25,7 @@ interface ERC20:
 
 interface Migrator:
     def migrate_lock(addr: address, amount: uint256): nonpayable
+    def migrate_locks(addrs: DynArray[address, MAX_LOCKS], amounts: DynArray[uint256, MAX_LOCKS], ends: DynArray[uint256, MAX_LOCKS]): nonpayable
 
 
 # Voting escrow to have time-weighted votes
@@ -113,6 +114,12 @@ MULTIPLIER: constant(uint256) = 10 ** 18
 
 PENALTY_RATIO: constant(uint256) = MULTIPLIER * 1 / 5
 
+# Locks created by a single `create_locks_for` call
+MAX_LOCKS: constant(uint256) = 64
+
+# Bitmap words (of 256 weeks) scanned looking for a slope change
+MAX_WORD_SCAN: constant(uint256) = 100
+
 
 token: public(address)
 
@@ -126,9 +133,11 @@ locked: public(HashMap[address, LockedBalance])
 
 epoch: public(uint256)
 point_history: public(Point[100000000000000000000000000000])  # epoch -> unsigned point
+week_epoch: public(HashMap[uint256, uint256])  # week start -> epoch of the global point recorded there
 user_point_history: public(HashMap[address, Point[1000000000]])  # user -> Point[user_epoch]
 user_point_epoch: public(HashMap[address, uint256])
 slope_changes: public(HashMap[uint256, int128])  # time -> signed slope change
+slope_change_weeks: HashMap[uint256, uint256]  # week / 256 -> weeks with a scheduled slope change
 
 owner: public(address)  # Can and will be a smart contract
 future_owner: public(address)
@@ -247,39 +256,65 @@ def locked__end(_addr: address) -> uint256:
 
 
 @internal
-def _checkpoint(addr: address, old_locked: LockedBalance, new_locked: LockedBalance):
+@pure
+def _lowest_bit(x: uint256) -> uint256:
     """
-    @notice Record global and per-user data to checkpoint.
-    @param addr User's wallet address. No user checkpoint if 0x0.
-    @param old_locked Pevious locked amount / end lock time for the user.
-    @param new_locked New locked amount / end lock time for the user.
+    @notice Index of the least significant set bit of `x` (`x` != 0).
     """
-    u_old: Point = empty(Point)
-    u_new: Point = empty(Point)
-    old_dslope: int128 = 0
-    new_dslope: int128 = 0
-    _epoch: uint256 = self.epoch
+    r: uint256 = 0
+    y: uint256 = x
+    s: uint256 = 128
+    for i in range(8):
+        if bitwise_and(y, shift(1, convert(s, int128)) - 1) == 0:
+            y = shift(y, -convert(s, int128))
+            r += s
+        s /= 2
+    return r
+
+
+@internal
+def _mark_slope_change(t: uint256):
+    """
+    @notice Record that week `t` has a scheduled slope change.
+    @param t Week start.
+    """
+    w: uint256 = t / WEEK
+    word: uint256 = self.slope_change_weeks[w / 256]
+    bit: uint256 = shift(1, convert(w % 256, int128))
+    if bitwise_and(word, bit) == 0:
+        self.slope_change_weeks[w / 256] = bitwise_or(word, bit)
+
+
+@internal
+@view
+def _next_slope_change(t: uint256, limit: uint256) -> uint256:
+    """
+    @notice Find the first week after the week of `t` with a scheduled slope change.
+    @param t Time to search from.
+    @param limit Upper bound of the search.
+    @return Start of that week, or `limit` if it comes later.
+    """
+    w: uint256 = t / WEEK + 1
+    last: uint256 = limit / WEEK
+    for i in range(MAX_WORD_SCAN):
+        if w > last:
+            break
+        bits: uint256 = shift(self.slope_change_weeks[w / 256], -convert(w % 256, int128))
+        if bits != 0:
+            return min((w + self._lowest_bit(bits)) * WEEK, limit)
+        w = (w / 256 + 1) * 256
+    return limit
 
-    if addr != ZERO_ADDRESS:
-        # Calculate slopes and biases
-        # Kept at zero when they have to
-        if old_locked.end > block.timestamp and old_locked.amount > 0:
-            u_old.slope = old_locked.amount / MAXTIME_I128
-            u_old.bias = u_old.slope * convert(old_locked.end - block.timestamp, int128)
-        if new_locked.end > block.timestamp and new_locked.amount > 0:
-            u_new.slope = new_locked.amount / MAXTIME_I128
-            u_new.bias = u_new.slope * convert(new_locked.end - block.timestamp, int128)
-
-        # Read values of scheduled changes in the slope
-        # old_locked.end can be in the past and in the future
-        # new_locked.end can ONLY by in the FUTURE unless everything expired: than zeros
-        old_dslope = self.slope_changes[old_locked.end]
-        if new_locked.end != 0:
-            if new_locked.end == old_locked.end:
-                new_dslope = old_dslope
-            else:
-                new_dslope = self.slope_changes[new_locked.end]
 
+@internal
+def _checkpoint_global() -> Point:
+    """
+    @notice Fill the global point history up to the current block.
+    @dev The point at the current block is returned without recording it,
+         so per-user changes can be applied to it first.
+    @return Global point at `block.timestamp`.
+    """
+    _epoch: uint256 = self.epoch
     last_point: Point = Point({bias: 0, slope: 0, ts: block.timestamp, blk: block.number})
     if _epoch > 0:
         last_point = self.point_history[_epoch]
@@ -320,47 +355,100 @@ def _checkpoint(addr: address, old_locked: LockedBalance, new_locked: LockedBala
             break
         else:
             self.point_history[_epoch] = last_point
+            self.week_epoch[t_i] = _epoch
 
     self.epoch = _epoch
     # Now point_history is filled until t=now
+    return last_point
 
-    if addr != ZERO_ADDRESS:
-        # If last point was in this block, the slope change has been applied already
-        # But in such case we have 0 slope(s)
-        last_point.slope += (u_new.slope - u_old.slope)
-        last_point.bias += (u_new.bias - u_old.bias)
-        if last_point.slope < 0:
-            last_point.slope = 0
-        if last_point.bias < 0:
-            last_point.bias = 0
 
-    # Record the changed point into history
-    self.point_history[_epoch] = last_point
+@internal
+def _checkpoint_user(addr: address, old_locked: LockedBalance, new_locked: LockedBalance, _last_point: Point) -> Point:
+    """
+    @notice Record per-user data to checkpoint and apply it to the global point.
+    @param addr User's wallet address.
+    @param old_locked Pevious locked amount / end lock time for the user.
+    @param new_locked New locked amount / end lock time for the user.
+    @param _last_point Global point at `block.timestamp`.
+    @return `_last_point` with the user's change applied.
+    """
+    u_old: Point = empty(Point)
+    u_new: Point = empty(Point)
+    old_dslope: int128 = 0
+    new_dslope: int128 = 0
+    last_point: Point = _last_point
+
+    # Calculate slopes and biases
+    # Kept at zero when they have to
+    if old_locked.end > block.timestamp and old_locked.amount > 0:
+        u_old.slope = old_locked.amount / MAXTIME_I128
+        u_old.bias = u_old.slope * convert(old_locked.end - block.timestamp, int128)
+    if new_locked.end > block.timestamp and new_locked.amount > 0:
+        u_new.slope = new_locked.amount / MAXTIME_I128
+        u_new.bias = u_new.slope * convert(new_locked.end - block.timestamp, int128)
+
+    # Read values of scheduled changes in the slope
+    # old_locked.end can be in the past and in the future
+    # new_locked.end can ONLY by in the FUTURE unless everything expired: than zeros
+    old_dslope = self.slope_changes[old_locked.end]
+    if new_locked.end != 0:
+        if new_locked.end == old_locked.end:
+            new_dslope = old_dslope
+        else:
+            new_dslope = self.slope_changes[new_locked.end]
+
+    # If last point was in this block, the slope change has been applied already
+    # But in such case we have 0 slope(s)
+    last_point.slope += (u_new.slope - u_old.slope)
+    last_point.bias += (u_new.bias - u_old.bias)
+    if last_point.slope < 0:
+        last_point.slope = 0
+    if last_point.bias < 0:
+        last_point.bias = 0
+
+    # Schedule the slope changes (slope is going down)
+    # We subtract new_user_slope from [new_locked.end]
+    # and add old_user_slope to [old_locked.end]
+    if old_locked.end > block.timestamp:
+        # old_dslope was <something> - u_old.slope, so we cancel that
+        old_dslope += u_old.slope
+        if new_locked.end == old_locked.end:
+            old_dslope -= u_new.slope  # It was a new deposit, not extension
+        self.slope_changes[old_locked.end] = old_dslope
+        self._mark_slope_change(old_locked.end)
+
+    if new_locked.end > block.timestamp:
+        if new_locked.end > old_locked.end:
+            new_dslope -= u_new.slope  # old slope disappeared at this point
+            self.slope_changes[new_locked.end] = new_dslope
+            self._mark_slope_change(new_locked.end)
+        # else: we recorded it already in old_dslope
+
+    # Now handle user history
+    user_epoch: uint256 = self.user_point_epoch[addr] + 1
 
+    self.user_point_epoch[addr] = user_epoch
+    u_new.ts = block.timestamp
+    u_new.blk = block.number
+    self.user_point_history[addr][user_epoch] = u_new
+
+    return last_point
+
+
+@internal
+def _checkpoint(addr: address, old_locked: LockedBalance, new_locked: LockedBalance):
+    """
+    @notice Record global and per-user data to checkpoint.
+    @param addr User's wallet address. No user checkpoint if 0x0.
+    @param old_locked Pevious locked amount / end lock time for the user.
+    @param new_locked New locked amount / end lock time for the user.
+    """
+    last_point: Point = self._checkpoint_global()
     if addr != ZERO_ADDRESS:
-        # Schedule the slope changes (slope is going down)
-        # We subtract new_user_slope from [new_locked.end]
-        # and add old_user_slope to [old_locked.end]
-        if old_locked.end > block.timestamp:
-            # old_dslope was <something> - u_old.slope, so we cancel that
-            old_dslope += u_old.slope
-            if new_locked.end == old_locked.end:
-                old_dslope -= u_new.slope  # It was a new deposit, not extension
-            self.slope_changes[old_locked.end] = old_dslope
-
-        if new_locked.end > block.timestamp:
-            if new_locked.end > old_locked.end:
-                new_dslope -= u_new.slope  # old slope disappeared at this point
-                self.slope_changes[new_locked.end] = new_dslope
-            # else: we recorded it already in old_dslope
-
-        # Now handle user history
-        user_epoch: uint256 = self.user_point_epoch[addr] + 1
-
-        self.user_point_epoch[addr] = user_epoch
-        u_new.ts = block.timestamp
-        u_new.blk = block.number
-        self.user_point_history[addr][user_epoch] = u_new
+        last_point = self._checkpoint_user(addr, old_locked, new_locked, last_point)
+
+    # Record the changed point into history
+    self.point_history[self.epoch] = last_point
 
 
 @external
@@ -470,6 +558,55 @@ def create_lock_for(_addr: address, _value: uint256, _unlock_time: uint256):
     self._create_lock_for(msg.sender, _addr, _value, _unlock_time)
 
 
+@external
+@nonreentrant('lock')
+def create_locks_for(_addrs: DynArray[address, MAX_LOCKS], _values: DynArray[uint256, MAX_LOCKS], _unlock_times: DynArray[uint256, MAX_LOCKS]):
+    """
+    @notice Create a lock for each of `_addrs` at once.
+    @dev This action is only performable by the contract owner.
+         The tokens are transferred and the global point is advanced once
+         for the whole batch, only the per-user points are written per lock.
+    @param _addrs Addresses for which to create the locks.
+    @param _values Amount to deposit for each address.
+    @param _unlock_times Epoch time when each lock ends, rounded down to whole weeks.
+    """
+    self.assert_is_owner(msg.sender)
+    assert self.migration == False  # dev: must migrate
+    assert len(_values) == len(_addrs) and len(_unlock_times) == len(_addrs)  # dev: length mismatch
+
+    last_point: Point = self._checkpoint_global()
+    supply_before: uint256 = self.supply
+    total: uint256 = 0
+
+    for i in range(MAX_LOCKS):
+        if i >= len(_addrs):
+            break
+        addr: address = _addrs[i]
+        value: uint256 = _values[i]
+        unlock_time: uint256 = (_unlock_times[i] / WEEK) * WEEK  # Locktime is rounded down to weeks
+        old_locked: LockedBalance = self.locked[addr]
+
+        assert value > 0  # dev: need non-zero value
+        assert old_locked.amount == 0, "W"
+        assert unlock_time > block.timestamp, "LBF"
+        assert unlock_time <= block.timestamp + MAXTIME, "VLABT"
+
+        new_locked: LockedBalance = LockedBalance({amount: convert(value, int128), end: unlock_time})
+        self.locked[addr] = new_locked
+        last_point = self._checkpoint_user(addr, old_locked, new_locked, last_point)
+        total += value
+
+        log Deposit(msg.sender, addr, value, unlock_time, CREATE_LOCK_TYPE, block.timestamp)
+
+    self.point_history[self.epoch] = last_point
+    self.supply = supply_before + total
+
+    if total != 0:
+        assert ERC20(self.token).transferFrom(msg.sender, self, total)
+
+    log Supply(supply_before, supply_before + total)
+
+
 @external
 @nonreentrant('lock')
 def increase_amount(_value: uint256):
@@ -604,6 +741,50 @@ def migrate():
     log Migrate(msg.sender, value, self.next_ve_contract)
 
 
+@external
+@nonreentrant('lock')
+def migrate_many(_addrs: DynArray[address, MAX_LOCKS]):
+    """
+    @notice Transfers the locks of `_addrs` to the new ve contract at once.
+    @dev This action is only performable by the contract owner.
+         Addresses without an active lock are skipped, expired locks stay
+         withdrawable. The global point is advanced and the tokens are
+         approved once for the whole batch.
+    @param _addrs Addresses of which to migrate the locks.
+    """
+    self.assert_is_owner(msg.sender)
+    next_ve: address = self.next_ve_contract
+    assert next_ve != ZERO_ADDRESS # dev: no next ve contract
+
+    last_point: Point = self._checkpoint_global()
+    addrs: DynArray[address, MAX_LOCKS] = []
+    values: DynArray[uint256, MAX_LOCKS] = []
+    ends: DynArray[uint256, MAX_LOCKS] = []
+    total: uint256 = 0
+
+    for addr in _addrs:
+        old_locked: LockedBalance = self.locked[addr]
+        if old_locked.amount == 0 or old_locked.end <= block.timestamp:
+            continue
+        value: uint256 = convert(old_locked.amount, uint256)
+
+        self.locked[addr] = empty(LockedBalance)
+        last_point = self._checkpoint_user(addr, old_locked, empty(LockedBalance), last_point)
+        addrs.append(addr)
+        values.append(value)
+        ends.append(old_locked.end)
+        total += value
+
+        log Migrate(addr, value, next_ve)
+
+    self.point_history[self.epoch] = last_point
+    self.supply -= total
+
+    if total != 0:
+        ERC20(self.token).approve(next_ve, total)
+        Migrator(next_ve).migrate_locks(addrs, values, ends)
+
+
 # The following ERC20/minime-compatible methods are not real balanceOf and supply!
 # They measure the weights for the purpose of voting, so they don't represent
 # real coins.
@@ -631,12 +812,68 @@ def find_block_epoch(_block: uint256, max_epoch: uint256) -> uint256:
     return _min
 
 
+@internal
+@view
+def find_timestamp_epoch(_t: uint256, max_epoch: uint256) -> uint256:
+    """
+    @notice Find the last global point recorded at or before `_t`.
+    @dev The search only covers the week of `_t`, between the points
+         `_checkpoint` records at its start and at the start of the next one.
+    @param _t Time to find.
+    @param max_epoch Don't go beyond this epoch.
+    @return Epoch of that point.
+    """
+    week: uint256 = _t / WEEK * WEEK
+    _min: uint256 = self.week_epoch[week]
+    _max: uint256 = self.week_epoch[week + WEEK]
+    if _max == 0:
+        _max = max_epoch
+    else:
+        _max -= 1
+
+    # Binary search
+    for i in range(128):  # Will be always enough for 128-bit numbers
+        if _min >= _max:
+            break
+        _mid: uint256 = (_min + _max + 1) / 2
+        if self.point_history[_mid].ts <= _t:
+            _min = _mid
+        else:
+            _max = _mid - 1
+    return _min
+
+
+@internal
+@view
+def find_user_timestamp_epoch(addr: address, _t: uint256, max_epoch: uint256) -> uint256:
+    """
+    @notice Find the last point of `addr` recorded at or before `_t`.
+    @param addr User's wallet address.
+    @param _t Time to find.
+    @param max_epoch Don't go beyond this epoch.
+    @return Epoch of that point, 0 if there is none.
+    """
+    # Binary search
+    _min: uint256 = 0
+    _max: uint256 = max_epoch
+    for i in range(128):  # Will be always enough for 128-bit numbers
+        if _min >= _max:
+            break
+        _mid: uint256 = (_min + _max + 1) / 2
+        if self.user_point_history[addr][_mid].ts <= _t:
+            _min = _mid
+        else:
+            _max = _mid - 1
+    return _min
+
+
 @internal
 @view
 def balance_of(addr: address, _t: uint256 = block.timestamp) -> uint256:
     """
     @notice Get the current voting power for `msg.sender`.
-    @dev Returns 0 if the contract has entered a migration.
+    @dev Times before the last user checkpoint start from the user point
+         recorded at or before them. Returns 0 if the contract has entered a migration.
     @param addr User wallet address.
     @param _t Epoch time to return voting power at.
     @return User voting power.
@@ -649,6 +886,8 @@ def balance_of(addr: address, _t: uint256 = block.timestamp) -> uint256:
         return 0
     else:
         last_point: Point = self.user_point_history[addr][_epoch]
+        if _t < last_point.ts:
+            last_point = self.user_point_history[addr][self.find_user_timestamp_epoch(addr, _t, _epoch)]
         last_point.bias -= last_point.slope * convert(_t - last_point.ts, int128)
         if last_point.bias < 0:
             last_point.bias = 0
@@ -743,6 +982,7 @@ def supply_at(point: Point, t: uint256) -> uint256:
     """
     @notice Calculate total voting power at some point in the past.
     @dev Returns 0 if the contract has entered a migration.
+         Weeks without slope changes are skipped, the bias decays linearly over them.
     @param point The point (bias/slope) to start search from.
     @param t Time to calculate the total voting power at.
     @return Total voting power at that time.
@@ -751,18 +991,12 @@ def supply_at(point: Point, t: uint256) -> uint256:
         return 0
 
     last_point: Point = point
-    t_i: uint256 = (last_point.ts / WEEK) * WEEK
     for i in range(255):
-        t_i += WEEK
-        d_slope: int128 = 0
-        if t_i > t:
-            t_i = t
-        else:
-            d_slope = self.slope_changes[t_i]
+        t_i: uint256 = self._next_slope_change(last_point.ts, t)
         last_point.bias -= last_point.slope * convert(t_i - last_point.ts, int128)
         if t_i == t:
             break
-        last_point.slope += d_slope
+        last_point.slope += self.slope_changes[t_i]
         last_point.ts = t_i
 
     if last_point.bias < 0:
@@ -770,6 +1004,26 @@ def supply_at(point: Point, t: uint256) -> uint256:
     return convert(last_point.bias, uint256)
 
 
+@internal
+@view
+def supply_at_time(t: uint256) -> uint256:
+    """
+    @notice Calculate total voting power at time `t`.
+    @dev Times before the last checkpoint start from the point recorded in
+         their week. Returns 0 if the contract has entered a migration.
+    @param t Time to calculate the total voting power at.
+    @return Total voting power at that time.
+    """
+    _epoch: uint256 = self.epoch
+    last_point: Point = self.point_history[_epoch]
+    if t < last_point.ts:
+        last_point = self.point_history[self.find_timestamp_epoch(t, _epoch)]
+        if t < last_point.ts:
+            # before the contract was deployed
+            return 0
+    return self.supply_at(last_point, t)
+
+
 @external
 @view
 def totalSupply(t: uint256 = block.timestamp) -> uint256:
@@ -777,11 +1031,23 @@ def totalSupply(t: uint256 = block.timestamp) -> uint256:
     @notice Calculate total voting power.
     @dev Adheres to the ERC20 `totalSupply` interface for Aragon compatibility.
          Returns 0 if the contract has entered a migration.
+    @param t Epoch time to return total voting power at.
     @return Total voting power.
     """
-    _epoch: uint256 = self.epoch
-    last_point: Point = self.point_history[_epoch]
-    return self.supply_at(last_point, t)
+    return self.supply_at_time(t)
+
+
+@external
+@view
+def balance_and_supply(addr: address) -> (uint256, uint256):
+    """
+    @notice Get the current voting power of `addr` and the total voting power.
+    @dev Single call for gauges computing boosts.
+         Returns zeros if the contract has entered a migration.
+    @param addr User wallet address.
+    @return User voting power, total voting power.
+    """
+    return self.balance_of(addr), self.supply_at(self.point_history[self.epoch], block.timestamp)
 
 
 @external
@@ -814,6 +1080,35 @@ def totalSupplyAt(_block: uint256) -> uint256:
     return self.supply_at(point, point.ts + dt)
 
 
+@external
+@view
+def balanceOfAtTime(addr: address, _ts: uint256) -> uint256:
+    """
+    @notice Measure voting power of `addr` at time `_ts`.
+    @dev Looks the user point up by timestamp, so there is no block to time
+         interpolation involved. Returns 0 if the contract has entered a migration.
+    @param addr User's wallet address.
+    @param _ts Time to calculate the voting power at.
+    @return Voting power.
+    """
+    assert _ts <= block.timestamp
+    return self.balance_of(addr, _ts)
+
+
+@external
+@view
+def totalSupplyAtTime(_ts: uint256) -> uint256:
+    """
+    @notice Calculate total voting power at time `_ts`.
+    @dev Looks the global point up by timestamp, so there is no block to time
+         interpolation involved. Returns 0 if the contract has entered a migration.
+    @param _ts Time to calculate the total voting power at.
+    @return Total voting power at `_ts`.
+    """
+    assert _ts <= block.timestamp
+    return self.supply_at_time(_ts)
+
+
 # These methods are for compatiblity with Governor Bravo.
 
 @external
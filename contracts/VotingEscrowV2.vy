@@ -0,0 +1,1435 @@
+# @version 0.3.3
+"""
+@title Voting Escrow V2
+@author Kōyō Finance
+@license MIT
+@notice Votes have a weight depending on time, so that users are
+        committed to the future of (whatever they are voting for).
+@dev Vote weight decays linearly over time. Lock time cannot be
+     more than `MAXTIME` (~1 year).
+     If a lock if forcefully exited the user experiences a 80% loss which is burnt.
+     Points and locks are stored bit-packed, see `PackedPoint`. Locks are
+     taken over from the previous ve contract through `migrate_lock`.
+"""
+
+
+from SmartWalletWhitelist import SmartWalletChecker
+
+
+interface ERC20:
+    def decimals() -> uint256: view
+    def name() -> String[64]: view
+    def symbol() -> String[32]: view
+    def approve(spender: address, amount: uint256) -> bool: nonpayable
+    def transfer(to: address, amount: uint256) -> bool: nonpayable
+    def transferFrom(spender: address, to: address, amount: uint256) -> bool: nonpayable
+    def burn(amount: uint256) -> bool: nonpayable
+
+interface Migrator:
+    def migrate_lock(addr: address, amount: uint256): nonpayable
+    def migrate_locks(addrs: DynArray[address, MAX_LOCKS], amounts: DynArray[uint256, MAX_LOCKS], ends: DynArray[uint256, MAX_LOCKS]): nonpayable
+
+
+# Voting escrow to have time-weighted votes
+# Votes have a weight depending on time, so that users are committed
+# to the future of (whatever they are voting for).
+# The weight in this implementation is linear, and lock cannot be more than maxtime:
+# w ^
+# 1 +        /
+#   |      /
+#   |    /
+#   |  /
+#   |/
+# 0 +--------+------> time
+#       maxtime (1 year?)
+#
+# If at any point the user decides to forcefully withdraw they will do so at a 80% loss of their initial locked amount.
+# The 80% lost will be burnt and removed from circulation.
+
+struct Point:
+    bias: int128
+    slope: int128  # - dweight / dt
+    ts: uint256
+    blk: uint256  # block
+# We cannot really do block numbers per se b/c slope is per time, not per block
+# and per block could be fairly bad b/c Ethereum changes blocktimes.
+# What we can do is to extrapolate ***At functions
+
+struct LockedBalance:
+    amount: int128
+    end: uint256
+
+# Storage layout of a Point, two slots instead of four:
+# bias_slope = bias << 128 | slope
+# ts_blk = ts << 64 | blk
+# bias and slope are never negative once recorded.
+struct PackedPoint:
+    bias_slope: uint256
+    ts_blk: uint256
+
+# LockedBalance is stored as a single word: amount << 128 | end
+
+
+interface PreviousVotingEscrow:
+    def locked(addr: address) -> LockedBalance: view
+
+
+event Initialized:
+    token: address
+
+event Deposit:
+    deposit_from: indexed(address)
+    provider: indexed(address)
+    value: uint256
+    locktime: indexed(uint256)
+    type: int128
+    ts: uint256
+event Supply:
+    prevSupply: uint256
+    supply: uint256
+event Migrate:
+    account: indexed(address)
+    amount: uint256
+    to: indexed(address)
+event Withdraw:
+    provider: indexed(address)
+    value: uint256
+    ts: uint256
+event PenaltyApplied:
+    provider: indexed(address)
+    value: uint256
+    penalty: uint256
+    ts: uint256
+
+event CommitOwnership:
+    owner: indexed(address)
+event ApplyOwnership:
+    owner: indexed(address)
+
+event CommitSmartWalletChecker:
+    checker: indexed(address)
+event ApplySmartWalletChecker:
+    checker: indexed(address)
+
+event CommitNextVeContract:
+    ve: indexed(address)
+event ApplyNextVeContract:
+    ve: indexed(address)
+
+
+DEPOSIT_FOR_TYPE: constant(int128) = 0
+CREATE_LOCK_TYPE: constant(int128) = 1
+INCREASE_LOCK_AMOUNT: constant(int128) = 2
+INCREASE_UNLOCK_TIME: constant(int128) = 3
+MIGRATE_LOCK_TYPE: constant(int128) = 4
+
+DAY: constant(uint256) = 86400  # 1 day
+WEEK: constant(uint256) = 7 * DAY  # all future times are rounded by week
+MAXTIME: constant(uint256) = 365 * DAY  # 1 year
+MAXTIME_I128: constant(int128) = 365 * DAY  # 1 year
+MULTIPLIER: constant(uint256) = 10 ** 18
+
+MASK_64: constant(uint256) = 2 ** 64 - 1
+MASK_128: constant(uint256) = 2 ** 128 - 1
+
+PENALTY_RATIO: constant(uint256) = MULTIPLIER * 1 / 5
+
+# Locks created by a single `create_locks_for` call
+MAX_LOCKS: constant(uint256) = 64
+
+# Bitmap words (of 256 weeks) scanned looking for a slope change
+MAX_WORD_SCAN: constant(uint256) = 100
+
+
+token: public(address)
+
+name: public(String[64])
+symbol: public(String[32])
+version: public(String[32])
+decimals: public(uint256)
+supply: public(uint256)
+
+packed_locked: HashMap[address, uint256]  # user -> packed LockedBalance
+
+epoch: public(uint256)
+packed_point_history: HashMap[uint256, PackedPoint]  # epoch -> unsigned point
+week_epoch: public(HashMap[uint256, uint256])  # week start -> epoch of the global point recorded there
+packed_user_point_history: HashMap[address, HashMap[uint256, PackedPoint]]  # user -> Point[user_epoch]
+user_point_epoch: public(HashMap[address, uint256])
+slope_changes: public(HashMap[uint256, int128])  # time -> signed slope change
+slope_change_weeks: HashMap[uint256, uint256]  # week / 256 -> weeks with a scheduled slope change
+
+owner: public(address)  # Can and will be a smart contract
+future_owner: public(address)
+
+# Aragon's view methods for compatibility
+controller: public(address)
+transfersEnabled: public(bool)
+
+smart_wallet_checker: public(address)
+future_smart_wallet_checker: public(address)
+
+previous_ve_contract: public(address)
+next_ve_contract: public(address)
+queued_next_ve_contract: public(address)
+migration: public(bool)
+
+
+@external
+def __init__(token_addr: address, _name: String[64], _symbol: String[32], _version: String[32], _previous_ve: address):
+    """
+    @notice Contract constructor.
+    @param token_addr `Koyo` (KYO) token address.
+    @param _name Token name.
+    @param _symbol Token symbol.
+    @param _version Contract version - required for Aragon compatibility.
+    @param _previous_ve Ve contract locks are migrated from, allowed to call `migrate_lock`.
+    """
+    self.owner = msg.sender
+
+    self.token = token_addr
+
+    _decimals: uint256 = ERC20(token_addr).decimals()
+    assert _decimals <= 255
+    self.decimals = _decimals
+
+    self.name = _name
+    self.symbol = _symbol
+    self.version = _version
+    self.previous_ve_contract = _previous_ve
+
+    self._write_point(0, Point({bias: 0, slope: 0, ts: block.timestamp, blk: block.number}))
+
+    self.controller = msg.sender
+    self.transfersEnabled = True
+
+    log Initialized(token_addr)
+
+
+@internal
+@view
+def assert_is_owner(addr: address):
+    """
+    @notice Check if the call is from the owner, revert if not.
+    @param addr Address to be checked.
+    """
+    assert addr == self.owner  # dev: owner only
+
+
+@internal
+def assert_not_contract(addr: address):
+    """
+    @notice Check if the call is from a whitelisted smart contract, revert if not.
+    @param addr Address to be checked.
+    """
+    if addr != tx.origin:
+        checker: address = self.smart_wallet_checker
+        if checker != ZERO_ADDRESS:
+            if SmartWalletChecker(checker).check(addr):
+                return
+        raise "SCDNA"
+
+
+@external
+@view
+def get_last_user_slope(addr: address) -> int128:
+    """
+    @notice Get the most recently recorded rate of voting power decrease for `addr`.
+    @dev Returns 0 if the contract has entered a migration.
+    @param addr Address of the user wallet.
+    @return Value of the slope.
+    """
+    if self.migration:
+        return 0
+
+    uepoch: uint256 = self.user_point_epoch[addr]
+    return self._read_user_point(addr, uepoch).slope
+
+
+@external
+@view
+def user_point_history__ts(_addr: address, _idx: uint256) -> uint256:
+    """
+    @notice Get the timestamp for checkpoint `_idx` for `_addr`.
+    @dev Returns 0 if the contract has entered a migration.
+    @param _addr User wallet address.
+    @param _idx User epoch number.
+    @return Epoch time of the checkpoint.
+    """
+    if self.migration:
+        return 0
+
+    return shift(self.packed_user_point_history[_addr][_idx].ts_blk, -64)
+
+
+@external
+@view
+def locked__end(_addr: address) -> uint256:
+    """
+    @notice Get timestamp when `_addr`'s lock finishes.
+    @dev Returns 0 if the contract has entered a migration.
+    @param _addr User wallet.
+    @return Epoch time of the lock end.
+    """
+    if self.migration:
+        return 0
+
+    return self._read_locked(_addr).end
+
+
+@external
+@view
+def locked(_addr: address) -> LockedBalance:
+    """
+    @notice Get the locked amount and lock end of `_addr`.
+    @param _addr User wallet.
+    @return Locked amount / end lock time.
+    """
+    return self._read_locked(_addr)
+
+
+@external
+@view
+def point_history(_epoch: uint256) -> Point:
+    """
+    @notice Get the global point recorded at epoch `_epoch`.
+    @param _epoch Global epoch number.
+    @return Unpacked point.
+    """
+    return self._read_point(_epoch)
+
+
+@external
+@view
+def user_point_history(_addr: address, _idx: uint256) -> Point:
+    """
+    @notice Get checkpoint `_idx` of `_addr`.
+    @param _addr User wallet address.
+    @param _idx User epoch number.
+    @return Unpacked point.
+    """
+    return self._read_user_point(_addr, _idx)
+
+
+@internal
+@pure
+def _pack_point(p: Point) -> PackedPoint:
+    """
+    @notice Pack `p` into its storage layout.
+    @dev Expects a non-negative bias and slope and `blk` below 2 ** 64.
+    """
+    return PackedPoint({
+        bias_slope: bitwise_or(shift(convert(p.bias, uint256), 128), convert(p.slope, uint256)),
+        ts_blk: bitwise_or(shift(p.ts, 64), p.blk),
+    })
+
+
+@internal
+@pure
+def _unpack_point(p: PackedPoint) -> Point:
+    """
+    @notice Unpack a `Point` from its storage layout.
+    """
+    return Point({
+        bias: convert(shift(p.bias_slope, -128), int128),
+        slope: convert(bitwise_and(p.bias_slope, MASK_128), int128),
+        ts: shift(p.ts_blk, -64),
+        blk: bitwise_and(p.ts_blk, MASK_64),
+    })
+
+
+@internal
+@view
+def _read_point(_epoch: uint256) -> Point:
+    """
+    @notice Global point recorded at `_epoch`.
+    """
+    return self._unpack_point(self.packed_point_history[_epoch])
+
+
+@internal
+def _write_point(_epoch: uint256, p: Point):
+    """
+    @notice Record `p` as the global point of `_epoch`.
+    """
+    self.packed_point_history[_epoch] = self._pack_point(p)
+
+
+@internal
+@view
+def _read_user_point(addr: address, _idx: uint256) -> Point:
+    """
+    @notice Point `_idx` of `addr`.
+    """
+    return self._unpack_point(self.packed_user_point_history[addr][_idx])
+
+
+@internal
+@view
+def _read_locked(addr: address) -> LockedBalance:
+    """
+    @notice Unpack the lock of `addr`.
+    """
+    packed: uint256 = self.packed_locked[addr]
+    return LockedBalance({amount: convert(shift(packed, -128), int128), end: bitwise_and(packed, MASK_128)})
+
+
+@internal
+def _write_locked(addr: address, _locked: LockedBalance):
+    """
+    @notice Pack and store the lock of `addr`.
+    @dev Expects a non-negative amount and `end` below 2 ** 128.
+    """
+    self.packed_locked[addr] = bitwise_or(shift(convert(_locked.amount, uint256), 128), _locked.end)
+
+
+@internal
+@pure
+def _lowest_bit(x: uint256) -> uint256:
+    """
+    @notice Index of the least significant set bit of `x` (`x` != 0).
+    """
+    r: uint256 = 0
+    y: uint256 = x
+    s: uint256 = 128
+    for i in range(8):
+        if bitwise_and(y, shift(1, convert(s, int128)) - 1) == 0:
+            y = shift(y, -convert(s, int128))
+            r += s
+        s /= 2
+    return r
+
+
+@internal
+def _mark_slope_change(t: uint256):
+    """
+    @notice Record that week `t` has a scheduled slope change.
+    @param t Week start.
+    """
+    w: uint256 = t / WEEK
+    word: uint256 = self.slope_change_weeks[w / 256]
+    bit: uint256 = shift(1, convert(w % 256, int128))
+    if bitwise_and(word, bit) == 0:
+        self.slope_change_weeks[w / 256] = bitwise_or(word, bit)
+
+
+@internal
+@view
+def _next_slope_change(t: uint256, limit: uint256) -> uint256:
+    """
+    @notice Find the first week after the week of `t` with a scheduled slope change.
+    @param t Time to search from.
+    @param limit Upper bound of the search.
+    @return Start of that week, or `limit` if it comes later.
+    """
+    w: uint256 = t / WEEK + 1
+    last: uint256 = limit / WEEK
+    for i in range(MAX_WORD_SCAN):
+        if w > last:
+            break
+        bits: uint256 = shift(self.slope_change_weeks[w / 256], -convert(w % 256, int128))
+        if bits != 0:
+            return min((w + self._lowest_bit(bits)) * WEEK, limit)
+        w = (w / 256 + 1) * 256
+    return limit
+
+
+@internal
+def _checkpoint_global() -> Point:
+    """
+    @notice Fill the global point history up to the current block.
+    @dev The point at the current block is returned without recording it,
+         so per-user changes can be applied to it first.
+    @return Global point at `block.timestamp`.
+    """
+    _epoch: uint256 = self.epoch
+    last_point: Point = Point({bias: 0, slope: 0, ts: block.timestamp, blk: block.number})
+    if _epoch > 0:
+        last_point = self._read_point(_epoch)
+    last_checkpoint: uint256 = last_point.ts
+    # initial_last_point is used for extrapolation to calculate block number
+    # (approximately, for *At methods) and save them
+    # as we cannot figure that out exactly from inside the contract
+    initial_last_point: Point = last_point
+    block_slope: uint256 = 0  # dblock/dt
+    if block.timestamp > last_point.ts:
+        block_slope = MULTIPLIER * (block.number - last_point.blk) / (block.timestamp - last_point.ts)
+    # If last point is already recorded in this block, slope=0
+    # But that's ok b/c we know the block in such case
+
+    # Go over weeks to fill history and calculate what the current point is
+    t_i: uint256 = (last_checkpoint / WEEK) * WEEK
+    for i in range(255):
+        # Hopefully it won't happen that this won't get used in 5 years!
+        # If it does, users will be able to withdraw but vote weight will be broken
+        t_i += WEEK
+        d_slope: int128 = 0
+        if t_i > block.timestamp:
+            t_i = block.timestamp
+        else:
+            d_slope = self.slope_changes[t_i]
+        last_point.bias -= last_point.slope * convert(t_i - last_checkpoint, int128)
+        last_point.slope += d_slope
+        if last_point.bias < 0:  # This can happen
+            last_point.bias = 0
+        if last_point.slope < 0:  # This cannot happen - just in case
+            last_point.slope = 0
+        last_checkpoint = t_i
+        last_point.ts = t_i
+        last_point.blk = initial_last_point.blk + block_slope * (t_i - initial_last_point.ts) / MULTIPLIER
+        _epoch += 1
+        if t_i == block.timestamp:
+            last_point.blk = block.number
+            break
+        else:
+            self._write_point(_epoch, last_point)
+            self.week_epoch[t_i] = _epoch
+
+    self.epoch = _epoch
+    # Now point_history is filled until t=now
+    return last_point
+
+
+@internal
+def _checkpoint_user(addr: address, old_locked: LockedBalance, new_locked: LockedBalance, _last_point: Point) -> Point:
+    """
+    @notice Record per-user data to checkpoint and apply it to the global point.
+    @param addr User's wallet address.
+    @param old_locked Pevious locked amount / end lock time for the user.
+    @param new_locked New locked amount / end lock time for the user.
+    @param _last_point Global point at `block.timestamp`.
+    @return `_last_point` with the user's change applied.
+    """
+    u_old: Point = empty(Point)
+    u_new: Point = empty(Point)
+    old_dslope: int128 = 0
+    new_dslope: int128 = 0
+    last_point: Point = _last_point
+
+    # Calculate slopes and biases
+    # Kept at zero when they have to
+    if old_locked.end > block.timestamp and old_locked.amount > 0:
+        u_old.slope = old_locked.amount / MAXTIME_I128
+        u_old.bias = u_old.slope * convert(old_locked.end - block.timestamp, int128)
+    if new_locked.end > block.timestamp and new_locked.amount > 0:
+        u_new.slope = new_locked.amount / MAXTIME_I128
+        u_new.bias = u_new.slope * convert(new_locked.end - block.timestamp, int128)
+
+    # Read values of scheduled changes in the slope
+    # old_locked.end can be in the past and in the future
+    # new_locked.end can ONLY by in the FUTURE unless everything expired: than zeros
+    old_dslope = self.slope_changes[old_locked.end]
+    if new_locked.end != 0:
+        if new_locked.end == old_locked.end:
+            new_dslope = old_dslope
+        else:
+            new_dslope = self.slope_changes[new_locked.end]
+
+    # If last point was in this block, the slope change has been applied already
+    # But in such case we have 0 slope(s)
+    last_point.slope += (u_new.slope - u_old.slope)
+    last_point.bias += (u_new.bias - u_old.bias)
+    if last_point.slope < 0:
+        last_point.slope = 0
+    if last_point.bias < 0:
+        last_point.bias = 0
+
+    # Schedule the slope changes (slope is going down)
+    # We subtract new_user_slope from [new_locked.end]
+    # and add old_user_slope to [old_locked.end]
+    if old_locked.end > block.timestamp:
+        # old_dslope was <something> - u_old.slope, so we cancel that
+        old_dslope += u_old.slope
+        if new_locked.end == old_locked.end:
+            old_dslope -= u_new.slope  # It was a new deposit, not extension
+        self.slope_changes[old_locked.end] = old_dslope
+        self._mark_slope_change(old_locked.end)
+
+    if new_locked.end > block.timestamp:
+        if new_locked.end > old_locked.end:
+            new_dslope -= u_new.slope  # old slope disappeared at this point
+            self.slope_changes[new_locked.end] = new_dslope
+            self._mark_slope_change(new_locked.end)
+        # else: we recorded it already in old_dslope
+
+    # Now handle user history
+    user_epoch: uint256 = self.user_point_epoch[addr] + 1
+
+    self.user_point_epoch[addr] = user_epoch
+    u_new.ts = block.timestamp
+    u_new.blk = block.number
+    self.packed_user_point_history[addr][user_epoch] = self._pack_point(u_new)
+
+    return last_point
+
+
+@internal
+def _checkpoint(addr: address, old_locked: LockedBalance, new_locked: LockedBalance):
+    """
+    @notice Record global and per-user data to checkpoint.
+    @param addr User's wallet address. No user checkpoint if 0x0.
+    @param old_locked Pevious locked amount / end lock time for the user.
+    @param new_locked New locked amount / end lock time for the user.
+    """
+    last_point: Point = self._checkpoint_global()
+    if addr != ZERO_ADDRESS:
+        last_point = self._checkpoint_user(addr, old_locked, new_locked, last_point)
+
+    # Record the changed point into history
+    self._write_point(self.epoch, last_point)
+
+
+@external
+def checkpoint():
+    """
+    @notice Record global data to checkpoint.
+    """
+    self._checkpoint(ZERO_ADDRESS, empty(LockedBalance), empty(LockedBalance))
+
+
+@internal
+def _deposit_for(_from: address, _addr: address, _value: uint256, unlock_time: uint256, locked_balance: LockedBalance, type: int128):
+    """
+    @notice Deposit and lock tokens for a user.
+    @dev A deposit cannot be made if the "VotingEscrow" contract has started a migration.
+    @param _from Address from which the tokens are transferred.
+    @param _addr User's wallet address.
+    @param _value Amount to deposit.
+    @param unlock_time New time when to unlock the tokens, or 0 if unchanged.
+    @param locked_balance Previous locked amount / timestamp.
+    """
+    assert(self.migration == False) # dev: must migrate
+
+    _locked: LockedBalance = locked_balance
+    supply_before: uint256 = self.supply
+
+    self.supply = supply_before + _value
+    old_locked: LockedBalance = _locked
+    # Adding to existing lock, or if a lock is expired - creating a new one
+    _locked.amount += convert(_value, int128)
+    if unlock_time != 0:
+        _locked.end = unlock_time
+    self._write_locked(_addr, _locked)
+
+    # Possibilities:
+    # Both old_locked.end could be current or expired (>/< block.timestamp)
+    # value == 0 (extend lock) or value > 0 (add to lock or extend lock)
+    # _locked.end > block.timestamp (always)
+    self._checkpoint(_addr, old_locked, _locked)
+
+    if _value != 0:
+        assert ERC20(self.token).transferFrom(_from, self, _value)
+
+    log Deposit(_from, _addr, _value, _locked.end, type, block.timestamp)
+    log Supply(supply_before, supply_before + _value)
+
+
+@internal
+def _create_lock_for(_from: address, _addr: address, _value: uint256, _unlock_time: uint256):
+    unlock_time: uint256 = (_unlock_time / WEEK) * WEEK  # Locktime is rounded down to weeks
+    _locked: LockedBalance = self._read_locked(_addr)
+
+    assert _value > 0  # dev: need non-zero value
+    assert _locked.amount == 0, "W"
+    assert unlock_time > block.timestamp, "LBF"
+    assert unlock_time <= block.timestamp + MAXTIME, "VLABT"
+
+    self._deposit_for(_from, _addr, _value, unlock_time, _locked, CREATE_LOCK_TYPE)
+
+
+@external
+@nonreentrant('lock')
+def deposit_for(_addr: address, _value: uint256):
+    """
+    @notice Deposit `_value` tokens for `_addr` and add to the lock.
+    @dev Anyone (even a smart contract) can deposit for someone else, but
+         cannot extend their locktime and deposit for a brand new user.
+    @param _addr User's wallet address.
+    @param _value Amount to add to user's lock.
+    """
+    _locked: LockedBalance = self._read_locked(_addr)
+
+    assert _value > 0  # dev: need non-zero value
+    assert _locked.amount > 0, "NELF"
+    assert _locked.end > block.timestamp, "CAEL-W"
+
+    self._deposit_for(msg.sender, _addr, _value, 0, _locked, DEPOSIT_FOR_TYPE)
+
+
+@external
+@nonreentrant('lock')
+def create_lock(_value: uint256, _unlock_time: uint256):
+    """
+    @notice Deposit `_value` tokens for `msg.sender` and lock until `_unlock_time`.
+    @dev This action cannot be performed by a smart contract
+         that isn't whitelisted in the "SmartWalletWhitelist" contract.
+    @param _value Amount to deposit.
+    @param _unlock_time Epoch time when tokens unlock, rounded down to whole weeks.
+    """
+    self.assert_not_contract(msg.sender)
+
+    self._create_lock_for(msg.sender, msg.sender, _value, _unlock_time)
+
+
+@external
+@nonreentrant('lock')
+def create_lock_for(_addr: address, _value: uint256, _unlock_time: uint256):
+    """
+    @notice Deposit `_value` tokens for `_addr` and lock until `_unlock_time`.
+    @dev This action is only performable by the contract owner.
+    @param _addr Address for which to create the lock.
+    @param _value Amount to deposit.
+    @param _unlock_time Epoch time when tokens unlock, rounded down to whole weeks.
+    """
+    self.assert_is_owner(msg.sender)
+
+    self._create_lock_for(msg.sender, _addr, _value, _unlock_time)
+
+
+@external
+@nonreentrant('lock')
+def create_locks_for(_addrs: DynArray[address, MAX_LOCKS], _values: DynArray[uint256, MAX_LOCKS], _unlock_times: DynArray[uint256, MAX_LOCKS]):
+    """
+    @notice Create a lock for each of `_addrs` at once.
+    @dev This action is only performable by the contract owner.
+         The tokens are transferred and the global point is advanced once
+         for the whole batch, only the per-user points are written per lock.
+    @param _addrs Addresses for which to create the locks.
+    @param _values Amount to deposit for each address.
+    @param _unlock_times Epoch time when each lock ends, rounded down to whole weeks.
+    """
+    self.assert_is_owner(msg.sender)
+    assert self.migration == False  # dev: must migrate
+    assert len(_values) == len(_addrs) and len(_unlock_times) == len(_addrs)  # dev: length mismatch
+
+    last_point: Point = self._checkpoint_global()
+    supply_before: uint256 = self.supply
+    total: uint256 = 0
+
+    for i in range(MAX_LOCKS):
+        if i >= len(_addrs):
+            break
+        addr: address = _addrs[i]
+        value: uint256 = _values[i]
+        unlock_time: uint256 = (_unlock_times[i] / WEEK) * WEEK  # Locktime is rounded down to weeks
+        old_locked: LockedBalance = self._read_locked(addr)
+
+        assert value > 0  # dev: need non-zero value
+        assert old_locked.amount == 0, "W"
+        assert unlock_time > block.timestamp, "LBF"
+        assert unlock_time <= block.timestamp + MAXTIME, "VLABT"
+
+        new_locked: LockedBalance = LockedBalance({amount: convert(value, int128), end: unlock_time})
+        self._write_locked(addr, new_locked)
+        last_point = self._checkpoint_user(addr, old_locked, new_locked, last_point)
+        total += value
+
+        log Deposit(msg.sender, addr, value, unlock_time, CREATE_LOCK_TYPE, block.timestamp)
+
+    self._write_point(self.epoch, last_point)
+    self.supply = supply_before + total
+
+    if total != 0:
+        assert ERC20(self.token).transferFrom(msg.sender, self, total)
+
+    log Supply(supply_before, supply_before + total)
+
+
+@external
+@nonreentrant('lock')
+def increase_amount(_value: uint256):
+    """
+    @notice Deposit `_value` additional tokens for `msg.sender`
+            without modifying the unlock time.
+    @dev This action cannot be performed by a smart contract
+         that isn't whitelisted in the "SmartWalletWhitelist" contract.
+    @param _value Amount of tokens to deposit and add to the lock.
+    """
+    self.assert_not_contract(msg.sender)
+
+    _locked: LockedBalance = self._read_locked(msg.sender)
+
+    assert _value > 0  # dev: need non-zero value
+    assert _locked.amount > 0, "NELF"
+    assert _locked.end > block.timestamp, "CAEL-W"
+
+    self._deposit_for(msg.sender, msg.sender, _value, 0, _locked, INCREASE_LOCK_AMOUNT)
+
+
+@external
+@nonreentrant('lock')
+def increase_unlock_time(_unlock_time: uint256):
+    """
+    @notice Extend the unlock time for `msg.sender` to `_unlock_time`.
+    @dev This action cannot be performed by a smart contract
+         that isn't whitelisted in the "SmartWalletWhitelist" contract.
+    @param _unlock_time New epoch time for unlocking.
+    """
+    self.assert_not_contract(msg.sender)
+
+    _locked: LockedBalance = self._read_locked(msg.sender)
+    unlock_time: uint256 = (_unlock_time / WEEK) * WEEK  # Locktime is rounded down to weeks
+
+    assert _locked.end > block.timestamp, "CAEL-W"
+    assert _locked.amount > 0, "NELF"
+    assert unlock_time > _locked.end, "COILT"
+    assert unlock_time <= block.timestamp + MAXTIME, "VLABT"
+
+    self._deposit_for(msg.sender, msg.sender, 0, unlock_time, _locked, INCREASE_UNLOCK_TIME)
+
+
+@external
+@nonreentrant('lock')
+def withdraw():
+    """
+    @notice Withdraw all tokens for `msg.sender`.
+    @dev Only possible if the lock has expired.
+    """
+    _locked: LockedBalance = self._read_locked(msg.sender)
+    assert block.timestamp >= _locked.end, "LNE"
+    value: uint256 = convert(_locked.amount, uint256)
+
+    old_locked: LockedBalance = _locked
+    _locked.end = 0
+    _locked.amount = 0
+    self._write_locked(msg.sender, _locked)
+    supply_before: uint256 = self.supply
+    self.supply = supply_before - value
+
+    # old_locked can have either expired <= timestamp or zero end
+    # _locked has only 0 end
+    # Both can have >= 0 amount
+    self._checkpoint(msg.sender, old_locked, _locked)
+
+    assert ERC20(self.token).transfer(msg.sender, value)
+
+    log Withdraw(msg.sender, value, block.timestamp)
+    log Supply(supply_before, supply_before - value)
+
+
+@external
+@nonreentrant('lock')
+def force_withdraw():
+    """
+    @notice Withdraw all tokens for `msg.sender` before their lock has expired.
+            Forcefully withdrawing incours a 80% penalty which gets permanently burnt.
+    @dev Only possible before a users lock ends and only if the "VotingEscow" hasn't entered a migration.
+    """
+    assert self.migration == False  # dev: must not be migrating
+
+    _locked: LockedBalance = self._read_locked(msg.sender)
+    assert block.timestamp < _locked.end, "LE"
+
+    value: uint256 = convert(_locked.amount, uint256)
+
+    old_locked: LockedBalance = _locked
+    _locked.end = 0
+    _locked.amount = 0
+    self._write_locked(msg.sender, _locked)
+    supply_before: uint256 = self.supply
+    self.supply = supply_before - value
+
+    # old_locked can have either expired <= timestamp or zero end
+    # _locked has only 0 end
+    # Both can have >= 0 amount
+    self._checkpoint(msg.sender, old_locked, _locked)
+
+    penalised: uint256 = value * PENALTY_RATIO / MULTIPLIER
+    assert ERC20(self.token).transfer(msg.sender, penalised)
+    assert ERC20(self.token).burn(value - penalised)
+
+    log Withdraw(msg.sender, value, block.timestamp)
+    log PenaltyApplied(msg.sender, value, penalised, block.timestamp)
+    log Supply(supply_before, supply_before - value)
+
+
+@external
+@nonreentrant('lock')
+def migrate():
+    """
+    @notice Transfers the lock of `msg.sender` to a new ve contract.
+    """
+    assert self.next_ve_contract != ZERO_ADDRESS # dev: no next ve contract
+
+    _locked: LockedBalance = self._read_locked(msg.sender)
+    assert block.timestamp < _locked.end, "LE"
+    value: uint256 = convert(_locked.amount, uint256)
+
+    ERC20(self.token).approve(self.next_ve_contract, value)
+    Migrator(self.next_ve_contract).migrate_lock(msg.sender, value)
+
+    old_locked: LockedBalance = _locked
+    _locked.end = 0
+    _locked.amount = 0
+    self._write_locked(msg.sender, _locked)
+    supply_before: uint256 = self.supply
+    self.supply = supply_before - value
+    self._checkpoint(msg.sender, old_locked, _locked)
+
+    log Migrate(msg.sender, value, self.next_ve_contract)
+
+
+@external
+@nonreentrant('lock')
+def migrate_many(_addrs: DynArray[address, MAX_LOCKS]):
+    """
+    @notice Transfers the locks of `_addrs` to the new ve contract at once.
+    @dev This action is only performable by the contract owner.
+         Addresses without an active lock are skipped, expired locks stay
+         withdrawable. The global point is advanced and the tokens are
+         approved once for the whole batch.
+    @param _addrs Addresses of which to migrate the locks.
+    """
+    self.assert_is_owner(msg.sender)
+    next_ve: address = self.next_ve_contract
+    assert next_ve != ZERO_ADDRESS # dev: no next ve contract
+
+    last_point: Point = self._checkpoint_global()
+    addrs: DynArray[address, MAX_LOCKS] = []
+    values: DynArray[uint256, MAX_LOCKS] = []
+    ends: DynArray[uint256, MAX_LOCKS] = []
+    total: uint256 = 0
+
+    for addr in _addrs:
+        old_locked: LockedBalance = self._read_locked(addr)
+        if old_locked.amount == 0 or old_locked.end <= block.timestamp:
+            continue
+        value: uint256 = convert(old_locked.amount, uint256)
+
+        self._write_locked(addr, empty(LockedBalance))
+        last_point = self._checkpoint_user(addr, old_locked, empty(LockedBalance), last_point)
+        addrs.append(addr)
+        values.append(value)
+        ends.append(old_locked.end)
+        total += value
+
+        log Migrate(addr, value, next_ve)
+
+    self._write_point(self.epoch, last_point)
+    self.supply -= total
+
+    if total != 0:
+        ERC20(self.token).approve(next_ve, total)
+        Migrator(next_ve).migrate_locks(addrs, values, ends)
+
+
+@external
+@nonreentrant('lock')
+def migrate_lock(_addr: address, _value: uint256):
+    """
+    @notice Take over the lock of `_addr` from the previous ve contract.
+    @dev Called by `migrate` of the previous contract, which approves `_value`
+         beforehand and clears its own lock afterwards. The lock end is read
+         from it. An existing lock of `_addr` is merged, keeping the later end.
+    @param _addr User's wallet address.
+    @param _value Amount locked in the previous contract.
+    """
+    assert msg.sender == self.previous_ve_contract  # dev: previous ve only
+    assert _value > 0  # dev: need non-zero value
+
+    previous: LockedBalance = PreviousVotingEscrow(msg.sender).locked(_addr)
+    _locked: LockedBalance = self._read_locked(_addr)
+
+    self._deposit_for(msg.sender, _addr, _value, max(previous.end, _locked.end), _locked, MIGRATE_LOCK_TYPE)
+
+
+@external
+@nonreentrant('lock')
+def migrate_locks(_addrs: DynArray[address, MAX_LOCKS], _values: DynArray[uint256, MAX_LOCKS], _ends: DynArray[uint256, MAX_LOCKS]):
+    """
+    @notice Take over a batch of locks from the previous ve contract.
+    @dev Called by `migrate_many` of the previous contract, which approves the
+         sum of `_values` beforehand and has already cleared the locks.
+         Existing locks are merged the same way as in `migrate_lock`.
+    @param _addrs User wallet addresses.
+    @param _values Amounts locked in the previous contract.
+    @param _ends Lock end times in the previous contract.
+    """
+    assert msg.sender == self.previous_ve_contract  # dev: previous ve only
+    assert self.migration == False  # dev: must migrate
+    assert len(_values) == len(_addrs) and len(_ends) == len(_addrs)  # dev: length mismatch
+
+    last_point: Point = self._checkpoint_global()
+    supply_before: uint256 = self.supply
+    total: uint256 = 0
+
+    for i in range(MAX_LOCKS):
+        if i >= len(_addrs):
+            break
+        addr: address = _addrs[i]
+        value: uint256 = _values[i]
+        old_locked: LockedBalance = self._read_locked(addr)
+        new_locked: LockedBalance = LockedBalance({
+            amount: old_locked.amount + convert(value, int128),
+            end: max(old_locked.end, _ends[i]),
+        })
+
+        self._write_locked(addr, new_locked)
+        last_point = self._checkpoint_user(addr, old_locked, new_locked, last_point)
+        total += value
+
+        log Deposit(msg.sender, addr, value, new_locked.end, MIGRATE_LOCK_TYPE, block.timestamp)
+
+    self._write_point(self.epoch, last_point)
+    self.supply = supply_before + total
+
+    if total != 0:
+        assert ERC20(self.token).transferFrom(msg.sender, self, total)
+
+    log Supply(supply_before, supply_before + total)
+
+
+# The following ERC20/minime-compatible methods are not real balanceOf and supply!
+# They measure the weights for the purpose of voting, so they don't represent
+# real coins.
+
+@internal
+@view
+def find_block_epoch(_block: uint256, max_epoch: uint256) -> uint256:
+    """
+    @notice Binary search to estimate timestamp for block number.
+    @param _block Block to find.
+    @param max_epoch Don't go beyond this epoch.
+    @return Approximate timestamp for block.
+    """
+    # Binary search
+    _min: uint256 = 0
+    _max: uint256 = max_epoch
+    for i in range(128):  # Will be always enough for 128-bit numbers
+        if _min >= _max:
+            break
+        _mid: uint256 = (_min + _max + 1) / 2
+        if bitwise_and(self.packed_point_history[_mid].ts_blk, MASK_64) <= _block:
+            _min = _mid
+        else:
+            _max = _mid - 1
+    return _min
+
+
+@internal
+@view
+def find_timestamp_epoch(_t: uint256, max_epoch: uint256) -> uint256:
+    """
+    @notice Find the last global point recorded at or before `_t`.
+    @dev The search only covers the week of `_t`, between the points
+         `_checkpoint` records at its start and at the start of the next one.
+    @param _t Time to find.
+    @param max_epoch Don't go beyond this epoch.
+    @return Epoch of that point.
+    """
+    week: uint256 = _t / WEEK * WEEK
+    _min: uint256 = self.week_epoch[week]
+    _max: uint256 = self.week_epoch[week + WEEK]
+    if _max == 0:
+        _max = max_epoch
+    else:
+        _max -= 1
+
+    # Binary search
+    for i in range(128):  # Will be always enough for 128-bit numbers
+        if _min >= _max:
+            break
+        _mid: uint256 = (_min + _max + 1) / 2
+        if shift(self.packed_point_history[_mid].ts_blk, -64) <= _t:
+            _min = _mid
+        else:
+            _max = _mid - 1
+    return _min
+
+
+@internal
+@view
+def find_user_timestamp_epoch(addr: address, _t: uint256, max_epoch: uint256) -> uint256:
+    """
+    @notice Find the last point of `addr` recorded at or before `_t`.
+    @param addr User's wallet address.
+    @param _t Time to find.
+    @param max_epoch Don't go beyond this epoch.
+    @return Epoch of that point, 0 if there is none.
+    """
+    # Binary search
+    _min: uint256 = 0
+    _max: uint256 = max_epoch
+    for i in range(128):  # Will be always enough for 128-bit numbers
+        if _min >= _max:
+            break
+        _mid: uint256 = (_min + _max + 1) / 2
+        if shift(self.packed_user_point_history[addr][_mid].ts_blk, -64) <= _t:
+            _min = _mid
+        else:
+            _max = _mid - 1
+    return _min
+
+
+@internal
+@view
+def balance_of(addr: address, _t: uint256 = block.timestamp) -> uint256:
+    """
+    @notice Get the current voting power for `msg.sender`.
+    @dev Times before the last user checkpoint start from the user point
+         recorded at or before them. Returns 0 if the contract has entered a migration.
+    @param addr User wallet address.
+    @param _t Epoch time to return voting power at.
+    @return User voting power.
+    """
+    if self.migration:
+        return 0
+
+    _epoch: uint256 = self.user_point_epoch[addr]
+    if _epoch == 0:
+        return 0
+    else:
+        last_point: Point = self._read_user_point(addr, _epoch)
+        if _t < last_point.ts:
+            last_point = self._read_user_point(addr, self.find_user_timestamp_epoch(addr, _t, _epoch))
+        last_point.bias -= last_point.slope * convert(_t - last_point.ts, int128)
+        if last_point.bias < 0:
+            last_point.bias = 0
+        return convert(last_point.bias, uint256)
+
+
+@external
+@view
+def balanceOf(addr: address, _t: uint256 = block.timestamp) -> uint256:
+    """
+    @notice Get the current voting power for `msg.sender`.
+    @dev Adheres to the ERC20 `balanceOf` interface for Aragon compatibility.
+         Returns 0 if the contract has entered a migration.
+    @param addr User wallet address.
+    @param _t Epoch time to return voting power at.
+    @return User voting power.
+    """
+    return self.balance_of(addr, _t)
+
+
+@internal
+@view
+def balance_of_at(addr: address, _block: uint256) -> uint256:
+    """
+    @notice Measure voting power of `addr` at block height `_block`.
+    @dev Returns 0 if the contract has entered a migration.
+    @param addr User's wallet address.
+    @param _block Block to calculate the voting power at.
+    @return Voting power.
+    """
+    if self.migration:
+        return 0
+
+    # Copying and pasting totalSupply code because Vyper cannot pass by
+    # reference yet
+    assert _block <= block.number
+
+    # Binary search
+    _min: uint256 = 0
+    _max: uint256 = self.user_point_epoch[addr]
+    for i in range(128):  # Will be always enough for 128-bit numbers
+        if _min >= _max:
+            break
+        _mid: uint256 = (_min + _max + 1) / 2
+        if bitwise_and(self.packed_user_point_history[addr][_mid].ts_blk, MASK_64) <= _block:
+            _min = _mid
+        else:
+            _max = _mid - 1
+
+    upoint: Point = self._read_user_point(addr, _min)
+
+    max_epoch: uint256 = self.epoch
+    _epoch: uint256 = self.find_block_epoch(_block, max_epoch)
+    point_0: Point = self._read_point(_epoch)
+    d_block: uint256 = 0
+    d_t: uint256 = 0
+    if _epoch < max_epoch:
+        point_1: Point = self._read_point(_epoch + 1)
+        d_block = point_1.blk - point_0.blk
+        d_t = point_1.ts - point_0.ts
+    else:
+        d_block = block.number - point_0.blk
+        d_t = block.timestamp - point_0.ts
+    block_time: uint256 = point_0.ts
+    if d_block != 0:
+        block_time += d_t * (_block - point_0.blk) / d_block
+
+    upoint.bias -= upoint.slope * convert(block_time - upoint.ts, int128)
+    if upoint.bias >= 0:
+        return convert(upoint.bias, uint256)
+    else:
+        return 0
+
+
+@external
+@view
+def balanceOfAt(addr: address, _block: uint256) -> uint256:
+    """
+    @notice Measure voting power of `addr` at block height `_block`.
+    @dev Adheres to MiniMe `balanceOfAt` interface: https://github.com/Giveth/minime .
+         Returns 0 if the contract has entered a migration.
+    @param addr User's wallet address.
+    @param _block Block to calculate the voting power at.
+    @return Voting power.
+    """
+    return self.balance_of_at(addr, _block)
+
+
+@internal
+@view
+def supply_at(point: Point, t: uint256) -> uint256:
+    """
+    @notice Calculate total voting power at some point in the past.
+    @dev Returns 0 if the contract has entered a migration.
+         Weeks without slope changes are skipped, the bias decays linearly over them.
+    @param point The point (bias/slope) to start search from.
+    @param t Time to calculate the total voting power at.
+    @return Total voting power at that time.
+    """
+    if self.migration:
+        return 0
+
+    last_point: Point = point
+    for i in range(255):
+        t_i: uint256 = self._next_slope_change(last_point.ts, t)
+        last_point.bias -= last_point.slope * convert(t_i - last_point.ts, int128)
+        if t_i == t:
+            break
+        last_point.slope += self.slope_changes[t_i]
+        last_point.ts = t_i
+
+    if last_point.bias < 0:
+        last_point.bias = 0
+    return convert(last_point.bias, uint256)
+
+
+@internal
+@view
+def supply_at_time(t: uint256) -> uint256:
+    """
+    @notice Calculate total voting power at time `t`.
+    @dev Times before the last checkpoint start from the point recorded in
+         their week. Returns 0 if the contract has entered a migration.
+    @param t Time to calculate the total voting power at.
+    @return Total voting power at that time.
+    """
+    _epoch: uint256 = self.epoch
+    last_point: Point = self._read_point(_epoch)
+    if t < last_point.ts:
+        last_point = self._read_point(self.find_timestamp_epoch(t, _epoch))
+        if t < last_point.ts:
+            # before the contract was deployed
+            return 0
+    return self.supply_at(last_point, t)
+
+
+@external
+@view
+def totalSupply(t: uint256 = block.timestamp) -> uint256:
+    """
+    @notice Calculate total voting power.
+    @dev Adheres to the ERC20 `totalSupply` interface for Aragon compatibility.
+         Returns 0 if the contract has entered a migration.
+    @param t Epoch time to return total voting power at.
+    @return Total voting power.
+    """
+    return self.supply_at_time(t)
+
+
+@external
+@view
+def balance_and_supply(addr: address) -> (uint256, uint256):
+    """
+    @notice Get the current voting power of `addr` and the total voting power.
+    @dev Single call for gauges computing boosts.
+         Returns zeros if the contract has entered a migration.
+    @param addr User wallet address.
+    @return User voting power, total voting power.
+    """
+    return self.balance_of(addr), self.supply_at(self._read_point(self.epoch), block.timestamp)
+
+
+@external
+@view
+def totalSupplyAt(_block: uint256) -> uint256:
+    """
+    @notice Calculate total voting power at some point in the past.
+    @dev Returns 0 if the contract has entered a migration.
+    @param _block Block to calculate the total voting power at.
+    @return Total voting power at `_block`.
+    """
+    if self.migration:
+        return 0
+
+    assert _block <= block.number
+    _epoch: uint256 = self.epoch
+    target_epoch: uint256 = self.find_block_epoch(_block, _epoch)
+
+    point: Point = self._read_point(target_epoch)
+    dt: uint256 = 0
+    if target_epoch < _epoch:
+        point_next: Point = self._read_point(target_epoch + 1)
+        if point.blk != point_next.blk:
+            dt = (_block - point.blk) * (point_next.ts - point.ts) / (point_next.blk - point.blk)
+    else:
+        if point.blk != block.number:
+            dt = (_block - point.blk) * (block.timestamp - point.ts) / (block.number - point.blk)
+    # Now dt contains info on how far are we beyond point
+
+    return self.supply_at(point, point.ts + dt)
+
+
+@external
+@view
+def balanceOfAtTime(addr: address, _ts: uint256) -> uint256:
+    """
+    @notice Measure voting power of `addr` at time `_ts`.
+    @dev Looks the user point up by timestamp, so there is no block to time
+         interpolation involved. Returns 0 if the contract has entered a migration.
+    @param addr User's wallet address.
+    @param _ts Time to calculate the voting power at.
+    @return Voting power.
+    """
+    assert _ts <= block.timestamp
+    return self.balance_of(addr, _ts)
+
+
+@external
+@view
+def totalSupplyAtTime(_ts: uint256) -> uint256:
+    """
+    @notice Calculate total voting power at time `_ts`.
+    @dev Looks the global point up by timestamp, so there is no block to time
+         interpolation involved. Returns 0 if the contract has entered a migration.
+    @param _ts Time to calculate the total voting power at.
+    @return Total voting power at `_ts`.
+    """
+    assert _ts <= block.timestamp
+    return self.supply_at_time(_ts)
+
+
+# These methods are for compatiblity with Governor Bravo.
+
+@external
+@view
+def getCurrentVotes(addr: address) -> uint256:
+    """
+    @notice Get the current voting power for `msg.sender`.
+    @dev Adheres to Compounds `getCurrentVotes` interface: https://github.com/compound-finance/compound-protocol .
+         Returns 0 if a migration is active.
+    @param addr User wallet address.
+    @return User voting power.
+    """
+    return self.balance_of(addr)
+
+
+@external
+@view
+def getPriorVotes(addr: address, _block: uint256) -> uint256:
+    """
+    @notice Measure voting power of `addr` at block number `_block`.
+    @dev Adheres to Compounds `getPriorVotes` interface: https://github.com/compound-finance/compound-protocol .
+         Returns 0 if a migration is active.
+    @param addr User's wallet address.
+    @param _block Block to calculate the voting power at.
+    @return User voting power at `_block`.
+    """
+    return self.balance_of_at(addr, _block)
+
+
+# Aragon - Dummy methods for compatibility
+
+@external
+def changeController(_newController: address):
+    """
+    @dev Dummy method required for Aragon compatibility.
+    """
+    assert msg.sender == self.controller
+    self.controller = _newController
+
+
+# Ownership - Transfer contract ownership/admin
+
+@external
+def commit_transfer_ownership(addr: address):
+    """
+    @notice Transfer ownership of VotingEscrow contract to `addr`.
+    @param addr Address to have ownership transferred to.
+    """
+    self.assert_is_owner(msg.sender)
+
+    self.future_owner = addr
+
+    log CommitOwnership(addr)
+
+
+@external
+def apply_transfer_ownership():
+    """
+    @notice Apply ownership transfer.
+    """
+    self.assert_is_owner(msg.sender)
+
+    _owner: address = self.future_owner
+    assert _owner != ZERO_ADDRESS  # dev: owner not set
+
+    self.owner = _owner
+    self.future_owner = ZERO_ADDRESS
+
+    log ApplyOwnership(_owner)
+
+
+# SmartWalletChecker - Switch contracts
+
+@external
+def commit_smart_wallet_checker(addr: address):
+    """
+    @notice Set an external contract to check for approved smart contract wallets.
+    @param addr Address of Smart contract checker.
+    """
+    self.assert_is_owner(msg.sender)
+
+    self.future_smart_wallet_checker = addr
+
+    log CommitSmartWalletChecker(addr)
+
+
+@external
+def apply_smart_wallet_checker():
+    """
+    @notice Apply setting external contract to check approved smart contract wallets.
+    """
+    self.assert_is_owner(msg.sender)
+
+    _checker: address = self.future_smart_wallet_checker
+    self.smart_wallet_checker = _checker
+
+    log ApplySmartWalletChecker(_checker)
+
+
+# Migrating to a new veKYO contract
+
+@external
+def commit_next_ve_contract(addr: address):
+    """
+    @notice Queues a new ve contract to replace the current one (self).
+    @param addr Address of the new ve contract.
+    """
+    self.assert_is_owner(msg.sender)
+
+    self.queued_next_ve_contract = addr
+
+    log CommitNextVeContract(addr)
+
+
+@external
+def apply_next_ve_contract():
+    """
+    @notice Apply the queued ve contract and set migration to True.
+    """
+    self.assert_is_owner(msg.sender)
+
+    next: address = self.queued_next_ve_contract
+
+    assert next != ZERO_ADDRESS
+
+    self.next_ve_contract = next
+    self.migration = True
+    self.queued_next_ve_contract = ZERO_ADDRESS
+
+    log ApplyNextVeContract(next)
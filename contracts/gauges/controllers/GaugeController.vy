@@ -75,6 +75,20 @@ WEEK: constant(uint256) = 604800
 # Cannot change weight votes more often than once in 7 days
 WEIGHT_VOTE_DELAY: constant(uint256) = 7 * 86400
 
+# Week bitmap kinds, see `_week_key`
+WEIGHT_CHANGES: constant(uint256) = 1
+WEIGHT_POINTS: constant(uint256) = 2
+SUM_CHANGES: constant(uint256) = 3
+SUM_POINTS: constant(uint256) = 4
+TYPE_WEIGHT_POINTS: constant(uint256) = 5
+TOTAL_POINTS: constant(uint256) = 6
+# Bitmap words (of 256 weeks) scanned looking for a marked week
+MAX_WORD_SCAN: constant(uint256) = 100
+# Gauges per `vote_for_many_gauge_weights` call
+MAX_VOTES: constant(uint256) = 16
+# Gauges per `add_gauges` call
+MAX_NEW_GAUGES: constant(uint256) = 32
+
 
 token: public(address)  # KYO token
 
@@ -100,21 +114,29 @@ last_user_vote: public(HashMap[address, HashMap[address, uint256]])  # Last user
 # changes_* are for changes in slope
 # time_* are for the last change timestamp
 # timestamps are rounded to whole weeks
-
-points_weight: public(HashMap[address, HashMap[uint256, Point]])  # gauge_addr -> time -> Point
-changes_weight: HashMap[address, HashMap[uint256, uint256]]  # gauge_addr -> time -> slope
+#
+# Unlike Curve's controller, points are only recorded for weeks which were
+# checkpointed or carry a slope change, both kinds of weeks are tracked in
+# `week_bitmaps`. Between two recorded weeks a point decays linearly, so
+# checkpoints jump straight from one slope change to the next and the
+# `points_*` views derive the skipped weeks from the last recorded one.
+
+points_weight_: HashMap[address, HashMap[uint256, Point]]  # gauge_addr -> time -> Point
+changes_weight: public(HashMap[address, HashMap[uint256, uint256]])  # gauge_addr -> time -> slope
 time_weight: public(HashMap[address, uint256])  # gauge_addr -> last scheduled time (next week)
 
-points_sum: public(HashMap[int128, HashMap[uint256, Point]])  # type_id -> time -> Point
-changes_sum: HashMap[int128, HashMap[uint256, uint256]]  # type_id -> time -> slope
+points_sum_: HashMap[int128, HashMap[uint256, Point]]  # type_id -> time -> Point
+changes_sum: public(HashMap[int128, HashMap[uint256, uint256]])  # type_id -> time -> slope
 time_sum: public(uint256[1000000000])  # type_id -> last scheduled time (next week)
 
-points_total: public(HashMap[uint256, uint256])  # time -> total weight
+points_total_: HashMap[uint256, uint256]  # time -> total weight
 time_total: public(uint256)  # last scheduled time
 
-points_type_weight: public(HashMap[int128, HashMap[uint256, uint256]])  # type_id -> time -> type weight
+points_type_weight_: HashMap[int128, HashMap[uint256, uint256]]  # type_id -> time -> type weight
 time_type_weight: public(uint256[1000000000])  # type_id -> last scheduled time (next week)
 
+week_bitmaps: HashMap[uint256, HashMap[uint256, uint256]]  # _week_key -> week / 256 -> marked weeks
+
 owner: public(address)
 future_owner: public(address)
 
@@ -152,24 +174,236 @@ def gauge_types(_addr: address) -> int128:
     return gauge_type - 1
 
 
+@internal
+@pure
+def _week_key(kind: uint256, subject: uint256) -> uint256:
+    """
+    @notice Key of the week bitmap of kind `kind` for the gauge or type `subject`
+    """
+    return bitwise_or(shift(kind, 160), subject)
+
+
+@internal
+@pure
+def _lowest_bit(x: uint256) -> uint256:
+    """
+    @notice Index of the least significant set bit of `x` (`x` != 0)
+    """
+    r: uint256 = 0
+    y: uint256 = x
+    s: uint256 = 128
+    for i in range(8):
+        if bitwise_and(y, shift(1, convert(s, int128)) - 1) == 0:
+            y = shift(y, -convert(s, int128))
+            r += s
+        s /= 2
+    return r
+
+
+@internal
+@pure
+def _highest_bit(x: uint256) -> uint256:
+    """
+    @notice Index of the most significant set bit of `x` (`x` != 0)
+    """
+    r: uint256 = 0
+    y: uint256 = x
+    s: uint256 = 128
+    for i in range(8):
+        if y >= shift(1, convert(s, int128)):
+            y = shift(y, -convert(s, int128))
+            r += s
+        s /= 2
+    return r
+
+
+@internal
+def _mark_week(key: uint256, t: uint256):
+    """
+    @notice Mark week `t` in the bitmap `key`
+    """
+    w: uint256 = t / WEEK
+    word: uint256 = self.week_bitmaps[key][w / 256]
+    bit: uint256 = shift(1, convert(w % 256, int128))
+    if bitwise_and(word, bit) == 0:
+        self.week_bitmaps[key][w / 256] = bitwise_or(word, bit)
+
+
+@internal
+@view
+def _is_marked(key: uint256, t: uint256) -> bool:
+    w: uint256 = t / WEEK
+    return bitwise_and(self.week_bitmaps[key][w / 256], shift(1, convert(w % 256, int128))) != 0
+
+
+@internal
+@view
+def _next_week(key: uint256, t: uint256, limit: uint256) -> uint256:
+    """
+    @notice First week after `t` marked in the bitmap `key`, capped at `limit`
+    """
+    w: uint256 = t / WEEK + 1
+    last: uint256 = limit / WEEK
+    for i in range(MAX_WORD_SCAN):
+        if w >= last:
+            break
+        bits: uint256 = shift(self.week_bitmaps[key][w / 256], -convert(w % 256, int128))
+        if bits != 0:
+            return min((w + self._lowest_bit(bits)) * WEEK, limit)
+        w = (w / 256 + 1) * 256
+    return limit
+
+
+@internal
+@view
+def _prev_week(key: uint256, t: uint256) -> uint256:
+    """
+    @notice Last week not after `t` marked in the bitmap `key`, 0 if none
+    """
+    w: uint256 = t / WEEK
+    for i in range(MAX_WORD_SCAN):
+        # drop the bits of the weeks after `w`
+        bits: uint256 = shift(self.week_bitmaps[key][w / 256], convert(255 - w % 256, int128))
+        if bits != 0:
+            return (w + self._highest_bit(bits) - 255) * WEEK
+        if w < 256:
+            break
+        w = w / 256 * 256 - 1
+    return 0
+
+
+@internal
+@pure
+def _decay(pt: Point, dt: uint256) -> Point:
+    """
+    @notice Point `pt` moved `dt` seconds forward, given no slope changes in between
+    """
+    if dt == 0:
+        return pt
+    d_bias: uint256 = pt.slope * dt
+    if pt.bias > d_bias:
+        return Point({bias: pt.bias - d_bias, slope: pt.slope})
+    return empty(Point)
+
+
+@internal
+@view
+def _weight_at(addr: address, time: uint256) -> Point:
+    """
+    @notice Weight point of gauge `addr` at week `time`
+    @dev Weeks up to the next one are projected the way `_get_weight`
+         would fill them if they are not filled yet
+    """
+    t: uint256 = time / WEEK * WEEK
+    t_last: uint256 = self.time_weight[addr]
+    if t <= t_last:
+        t0: uint256 = self._prev_week(self._week_key(WEIGHT_POINTS, convert(addr, uint256)), t)
+        return self._decay(self.points_weight_[addr][t0], t - t0)
+    if t_last == 0 or t > (block.timestamp / WEEK + 1) * WEEK:
+        return self.points_weight_[addr][t]
+
+    pt: Point = self.points_weight_[addr][t_last]
+    changes_key: uint256 = self._week_key(WEIGHT_CHANGES, convert(addr, uint256))
+    for i in range(500):
+        t_next: uint256 = self._next_week(changes_key, t_last, t)
+        d_bias: uint256 = pt.slope * (t_next - t_last)
+        if pt.bias > d_bias:
+            pt.bias -= d_bias
+            pt.slope -= self.changes_weight[addr][t_next]
+        else:
+            pt = empty(Point)
+        t_last = t_next
+        if t_last == t:
+            break
+    return pt
+
+
+@internal
+@view
+def _sum_at(gauge_type: int128, time: uint256) -> Point:
+    """
+    @notice Sum of gauge weights of type `gauge_type` at week `time`
+    @dev Weeks up to the next one are projected the way `_get_sum`
+         would fill them if they are not filled yet
+    """
+    t: uint256 = time / WEEK * WEEK
+    t_last: uint256 = self.time_sum[gauge_type]
+    if t <= t_last:
+        t0: uint256 = self._prev_week(self._week_key(SUM_POINTS, convert(gauge_type, uint256)), t)
+        return self._decay(self.points_sum_[gauge_type][t0], t - t0)
+    if t_last == 0 or t > (block.timestamp / WEEK + 1) * WEEK:
+        return self.points_sum_[gauge_type][t]
+
+    pt: Point = self.points_sum_[gauge_type][t_last]
+    changes_key: uint256 = self._week_key(SUM_CHANGES, convert(gauge_type, uint256))
+    for i in range(500):
+        t_next: uint256 = self._next_week(changes_key, t_last, t)
+        d_bias: uint256 = pt.slope * (t_next - t_last)
+        if pt.bias > d_bias:
+            pt.bias -= d_bias
+            pt.slope -= self.changes_sum[gauge_type][t_next]
+        else:
+            pt = empty(Point)
+        t_last = t_next
+        if t_last == t:
+            break
+    return pt
+
+
+@internal
+@view
+def _type_weight_at(gauge_type: int128, time: uint256) -> uint256:
+    """
+    @notice Weight of type `gauge_type` at week `time`
+    """
+    t: uint256 = time / WEEK * WEEK
+    t_last: uint256 = self.time_type_weight[gauge_type]
+    if t <= t_last:
+        t0: uint256 = self._prev_week(self._week_key(TYPE_WEIGHT_POINTS, convert(gauge_type, uint256)), t)
+        return self.points_type_weight_[gauge_type][t0]
+    if t_last == 0 or t > (block.timestamp / WEEK + 1) * WEEK:
+        return self.points_type_weight_[gauge_type][t]
+    return self.points_type_weight_[gauge_type][t_last]
+
+
+@internal
+@view
+def _total_at(time: uint256) -> uint256:
+    """
+    @notice Total (type-weighted) weight at week `time`
+    """
+    t: uint256 = time / WEEK * WEEK
+    if t > self.time_total:
+        if t > (block.timestamp / WEEK + 1) * WEEK:
+            return self.points_total_[t]
+    elif self._is_marked(self._week_key(TOTAL_POINTS, 0), t):
+        return self.points_total_[t]
+
+    pt: uint256 = 0
+    _n_gauge_types: int128 = self.n_gauge_types
+    for gauge_type in range(100):
+        if gauge_type == _n_gauge_types:
+            break
+        pt += self._sum_at(gauge_type, t).bias * self._type_weight_at(gauge_type, t)
+    return pt
+
+
 @internal
 def _get_type_weight(gauge_type: int128) -> uint256:
     """
-    @notice Fill historic type weights week-over-week for missed checkins
-            and return the type weight for the future week
+    @notice Record the type weight for the future week if it is missing
+            and return it
     @param gauge_type Gauge type id
     @return Type weight
     """
     t: uint256 = self.time_type_weight[gauge_type]
     if t > 0:
-        w: uint256 = self.points_type_weight[gauge_type][t]
-        for i in range(500):
-            if t > block.timestamp:
-                break
-            t += WEEK
-            self.points_type_weight[gauge_type][t] = w
-            if t > block.timestamp:
-                self.time_type_weight[gauge_type] = t
+        w: uint256 = self.points_type_weight_[gauge_type][t]
+        if t <= block.timestamp:
+            t = (block.timestamp / WEEK + 1) * WEEK
+            self.points_type_weight_[gauge_type][t] = w
+            self._mark_week(self._week_key(TYPE_WEIGHT_POINTS, convert(gauge_type, uint256)), t)
+            self.time_type_weight[gauge_type] = t
         return w
     else:
         return 0
@@ -178,29 +412,36 @@ def _get_type_weight(gauge_type: int128) -> uint256:
 @internal
 def _get_sum(gauge_type: int128) -> uint256:
     """
-    @notice Fill sum of gauge weights for the same type week-over-week for
-            missed checkins and return the sum for the future week
+    @notice Fill sum of gauge weights for the same type for missed checkins,
+            one slope change at a time, and return the sum for the future week
     @param gauge_type Gauge type id
     @return Sum of weights
     """
     t: uint256 = self.time_sum[gauge_type]
     if t > 0:
-        pt: Point = self.points_sum[gauge_type][t]
+        pt: Point = self.points_sum_[gauge_type][t]
+        if t > block.timestamp:
+            return pt.bias
+
+        target: uint256 = (block.timestamp / WEEK + 1) * WEEK
+        changes_key: uint256 = self._week_key(SUM_CHANGES, convert(gauge_type, uint256))
+        points_key: uint256 = self._week_key(SUM_POINTS, convert(gauge_type, uint256))
         for i in range(500):
-            if t > block.timestamp:
-                break
-            t += WEEK
-            d_bias: uint256 = pt.slope * WEEK
+            t_next: uint256 = self._next_week(changes_key, t, target)
+            d_bias: uint256 = pt.slope * (t_next - t)
             if pt.bias > d_bias:
                 pt.bias -= d_bias
-                d_slope: uint256 = self.changes_sum[gauge_type][t]
+                d_slope: uint256 = self.changes_sum[gauge_type][t_next]
                 pt.slope -= d_slope
             else:
                 pt.bias = 0
                 pt.slope = 0
-            self.points_sum[gauge_type][t] = pt
-            if t > block.timestamp:
-                self.time_sum[gauge_type] = t
+            t = t_next
+            self.points_sum_[gauge_type][t] = pt
+            self._mark_week(points_key, t)
+            if t == target:
+                break
+        self.time_sum[gauge_type] = t
         return pt.bias
     else:
         return 0
@@ -209,16 +450,13 @@ def _get_sum(gauge_type: int128) -> uint256:
 @internal
 def _get_total() -> uint256:
     """
-    @notice Fill historic total weights week-over-week for missed checkins
-            and return the total for the future week
+    @notice Fill per type sums and weights for missed checkins and record
+            the total for the future week
+    @dev Totals of skipped weeks are derived from the per type records
     @return Total weight
     """
-    t: uint256 = self.time_total
+    t: uint256 = (block.timestamp / WEEK + 1) * WEEK
     _n_gauge_types: int128 = self.n_gauge_types
-    if t > block.timestamp:
-        # If we have already checkpointed - still need to change the value
-        t -= WEEK
-    pt: uint256 = self.points_total[t]
 
     for gauge_type in range(100):
         if gauge_type == _n_gauge_types:
@@ -226,65 +464,65 @@ def _get_total() -> uint256:
         self._get_sum(gauge_type)
         self._get_type_weight(gauge_type)
 
-    for i in range(500):
-        if t > block.timestamp:
+    pt: uint256 = 0
+    for gauge_type in range(100):
+        if gauge_type == _n_gauge_types:
             break
-        t += WEEK
-        pt = 0
-        # Scales as n_types * n_unchecked_weeks (hopefully 1 at most)
-        for gauge_type in range(100):
-            if gauge_type == _n_gauge_types:
-                break
-            type_sum: uint256 = self.points_sum[gauge_type][t].bias
-            type_weight: uint256 = self.points_type_weight[gauge_type][t]
-            pt += type_sum * type_weight
-        self.points_total[t] = pt
+        type_sum: uint256 = self.points_sum_[gauge_type][t].bias
+        type_weight: uint256 = self.points_type_weight_[gauge_type][t]
+        pt += type_sum * type_weight
+    self.points_total_[t] = pt
+    self._mark_week(self._week_key(TOTAL_POINTS, 0), t)
+    self.time_total = t
 
-        if t > block.timestamp:
-            self.time_total = t
     return pt
 
 
 @internal
 def _get_weight(gauge_addr: address) -> uint256:
     """
-    @notice Fill historic gauge weights week-over-week for missed checkins
-            and return the total for the future week
+    @notice Fill historic gauge weights for missed checkins, one slope change
+            at a time, and return the total for the future week
     @param gauge_addr Address of the gauge
     @return Gauge weight
     """
     t: uint256 = self.time_weight[gauge_addr]
     if t > 0:
-        pt: Point = self.points_weight[gauge_addr][t]
+        pt: Point = self.points_weight_[gauge_addr][t]
+        if t > block.timestamp:
+            return pt.bias
+
+        target: uint256 = (block.timestamp / WEEK + 1) * WEEK
+        changes_key: uint256 = self._week_key(WEIGHT_CHANGES, convert(gauge_addr, uint256))
+        points_key: uint256 = self._week_key(WEIGHT_POINTS, convert(gauge_addr, uint256))
         for i in range(500):
-            if t > block.timestamp:
-                break
-            t += WEEK
-            d_bias: uint256 = pt.slope * WEEK
+            t_next: uint256 = self._next_week(changes_key, t, target)
+            d_bias: uint256 = pt.slope * (t_next - t)
             if pt.bias > d_bias:
                 pt.bias -= d_bias
-                d_slope: uint256 = self.changes_weight[gauge_addr][t]
+                d_slope: uint256 = self.changes_weight[gauge_addr][t_next]
                 pt.slope -= d_slope
             else:
                 pt.bias = 0
                 pt.slope = 0
-            self.points_weight[gauge_addr][t] = pt
-            if t > block.timestamp:
-                self.time_weight[gauge_addr] = t
+            t = t_next
+            self.points_weight_[gauge_addr][t] = pt
+            self._mark_week(points_key, t)
+            if t == target:
+                break
+        self.time_weight[gauge_addr] = t
         return pt.bias
     else:
         return 0
 
 
-@external
-def add_gauge(addr: address, gauge_type: int128, weight: uint256 = 0):
+@internal
+def _add_gauge(addr: address, gauge_type: int128, weight: uint256, next_time: uint256) -> uint256:
     """
-    @notice Add gauge `addr` of type `gauge_type` with weight `weight`
-    @param addr Gauge address
-    @param gauge_type Gauge type
-    @param weight Gauge weight
+    @notice Register gauge `addr` of type `gauge_type` with weight `weight`
+    @dev The caller fills and writes the total weight of `next_time`
+    @return Weight added to the total
     """
-    assert msg.sender == self.owner
     assert (gauge_type >= 0) and (gauge_type < self.n_gauge_types)
     assert self.gauge_types_[addr] == 0  # dev: cannot add the same gauge twice
 
@@ -293,25 +531,71 @@ def add_gauge(addr: address, gauge_type: int128, weight: uint256 = 0):
     self.gauges[n] = addr
 
     self.gauge_types_[addr] = gauge_type + 1
-    next_time: uint256 = (block.timestamp + WEEK) / WEEK * WEEK
 
+    added: uint256 = 0
     if weight > 0:
         _type_weight: uint256 = self._get_type_weight(gauge_type)
         _old_sum: uint256 = self._get_sum(gauge_type)
-        _old_total: uint256 = self._get_total()
 
-        self.points_sum[gauge_type][next_time].bias = weight + _old_sum
+        self.points_sum_[gauge_type][next_time].bias = weight + _old_sum
+        self._mark_week(self._week_key(SUM_POINTS, convert(gauge_type, uint256)), next_time)
         self.time_sum[gauge_type] = next_time
-        self.points_total[next_time] = _old_total + _type_weight * weight
-        self.time_total = next_time
-
-        self.points_weight[addr][next_time].bias = weight
+        self.points_weight_[addr][next_time].bias = weight
+        added = _type_weight * weight
 
     if self.time_sum[gauge_type] == 0:
+        # the first gauge of the type, its (empty) sum starts at `next_time`
+        self._mark_week(self._week_key(SUM_POINTS, convert(gauge_type, uint256)), next_time)
         self.time_sum[gauge_type] = next_time
     self.time_weight[addr] = next_time
+    self._mark_week(self._week_key(WEIGHT_POINTS, convert(addr, uint256)), next_time)
 
     log NewGauge(addr, gauge_type, weight)
+    return added
+
+
+@external
+def add_gauge(addr: address, gauge_type: int128, weight: uint256 = 0):
+    """
+    @notice Add gauge `addr` of type `gauge_type` with weight `weight`
+    @param addr Gauge address
+    @param gauge_type Gauge type
+    @param weight Gauge weight
+    """
+    assert msg.sender == self.owner
+
+    next_time: uint256 = (block.timestamp + WEEK) / WEEK * WEEK
+    if weight > 0:
+        _old_total: uint256 = self._get_total()
+        self.points_total_[next_time] = _old_total + self._add_gauge(addr, gauge_type, weight, next_time)
+    else:
+        self._add_gauge(addr, gauge_type, 0, next_time)
+
+
+@external
+def add_gauges(
+    _addrs: DynArray[address, MAX_NEW_GAUGES],
+    _gauge_types: DynArray[int128, MAX_NEW_GAUGES],
+    _weights: DynArray[uint256, MAX_NEW_GAUGES],
+):
+    """
+    @notice Add many gauges at once
+    @dev Same as `add_gauge` for each of them, but the total weight is only
+         filled and written once
+    @param _addrs Gauge addresses
+    @param _gauge_types Gauge type of each gauge
+    @param _weights Gauge weight of each gauge
+    """
+    assert msg.sender == self.owner
+    assert len(_gauge_types) == len(_addrs) and len(_weights) == len(_addrs)  # dev: length mismatch
+
+    next_time: uint256 = (block.timestamp + WEEK) / WEEK * WEEK
+    _total: uint256 = self._get_total()
+    for i in range(MAX_NEW_GAUGES):
+        if i == len(_addrs):
+            break
+        _total += self._add_gauge(_addrs[i], _gauge_types[i], _weights[i], next_time)
+    self.points_total_[next_time] = _total
 
 
 @external
@@ -344,12 +628,12 @@ def _gauge_relative_weight(addr: address, time: uint256) -> uint256:
     @return Value of relative weight normalized to 1e18
     """
     t: uint256 = time / WEEK * WEEK
-    _total_weight: uint256 = self.points_total[t]
+    _total_weight: uint256 = self._total_at(t)
+    gauge_type: int128 = self.gauge_types_[addr] - 1
 
-    if _total_weight > 0:
-        gauge_type: int128 = self.gauge_types_[addr] - 1
-        _type_weight: uint256 = self.points_type_weight[gauge_type][t]
-        _gauge_weight: uint256 = self.points_weight[addr][t].bias
+    if _total_weight > 0 and gauge_type >= 0:
+        _type_weight: uint256 = self._type_weight_at(gauge_type, t)
+        _gauge_weight: uint256 = self._weight_at(addr, t).bias
         return MULTIPLIER * _type_weight * _gauge_weight / _total_weight
 
     else:
@@ -400,8 +684,10 @@ def _change_type_weight(type_id: int128, weight: uint256):
     next_time: uint256 = (block.timestamp + WEEK) / WEEK * WEEK
 
     _total_weight = _total_weight + old_sum * weight - old_sum * old_weight
-    self.points_total[next_time] = _total_weight
-    self.points_type_weight[type_id][next_time] = weight
+    self.points_total_[next_time] = _total_weight
+    self.points_type_weight_[type_id][next_time] = weight
+    self._mark_week(self._week_key(TOTAL_POINTS, 0), next_time)
+    self._mark_week(self._week_key(TYPE_WEIGHT_POINTS, convert(type_id, uint256)), next_time)
     self.time_total = next_time
     self.time_type_weight[type_id] = next_time
 
@@ -446,15 +732,18 @@ def _change_gauge_weight(addr: address, weight: uint256):
     _total_weight: uint256 = self._get_total()
     next_time: uint256 = (block.timestamp + WEEK) / WEEK * WEEK
 
-    self.points_weight[addr][next_time].bias = weight
+    self.points_weight_[addr][next_time].bias = weight
+    self._mark_week(self._week_key(WEIGHT_POINTS, convert(addr, uint256)), next_time)
     self.time_weight[addr] = next_time
 
     new_sum: uint256 = old_sum + weight - old_gauge_weight
-    self.points_sum[gauge_type][next_time].bias = new_sum
+    self.points_sum_[gauge_type][next_time].bias = new_sum
+    self._mark_week(self._week_key(SUM_POINTS, convert(gauge_type, uint256)), next_time)
     self.time_sum[gauge_type] = next_time
 
     _total_weight = _total_weight + new_sum * type_weight - old_sum * type_weight
-    self.points_total[next_time] = _total_weight
+    self.points_total_[next_time] = _total_weight
+    self._mark_week(self._week_key(TOTAL_POINTS, 0), next_time)
     self.time_total = next_time
 
     log NewGaugeWeight(addr, block.timestamp, weight, _total_weight)
@@ -471,19 +760,18 @@ def change_gauge_weight(addr: address, weight: uint256):
     self._change_gauge_weight(addr, weight)
 
 
-@external
-def vote_for_gauge_weights(_gauge_addr: address, _user_weight: uint256):
+@internal
+def _vote_for_gauge_weights(_gauge_addr: address, _user_weight: uint256, slope: uint256, lock_end: uint256, next_time: uint256, _power_used: uint256) -> uint256:
     """
-    @notice Allocate voting power for changing pool weights
-    @param _gauge_addr Gauge which `msg.sender` votes for
-    @param _user_weight Weight for a gauge in bps (units of 0.01%). Minimal is 0.01%. Ignored if 0
+    @notice Allocate `_user_weight` of `msg.sender`'s voting power to `_gauge_addr`
+    @dev The total power used is checked by the caller, the total weight is
+         not recomputed
+    @param slope Current slope of `msg.sender`'s lock
+    @param lock_end End of `msg.sender`'s lock
+    @param next_time Start of the next week
+    @param _power_used Voting power used before this vote
+    @return Voting power used after this vote
     """
-    escrow: address = self.voting_escrow
-    slope: uint256 = convert(VotingEscrow(escrow).get_last_user_slope(msg.sender), uint256)
-    lock_end: uint256 = VotingEscrow(escrow).locked__end(msg.sender)
-    _n_gauges: int128 = self.n_gauges
-    next_time: uint256 = (block.timestamp + WEEK) / WEEK * WEEK
-    assert lock_end > next_time, "Your token lock expires too soon"
     assert (_user_weight >= 0) and (_user_weight <= 10000), "You used all your voting power"
     assert block.timestamp >= self.last_user_vote[msg.sender][_gauge_addr] + WEIGHT_VOTE_DELAY, "Cannot vote so often"
 
@@ -503,28 +791,24 @@ def vote_for_gauge_weights(_gauge_addr: address, _user_weight: uint256):
     new_dt: uint256 = lock_end - next_time  # dev: raises when expired
     new_bias: uint256 = new_slope.slope * new_dt
 
-    # Check and update powers (weights) used
-    power_used: uint256 = self.vote_user_power[msg.sender]
-    power_used = power_used + new_slope.power - old_slope.power
-    self.vote_user_power[msg.sender] = power_used
-    assert (power_used >= 0) and (power_used <= 10000), 'Used too much power'
+    power_used: uint256 = _power_used + new_slope.power - old_slope.power
 
     ## Remove old and schedule new slope changes
     # Remove slope changes for old slopes
     # Schedule recording of initial slope for next_time
     old_weight_bias: uint256 = self._get_weight(_gauge_addr)
-    old_weight_slope: uint256 = self.points_weight[_gauge_addr][next_time].slope
+    old_weight_slope: uint256 = self.points_weight_[_gauge_addr][next_time].slope
     old_sum_bias: uint256 = self._get_sum(gauge_type)
-    old_sum_slope: uint256 = self.points_sum[gauge_type][next_time].slope
+    old_sum_slope: uint256 = self.points_sum_[gauge_type][next_time].slope
 
-    self.points_weight[_gauge_addr][next_time].bias = max(old_weight_bias + new_bias, old_bias) - old_bias
-    self.points_sum[gauge_type][next_time].bias = max(old_sum_bias + new_bias, old_bias) - old_bias
+    self.points_weight_[_gauge_addr][next_time].bias = max(old_weight_bias + new_bias, old_bias) - old_bias
+    self.points_sum_[gauge_type][next_time].bias = max(old_sum_bias + new_bias, old_bias) - old_bias
     if old_slope.end > next_time:
-        self.points_weight[_gauge_addr][next_time].slope = max(old_weight_slope + new_slope.slope, old_slope.slope) - old_slope.slope
-        self.points_sum[gauge_type][next_time].slope = max(old_sum_slope + new_slope.slope, old_slope.slope) - old_slope.slope
+        self.points_weight_[_gauge_addr][next_time].slope = max(old_weight_slope + new_slope.slope, old_slope.slope) - old_slope.slope
+        self.points_sum_[gauge_type][next_time].slope = max(old_sum_slope + new_slope.slope, old_slope.slope) - old_slope.slope
     else:
-        self.points_weight[_gauge_addr][next_time].slope += new_slope.slope
-        self.points_sum[gauge_type][next_time].slope += new_slope.slope
+        self.points_weight_[_gauge_addr][next_time].slope += new_slope.slope
+        self.points_sum_[gauge_type][next_time].slope += new_slope.slope
     if old_slope.end > block.timestamp:
         # Cancel old slope changes if they still didn't happen
         self.changes_weight[_gauge_addr][old_slope.end] -= old_slope.slope
@@ -532,8 +816,8 @@ def vote_for_gauge_weights(_gauge_addr: address, _user_weight: uint256):
     # Add slope changes for new slopes
     self.changes_weight[_gauge_addr][new_slope.end] += new_slope.slope
     self.changes_sum[gauge_type][new_slope.end] += new_slope.slope
-
-    self._get_total()
+    self._mark_week(self._week_key(WEIGHT_CHANGES, convert(_gauge_addr, uint256)), new_slope.end)
+    self._mark_week(self._week_key(SUM_CHANGES, convert(gauge_type, uint256)), new_slope.end)
 
     self.vote_user_slopes[msg.sender][_gauge_addr] = new_slope
 
@@ -542,6 +826,61 @@ def vote_for_gauge_weights(_gauge_addr: address, _user_weight: uint256):
 
     log VoteForGauge(block.timestamp, msg.sender, _gauge_addr, _user_weight)
 
+    return power_used
+
+
+@external
+def vote_for_gauge_weights(_gauge_addr: address, _user_weight: uint256):
+    """
+    @notice Allocate voting power for changing pool weights
+    @param _gauge_addr Gauge which `msg.sender` votes for
+    @param _user_weight Weight for a gauge in bps (units of 0.01%). Minimal is 0.01%. Ignored if 0
+    """
+    escrow: address = self.voting_escrow
+    slope: uint256 = convert(VotingEscrow(escrow).get_last_user_slope(msg.sender), uint256)
+    lock_end: uint256 = VotingEscrow(escrow).locked__end(msg.sender)
+    next_time: uint256 = (block.timestamp + WEEK) / WEEK * WEEK
+    assert lock_end > next_time, "Your token lock expires too soon"
+
+    # Check and update powers (weights) used
+    power_used: uint256 = self._vote_for_gauge_weights(
+        _gauge_addr, _user_weight, slope, lock_end, next_time, self.vote_user_power[msg.sender]
+    )
+    self.vote_user_power[msg.sender] = power_used
+    assert (power_used >= 0) and (power_used <= 10000), 'Used too much power'
+
+    self._get_total()
+
+
+@external
+def vote_for_many_gauge_weights(_gauge_addrs: DynArray[address, MAX_VOTES], _user_weights: DynArray[uint256, MAX_VOTES]):
+    """
+    @notice Allocate voting power for changing the weights of many pools at once
+    @dev The used power is only checked after all votes are applied, so
+         power can be moved between gauges in any order
+    @param _gauge_addrs Gauges which `msg.sender` votes for
+    @param _user_weights Weight for each gauge in bps (units of 0.01%)
+    """
+    assert len(_gauge_addrs) == len(_user_weights)
+
+    escrow: address = self.voting_escrow
+    slope: uint256 = convert(VotingEscrow(escrow).get_last_user_slope(msg.sender), uint256)
+    lock_end: uint256 = VotingEscrow(escrow).locked__end(msg.sender)
+    next_time: uint256 = (block.timestamp + WEEK) / WEEK * WEEK
+    assert lock_end > next_time, "Your token lock expires too soon"
+
+    power_used: uint256 = self.vote_user_power[msg.sender]
+    for i in range(MAX_VOTES):
+        if i == len(_gauge_addrs):
+            break
+        power_used = self._vote_for_gauge_weights(
+            _gauge_addrs[i], _user_weights[i], slope, lock_end, next_time, power_used
+        )
+    self.vote_user_power[msg.sender] = power_used
+    assert (power_used >= 0) and (power_used <= 10000), 'Used too much power'
+
+    self._get_total()
+
 
 @external
 @view
@@ -551,7 +890,7 @@ def get_gauge_weight(addr: address) -> uint256:
     @param addr Gauge address
     @return Gauge weight
     """
-    return self.points_weight[addr][self.time_weight[addr]].bias
+    return self.points_weight_[addr][self.time_weight[addr]].bias
 
 
 @external
@@ -562,7 +901,7 @@ def get_type_weight(type_id: int128) -> uint256:
     @param type_id Type id
     @return Type weight
     """
-    return self.points_type_weight[type_id][self.time_type_weight[type_id]]
+    return self.points_type_weight_[type_id][self.time_type_weight[type_id]]
 
 
 @external
@@ -572,7 +911,7 @@ def get_total_weight() -> uint256:
     @notice Get current total (type-weighted) weight
     @return Total weight
     """
-    return self.points_total[self.time_total]
+    return self.points_total_[self.time_total]
 
 
 @external
@@ -583,7 +922,54 @@ def get_weights_sum_per_type(type_id: int128) -> uint256:
     @param type_id Type id
     @return Sum of gauge weights
     """
-    return self.points_sum[type_id][self.time_sum[type_id]].bias
+    return self.points_sum_[type_id][self.time_sum[type_id]].bias
+
+
+@external
+@view
+def points_weight(addr: address, time: uint256) -> Point:
+    """
+    @notice Get the weight point of a gauge at a week
+    @param addr Gauge address
+    @param time Timestamp, rounded down to a week
+    @return Gauge weight point
+    """
+    return self._weight_at(addr, time)
+
+
+@external
+@view
+def points_sum(type_id: int128, time: uint256) -> Point:
+    """
+    @notice Get the sum of gauge weights per type at a week
+    @param type_id Type id
+    @param time Timestamp, rounded down to a week
+    @return Sum of gauge weights point
+    """
+    return self._sum_at(type_id, time)
+
+
+@external
+@view
+def points_total(time: uint256) -> uint256:
+    """
+    @notice Get the total (type-weighted) weight at a week
+    @param time Timestamp, rounded down to a week
+    @return Total weight
+    """
+    return self._total_at(time)
+
+
+@external
+@view
+def points_type_weight(type_id: int128, time: uint256) -> uint256:
+    """
+    @notice Get the type weight at a week
+    @param type_id Type id
+    @param time Timestamp, rounded down to a week
+    @return Type weight
+    """
+    return self._type_weight_at(type_id, time)
 
 
 @external
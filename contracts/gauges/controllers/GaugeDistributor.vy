@@ -13,9 +13,23 @@ interface GaugeController:
     def gauge_types(addr: address) -> int128: view
 interface Gauge:
     def integrate_fraction(addr: address) -> uint256: view
+    def projected_integrate_fraction(addr: address) -> uint256: view
     def user_checkpoint(addr: address) -> bool: nonpayable
 
 
+event AddEpochGauge:
+    gauge: indexed(address)
+event FundEpoch:
+    amount: uint256
+
+event CommitOwnership:
+    owner: indexed(address)
+event ApplyOwnership:
+    owner: indexed(address)
+
+
+MAX_GAUGES: constant(uint256) = 64
+
 token: public(address)
 minter: public(address)
 gauge_controller: public(address)
@@ -26,26 +40,67 @@ distributed: public(HashMap[address, HashMap[address, uint256]])
 # minter -> user -> can distribute?
 allowed_to_distribute_for: public(HashMap[address, HashMap[address, bool]])
 
+# `MerkleDistributor` paying out the gauges distributed by epoch
+epoch_distributor: public(address)
+epoch_gauges: public(HashMap[address, bool])
+
+owner: public(address)
+future_owner: public(address)
+
 @external
 def __init__(_token: address, _minter: address, _gauge_controller: address):
     self.token = _token
     self.minter = _minter
     self.gauge_controller = _gauge_controller
+    self.owner = msg.sender
 
 
 @internal
-def _distribute_for(gauge_addr: address, _for: address):
+def _checkpoint_for(gauge_addr: address, _for: address) -> uint256:
+    """
+    @notice Checkpoint `_for` in `gauge_addr` and book everything owed to them.
+    @return Amount which has not been distributed yet.
+    """
     assert GaugeController(self.gauge_controller).gauge_types(gauge_addr) >= 0  # dev: gauge is not added
+    assert not self.epoch_gauges[gauge_addr]  # dev: gauge is distributed by epoch
 
     Gauge(gauge_addr).user_checkpoint(_for)
     total_mint: uint256 = Gauge(gauge_addr).integrate_fraction(_for)
     to_mint: uint256 = total_mint - self.distributed[_for][gauge_addr]
 
     if to_mint != 0:
-        Minter(self.minter).mint_and_distribute()
-        ERC20(self.token).transfer(_for, to_mint)
         self.distributed[_for][gauge_addr] = total_mint
 
+    return to_mint
+
+
+@internal
+def _send(_for: address, to_mint: uint256):
+    if to_mint != 0:
+        # the emissions share is sent here on every mint, only mint when
+        # what was sent before does not cover this claim
+        if ERC20(self.token).balanceOf(self) < to_mint:
+            Minter(self.minter).mint_and_distribute()
+        ERC20(self.token).transfer(_for, to_mint)
+
+
+@internal
+def assert_is_owner(addr: address):
+    """
+    @notice Check if the call is from the owner, revert if it is not.
+    @param addr Address to check.
+    """
+    assert addr == self.owner  # dev: owner only
+
+
+@internal
+def _distribute_for(gauge_addrs: DynArray[address, MAX_GAUGES], _for: address):
+    to_mint: uint256 = 0
+    for gauge_addr in gauge_addrs:
+        to_mint += self._checkpoint_for(gauge_addr, _for)
+
+    self._send(_for, to_mint)
+
 
 @external
 @nonreentrant('lock')
@@ -54,18 +109,19 @@ def distribute(gauge_addr: address):
     @notice Mint everything which belongs to `msg.sender` and send to them.
     @param gauge_addr `Gauge` address to get mintable amount from.
     """
-    self._distribute_for(gauge_addr, msg.sender)
+    self._send(msg.sender, self._checkpoint_for(gauge_addr, msg.sender))
 
 
 @external
 @nonreentrant('lock')
-def distribute_many(gauge_addrs: DynArray[address, 16]):
+def distribute_many(gauge_addrs: DynArray[address, MAX_GAUGES]):
     """
     @notice Mint everything which belongs to `msg.sender` across multiple gauges.
+    @dev The amounts owed by every gauge are summed up so the `Minter` is
+         called and the token transferred at most once per call.
     @param gauge_addrs List of `Gauge` addresses.
     """
-    for gauge_addr in gauge_addrs:
-        self._distribute_for(gauge_addr, msg.sender)
+    self._distribute_for(gauge_addrs, msg.sender)
 
 
 @external
@@ -78,7 +134,25 @@ def distribute_for(gauge_addr: address, _for: address):
     @param _for Address to distribute to.
     """
     if self.allowed_to_distribute_for[msg.sender][_for]:
-        self._distribute_for(gauge_addr, _for)
+        self._send(_for, self._checkpoint_for(gauge_addr, _for))
+
+
+@external
+@view
+def pending_for(_for: address, gauge_addrs: DynArray[address, MAX_GAUGES]) -> DynArray[uint256, MAX_GAUGES]:
+    """
+    @notice Amounts `distribute` would currently send to `_for` from each gauge.
+    @param _for Address to query for.
+    @param gauge_addrs List of `Gauge` addresses.
+    @return Pending amount per gauge.
+    """
+    pending: DynArray[uint256, MAX_GAUGES] = []
+    for gauge_addr in gauge_addrs:
+        if self.epoch_gauges[gauge_addr]:
+            pending.append(0)
+        else:
+            pending.append(Gauge(gauge_addr).projected_integrate_fraction(_for) - self.distributed[_for][gauge_addr])
+    return pending
 
 
 @external
@@ -88,3 +162,75 @@ def toggle_approve_distribute(distributting_user: address):
     @param distributting_user Address to toggle permission for.
     """
     self.allowed_to_distribute_for[distributting_user][msg.sender] = not self.allowed_to_distribute_for[distributting_user][msg.sender]
+
+
+@external
+def set_epoch_distributor(_epoch_distributor: address):
+    """
+    @notice Set the `MerkleDistributor` paying out the gauges distributed by epoch.
+    @param _epoch_distributor `MerkleDistributor` address.
+    """
+    self.assert_is_owner(msg.sender)
+
+    self.epoch_distributor = _epoch_distributor
+
+
+@external
+def add_epoch_gauge(gauge_addr: address):
+    """
+    @notice Distribute the KYO of `gauge_addr` by epoch from now on.
+    @dev `distribute` reverts for the gauge afterwards, `distributed` stays
+         frozen and is what the epoch amounts are reduced by. There is no
+         way back, `distributed` would not cover what was paid by epoch.
+    @param gauge_addr `Gauge` address.
+    """
+    self.assert_is_owner(msg.sender)
+    assert not self.epoch_gauges[gauge_addr]  # dev: already distributed by epoch
+
+    self.epoch_gauges[gauge_addr] = True
+
+    log AddEpochGauge(gauge_addr)
+
+
+@external
+@nonreentrant('lock')
+def fund_epoch(_amount: uint256):
+    """
+    @notice Send `_amount` KYO of the gauges distributed by epoch to the `MerkleDistributor`.
+    @dev Called by the `MerkleDistributor` when a new root is published.
+    @param _amount Amount of KYO added to the tree.
+    """
+    assert msg.sender == self.epoch_distributor  # dev: epoch distributor only
+
+    self._send(msg.sender, _amount)
+
+    log FundEpoch(_amount)
+
+
+@external
+def commit_transfer_ownership(addr: address):
+    """
+    @notice Transfer ownership of the "GaugeDistributor" contract to `addr`.
+    @param addr Address to have ownership transferred to.
+    """
+    self.assert_is_owner(msg.sender)
+
+    self.future_owner = addr
+
+    log CommitOwnership(addr)
+
+
+@external
+def apply_transfer_ownership():
+    """
+    @notice Apply ownership transfer.
+    """
+    self.assert_is_owner(msg.sender)
+
+    _owner: address = self.future_owner
+    assert _owner != ZERO_ADDRESS  # dev: owner not set
+
+    self.owner = _owner
+    self.future_owner = ZERO_ADDRESS
+
+    log ApplyOwnership(_owner)
@@ -0,0 +1,175 @@
+# @version 0.3.3
+"""
+@title Kōyō Finance Merkle Distributor
+@author Kōyō Finance
+@license MIT
+@notice Pays out the KYO of gauges distributed by epoch. Once per epoch the
+        owner posts the root of a Merkle tree of (account, cumulative amount)
+        leaves computed off-chain from the gauge integrals, users claim the
+        difference to what they claimed before with a single proof.
+"""
+
+from vyper.interfaces import ERC20
+
+
+interface GaugeDistributor:
+    def fund_epoch(_amount: uint256): nonpayable
+
+
+event Claim:
+    account: indexed(address)
+    amount: uint256
+    cumulative: uint256
+
+event UpdateRoot:
+    epoch: indexed(uint256)
+    root: bytes32
+    total: uint256
+
+event CommitOwnership:
+    owner: indexed(address)
+event ApplyOwnership:
+    owner: indexed(address)
+
+
+# 2**32 leaves
+MAX_PROOF_LENGTH: constant(uint256) = 32
+
+token: public(address)
+gauge_distributor: public(address)
+
+merkle_root: public(bytes32)
+# end of the last epoch included in `merkle_root`
+epoch: public(uint256)
+# sum of all cumulative amounts in `merkle_root`
+total: public(uint256)
+
+# account -> cumulative amount claimed so far
+claimed: public(HashMap[address, uint256])
+
+owner: public(address)
+future_owner: public(address)
+
+
+@external
+def __init__(_token: address, _gauge_distributor: address):
+    """
+    @notice Contract constructor.
+    @param _token KYO token contract address.
+    @param _gauge_distributor Gauge distributor the KYO of the epochs is taken from.
+    """
+    self.token = _token
+    self.gauge_distributor = _gauge_distributor
+    self.owner = msg.sender
+
+
+@internal
+@pure
+def _leaf(_account: address, _cumulative: uint256) -> bytes32:
+    return keccak256(concat(convert(_account, bytes32), convert(_cumulative, bytes32)))
+
+
+@internal
+@view
+def _verify(_leaf: bytes32, _proof: DynArray[bytes32, MAX_PROOF_LENGTH]) -> bool:
+    """
+    @notice Check `_proof` of `_leaf` against `merkle_root`.
+    @dev Pairs are hashed in sorted order, so proofs need no path bits.
+    """
+    computed: bytes32 = _leaf
+    for node in _proof:
+        if convert(computed, uint256) <= convert(node, uint256):
+            computed = keccak256(concat(computed, node))
+        else:
+            computed = keccak256(concat(node, computed))
+    return computed == self.merkle_root
+
+
+@external
+@view
+def claimable(_account: address, _cumulative: uint256, _proof: DynArray[bytes32, MAX_PROOF_LENGTH]) -> uint256:
+    """
+    @notice Amount `claim` would currently send to `_account`.
+    @param _account Address to query for.
+    @param _cumulative Cumulative amount of `_account` in the current tree.
+    @param _proof Merkle proof of the leaf.
+    @return Claimable KYO, 0 for an invalid proof.
+    """
+    if not self._verify(self._leaf(_account, _cumulative), _proof):
+        return 0
+    return _cumulative - self.claimed[_account]
+
+
+@external
+@nonreentrant('lock')
+def claim(_account: address, _cumulative: uint256, _proof: DynArray[bytes32, MAX_PROOF_LENGTH]) -> uint256:
+    """
+    @notice Send everything `_account` earned up to the current epoch.
+    @dev Anyone is allowed to trigger this as the tokens always go to `_account`.
+    @param _account Address to claim for.
+    @param _cumulative Cumulative amount of `_account` in the current tree.
+    @param _proof Merkle proof of the leaf.
+    @return Claimed KYO.
+    """
+    assert self._verify(self._leaf(_account, _cumulative), _proof)  # dev: invalid proof
+
+    amount: uint256 = _cumulative - self.claimed[_account]
+    if amount != 0:
+        self.claimed[_account] = _cumulative
+        assert ERC20(self.token).transfer(_account, amount)
+
+        log Claim(_account, amount, _cumulative)
+    return amount
+
+
+@external
+def update_root(_root: bytes32, _epoch: uint256, _total: uint256):
+    """
+    @notice Publish the tree of epochs up to `_epoch`.
+    @dev Takes the KYO added to the tree since the last root from the gauge
+         distributor, cumulative amounts never decrease.
+    @param _root Merkle root of the (account, cumulative amount) leaves.
+    @param _epoch End of the last epoch included in the tree.
+    @param _total Sum of all cumulative amounts in the tree.
+    """
+    assert msg.sender == self.owner  # dev: owner only
+    assert _epoch > self.epoch  # dev: epoch already published
+    assert _total >= self.total  # dev: total decreased
+
+    if _total > self.total:
+        GaugeDistributor(self.gauge_distributor).fund_epoch(_total - self.total)
+
+    self.merkle_root = _root
+    self.epoch = _epoch
+    self.total = _total
+
+    log UpdateRoot(_epoch, _root, _total)
+
+
+@external
+def commit_transfer_ownership(addr: address):
+    """
+    @notice Transfer ownership of the "MerkleDistributor" contract to `addr`.
+    @param addr Address to have ownership transferred to.
+    """
+    assert msg.sender == self.owner  # dev: owner only
+
+    self.future_owner = addr
+
+    log CommitOwnership(addr)
+
+
+@external
+def apply_transfer_ownership():
+    """
+    @notice Apply ownership transfer.
+    """
+    assert msg.sender == self.owner  # dev: owner only
+
+    _owner: address = self.future_owner
+    assert _owner != ZERO_ADDRESS  # dev: owner not set
+
+    self.owner = _owner
+    self.future_owner = ZERO_ADDRESS
+
+    log ApplyOwnership(_owner)
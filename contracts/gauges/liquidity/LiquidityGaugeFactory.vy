@@ -0,0 +1,111 @@
+# @version 0.3.3
+"""
+@title Liquidity Gauge Factory
+@author Kōyō Finance
+@license MIT
+@notice Deploys `LiquidityGaugeV1` gauges as minimal proxies of one implementation
+@dev Every proxy shares the KYO, veKYO, distributor and controller of the
+     implementation, only the LP token and the owner are set per gauge.
+"""
+
+
+interface LiquidityGauge:
+    def initialize(_lp_token: address, _owner: address): nonpayable
+
+
+event GaugeDeployed:
+    gauge: indexed(address)
+    lp_token: indexed(address)
+
+event CommitOwnership:
+    owner: indexed(address)
+event ApplyOwnership:
+    owner: indexed(address)
+
+
+# Gauges per `deploy_gauges` call, `MAX_NEW_GAUGES` of the `GaugeController`
+MAX_GAUGES: constant(uint256) = 32
+
+
+implementation: public(address)
+
+gauge_count: public(uint256)
+gauges: public(HashMap[uint256, address])
+
+owner: public(address)
+future_owner: public(address)
+
+
+@external
+def __init__(_implementation: address):
+    """
+    @notice Contract constructor
+    @param _implementation `LiquidityGaugeV1` deployed with a ZERO_ADDRESS LP token
+    """
+    self.implementation = _implementation
+    self.owner = msg.sender
+
+
+@internal
+def _deploy_gauge(_lp_token: address, _owner: address) -> address:
+    gauge: address = create_forwarder_to(self.implementation)
+    LiquidityGauge(gauge).initialize(_lp_token, _owner)
+
+    n: uint256 = self.gauge_count
+    self.gauges[n] = gauge
+    self.gauge_count = n + 1
+
+    log GaugeDeployed(gauge, _lp_token)
+    return gauge
+
+
+@external
+def deploy_gauge(_lp_token: address) -> address:
+    """
+    @notice Deploy a gauge for `_lp_token`
+    @dev The gauge is owned by the owner of this factory and still has to be
+         added to the `GaugeController`
+    @param _lp_token Liquidity Pool contract address
+    @return Gauge address
+    """
+    assert msg.sender == self.owner  # dev: owner only
+
+    return self._deploy_gauge(_lp_token, msg.sender)
+
+
+@external
+def deploy_gauges(_lp_tokens: DynArray[address, MAX_GAUGES]) -> DynArray[address, MAX_GAUGES]:
+    """
+    @notice Deploy a gauge for each of `_lp_tokens`
+    @param _lp_tokens Liquidity Pool contract addresses
+    @return Gauge addresses, in the order of `_lp_tokens`
+    """
+    assert msg.sender == self.owner  # dev: owner only
+
+    gauges: DynArray[address, MAX_GAUGES] = []
+    for lp_token in _lp_tokens:
+        gauges.append(self._deploy_gauge(lp_token, msg.sender))
+    return gauges
+
+
+@external
+def commit_transfer_ownership(addr: address):
+    """
+    @notice Transfer ownership of LiquidityGaugeFactory to `addr`
+    @param addr Address to have ownership transferred to
+    """
+    assert msg.sender == self.owner  # dev: owner only
+    self.future_owner = addr
+    log CommitOwnership(addr)
+
+
+@external
+def apply_transfer_ownership():
+    """
+    @notice Apply pending ownership transfer
+    """
+    assert msg.sender == self.owner  # dev: owner only
+    _owner: address = self.future_owner
+    assert _owner != ZERO_ADDRESS  # dev: owner not set
+    self.owner = _owner
+    log ApplyOwnership(_owner)
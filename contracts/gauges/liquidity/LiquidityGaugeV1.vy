@@ -34,6 +34,7 @@ interface GaugeDistributor:
     def distributed(user: address, gauge: address) -> uint256: view
 
 interface VotingEscrow:
+    def balance_and_supply(addr: address) -> (uint256, uint256): view
     def user_point_epoch(addr: address) -> uint256: view
     def user_point_history__ts(addr: address, epoch: uint256) -> uint256: view
 
@@ -79,6 +80,7 @@ event ApplyOwnership:
 
 
 MAX_REWARDS: constant(uint256) = 8
+MAX_CHECKPOINTS: constant(uint256) = 256
 TOKENLESS_PRODUCTION: constant(uint256) = 40
 WEEK: constant(uint256) = 604800
 
@@ -104,12 +106,19 @@ working_supply: public(uint256)
 
 # The goal is to be able to calculate ∫(rate * balance / totalSupply dt) from 0 till checkpoint
 # All values are kept in units of being multiplied by 1e18
+# There is one period per week with checkpoints, holding the last checkpoint
+# of that week, `period_timestamp(period())` / `integrate_inv_supply(period())`
+# are the latest checkpoint
 period: public(int128)
 period_timestamp: public(uint256[100000000000000000000000000000])
 
 # 1e18 * ∫(rate(t) / totalSupply(t) dt) from 0 till checkpoint
 integrate_inv_supply: public(uint256[100000000000000000000000000000])  # bump epoch when rate() changes
 
+# [uint128 week][uint128 relative weight] of the last week read from the controller
+# weights of started weeks are final, so later checkpoints in the same week reuse it
+week_relative_weight: uint256
+
 # 1e18 * ∫(rate(t) / totalSupply(t) dt) from (last_action) till checkpoint
 integrate_inv_supply_of: public(HashMap[address, uint256])
 integrate_checkpoint_of: public(HashMap[address, uint256])
@@ -148,7 +157,8 @@ def __init__(_kyo: address, _voting_escrow: address, _gauge_distributor: address
     @param _voting_escrow veKYO (voting escrow) contract address.
     @param _gauge_distributor Gauge distributor (gauge minter) contract address.
     @param _gauge_controller Gauge controller contract address.
-    @param _lp_token Liquidity Pool contract address.
+    @param _lp_token Liquidity Pool contract address, ZERO_ADDRESS for an
+                     implementation of `LiquidityGaugeFactory` proxies.
     """
 
     KYO = _kyo
@@ -156,15 +166,48 @@ def __init__(_kyo: address, _voting_escrow: address, _gauge_distributor: address
     GAUGE_DISTRIBUTOR = _gauge_distributor
     GAUGE_CONTROLLER = _gauge_controller
 
-    self.lp_token = _lp_token
     self.owner = msg.sender
 
+    if _lp_token == ZERO_ADDRESS:
+        # the implementation itself can never be initialized
+        self.lp_token = 0x000000000000000000000000000000000000dEaD
+    else:
+        self._initialize(_lp_token, _kyo)
+
+
+@internal
+def _initialize(_lp_token: address, _kyo: address):
+    """
+    @notice Set up the gauge of `_lp_token`.
+    @dev Shared by the constructor and `initialize`. `_kyo` is passed in as
+         the constructor has not written the immutables to the runtime code yet.
+    @param _lp_token Liquidity Pool contract address.
+    @param _kyo KYO token contract address.
+    """
+    self.lp_token = _lp_token
+
     symbol: String[26] = ERC20Extended(_lp_token).symbol()
     self.name = concat("Koyo.finance ", symbol, " Gauge Deposit")
     self.symbol = concat(symbol, "-gauge")
 
     self.period_timestamp[0] = block.timestamp
-    self.inflation_rate = Koyo(KYO).emission_rate() * SHARE_EMISSIONS / SHARE__DENOMINATOR
+    self.inflation_rate = Koyo(_kyo).emission_rate() * SHARE_EMISSIONS / SHARE__DENOMINATOR
+
+
+@external
+def initialize(_lp_token: address, _owner: address):
+    """
+    @notice Initialize a minimal proxy of this gauge.
+    @dev Called by `LiquidityGaugeFactory` right after deploying the proxy.
+         KYO, veKYO, the distributor and the controller are the immutables of
+         the implementation.
+    @param _lp_token Liquidity Pool contract address.
+    @param _owner Gauge owner.
+    """
+    assert self.lp_token == ZERO_ADDRESS  # dev: already initialized
+
+    self.owner = _owner
+    self._initialize(_lp_token, KYO)
 
 
 @view
@@ -188,19 +231,18 @@ def integrate_checkpoint() -> uint256:
 
 
 @internal
-def _update_liquidity_limit(addr: address, l: uint256, L: uint256):
+def _set_working_balance(addr: address, l: uint256, L: uint256, voting_balance: uint256, voting_total: uint256, _working_supply: uint256) -> uint256:
     """
-    @notice Calculate limits which depend on the amount of KYO token per-user.
-            Effectively it calculates working balances to apply amplification
-            of KYO production by KYO.
+    @notice Set the working balance of a user from their voting power.
+    @dev Does not write `working_supply`, so batches can keep it in memory.
     @param addr User address.
     @param l User's amount of liquidity (LP tokens).
     @param L Total amount of liquidity (LP tokens).
+    @param voting_balance User's voting power.
+    @param voting_total Total voting power.
+    @param _working_supply Working supply before the update.
+    @return uint256 working supply after the update.
     """
-    # To be called after totalSupply is updated
-    voting_balance: uint256 = ERC20(VOTING_ESCROW).balanceOf(addr)
-    voting_total: uint256 = ERC20(VOTING_ESCROW).totalSupply()
-
     lim: uint256 = l * TOKENLESS_PRODUCTION / 100
     if voting_total > 0:
         lim += L * voting_balance / voting_total * (100 - TOKENLESS_PRODUCTION) / 100
@@ -208,10 +250,28 @@ def _update_liquidity_limit(addr: address, l: uint256, L: uint256):
     lim = min(l, lim)
     old_bal: uint256 = self.working_balances[addr]
     self.working_balances[addr] = lim
-    _working_supply: uint256 = self.working_supply + lim - old_bal
-    self.working_supply = _working_supply
+    new_supply: uint256 = _working_supply + lim - old_bal
+
+    log UpdateLiquidityLimit(addr, l, L, lim, new_supply)
+    return new_supply
+
+
+@internal
+def _update_liquidity_limit(addr: address, l: uint256, L: uint256):
+    """
+    @notice Calculate limits which depend on the amount of KYO token per-user.
+            Effectively it calculates working balances to apply amplification
+            of KYO production by KYO.
+    @param addr User address.
+    @param l User's amount of liquidity (LP tokens).
+    @param L Total amount of liquidity (LP tokens).
+    """
+    # To be called after totalSupply is updated
+    voting_balance: uint256 = 0
+    voting_total: uint256 = 0
+    voting_balance, voting_total = VotingEscrow(VOTING_ESCROW).balance_and_supply(addr)
 
-    log UpdateLiquidityLimit(addr, l, L, lim, _working_supply)
+    self.working_supply = self._set_working_balance(addr, l, L, voting_balance, voting_total, self.working_supply)
 
 
 @internal
@@ -276,10 +336,10 @@ def _checkpoint_rewards(_user: address, _total_supply: uint256, _claim: bool, _r
 
 
 @internal
-def _checkpoint(addr: address):
+def _checkpoint_global() -> uint256:
     """
-    @notice Checkpoint for a user.
-    @param addr User address.
+    @notice Advance the integral of 1/supply to the current block.
+    @return uint256 `integrate_inv_supply` at the current block.
     """
     _period: int128 = self.period
     _period_time: uint256 = self.period_timestamp[_period]
@@ -294,13 +354,24 @@ def _checkpoint(addr: address):
     # Update integral of 1/supply
     if block.timestamp > _period_time:
         _working_supply: uint256 = self.working_supply
-        GaugeController(GAUGE_CONTROLLER).checkpoint_gauge(self)
+        cached: uint256 = self.week_relative_weight
+        cached_week: uint256 = shift(cached, -128)
+        checkpointed: bool = False
         prev_week_time: uint256 = _period_time
         week_time: uint256 = min((_period_time + WEEK) / WEEK * WEEK, block.timestamp)
 
         for i in range(500):
             dt: uint256 = week_time - prev_week_time
-            w: uint256 = GaugeController(GAUGE_CONTROLLER).gauge_relative_weight(self, prev_week_time / WEEK * WEEK)
+            w: uint256 = 0
+            if prev_week_time / WEEK * WEEK == cached_week:
+                w = cached % 2**128
+            else:
+                if not checkpointed:
+                    GaugeController(GAUGE_CONTROLLER).checkpoint_gauge(self)
+                    checkpointed = True
+                cached_week = prev_week_time / WEEK * WEEK
+                w = GaugeController(GAUGE_CONTROLLER).gauge_relative_weight(self, cached_week)
+                cached = shift(cached_week, 128) + w
 
             if _working_supply > 0:
                     _integrate_inv_supply += rate * w * dt / _working_supply
@@ -316,18 +387,42 @@ def _checkpoint(addr: address):
             prev_week_time = week_time
             week_time = min(week_time + WEEK, block.timestamp)
 
-    _period += 1
-    self.period = _period
-    self.period_timestamp[_period] = block.timestamp
-    self.integrate_inv_supply[_period] = _integrate_inv_supply
+        if checkpointed:
+            self.week_relative_weight = cached
+
+        # one history entry per week, later checkpoints in the same week
+        # update it in place instead of taking two fresh slots every time
+        if _period_time / WEEK != block.timestamp / WEEK:
+            _period += 1
+            self.period = _period
+        self.period_timestamp[_period] = block.timestamp
+        self.integrate_inv_supply[_period] = _integrate_inv_supply
 
-    # Update user-specific integrals
+    return _integrate_inv_supply
+
+
+@internal
+def _checkpoint_user(addr: address, _integrate_inv_supply: uint256):
+    """
+    @notice Update the integrals of a user up to `_integrate_inv_supply`.
+    @param addr User address.
+    @param _integrate_inv_supply Integral of 1/supply at the current block.
+    """
     _working_balance: uint256 = self.working_balances[addr]
     self.integrate_fraction[addr] += _working_balance * (_integrate_inv_supply - self.integrate_inv_supply_of[addr]) / 10 ** 18
     self.integrate_inv_supply_of[addr] = _integrate_inv_supply
     self.integrate_checkpoint_of[addr] = block.timestamp
 
 
+@internal
+def _checkpoint(addr: address):
+    """
+    @notice Checkpoint for a user.
+    @param addr User address.
+    """
+    self._checkpoint_user(addr, self._checkpoint_global())
+
+
 @external
 def user_checkpoint(addr: address) -> bool:
     """
@@ -341,6 +436,34 @@ def user_checkpoint(addr: address) -> bool:
     return True
 
 
+@external
+def checkpoint_many(_addrs: DynArray[address, MAX_CHECKPOINTS]) -> bool:
+    """
+    @notice Record a checkpoint for each of `_addrs` at once.
+    @dev Only callable by the owner and the gauge distributor. The integral
+         of 1/supply is advanced and the total voting power read once for
+         the whole batch, only the user integrals and working balances are
+         written per address.
+    @param _addrs Addresses to checkpoint.
+    @return bool success.
+    """
+    assert msg.sender in [self.owner, GAUGE_DISTRIBUTOR]  # dev: unauthorized
+
+    _integrate_inv_supply: uint256 = self._checkpoint_global()
+    _total_supply: uint256 = self.totalSupply
+    voting_total: uint256 = ERC20(VOTING_ESCROW).totalSupply()
+    _working_supply: uint256 = self.working_supply
+
+    for addr in _addrs:
+        self._checkpoint_user(addr, _integrate_inv_supply)
+        _working_supply = self._set_working_balance(
+            addr, self.balanceOf[addr], _total_supply, ERC20(VOTING_ESCROW).balanceOf(addr), voting_total, _working_supply
+        )
+
+    self.working_supply = _working_supply
+    return True
+
+
 @external
 def claimable_tokens(addr: address) -> uint256:
     """
@@ -352,6 +475,46 @@ def claimable_tokens(addr: address) -> uint256:
     return self.integrate_fraction[addr] - GaugeDistributor(GAUGE_DISTRIBUTOR).distributed(addr, self)
 
 
+@view
+@external
+def projected_integrate_fraction(addr: address) -> uint256:
+    """
+    @notice Get `integrate_fraction` of a user as if it was checkpointed now.
+    @dev Read-only counterpart of `_checkpoint`, weights of weeks the
+         controller has not filled yet are projected by the controller.
+    @param addr User address.
+    @return uint256 total number of tokens the user is entitled to so far.
+    """
+    _period: int128 = self.period
+    _period_time: uint256 = self.period_timestamp[_period]
+    _integrate_inv_supply: uint256 = self.integrate_inv_supply[_period]
+
+    if block.timestamp > _period_time and not self.is_killed:
+        _working_supply: uint256 = self.working_supply
+        rate: uint256 = self.inflation_rate
+        cached: uint256 = self.week_relative_weight
+        prev_week_time: uint256 = _period_time
+        week_time: uint256 = min((_period_time + WEEK) / WEEK * WEEK, block.timestamp)
+
+        for i in range(500):
+            dt: uint256 = week_time - prev_week_time
+            w: uint256 = 0
+            if prev_week_time / WEEK * WEEK == shift(cached, -128):
+                w = cached % 2**128
+            else:
+                w = GaugeController(GAUGE_CONTROLLER).gauge_relative_weight(self, prev_week_time / WEEK * WEEK)
+
+            if _working_supply > 0:
+                _integrate_inv_supply += rate * w * dt / _working_supply
+
+            if week_time == block.timestamp:
+                break
+            prev_week_time = week_time
+            week_time = min(week_time + WEEK, block.timestamp)
+
+    return self.integrate_fraction[addr] + self.working_balances[addr] * (_integrate_inv_supply - self.integrate_inv_supply_of[addr]) / 10 ** 18
+
+
 @view
 @external
 def claimed_reward(_addr: address, _token: address) -> uint256:
@@ -431,6 +594,42 @@ def kick(addr: address):
     self._update_liquidity_limit(addr, self.balanceOf[addr], self.totalSupply)
 
 
+@external
+def kick_many(_addrs: DynArray[address, MAX_CHECKPOINTS]) -> uint256:
+    """
+    @notice Kick each of `_addrs` which `kick` would accept.
+    @dev Addresses which cannot or need not be kicked are skipped instead
+         of reverting the whole batch. The integral of 1/supply is advanced
+         and the total voting power read once for the whole batch.
+    @param _addrs Addresses to kick.
+    @return uint256 number of addresses kicked.
+    """
+    _integrate_inv_supply: uint256 = self._checkpoint_global()
+    _total_supply: uint256 = self.totalSupply
+    voting_total: uint256 = ERC20(VOTING_ESCROW).totalSupply()
+    _working_supply: uint256 = self.working_supply
+    kicked: uint256 = 0
+
+    for addr in _addrs:
+        _balance: uint256 = self.balanceOf[addr]
+        if self.working_balances[addr] <= _balance * TOKENLESS_PRODUCTION / 100:
+            continue
+        voting_balance: uint256 = ERC20(VOTING_ESCROW).balanceOf(addr)
+        if voting_balance != 0:
+            t_ve: uint256 = VotingEscrow(VOTING_ESCROW).user_point_history__ts(
+                addr, VotingEscrow(VOTING_ESCROW).user_point_epoch(addr)
+            )
+            if t_ve <= self.integrate_checkpoint_of[addr]:
+                continue
+
+        self._checkpoint_user(addr, _integrate_inv_supply)
+        _working_supply = self._set_working_balance(addr, _balance, _total_supply, voting_balance, voting_total, _working_supply)
+        kicked += 1
+
+    self.working_supply = _working_supply
+    return kicked
+
+
 @external
 @nonreentrant('lock')
 def deposit(_value: uint256, _addr: address = msg.sender, _claim_rewards: bool = False):
@@ -0,0 +1,51 @@
+# @version 0.3.3
+"""
+@title Multicall
+@license MIT
+@notice Aggregate the results of many calls into a single `eth_call`.
+@dev ABI compatible with `tryBlockAndAggregate` of MakerDAO's Multicall2,
+     so the same client code works against a canonical deployment.
+     Stands in for that deployment on development networks.
+"""
+
+
+MAX_CALLS: constant(uint256) = 255
+MAX_CALLDATA: constant(uint256) = 132  # selector + 4 words
+MAX_RETURNDATA: constant(uint256) = 256  # 8 words
+
+
+struct Call:
+    target: address
+    call_data: Bytes[MAX_CALLDATA]
+
+struct Result:
+    success: bool
+    return_data: Bytes[MAX_RETURNDATA]
+
+
+@external
+def tryBlockAndAggregate(require_success: bool, calls: DynArray[Call, MAX_CALLS]) -> (uint256, bytes32, DynArray[Result, MAX_CALLS]):
+    """
+    @notice Execute `calls` in order and return all results.
+    @dev Meant to be used through `eth_call`. Calls are not static so
+         checkpointing "views" such as `claimable_tokens` can be included.
+    @param require_success Revert if any of the calls fails.
+    @param calls Targets and ABI encoded calldata.
+    @return Block number, parent block hash and one result per call.
+    """
+    results: DynArray[Result, MAX_CALLS] = []
+
+    for c in calls:
+        success: bool = False
+        response: Bytes[MAX_RETURNDATA] = b""
+        success, response = raw_call(
+            c.target,
+            c.call_data,
+            max_outsize=MAX_RETURNDATA,
+            revert_on_failure=False,
+        )
+        if require_success:
+            assert success  # dev: call failed
+        results.append(Result({success: success, return_data: response}))
+
+    return block.number, blockhash(block.number - 1), results
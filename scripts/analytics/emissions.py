@@ -0,0 +1,351 @@
+"""
+Weekly KYO emissions projection for `Minter` recipients and gauges.
+
+`read_params` reads everything the projection depends on in one block-pinned
+multicall: `Koyo.emission_rate` / `emission_end`, the `Minter.addresses_*`
+wallets, and for every gauge, gauge type and the total the `GaugeController`
+points of the current and the next week plus the `changes_weight` /
+`changes_sum` slope changes scheduled after that.
+
+`EmissionsProjection` lays the rest of `EMISSION_DURATION` out as a grid of
+weeks and keeps per-week NumPy rows for gauge weights, weight sums per type,
+type weights and the total weight. Future weeks are filled the way
+`GaugeController._get_weight` / `_get_sum` will fill them (linear decay, one
+slope change per week), so relative weights match `gauge_relative_weight` as
+long as nobody votes or changes a weight in the meantime. Such changes can be
+applied with `change_gauge_weight`, `change_type_weight` and `vote`, which only
+rebuild the rows they touch.
+
+All amounts are Python integers in `object` arrays, like in
+`ve_simulator.py`. Per-week amounts are rounded down the way a single
+`mint_and_distribute` / checkpoint per week would round them.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+
+DAY = 86400
+WEEK = 7 * DAY
+YEAR = 365 * DAY
+MULTIPLIER = 10**18
+
+EMISSION_DURATION = 5 * YEAR
+
+# `Minter.vy` and `LiquidityGaugeV1.vy`
+SHARE__DENOMINATOR = 10**10
+SHARE_EMISSIONS = 6_400_000_000
+SHARE_TREASURY = 1_000_000_000
+SHARE_TEAM_MEMBER = 600_000_000
+SHARE_ADVISOR = 50_000_000
+SHARE_BOBA_BAR = 100_000_000
+
+# `Minter.addresses_*` getter -> (number of addresses, share of each)
+MINTER_RECIPIENTS = {
+    "addresses_emission": (1, SHARE_EMISSIONS),
+    "addresses_treasury": (1, SHARE_TREASURY),
+    "addresses_team_members": (4, SHARE_TEAM_MEMBER),
+    "addresses_advisors": (2, SHARE_ADVISOR),
+    "addresses_boba_bar": (1, SHARE_BOBA_BAR),
+}
+
+# Votes end with the voter's lock, which is at most a year out
+MAX_CHANGE_WEEKS = YEAR // WEEK + 2
+
+
+class Recipient(NamedTuple):
+    role: str
+    address: str
+    share: int
+
+
+class WeightRow(NamedTuple):
+    """
+    Weight point of the current and the next week, and slope changes from
+    the week after next on.
+    """
+
+    bias: tuple
+    slope: tuple
+    changes: dict
+
+
+class EmissionParams(NamedTuple):
+    start: int
+    emission_rate: int
+    emission_end: int
+    recipients: list
+    gauges: list
+    gauge_types: list
+    gauge_weights: list
+    type_weights: list
+    type_sums: list
+
+
+class ProjectionChunk(NamedTuple):
+    weeks: np.ndarray
+    seconds: np.ndarray
+    minted: np.ndarray
+    recipients: dict
+    gauges: dict
+
+
+def read_params(reader, koyo: str, minter: str, gauge_controller: str, gauges: list, start: int, block: int = None) -> EmissionParams:
+    """
+    Read the projection parameters at `block`.
+
+    Parameters
+    ----------
+    reader : MulticallReader
+        Reader from `scripts.analytics.multicall`.
+    gauges : list
+        Gauge addresses, e.g. `deployments["Gauge"].values()`.
+    start : int
+        Timestamp to project from, usually the timestamp of `block`.
+    """
+    gauges = [str(g) for g in gauges]
+    week = start // WEEK * WEEK
+    point_weeks = (week, week + WEEK)
+    change_weeks = [week + i * WEEK for i in range(2, MAX_CHANGE_WEEKS)]
+
+    calls = [
+        reader.call("Koyo", koyo, "emission_rate", key="emission_rate"),
+        reader.call("Koyo", koyo, "emission_end", key="emission_end"),
+        reader.call("GaugeController", gauge_controller, "n_gauge_types", key="n_gauge_types"),
+    ]
+    for fn_name, (count, _) in MINTER_RECIPIENTS.items():
+        for i in range(count):
+            calls.append(reader.call("Minter", minter, fn_name, i, key=(fn_name, i)))
+    for gauge in gauges:
+        calls.append(reader.call("GaugeController", gauge_controller, "gauge_types", gauge, key=("gauge_types", gauge)))
+    first = reader.run(calls, block)
+    block = first["block"]
+
+    n_types = first["n_gauge_types"]
+    calls = []
+    for points_fn, changes_fn, subjects in (
+        ("points_weight", "changes_weight", gauges),
+        ("points_sum", "changes_sum", range(n_types)),
+    ):
+        for subject in subjects:
+            for t in point_weeks:
+                calls.append(reader.call("GaugeController", gauge_controller, points_fn, subject, t, key=(points_fn, subject, t)))
+            for t in change_weeks:
+                calls.append(reader.call("GaugeController", gauge_controller, changes_fn, subject, t, key=(changes_fn, subject, t)))
+    for type_id in range(n_types):
+        for t in point_weeks:
+            calls.append(reader.call(
+                "GaugeController", gauge_controller, "points_type_weight", type_id, t, key=("points_type_weight", type_id, t)
+            ))
+    raw = reader.run(calls, block)
+
+    def row(points_fn, changes_fn, subject):
+        points = [raw[(points_fn, subject, t)] for t in point_weeks]
+        changes = {t: raw[(changes_fn, subject, t)] for t in change_weeks if raw[(changes_fn, subject, t)]}
+        return WeightRow(tuple(p[0] for p in points), tuple(p[1] for p in points), changes)
+
+    recipients = []
+    for fn_name, (count, share) in MINTER_RECIPIENTS.items():
+        for i in range(count):
+            recipients.append(Recipient(fn_name[len("addresses_"):], first[(fn_name, i)], share))
+
+    return EmissionParams(
+        start=start,
+        emission_rate=first["emission_rate"],
+        emission_end=first["emission_end"],
+        recipients=recipients,
+        gauges=gauges,
+        gauge_types=[first[("gauge_types", gauge)] for gauge in gauges],
+        gauge_weights=[row("points_weight", "changes_weight", gauge) for gauge in gauges],
+        type_weights=[tuple(raw[("points_type_weight", type_id, t)] for t in point_weeks) for type_id in range(n_types)],
+        type_sums=[row("points_sum", "changes_sum", type_id) for type_id in range(n_types)],
+    )
+
+
+def _decay_row(bias: tuple, slope: int, changes: np.ndarray) -> np.ndarray:
+    """
+    Bias per week given the biases of the first two weeks, the slope of the
+    second one and the slope changes (indexed by week) after it. Once a point
+    decays to zero it stays there, like in `GaugeController._get_weight`.
+    """
+    n = len(changes)
+    row = np.zeros(n, dtype=object)
+    row[: min(n, 2)] = bias[: min(n, 2)]
+    if n <= 2:
+        return row
+
+    # slopes of weeks 1 .. n - 1, unclipped biases of weeks 2 .. n - 1
+    slopes = slope - np.cumsum(np.concatenate(([0], changes[2:])))
+    biases = bias[1] - WEEK * np.cumsum(slopes[:-1])
+    # week k keeps its bias if week k - 1 did not decay past zero
+    decays = np.concatenate(([bias[1] > slopes[0] * WEEK], biases[:-1] > slopes[1:-1] * WEEK)).astype(bool)
+    row[2:] = np.where(np.logical_and.accumulate(decays), biases, 0)
+    return row
+
+
+class EmissionsProjection:
+    """
+    Parameters
+    ----------
+    params : EmissionParams
+        As returned by `read_params`.
+    """
+
+    def __init__(self, params: EmissionParams):
+        self.params = params
+        first_week = params.start // WEEK * WEEK
+        self.weeks = np.arange(first_week, max(params.emission_end, first_week + WEEK), WEEK, dtype=np.int64)
+
+        ends = np.minimum(self.weeks + WEEK, params.emission_end)
+        begins = np.maximum(self.weeks, params.start)
+        self.seconds = np.maximum(ends - begins, 0)
+        self.minted = self.seconds.astype(object) * params.emission_rate
+        # what `LiquidityGaugeV1.inflation_rate` is set to
+        self.inflation_rate = params.emission_rate * SHARE_EMISSIONS // SHARE__DENOMINATOR
+
+        n_weeks = len(self.weeks)
+        n_types = len(params.type_weights)
+        self._gauge_index = {gauge: i for i, gauge in enumerate(params.gauges)}
+
+        # slope of the next week and slope changes per week, per gauge / type
+        self._gauge_slopes = [row.slope[1] for row in params.gauge_weights]
+        self._gauge_changes = [self._changes(row) for row in params.gauge_weights]
+        self._sum_slopes = [row.slope[1] for row in params.type_sums]
+        self._sum_changes = [self._changes(row) for row in params.type_sums]
+
+        self.gauge_bias = np.zeros((len(params.gauges), n_weeks), dtype=object)
+        for i, row in enumerate(params.gauge_weights):
+            self.gauge_bias[i] = _decay_row(row.bias, row.slope[1], self._gauge_changes[i])
+
+        self.sum_bias = np.zeros((n_types, n_weeks), dtype=object)
+        self.type_weight = np.zeros((n_types, n_weeks), dtype=object)
+        for type_id, row in enumerate(params.type_sums):
+            self.sum_bias[type_id] = _decay_row(row.bias, row.slope[1], self._sum_changes[type_id])
+            self.type_weight[type_id, 0] = params.type_weights[type_id][0]
+            self.type_weight[type_id, 1:] = params.type_weights[type_id][1]
+
+        self.total = (self.sum_bias * self.type_weight).sum(axis=0) if n_types else np.zeros(n_weeks, dtype=object)
+        self._relative = None
+
+    def _changes(self, row: WeightRow) -> np.ndarray:
+        changes = np.zeros(len(self.weeks), dtype=object)
+        for t, change in row.changes.items():
+            i = self._week_index(t)
+            if i < len(changes):
+                changes[i] += change
+        return changes
+
+    def _week_index(self, t: int) -> int:
+        return int((t // WEEK * WEEK - self.weeks[0]) // WEEK)
+
+    def _set_gauge(self, i: int, bias: int, slope: int):
+        """
+        Set the next week's point of gauge `i` and of its type sum, rebuild
+        both rows and patch the total with the difference.
+        """
+        type_id = self.params.gauge_types[i]
+        d_bias = bias - self.gauge_bias[i, 1]
+        d_slope = slope - self._gauge_slopes[i]
+
+        self._gauge_slopes[i] = slope
+        self.gauge_bias[i] = _decay_row((self.gauge_bias[i, 0], bias), slope, self._gauge_changes[i])
+
+        old_sum = self.sum_bias[type_id].copy()
+        self._sum_slopes[type_id] += d_slope
+        self.sum_bias[type_id] = _decay_row(
+            (old_sum[0], old_sum[1] + d_bias), self._sum_slopes[type_id], self._sum_changes[type_id]
+        )
+        self.total += (self.sum_bias[type_id] - old_sum) * self.type_weight[type_id]
+        self._relative = None
+
+    def change_gauge_weight(self, gauge: str, weight: int):
+        """
+        Apply `GaugeController.change_gauge_weight(gauge, weight)` as sent
+        during the first projected week. Only the rows of `gauge` and its
+        type are rebuilt.
+        """
+        i = self._gauge_index[str(gauge)]
+        self._set_gauge(i, weight, self._gauge_slopes[i])
+
+    def change_type_weight(self, type_id: int, weight: int):
+        """
+        Apply `GaugeController.change_type_weight(type_id, weight)` as sent
+        during the first projected week.
+        """
+        old = self.type_weight[type_id].copy()
+        self.type_weight[type_id, 1:] = weight
+        self.total += self.sum_bias[type_id] * (self.type_weight[type_id] - old)
+        self._relative = None
+
+    def vote(self, gauge: str, slope: int, end: int):
+        """
+        Add a new vote of `slope` (the voter's ve slope times the vote
+        weight / 10000) ending at `end` (a week start) to `gauge`, as cast
+        during the first projected week.
+        """
+        i = self._gauge_index[str(gauge)]
+        type_id = self.params.gauge_types[i]
+        end_index = self._week_index(end)
+        if end_index < len(self.weeks):
+            self._gauge_changes[i][end_index] += slope
+            self._sum_changes[type_id][end_index] += slope
+
+        bias = slope * (end - int(self.weeks[0]) - WEEK)
+        self._set_gauge(i, self.gauge_bias[i, 1] + bias, self._gauge_slopes[i] + slope)
+
+    @property
+    def relative_weights(self) -> np.ndarray:
+        """
+        `gauge_relative_weight` of every gauge (rows) for every week (columns).
+        """
+        if self._relative is None:
+            relative = np.zeros(self.gauge_bias.shape, dtype=object)
+            nonzero = self.total != 0
+            for i, gauge_type in enumerate(self.params.gauge_types):
+                weighted = MULTIPLIER * self.type_weight[gauge_type] * self.gauge_bias[i]
+                relative[i, nonzero] = weighted[nonzero] // self.total[nonzero]
+            self._relative = relative
+        return self._relative
+
+    def stream(self, until: int = None, chunk_weeks: int = 4):
+        """
+        Yield `ProjectionChunk`s of `chunk_weeks` weeks up to `until`
+        (defaults to the end of emissions).
+
+        `recipients` maps each `Minter` wallet, `gauges` each gauge to the
+        KYO it receives in every week of the chunk.
+        """
+        seconds = self.seconds
+        n_weeks = len(self.weeks)
+        if until is not None:
+            # `until` can fall into the middle of a week
+            ends = np.minimum(self.weeks + WEEK, min(until, self.params.emission_end))
+            seconds = np.maximum(ends - np.maximum(self.weeks, self.params.start), 0)
+            n_weeks = int(np.count_nonzero(seconds))
+
+        relative = self.relative_weights
+        for lo in range(0, n_weeks, chunk_weeks):
+            hi = min(lo + chunk_weeks, n_weeks)
+            chunk_seconds = seconds[lo:hi].astype(object)
+            minted = chunk_seconds * self.params.emission_rate
+            yield ProjectionChunk(
+                weeks=self.weeks[lo:hi],
+                seconds=seconds[lo:hi],
+                minted=minted,
+                recipients={r.address: minted * r.share // SHARE__DENOMINATOR for r in self.params.recipients},
+                gauges={
+                    gauge: self.inflation_rate * relative[i, lo:hi] * chunk_seconds // MULTIPLIER
+                    for i, gauge in enumerate(self.params.gauges)
+                },
+            )
+
+    def totals(self, until: int = None) -> dict:
+        """
+        KYO each `Minter` wallet accrues and each gauge receives up to `until`.
+        """
+        totals = {}
+        for chunk in self.stream(until, chunk_weeks=len(self.weeks)):
+            for address, amounts in {**chunk.recipients, **chunk.gauges}.items():
+                totals[address] = totals.get(address, 0) + int(amounts.sum())
+        return totals
@@ -0,0 +1,347 @@
+"""
+Epoch based gauge KYO rewards, computed off-chain and paid out by
+`contracts/gauges/controllers/MerkleDistributor.vy`.
+
+`GaugeReplay` is an event driven port of `LiquidityGaugeV1._checkpoint`. Every
+gauge action checkpoints the users it touches and logs either a `Transfer`
+(`deposit`, `withdraw`, `transfer`, with the zero address standing in for
+mints and burns) or an `UpdateLiquidityLimit` (`user_checkpoint`, `kick`, one
+per address of `checkpoint_many` and `kick_many`, and every balance change). Working balances and the working supply only change in
+`_update_liquidity_limit`, which logs them. The gauge events therefore carry
+everything `integrate_inv_supply` and `integrate_fraction` depend on, except
+the relative weight of each week, which is passed in (see `read_weights`).
+
+`EpochRewards` combines the replays of all gauges distributed by epoch.
+`EpochRewards.amounts(end)` is each user's `integrate_fraction` as if they had
+been checkpointed at `end` (what `projected_integrate_fraction` returns at
+that time), summed over the gauges, less what `GaugeDistributor.distributed`
+paid out before a gauge switched to epochs. These cumulative amounts are the
+leaves of `MerkleTree`.
+
+All arithmetic is done on Python integers, so amounts are bit-exact with the
+uint256 math of the gauge. Killed gauges are not supported, `set_killed` does
+not log anything.
+"""
+
+import json
+from typing import NamedTuple
+
+from eth_utils import to_checksum_address
+
+try:
+    # several times faster than the pycryptodome backend of eth-hash
+    from sha3 import keccak_256
+except ImportError:
+    from Crypto.Hash import keccak as pycryptodome_keccak
+
+    def keccak_256(data: bytes = b""):
+        return pycryptodome_keccak.new(data=data, digest_bits=256)
+
+
+WEEK = 7 * 86400
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+def _keccak(data: bytes) -> bytes:
+    return keccak_256(data).digest()
+
+
+class UserState(NamedTuple):
+    working_balance: int
+    integrate_inv_supply_of: int
+    integrate_fraction: int
+
+
+EMPTY_USER = UserState(0, 0, 0)
+
+
+class GaugeReplay:
+    """
+    Replica of the integrals of one `LiquidityGaugeV1`.
+
+    Parameters
+    ----------
+    inflation_rate : int
+        `LiquidityGaugeV1.inflation_rate`, fixed at deployment.
+    weights : dict
+        `{week: gauge_relative_weight(gauge, week)}` of every week the gauge
+        accrues over. Weeks are looked up lazily, so it can be extended
+        before each epoch.
+    """
+
+    def __init__(self, inflation_rate: int, weights: dict):
+        self.inflation_rate = inflation_rate
+        self.weights = weights
+
+        self.period_time = None
+        self.integrate_inv_supply = 0
+        self.working_supply = 0
+        self.users = {}
+
+    @classmethod
+    def from_chain(cls, gauge, weights: dict, from_block: int = 0, to_block: int = None):
+        """
+        Build a replay from the logs of a deployed gauge.
+
+        Parameters
+        ----------
+        gauge : brownie.network.contract.Contract
+            Gauge to replay.
+        weights : dict
+            See the class parameters.
+        from_block : int
+            First block to fetch logs from, must not be after the deployment.
+        to_block : int
+            Last block to fetch logs from (defaults to the chain head).
+        """
+        from brownie import web3
+
+        if to_block is None:
+            to_block = web3.eth.block_number
+
+        logs = []
+        for name in ("UpdateLiquidityLimit", "Transfer"):
+            for entry in gauge.events.get_sequence(from_block, to_block, name):
+                logs.append((entry.blockNumber, entry.logIndex, name, dict(entry.args)))
+        logs.sort(key=lambda log: log[:2])
+
+        timestamps = {}
+        replay = cls(gauge.inflation_rate(), weights)
+        for block_number, _, name, args in logs:
+            if block_number not in timestamps:
+                timestamps[block_number] = web3.eth.get_block(block_number).timestamp
+            replay.apply_event(name, args, timestamps[block_number])
+
+        return replay
+
+    def apply_event(self, name: str, args: dict, timestamp: int):
+        """
+        Apply a single decoded gauge event. Events have to be applied in
+        (block, log index) order. Unknown events are ignored.
+        """
+        if name == "UpdateLiquidityLimit":
+            user = args["user"]
+            # `_update_liquidity_limit` always follows a checkpoint of the user
+            self._checkpoint(user, timestamp)
+            state = self.users[user]
+            self.users[user] = state._replace(working_balance=args["working_balance"])
+            self.working_supply = args["working_supply"]
+
+        elif name == "Transfer":
+            for user in (args["_from"], args["_to"]):
+                if user != ZERO_ADDRESS:
+                    self._checkpoint(user, timestamp)
+
+    def _integrate(self, timestamp: int) -> int:
+        """
+        `integrate_inv_supply` of a checkpoint at `timestamp`.
+        """
+        _integrate_inv_supply = self.integrate_inv_supply
+        prev_week_time = self.period_time
+        if prev_week_time is None or timestamp <= prev_week_time or self.working_supply == 0:
+            return _integrate_inv_supply
+
+        week_time = min((prev_week_time + WEEK) // WEEK * WEEK, timestamp)
+        while True:
+            w = self.weights[prev_week_time // WEEK * WEEK]
+            _integrate_inv_supply += self.inflation_rate * w * (week_time - prev_week_time) // self.working_supply
+
+            if week_time == timestamp:
+                return _integrate_inv_supply
+            prev_week_time = week_time
+            week_time = min(week_time + WEEK, timestamp)
+
+    def _checkpoint(self, user: str, timestamp: int):
+        _integrate_inv_supply = self._integrate(timestamp)
+        if self.period_time is None or timestamp > self.period_time:
+            self.period_time = timestamp
+            self.integrate_inv_supply = _integrate_inv_supply
+
+        state = self.users.get(user, EMPTY_USER)
+        self.users[user] = UserState(
+            state.working_balance,
+            _integrate_inv_supply,
+            state.integrate_fraction
+            + state.working_balance * (_integrate_inv_supply - state.integrate_inv_supply_of) // 10**18,
+        )
+
+    def integrate_fractions(self, timestamp: int) -> dict:
+        """
+        `{user: integrate_fraction}` as if every user was checkpointed at
+        `timestamp`, which must not be before the last applied event.
+        """
+        assert self.period_time is None or timestamp >= self.period_time, "timestamp before last event"
+        _integrate_inv_supply = self._integrate(timestamp)
+        return {
+            user: state.integrate_fraction
+            + state.working_balance * (_integrate_inv_supply - state.integrate_inv_supply_of) // 10**18
+            for user, state in self.users.items()
+        }
+
+
+class EpochRewards:
+    """
+    Cumulative epoch amounts over all gauges distributed by epoch.
+
+    Parameters
+    ----------
+    replays : dict
+        `{gauge: GaugeReplay}`.
+    distributed : dict
+        `{gauge: {user: GaugeDistributor.distributed(user, gauge)}}` as frozen
+        by `GaugeDistributor.add_epoch_gauge`, see `read_distributed`.
+    """
+
+    def __init__(self, replays: dict, distributed: dict = None):
+        self.replays = replays
+        self.distributed = distributed or {}
+
+    def amounts(self, end: int) -> dict:
+        """
+        `{user: cumulative amount}` up to the end of the epoch at `end`,
+        users without anything to claim are left out.
+        """
+        amounts = {}
+        for gauge, replay in self.replays.items():
+            distributed = self.distributed.get(gauge, {})
+            for user, amount in replay.integrate_fractions(end).items():
+                amount -= distributed.get(user, 0)
+                if amount > 0:
+                    amounts[user] = amounts.get(user, 0) + amount
+        return amounts
+
+
+def read_weights(reader, gauge_controller: str, gauges: list, weeks: list, block: int = None) -> dict:
+    """
+    `{gauge: {week: gauge_relative_weight(gauge, week)}}` in one multicall.
+
+    Weights are only final once the controller has been checkpointed in that
+    week (the gauge itself calls `checkpoint_gauge` before reading them), the
+    keeper does so every week.
+    """
+    calls = [
+        reader.call("GaugeController", gauge_controller, "gauge_relative_weight", str(gauge), week, key=(str(gauge), week))
+        for gauge in gauges
+        for week in weeks
+    ]
+    raw = reader.run(calls, block)
+    return {str(gauge): {week: raw[(str(gauge), week)] for week in weeks} for gauge in gauges}
+
+
+def read_distributed(reader, gauge_distributor: str, gauges: list, users: list, block: int = None) -> dict:
+    """
+    `{gauge: {user: GaugeDistributor.distributed(user, gauge)}}` of the users
+    with a non-zero amount, read once after the gauges switched to epochs.
+    """
+    calls = [
+        reader.call("GaugeDistributor", gauge_distributor, "distributed", str(user), str(gauge), key=(str(gauge), str(user)))
+        for gauge in gauges
+        for user in users
+    ]
+    raw = reader.run(calls, block)
+
+    distributed = {str(gauge): {} for gauge in gauges}
+    for gauge in gauges:
+        for user in users:
+            if raw[(str(gauge), str(user))]:
+                distributed[str(gauge)][str(user)] = raw[(str(gauge), str(user))]
+    return distributed
+
+
+def leaf(account: str, amount: int) -> bytes:
+    """
+    `MerkleDistributor._leaf`: keccak256 of the ABI encoded (address, uint256).
+    """
+    return _keccak(bytes(12) + bytes.fromhex(account[2:]) + amount.to_bytes(32, "big"))
+
+
+def _hash_pair(a: bytes, b: bytes) -> bytes:
+    return _keccak(a + b) if a <= b else _keccak(b + a)
+
+
+class MerkleTree:
+    """
+    Merkle tree of (account, cumulative amount) leaves with sorted pair
+    hashing, as verified by `MerkleDistributor._verify`. A node without a
+    sibling is carried up to the next layer unchanged.
+
+    Parameters
+    ----------
+    amounts : dict
+        `{account: cumulative amount}` with checksummed accounts, as the
+        indexer and brownie return them.
+    """
+
+    def __init__(self, amounts: dict):
+        self.amounts = amounts
+        self.accounts = sorted(amounts)
+        self.index = {account: i for i, account in enumerate(self.accounts)}
+
+        layer = [leaf(account, self.amounts[account]) for account in self.accounts]
+        self.layers = [layer]
+        while len(layer) > 1:
+            pairs = [_hash_pair(layer[i], layer[i + 1]) for i in range(0, len(layer) - 1, 2)]
+            if len(layer) % 2:
+                pairs.append(layer[-1])
+            layer = pairs
+            self.layers.append(layer)
+
+    @property
+    def root(self) -> bytes:
+        return self.layers[-1][0] if self.accounts else bytes(32)
+
+    @property
+    def total(self) -> int:
+        return sum(self.amounts.values())
+
+    def proof(self, account: str) -> list:
+        """
+        Sibling hashes from the leaf of `account` up to the root.
+        """
+        i = self.index[to_checksum_address(account)]
+        proof = []
+        for layer in self.layers[:-1]:
+            sibling = i ^ 1
+            if sibling < len(layer):
+                proof.append(layer[sibling])
+            i //= 2
+        return proof
+
+    def verify(self, account: str, amount: int, proof: list) -> bool:
+        computed = leaf(to_checksum_address(account), amount)
+        for node in proof:
+            computed = _hash_pair(computed, node)
+        return computed == self.root
+
+    def hex_proofs(self) -> list:
+        """
+        Hex encoded proofs of all accounts, in `accounts` order. Builds them
+        layer by layer, which is several times faster than calling `proof`
+        for every account.
+        """
+        proofs = [[] for _ in self.accounts]
+        indices = range(len(self.accounts))
+        for depth, layer in enumerate(self.layers[:-1]):
+            nodes = ["0x" + node.hex() for node in layer]
+            last = len(layer) - 1
+            for i in indices:
+                sibling = (i >> depth) ^ 1
+                if sibling <= last:
+                    proofs[i].append(nodes[sibling])
+        return proofs
+
+    def dump(self, path: str, epoch: int):
+        """
+        Write the root, the total and every claim with its proof as JSON, the
+        file users (or a frontend) claim from.
+        """
+        claims = {
+            account: {"amount": str(self.amounts[account]), "proof": proof}
+            for account, proof in zip(self.accounts, self.hex_proofs())
+        }
+        with open(path, "w") as fp:
+            json.dump(
+                {"epoch": epoch, "root": "0x" + self.root.hex(), "total": str(self.total), "claims": claims},
+                fp,
+            )
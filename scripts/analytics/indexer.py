@@ -0,0 +1,402 @@
+"""
+Incremental event indexer for the Kōyō contracts.
+
+Logs of every contract listed in `deployments.json` are fetched in bulk block
+ranges (one `eth_getLogs` per range for all addresses), decoded with
+topic -> decoder tables precomputed from `abis/*.json` and appended to an
+Arrow IPC store:
+
+    <root>/_state.json                          high-water mark + indexed addresses
+    <root>/<Abi>/<Event>/<first>-<last>.arrow   one part per flush
+
+Parts are written in the Arrow IPC file format, so `EventStore` can memory-map
+them without copying. Integers wider than 63 bits (all of the uint256 / int128
+values) are stored as decimal strings and converted back by `EventStore.events`.
+"""
+
+import json
+import os
+from glob import glob
+
+import pyarrow as pa
+from eth_utils import keccak, to_checksum_address
+
+try:
+    from eth_abi import decode as decode_abi
+except ImportError:  # eth-abi < 4
+    from eth_abi import decode_abi
+
+
+ABI_DIR = "abis"
+DEPLOYMENTS_JSON = "deployments.json"
+STATE_FILE = "_state.json"
+
+# `deployments.json` key -> ABI file name, everything else maps to itself
+GAUGE_KEY = "Gauge"
+GAUGE_ABI = "LiquidityGaugeV1"
+
+BASE_FIELDS = [
+    pa.field("block_number", pa.int64()),
+    pa.field("log_index", pa.int32()),
+    pa.field("transaction_hash", pa.string()),
+    pa.field("address", pa.string()),
+]
+
+
+def _int_bits(abi_type: str) -> int:
+    bits = abi_type[4:] if abi_type.startswith("uint") else abi_type[3:]
+    return int(bits or 256)
+
+
+def _is_wide_int(abi_type: str) -> bool:
+    return abi_type.startswith(("uint", "int")) and _int_bits(abi_type) >= 64
+
+
+def _arrow_type(abi_type: str):
+    if abi_type.endswith("]"):
+        return pa.list_(_arrow_type(abi_type[: abi_type.rindex("[")]))
+    if abi_type in ("address", "string") or _is_wide_int(abi_type):
+        return pa.string()
+    if abi_type == "bool":
+        return pa.bool_()
+    if abi_type.startswith("bytes"):
+        return pa.binary()
+    return pa.int64()
+
+
+def _to_arrow(abi_type: str, value):
+    if abi_type.endswith("]"):
+        inner = abi_type[: abi_type.rindex("[")]
+        return [_to_arrow(inner, v) for v in value]
+    if abi_type == "address":
+        return to_checksum_address(value)
+    if _is_wide_int(abi_type):
+        return str(value)
+    return value
+
+
+def _from_arrow(abi_type: str, value):
+    if abi_type.endswith("]"):
+        inner = abi_type[: abi_type.rindex("[")]
+        return [_from_arrow(inner, v) for v in value]
+    if abi_type.startswith(("uint", "int")):
+        return int(value)
+    return value
+
+
+class EventDecoder:
+    """
+    Decoder for one ABI event, keyed by its topic0.
+    """
+
+    def __init__(self, abi_name: str, entry: dict):
+        self.abi_name = abi_name
+        self.name = entry["name"]
+        self.inputs = [(i["name"], i["type"], i["indexed"]) for i in entry["inputs"]]
+
+        signature = f"{self.name}({','.join(t for _, t, _ in self.inputs)})"
+        self.topic = keccak(text=signature)
+
+        self.indexed = [(n, t) for n, t, indexed in self.inputs if indexed]
+        self.data = [(n, t) for n, t, indexed in self.inputs if not indexed]
+        self.types = {n: t for n, t, _ in self.inputs}
+
+        self.schema = pa.schema(
+            BASE_FIELDS + [pa.field(n, _arrow_type(t)) for n, t, _ in self.inputs]
+        )
+        assert len(set(self.schema.names)) == len(self.schema.names), signature
+
+    def decode(self, log) -> dict:
+        row = {
+            "block_number": log["blockNumber"],
+            "log_index": log["logIndex"],
+            "transaction_hash": _hex(log["transactionHash"]),
+            "address": log["address"],
+        }
+
+        for (name, abi_type), topic in zip(self.indexed, log["topics"][1:]):
+            if abi_type in ("string", "bytes") or abi_type.endswith("]"):
+                # dynamic indexed values are only available as their hash
+                row[name] = bytes(topic)
+            else:
+                row[name] = _to_arrow(abi_type, decode_abi([abi_type], bytes(topic))[0])
+
+        data = log["data"]
+        if isinstance(data, str):
+            data = bytes.fromhex(data[2:] if data.startswith("0x") else data)
+        values = decode_abi([t for _, t in self.data], bytes(data))
+        for (name, abi_type), value in zip(self.data, values):
+            row[name] = _to_arrow(abi_type, value)
+
+        return row
+
+    def decode_args(self, log) -> dict:
+        """
+        Event arguments of `log` with integer values, as `EventStore.events`
+        returns them.
+        """
+        row = self.decode(log)
+        return {n: _from_arrow(t, row[n]) for n, t in self.types.items()}
+
+
+def _hex(value) -> str:
+    if isinstance(value, str):
+        return value
+    return "0x" + bytes(value).hex()
+
+
+def load_decoders(abi_dir: str = ABI_DIR) -> dict:
+    """
+    Build `{abi_name: {topic0: EventDecoder}}` from every ABI in `abi_dir`.
+    """
+    decoders = {}
+    for path in sorted(glob(os.path.join(abi_dir, "*.json"))):
+        abi_name = os.path.splitext(os.path.basename(path))[0]
+        with open(path) as fp:
+            abi = json.load(fp)
+
+        decoders[abi_name] = {}
+        for entry in abi:
+            if entry["type"] == "event" and not entry.get("anonymous"):
+                decoder = EventDecoder(abi_name, entry)
+                decoders[abi_name][decoder.topic] = decoder
+
+    return decoders
+
+
+def load_addresses(deployments) -> dict:
+    """
+    Map every deployed address to the name of its ABI.
+
+    Parameters
+    ----------
+    deployments : dict | str
+        Parsed `deployments.json` or a path to it.
+    """
+    if isinstance(deployments, str):
+        with open(deployments) as fp:
+            deployments = json.load(fp)
+
+    addresses = {}
+    for key, value in deployments.items():
+        if key == GAUGE_KEY:
+            for gauge in value.values():
+                addresses[to_checksum_address(gauge)] = GAUGE_ABI
+        else:
+            addresses[to_checksum_address(value)] = key
+
+    return addresses
+
+
+class EventStore:
+    """
+    Read / write access to an indexer directory.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _state_path(self):
+        return os.path.join(self.root, STATE_FILE)
+
+    def load_state(self) -> dict:
+        try:
+            with open(self._state_path()) as fp:
+                return json.load(fp)
+        except FileNotFoundError:
+            return {"block": None, "addresses": []}
+
+    def save_state(self, state: dict):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self._state_path() + ".tmp"
+        with open(tmp, "w") as fp:
+            json.dump(state, fp)
+        os.replace(tmp, self._state_path())
+
+    def _parts(self, abi_name: str, event: str):
+        return sorted(glob(os.path.join(self.root, abi_name, event, "*.arrow")))
+
+    def discard_after(self, block):
+        """
+        Remove parts written after the last persisted high-water mark, left
+        behind by a run that died between writing data and saving its state.
+        """
+        for path in glob(os.path.join(self.root, "*", "*", "*.arrow")):
+            first = int(os.path.basename(path).split("-")[0])
+            if block is None or first > block:
+                os.remove(path)
+
+    def append(self, decoder: EventDecoder, rows: list, first: int, last: int, tag: str = None):
+        directory = os.path.join(self.root, decoder.abi_name, decoder.name)
+        os.makedirs(directory, exist_ok=True)
+        table = pa.Table.from_pylist(rows, schema=decoder.schema)
+
+        name = f"{first:012d}-{last:012d}" + (f"-{tag}" if tag else "")
+        path = os.path.join(directory, name + ".arrow")
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, decoder.schema) as writer:
+                writer.write_table(table)
+
+    def table(self, abi_name: str, event: str):
+        """
+        Memory-map every part of `abi_name.event` into one table.
+        Returns None if nothing was indexed for it yet.
+        """
+        tables = [
+            pa.ipc.open_file(pa.memory_map(path)).read_all()
+            for path in self._parts(abi_name, event)
+        ]
+        if not tables:
+            return None
+        return pa.concat_tables(tables)
+
+    def events(self, decoders: dict, abi_name: str, names=None, address: str = None) -> list:
+        """
+        Decoded events of `abi_name` in chain order as
+        `(block_number, log_index, name, args)` tuples with integer values
+        restored, e.g. to feed `VotingEscrowSimulator.apply_event`.
+        """
+        result = []
+        for decoder in decoders[abi_name].values():
+            if names is not None and decoder.name not in names:
+                continue
+            table = self.table(abi_name, decoder.name)
+            if table is None:
+                continue
+            for row in table.to_pylist():
+                if address is not None and row["address"] != address:
+                    continue
+                args = {n: _from_arrow(t, row[n]) for n, t in decoder.types.items()}
+                result.append((row["block_number"], row["log_index"], decoder.name, args))
+
+        result.sort(key=lambda event: event[:2])
+        return result
+
+
+class EventIndexer:
+    """
+    Fetch, decode and store logs for all deployed contracts.
+
+    Parameters
+    ----------
+    web3 : Web3
+        Connected web3 instance, e.g. `brownie.web3`.
+    root : str
+        Directory of the event store.
+    deployments : dict | str
+        Parsed `deployments.json` or a path to it.
+    abi_dir : str
+        Directory holding the JSON ABIs.
+    batch_size : int
+        Number of blocks fetched per `eth_getLogs` call.
+    flush_every : int
+        Number of batches buffered in memory before they are written out
+        and the high-water mark is advanced.
+    confirmations : int
+        Blocks behind the head that are considered final.
+    """
+
+    def __init__(
+        self,
+        web3,
+        root: str,
+        deployments=DEPLOYMENTS_JSON,
+        abi_dir: str = ABI_DIR,
+        batch_size: int = 5_000,
+        flush_every: int = 20,
+        confirmations: int = 0,
+    ):
+        self.web3 = web3
+        self.store = EventStore(root)
+        self.decoders = load_decoders(abi_dir)
+        self.addresses = load_addresses(deployments)
+        self.batch_size = batch_size
+        self.flush_every = flush_every
+        self.confirmations = confirmations
+
+    def run(self, start_block: int = 0, end_block: int = None) -> int:
+        """
+        Index everything between the stored high-water mark (or `start_block`
+        on the first run) and `end_block` (defaults to the confirmed head).
+
+        Contracts added to the deployments since the previous run are
+        backfilled from `start_block` up to the high-water mark first.
+
+        Returns
+        -------
+        int
+            The new high-water mark.
+        """
+        if end_block is None:
+            end_block = self.web3.eth.block_number - self.confirmations
+
+        state = self.store.load_state()
+        mark = state["block"]
+        self.store.discard_after(mark)
+
+        if mark is not None:
+            new = sorted(set(self.addresses) - set(state["addresses"]))
+            if new:
+                tag = keccak(text=",".join(new)).hex()[:8]
+                self._index(new, start_block, mark, tag=tag)
+                state["addresses"] = sorted(set(state["addresses"]) | set(new))
+                self.store.save_state(state)
+
+        state["addresses"] = sorted(set(state["addresses"]) | set(self.addresses))
+        first = start_block if mark is None else mark + 1
+        if first <= end_block:
+            self._index(sorted(self.addresses), first, end_block, state=state)
+
+        return state["block"]
+
+    def _index(self, addresses, first, last, state=None, tag=None):
+        """
+        Fetch `first..last` for `addresses`. With `state` the high-water mark
+        is advanced on every flush, otherwise (backfills) parts are tagged so
+        they never collide with the parts of the main pass.
+        """
+        buffered = {}
+        flush_from = first
+        batches = 0
+
+        for lo in range(first, last + 1, self.batch_size):
+            hi = min(lo + self.batch_size - 1, last)
+            for log in self._get_logs(addresses, lo, hi):
+                decoder = self._decoder(log)
+                if decoder is not None:
+                    buffered.setdefault(decoder, []).append(decoder.decode(log))
+
+            batches += 1
+            if batches % self.flush_every == 0 or hi == last:
+                for decoder, rows in buffered.items():
+                    self.store.append(decoder, rows, flush_from, hi, tag)
+                buffered = {}
+                flush_from = hi + 1
+                if state is not None:
+                    state["block"] = hi
+                    self.store.save_state(state)
+
+    def _decoder(self, log):
+        abi_name = self.addresses.get(log["address"])
+        if abi_name is None or not log["topics"]:
+            return None
+        return self.decoders.get(abi_name, {}).get(bytes(log["topics"][0]))
+
+    def _get_logs(self, addresses, lo, hi):
+        try:
+            return self.web3.eth.get_logs(
+                {"fromBlock": lo, "toBlock": hi, "address": list(addresses)}
+            )
+        except Exception:
+            # most providers cap the number of results per call, split the range
+            if lo == hi:
+                raise
+            mid = (lo + hi) // 2
+            return self._get_logs(addresses, lo, mid) + self._get_logs(addresses, mid + 1, hi)
+
+
+def main():
+    from brownie import web3
+
+    mark = EventIndexer(web3, "events").run()
+    print(f"Indexed up to block {mark}")
@@ -0,0 +1,223 @@
+"""
+Index of gauge stakers and their veKYO locks, to find `kick` candidates.
+
+`LiquidityGaugeV1.kick(addr)` is accepted when
+
+    (VotingEscrow.balanceOf(addr) == 0 or t_ve > integrate_checkpoint_of(addr))
+    and working_balances(addr) > balanceOf(addr) * 40 / 100
+
+where `t_ve` is the timestamp of the last escrow point of `addr`.
+`StakerIndex` tracks every input of that condition from events, without any
+calls:
+
+  * gauge balances, from `Transfer` (deposits, withdrawals and transfers,
+    with the zero address standing in for mints and burns),
+  * working balances, from `UpdateLiquidityLimit`,
+  * the last checkpoint of each staker, since both events checkpoint every
+    user they name,
+  * escrow points, from `Deposit`, `Withdraw` and `Migrate`. A lock of
+    `amount` ending at `end` has voting power until `end`, and none at all
+    below `MAXTIME` wei (zero slope).
+
+The state is kept in columns, one row per (gauge, staker) pair and one per
+escrow user, so `StakerIndex.candidates` checks every pair in a single
+vectorized pass. Balances do not fit into int64 and are stored in `object`
+arrays, as in `ve_simulator.py`, which keeps the comparison bit-exact.
+
+`LiquidityGaugeV1.claimable_tokens` checkpoints without logging when it is
+sent as a transaction, so the index can be behind on `integrate_checkpoint_of`
+and report a pair `kick` would reject. `kick_many` skips such pairs; record
+them with `StakerIndex.mark_checkpointed`.
+"""
+
+import numpy as np
+
+
+MAXTIME = 365 * 86400
+TOKENLESS_PRODUCTION = 40
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+GAUGE_EVENTS = ("Transfer", "UpdateLiquidityLimit")
+ESCROW_EVENTS = ("Deposit", "Withdraw", "Migrate", "ApplyNextVeContract")
+
+
+def _grow(array: np.ndarray, size: int) -> np.ndarray:
+    if size <= len(array):
+        return array
+    grown = np.zeros(max(size, 2 * len(array)), dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+class StakerIndex:
+    """
+    Columnar, event driven index of (gauge, staker) pairs.
+
+    Parameters
+    ----------
+    capacity : int
+        Initial number of rows, columns grow as needed.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.migration = False
+
+        # one row per (gauge, staker) pair
+        self.pairs = {}
+        self.pair_gauge = []
+        self.pair_user = []
+        self.balance = np.zeros(capacity, dtype=object)
+        self.working_balance = np.zeros(capacity, dtype=object)
+        self.last_checkpoint = np.zeros(capacity, dtype=np.int64)
+        self.pair_escrow = np.zeros(capacity, dtype=np.int64)
+
+        # one row per escrow user
+        self.escrow_users = {}
+        self.locked = {}
+        self.ve_ts = np.zeros(capacity, dtype=np.int64)
+        # voting power is 0 from this timestamp on
+        self.ve_until = np.zeros(capacity, dtype=np.int64)
+
+    @classmethod
+    def from_chain(cls, voting_escrow, gauges: list, from_block: int = 0, to_block: int = None):
+        """
+        Build an index from the logs of a deployed escrow and its gauges.
+
+        Parameters
+        ----------
+        voting_escrow : brownie.network.contract.Contract
+            Escrow the gauges read boosts from.
+        gauges : list
+            Gauge contracts to index.
+        from_block : int
+            First block to fetch logs from, must not be after the deployments.
+        to_block : int
+            Last block to fetch logs from (defaults to the chain head).
+        """
+        from brownie import web3
+
+        if to_block is None:
+            to_block = web3.eth.block_number
+
+        timestamps = {}
+
+        def logs(contract, names):
+            entries = []
+            for name in names:
+                for entry in contract.events.get_sequence(from_block, to_block, name):
+                    entries.append((entry.blockNumber, entry.logIndex, name, dict(entry.args)))
+            for block_number, _, name, args in sorted(entries, key=lambda entry: entry[:2]):
+                if block_number not in timestamps:
+                    timestamps[block_number] = web3.eth.get_block(block_number).timestamp
+                yield name, args, timestamps[block_number]
+
+        index = cls()
+        for name, args, timestamp in logs(voting_escrow, ESCROW_EVENTS):
+            index.apply_escrow_event(name, args, args.get("ts") or timestamp)
+        for gauge in gauges:
+            for name, args, timestamp in logs(gauge, GAUGE_EVENTS):
+                index.apply_gauge_event(gauge.address, name, args, timestamp)
+
+        return index
+
+    def __len__(self) -> int:
+        return len(self.pair_user)
+
+    def _escrow_row(self, user: str) -> int:
+        row = self.escrow_users.get(user)
+        if row is None:
+            row = self.escrow_users[user] = len(self.escrow_users)
+            self.ve_ts = _grow(self.ve_ts, row + 1)
+            self.ve_until = _grow(self.ve_until, row + 1)
+        return row
+
+    def _pair_row(self, gauge: str, user: str) -> int:
+        row = self.pairs.get((gauge, user))
+        if row is None:
+            row = self.pairs[(gauge, user)] = len(self.pair_user)
+            self.pair_gauge.append(gauge)
+            self.pair_user.append(user)
+            self.balance = _grow(self.balance, row + 1)
+            self.working_balance = _grow(self.working_balance, row + 1)
+            self.last_checkpoint = _grow(self.last_checkpoint, row + 1)
+            self.pair_escrow = _grow(self.pair_escrow, row + 1)
+            self.pair_escrow[row] = self._escrow_row(user)
+        return row
+
+    def apply_gauge_event(self, gauge: str, name: str, args: dict, timestamp: int):
+        """
+        Apply a single decoded event of `gauge`. Events of one gauge have to
+        be applied in (block, log index) order. Unknown events are ignored.
+        """
+        if name == "Transfer":
+            value = args["_value"]
+            for user, delta in ((args["_from"], -value), (args["_to"], value)):
+                if user != ZERO_ADDRESS:
+                    row = self._pair_row(gauge, user)
+                    self.balance[row] += delta
+                    self.last_checkpoint[row] = timestamp
+
+        elif name == "UpdateLiquidityLimit":
+            row = self._pair_row(gauge, args["user"])
+            self.working_balance[row] = args["working_balance"]
+            self.last_checkpoint[row] = timestamp
+
+    def apply_escrow_event(self, name: str, args: dict, timestamp: int):
+        """
+        Apply a single decoded escrow event. Events have to be applied in
+        (block, log index) order. Unknown events are ignored.
+        """
+        if name == "Deposit":
+            user = args["provider"]
+            amount = self.locked.get(user, 0) + args["value"]
+            end = args["locktime"]
+        elif name in ("Withdraw", "Migrate"):
+            user = args["provider"] if name == "Withdraw" else args["account"]
+            amount = end = 0
+        elif name == "ApplyNextVeContract":
+            # `balanceOf` returns 0 for everyone from now on
+            self.migration = True
+            return
+        else:
+            return
+
+        self.locked[user] = amount
+        row = self._escrow_row(user)
+        self.ve_ts[row] = timestamp
+        self.ve_until[row] = end if amount // MAXTIME > 0 and end > timestamp else 0
+
+    def mark_checkpointed(self, gauge: str, user: str, timestamp: int):
+        """
+        Record a checkpoint of `user` which did not log anything, e.g. a pair
+        `kick_many` skipped.
+        """
+        row = self.pairs.get((gauge, user))
+        if row is not None:
+            self.last_checkpoint[row] = max(self.last_checkpoint[row], timestamp)
+
+    def candidates(self, timestamp: int) -> dict:
+        """
+        `{gauge: [staker, ...]}` of every pair `kick` accepts at `timestamp`.
+
+        Stakers are sorted by how far their working balance is above the
+        unboosted one, largest first, and gauges by their largest candidate.
+        """
+        n = len(self.pair_user)
+        working = self.working_balance[:n]
+        excess = working - self.balance[:n] * TOKENLESS_PRODUCTION // 100
+        needed = excess > 0
+
+        escrow = self.pair_escrow[:n]
+        no_voting_power = self.ve_until[escrow] <= timestamp
+        if self.migration:
+            no_voting_power[:] = True
+        allowed = no_voting_power | (self.ve_ts[escrow] > self.last_checkpoint[:n])
+
+        rows = np.flatnonzero(needed & allowed)
+        rows = rows[np.argsort(-excess[rows], kind="stable")]
+
+        result = {}
+        for row in rows:
+            result.setdefault(self.pair_gauge[row], []).append(self.pair_user[row])
+        return result
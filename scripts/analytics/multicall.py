@@ -0,0 +1,269 @@
+"""
+Batched, block-pinned read layer on top of a Multicall2 compatible contract
+(see `contracts/testing/Multicall.vy`).
+
+View calls are encoded from the JSON ABIs in `abis/`, grouped into
+`tryBlockAndAggregate` chunks and sent as raw `eth_call` requests over a
+bounded pool of HTTP connections. Every chunk is pinned to the same block
+and the returned parent hashes are compared, so a snapshot is consistent even
+if the chain advances (or reorgs) while it is being read.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+from glob import glob
+from typing import Any, Callable, Hashable, NamedTuple
+
+import aiohttp
+from eth_utils import keccak, to_checksum_address
+
+try:
+    from eth_abi import decode as decode_abi, encode as encode_abi
+except ImportError:  # eth-abi < 4
+    from eth_abi import decode_abi, encode_abi
+
+from .indexer import ABI_DIR
+
+
+AGGREGATE_SIGNATURE = "tryBlockAndAggregate(bool,(address,bytes)[])"
+AGGREGATE_SELECTOR = keccak(text=AGGREGATE_SIGNATURE)[:4]
+AGGREGATE_OUTPUT = ["uint256", "bytes32", "(bool,bytes)[]"]
+
+# bounded by `MAX_CALLS` of the bundled contract
+MAX_CHUNK_SIZE = 255
+
+
+def _abi_type(param: dict) -> str:
+    if param["type"].startswith("tuple"):
+        inner = ",".join(_abi_type(c) for c in param["components"])
+        return f"({inner}){param['type'][5:]}"
+    return param["type"]
+
+
+class Function(NamedTuple):
+    selector: bytes
+    inputs: list
+    outputs: list
+
+    def encode(self, *args) -> bytes:
+        return self.selector + encode_abi(self.inputs, list(args))
+
+    def decode(self, data: bytes):
+        values = decode_abi(self.outputs, data)
+        return values[0] if len(values) == 1 else values
+
+
+def load_functions(abi_dir: str = ABI_DIR) -> dict:
+    """
+    Build `{abi_name: {(fn_name, n_inputs): Function}}` from `abi_dir`.
+    Overloads (e.g. `gauge_relative_weight`) are told apart by argument count.
+    """
+    functions = {}
+    for path in sorted(glob(os.path.join(abi_dir, "*.json"))):
+        abi_name = os.path.splitext(os.path.basename(path))[0]
+        with open(path) as fp:
+            abi = json.load(fp)
+
+        functions[abi_name] = {}
+        for entry in abi:
+            if entry["type"] != "function":
+                continue
+            inputs = [_abi_type(i) for i in entry["inputs"]]
+            outputs = [_abi_type(o) for o in entry["outputs"]]
+            selector = keccak(text=f"{entry['name']}({','.join(inputs)})")[:4]
+            functions[abi_name][(entry["name"], len(inputs))] = Function(selector, inputs, outputs)
+
+    return functions
+
+
+class Call(NamedTuple):
+    target: str
+    data: bytes
+    decode: Callable[[bytes], Any]
+    key: Hashable
+
+
+class MulticallReader:
+    """
+    Parameters
+    ----------
+    rpc_url : str
+        HTTP JSON-RPC endpoint.
+    multicall : str
+        Address of the Multicall2 compatible contract.
+    chunk_size : int
+        Calls per `eth_call`.
+    pool_size : int
+        Maximum number of concurrent requests / open connections.
+    abi_dir : str
+        Directory holding the JSON ABIs.
+    """
+
+    def __init__(
+        self,
+        rpc_url: str,
+        multicall: str,
+        chunk_size: int = MAX_CHUNK_SIZE,
+        pool_size: int = 8,
+        abi_dir: str = ABI_DIR,
+    ):
+        assert 0 < chunk_size <= MAX_CHUNK_SIZE
+        self.rpc_url = rpc_url
+        self.multicall = to_checksum_address(multicall)
+        self.chunk_size = chunk_size
+        self.pool_size = pool_size
+        self.functions = load_functions(abi_dir)
+        self._ids = itertools.count()
+
+    def call(self, abi_name: str, target: str, fn_name: str, *args, key: Hashable = None) -> Call:
+        """
+        Prepare a call of `abi_name.fn_name(*args)` on `target`.
+        `key` defaults to `(target, fn_name, *args)`.
+        """
+        fn = self.functions[abi_name][(fn_name, len(args))]
+        if key is None:
+            key = (str(target), fn_name) + tuple(args)
+        return Call(to_checksum_address(str(target)), fn.encode(*args), fn.decode, key)
+
+    def run(self, calls: list, block: int = None) -> dict:
+        """
+        Blocking wrapper around `fetch`.
+        """
+        return asyncio.run(self.fetch(calls, block))
+
+    async def fetch(self, calls: list, block: int = None) -> dict:
+        """
+        Execute `calls` at `block` (defaults to the current head).
+
+        Returns
+        -------
+        dict
+            `{key: value}` with `None` for calls that reverted, plus the
+            pinned block number under the `"block"` key.
+        """
+        connector = aiohttp.TCPConnector(limit=self.pool_size)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            if block is None:
+                block = int(await self._rpc(session, "eth_blockNumber", []), 16)
+
+            chunks = [
+                calls[i : i + self.chunk_size] for i in range(0, len(calls), self.chunk_size)
+            ]
+            responses = await asyncio.gather(
+                *(self._aggregate(session, chunk, block) for chunk in chunks)
+            )
+
+        result = {"block": block}
+        parents = set()
+        for chunk, (number, parent, returned) in zip(chunks, responses):
+            assert number == block
+            parents.add(parent)
+            for c, (success, data) in zip(chunk, returned):
+                result[c.key] = c.decode(data) if success and data else None
+
+        assert len(parents) <= 1, "chunks were served from different forks"
+        return result
+
+    async def _aggregate(self, session, chunk, block):
+        payload = AGGREGATE_SELECTOR + encode_abi(
+            ["bool", "(address,bytes)[]"], [False, [(c.target, c.data) for c in chunk]]
+        )
+        data = await self._rpc(
+            session,
+            "eth_call",
+            [{"to": self.multicall, "data": "0x" + payload.hex()}, hex(block)],
+        )
+        return decode_abi(AGGREGATE_OUTPUT, bytes.fromhex(data[2:]))
+
+    async def _rpc(self, session, method, params):
+        body = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+        async with session.post(self.rpc_url, json=body) as response:
+            reply = await response.json(content_type=None)
+        if "error" in reply:
+            raise ValueError(reply["error"])
+        return reply["result"]
+
+
+def gauge_snapshot(
+    reader: MulticallReader,
+    gauges: list,
+    users: list,
+    voting_escrow: str,
+    gauge_controller: str,
+    gauge_distributor: str,
+    reward_tokens: dict = None,
+    block: int = None,
+) -> dict:
+    """
+    Read the per-user state of every gauge at a single block.
+
+    Parameters
+    ----------
+    gauges : list
+        Gauge addresses, e.g. `deployments["Gauge"].values()`.
+    users : list
+        User addresses.
+    reward_tokens : dict
+        Optional `{gauge: [reward token, ...]}` for `claimable_reward`.
+
+    Returns
+    -------
+    dict
+        `{"block", "total_supply", "gauges": {gauge: {...}}, "users": {user: {...}}}`.
+    """
+    gauges = [str(g) for g in gauges]
+    users = [str(u) for u in users]
+    reward_tokens = reward_tokens or {}
+
+    views = [reader.call("VotingEscrow", voting_escrow, "totalSupply", key="ve_supply")]
+
+    for user in users:
+        views.append(reader.call("VotingEscrow", voting_escrow, "balanceOf", user, key=("ve", user)))
+
+    for gauge in gauges:
+        views.append(reader.call("GaugeController", gauge_controller, "gauge_relative_weight", gauge, key=("weight", gauge)))
+        views.append(reader.call("LiquidityGaugeV1", gauge, "totalSupply", key=("supply", gauge)))
+        views.append(reader.call("LiquidityGaugeV1", gauge, "working_supply", key=("working_supply", gauge)))
+        for user in users:
+            for fn_name in ("balanceOf", "working_balances", "integrate_fraction", "projected_integrate_fraction"):
+                views.append(reader.call("LiquidityGaugeV1", gauge, fn_name, user, key=(fn_name, gauge, user)))
+            views.append(reader.call("GaugeDistributor", gauge_distributor, "distributed", user, gauge, key=("distributed", gauge, user)))
+            for token in reward_tokens.get(gauge, []):
+                views.append(reader.call(
+                    "LiquidityGaugeV1", gauge, "claimable_reward", user, str(token),
+                    key=("claimable_reward", gauge, user, str(token)),
+                ))
+
+    raw = reader.run(views, block)
+
+    snapshot = {
+        "block": raw["block"],
+        "total_supply": raw["ve_supply"],
+        "users": {user: {"ve_balance": raw[("ve", user)]} for user in users},
+        "gauges": {},
+    }
+    for gauge in gauges:
+        state = {
+            "relative_weight": raw[("weight", gauge)],
+            "total_supply": raw[("supply", gauge)],
+            "working_supply": raw[("working_supply", gauge)],
+            "users": {},
+        }
+        for user in users:
+            projected = raw[("projected_integrate_fraction", gauge, user)]
+            distributed = raw[("distributed", gauge, user)]
+            state["users"][user] = {
+                "balance": raw[("balanceOf", gauge, user)],
+                "working_balance": raw[("working_balances", gauge, user)],
+                "integrate_fraction": raw[("integrate_fraction", gauge, user)],
+                "claimable_tokens": None if projected is None or distributed is None else projected - distributed,
+                "claimable_reward": {
+                    str(token): raw[("claimable_reward", gauge, user, str(token))]
+                    for token in reward_tokens.get(gauge, [])
+                },
+            }
+        snapshot["gauges"][gauge] = state
+
+    return snapshot
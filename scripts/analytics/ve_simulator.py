@@ -0,0 +1,518 @@
+"""
+Off-chain replica of `contracts/VotingEscrow.vy`.
+
+Replays `Deposit` / `Withdraw` / `PenaltyApplied` / `Migrate` / `Supply` events
+through a line-by-line port of `VotingEscrow._checkpoint` and then answers
+`balanceOf`, `balanceOfAt`, `balanceOfAtTime`, `totalSupply`, `totalSupplyAt`
+and `totalSupplyAtTime` for every holder at once using NumPy arrays.
+
+All arithmetic is done on Python integers (biases and slopes are stored in
+`object` arrays as they do not fit into int64), so results are bit-exact with
+the int128 / uint256 math of the contract.
+
+The escrow does not emit an event for a bare `checkpoint()` call. Such calls
+do not change any voting power but they do add entries to `point_history`,
+which is used for the block -> time interpolation of the `*At` methods. Feed
+them through `VotingEscrowSimulator.checkpoint` if `balance_of_at` and
+`total_supply_at` have to match the contract exactly.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+
+DAY = 86400
+WEEK = 7 * DAY
+MAXTIME = 365 * DAY
+MULTIPLIER = 10**18
+
+# (user index, block or timestamp) pairs are packed into one int64 search key
+BLOCK_BITS = 40
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+class Point(NamedTuple):
+    bias: int
+    slope: int
+    ts: int
+    blk: int
+
+
+class LockedBalance(NamedTuple):
+    amount: int
+    end: int
+
+
+EMPTY_POINT = Point(0, 0, 0, 0)
+EMPTY_LOCK = LockedBalance(0, 0)
+
+
+class VotingEscrowSimulator:
+    """
+    Event driven replica of the escrow storage: `locked`, `point_history`,
+    `user_point_history` and `slope_changes`.
+
+    Parameters
+    ----------
+    genesis_block : int
+        Block number the escrow was deployed at.
+    genesis_ts : int
+        Timestamp the escrow was deployed at.
+    """
+
+    def __init__(self, genesis_block: int, genesis_ts: int):
+        self.supply = 0
+        self.burnt = 0
+        self.migration = False
+
+        self.locked = {}
+        self.point_history = [Point(0, 0, genesis_ts, genesis_block)]
+        self.user_point_history = {}
+        self.slope_changes = {}
+
+        self._last_event = (genesis_block, genesis_ts)
+        # (event name, block, tx hash) of the batch the last event belongs to
+        self._batch = None
+
+    @property
+    def epoch(self) -> int:
+        return len(self.point_history) - 1
+
+    @classmethod
+    def from_chain(cls, voting_escrow, from_block: int = 0, to_block: int = None):
+        """
+        Build a simulator from the logs of a deployed `VotingEscrow`.
+
+        Parameters
+        ----------
+        voting_escrow : brownie.network.contract.Contract
+            Escrow to replay.
+        from_block : int
+            First block to fetch logs from, must not be after the deployment.
+        to_block : int
+            Last block to fetch logs from (defaults to the chain head).
+        """
+        from brownie import web3
+
+        if to_block is None:
+            to_block = web3.eth.block_number
+
+        logs = []
+        for name, entries in voting_escrow.events.get_sequence(from_block, to_block).items():
+            for entry in entries:
+                logs.append((entry.blockNumber, entry.logIndex, name, dict(entry.args), entry.transactionHash.hex()))
+        logs.sort(key=lambda log: log[:2])
+
+        timestamps = {}
+
+        def block_ts(number):
+            if number not in timestamps:
+                timestamps[number] = web3.eth.get_block(number).timestamp
+            return timestamps[number]
+
+        initialized = [log for log in logs if log[2] == "Initialized"]
+        assert initialized, "deployment block not in range"
+        genesis_block = initialized[0][0]
+
+        sim = cls(genesis_block, block_ts(genesis_block))
+        for block_number, _, name, args, tx_hash in logs:
+            sim.apply_event(name, args, block_number, args.get("ts") or block_ts(block_number), tx_hash)
+
+        return sim
+
+    def apply_event(self, name: str, args: dict, block_number: int, timestamp: int, tx_hash: str = None):
+        """
+        Apply a single decoded escrow event. Events have to be applied in
+        (block, log index) order. Unknown events are ignored.
+
+        `create_locks_for` and `migrate_many` advance the global point once
+        per transaction. Consecutive `Deposit`s without a `Supply` in between
+        can only come from one `create_locks_for`, consecutive `Migrate`s
+        are only taken as one `migrate_many` if they share `tx_hash`.
+        """
+        if name == "Deposit":
+            addr = args["provider"]
+            old_locked = self.locked.get(addr, EMPTY_LOCK)
+            new_locked = LockedBalance(old_locked.amount + args["value"], args["locktime"])
+            self.locked[addr] = new_locked
+            self._checkpoint_event(addr, old_locked, new_locked, timestamp, block_number, (name, block_number, tx_hash))
+
+        elif name in ("Withdraw", "Migrate"):
+            addr = args["provider"] if name == "Withdraw" else args["account"]
+            old_locked = self.locked.get(addr, EMPTY_LOCK)
+            self.locked[addr] = EMPTY_LOCK
+            batch = (name, block_number, tx_hash) if name == "Migrate" and tx_hash is not None else None
+            self._checkpoint_event(addr, old_locked, EMPTY_LOCK, timestamp, block_number, batch)
+
+        elif name == "PenaltyApplied":
+            # the lock itself is cleared by the accompanying `Withdraw`
+            self.burnt += args["value"] - args["penalty"]
+
+        elif name == "Supply":
+            self.supply = args["supply"]
+
+        elif name == "ApplyNextVeContract":
+            self.migration = True
+
+        else:
+            return
+
+        if name not in ("Deposit", "Migrate"):
+            self._batch = None
+        self._last_event = (block_number, timestamp)
+
+    def checkpoint(self, block_number: int, timestamp: int):
+        """
+        Mirror a bare `VotingEscrow.checkpoint()` call.
+        """
+        self._checkpoint(ZERO_ADDRESS, EMPTY_LOCK, EMPTY_LOCK, timestamp, block_number)
+        self._batch = None
+        self._last_event = (block_number, timestamp)
+
+    def _checkpoint_event(self, addr, old_locked, new_locked, ts, blk, batch):
+        # Later events of a batch apply to the global point of its first one
+        if batch is not None and batch == self._batch:
+            _epoch = self.epoch
+            last_point = self.point_history[_epoch]
+        else:
+            last_point, _epoch = self._checkpoint_global(ts, blk)
+        self._write_point(_epoch, self._checkpoint_user(addr, old_locked, new_locked, last_point, ts, blk))
+        self._batch = batch
+
+    def _checkpoint(self, addr, old_locked, new_locked, ts, blk):
+        last_point, _epoch = self._checkpoint_global(ts, blk)
+        if addr != ZERO_ADDRESS:
+            last_point = self._checkpoint_user(addr, old_locked, new_locked, last_point, ts, blk)
+        self._write_point(_epoch, last_point)
+
+    def _checkpoint_global(self, ts, blk):
+        # Port of `VotingEscrow._checkpoint_global`, see the contract for
+        # comments. Returns the point at `ts` and its epoch without writing it.
+        _epoch = self.epoch
+        if _epoch > 0:
+            bias, slope, last_ts, last_blk = self.point_history[_epoch]
+        else:
+            bias, slope, last_ts, last_blk = 0, 0, ts, blk
+        initial_ts, initial_blk = last_ts, last_blk
+        last_checkpoint = last_ts
+
+        block_slope = 0
+        if ts > last_ts:
+            block_slope = MULTIPLIER * (blk - last_blk) // (ts - last_ts)
+
+        t_i = (last_checkpoint // WEEK) * WEEK
+        for _ in range(255):
+            t_i += WEEK
+            d_slope = 0
+            if t_i > ts:
+                t_i = ts
+            else:
+                d_slope = self.slope_changes.get(t_i, 0)
+            bias -= slope * (t_i - last_checkpoint)
+            slope += d_slope
+            bias = max(bias, 0)
+            slope = max(slope, 0)
+            last_checkpoint = t_i
+            last_blk = initial_blk + block_slope * (t_i - initial_ts) // MULTIPLIER
+            _epoch += 1
+            if t_i == ts:
+                last_blk = blk
+                break
+            self._write_point(_epoch, Point(bias, slope, t_i, last_blk))
+
+        return Point(bias, slope, t_i, last_blk), _epoch
+
+    def _checkpoint_user(self, addr, old_locked, new_locked, last_point, ts, blk):
+        # Port of `VotingEscrow._checkpoint_user`, see the contract for comments
+        u_old_slope = u_old_bias = 0
+        u_new_slope = u_new_bias = 0
+        new_dslope = 0
+
+        if old_locked.end > ts and old_locked.amount > 0:
+            u_old_slope = old_locked.amount // MAXTIME
+            u_old_bias = u_old_slope * (old_locked.end - ts)
+        if new_locked.end > ts and new_locked.amount > 0:
+            u_new_slope = new_locked.amount // MAXTIME
+            u_new_bias = u_new_slope * (new_locked.end - ts)
+
+        old_dslope = self.slope_changes.get(old_locked.end, 0)
+        if new_locked.end != 0:
+            if new_locked.end == old_locked.end:
+                new_dslope = old_dslope
+            else:
+                new_dslope = self.slope_changes.get(new_locked.end, 0)
+
+        bias, slope, t_i, last_blk = last_point
+        slope = max(slope + u_new_slope - u_old_slope, 0)
+        bias = max(bias + u_new_bias - u_old_bias, 0)
+
+        if old_locked.end > ts:
+            old_dslope += u_old_slope
+            if new_locked.end == old_locked.end:
+                old_dslope -= u_new_slope
+            self.slope_changes[old_locked.end] = old_dslope
+
+        if new_locked.end > ts and new_locked.end > old_locked.end:
+            new_dslope -= u_new_slope
+            self.slope_changes[new_locked.end] = new_dslope
+
+        history = self.user_point_history.setdefault(addr, [EMPTY_POINT])
+        history.append(Point(u_new_bias, u_new_slope, ts, blk))
+
+        return Point(bias, slope, t_i, last_blk)
+
+    def _write_point(self, epoch, point):
+        if epoch == len(self.point_history):
+            self.point_history.append(point)
+        else:
+            self.point_history[epoch] = point
+
+    def snapshot(self, block_number: int = None, timestamp: int = None):
+        """
+        Freeze the replayed state into NumPy arrays.
+
+        Parameters
+        ----------
+        block_number : int
+            `block.number` the queries are evaluated at (defaults to the last applied event).
+        timestamp : int
+            `block.timestamp` the queries are evaluated at (defaults to the last applied event).
+        """
+        if block_number is None:
+            block_number, timestamp = self._last_event
+        return EscrowSnapshot(self, block_number, timestamp)
+
+
+class EscrowSnapshot:
+    """
+    Columnar view of a `VotingEscrowSimulator` at a fixed head block.
+
+    `users` fixes the order of every per-user result array. User histories are
+    stored back to back (CSR layout) with `user_offsets[i]` pointing at the
+    empty point at index 0 of user `i`'s history.
+    """
+
+    def __init__(self, sim: VotingEscrowSimulator, block_number: int, timestamp: int):
+        self.block_number = block_number
+        self.timestamp = timestamp
+        self.migration = sim.migration
+
+        self.users = list(sim.user_point_history)
+        histories = [sim.user_point_history[addr] for addr in self.users]
+        lengths = np.array([len(h) for h in histories], dtype=np.int64)
+
+        self.user_offsets = np.zeros(len(self.users) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.user_offsets[1:])
+        self.user_epoch = lengths - 1
+
+        flat = [point for history in histories for point in history]
+        self.user_bias = np.array([p.bias for p in flat], dtype=object)
+        self.user_slope = np.array([p.slope for p in flat], dtype=object)
+        self.user_ts = np.array([p.ts for p in flat], dtype=np.int64)
+        self.user_blk = np.array([p.blk for p in flat], dtype=np.int64)
+
+        self.point_bias = np.array([p.bias for p in sim.point_history], dtype=object)
+        self.point_slope = np.array([p.slope for p in sim.point_history], dtype=object)
+        self.point_ts = np.array([p.ts for p in sim.point_history], dtype=np.int64)
+        self.point_blk = np.array([p.blk for p in sim.point_history], dtype=np.int64)
+        self.epoch = len(sim.point_history) - 1
+
+        changes = sorted(sim.slope_changes.items())
+        self.change_ts = np.array([t for t, _ in changes], dtype=np.int64)
+        self.change_slope = np.array([s for _, s in changes], dtype=object)
+
+    def _slope_changes(self, t):
+        idx = np.searchsorted(self.change_ts, t)
+        found = idx < len(self.change_ts)
+        found[found] = self.change_ts[idx[found]] == t[found]
+        out = np.zeros(t.shape, dtype=object)
+        out[found] = self.change_slope[idx[found]]
+        return out
+
+    def _supply_at(self, bias, slope, ts, t):
+        # Vectorized `VotingEscrow.supply_at`: every lane walks the same
+        # 255 week loop as the contract, lanes that reached `t` stop moving
+        bias = bias.copy()
+        slope = slope.copy()
+        ts = ts.copy()
+        t_i = (ts // WEEK) * WEEK
+        active = np.ones(t.shape, dtype=bool)
+
+        for _ in range(255):
+            t_i = np.where(active, t_i + WEEK, t_i)
+            reached = t_i > t
+            t_i = np.where(active & reached, t, t_i)
+            d_slope = np.where(reached, 0, self._slope_changes(t_i))
+
+            bias = np.where(active, bias - slope * (t_i - ts), bias)
+            active &= t_i != t
+            slope = np.where(active, slope + d_slope, slope)
+            ts = np.where(active, t_i, ts)
+            if not active.any():
+                break
+
+        return np.where(bias < 0, 0, bias).astype(object)
+
+    def _find_block_epoch(self, block):
+        # Last epoch with `blk <= block`, like `find_block_epoch`
+        return np.searchsorted(self.point_blk, block, side="right") - 1
+
+    def _block_time(self, block):
+        # Block -> timestamp interpolation shared by `balance_of_at`
+        epoch = self._find_block_epoch(block)
+        blk_0 = self.point_blk[epoch]
+        ts_0 = self.point_ts[epoch]
+
+        has_next = epoch < self.epoch
+        nxt = np.minimum(epoch + 1, self.epoch)
+        d_block = np.where(has_next, self.point_blk[nxt] - blk_0, self.block_number - blk_0)
+        d_t = np.where(has_next, self.point_ts[nxt] - ts_0, self.timestamp - ts_0)
+
+        block_time = ts_0.astype(object)
+        moved = d_block != 0
+        block_time[moved] += (
+            d_t[moved].astype(object) * (block[moved] - blk_0[moved]).astype(object)
+        ) // d_block[moved].astype(object)
+        return block_time
+
+    def _find_user_epoch(self, column, value):
+        # Per-user binary search over `user_point_history[addr][0:epoch + 1]`
+        # by `column` (`user_blk` or `user_ts`), done as a single search over
+        # the concatenated (user, column) keys. Returns the flattened
+        # `(value, user)` grid and the index of the point found for each.
+        n_users = len(self.users)
+        flat = np.broadcast_to(value[..., None], value.shape + (n_users,)).ravel()
+        user = np.tile(np.arange(n_users, dtype=np.int64), int(np.prod(value.shape, dtype=np.int64)))
+
+        keys = np.repeat(np.arange(n_users, dtype=np.int64), self.user_epoch + 1)
+        order = (keys << BLOCK_BITS) + column
+        needle = (user << BLOCK_BITS) + flat
+        return flat, np.searchsorted(order, needle, side="right") - 1
+
+    def balance_of(self, t=None):
+        """
+        `balanceOf(addr, t)` for every user.
+
+        Times before a user's last checkpoint start from their point recorded
+        at or before them, like `find_user_timestamp_epoch`.
+
+        Parameters
+        ----------
+        t : int | array_like
+            Timestamp(s). An array of `k` timestamps yields a `(k, n_users)` result.
+        """
+        if t is None:
+            t = self.timestamp
+        t = np.asarray(t, dtype=np.int64)
+        n_users = len(self.users)
+        if self.migration:
+            return np.zeros(t.shape + (n_users,), dtype=object)
+
+        flat_t, idx = self._find_user_epoch(self.user_ts, t)
+        bias = self.user_bias[idx] - self.user_slope[idx] * (flat_t - self.user_ts[idx]).astype(object)
+        bias = np.where(bias < 0, 0, bias).astype(object)
+        return bias.reshape(t.shape + (n_users,))
+
+    def balance_of_at_time(self, t):
+        """
+        `balanceOfAtTime(addr, t)` for every user.
+
+        Parameters
+        ----------
+        t : int | array_like
+            Timestamp(s), not after the snapshot head. An array of `k`
+            timestamps yields a `(k, n_users)` result.
+        """
+        assert (np.asarray(t) <= self.timestamp).all()
+        return self.balance_of(t)
+
+    def balance_of_at(self, block):
+        """
+        `balanceOfAt(addr, block)` for every user.
+
+        Parameters
+        ----------
+        block : int | array_like
+            Block number(s), not after the snapshot head. An array of `k`
+            blocks yields a `(k, n_users)` result.
+        """
+        block = np.asarray(block, dtype=np.int64)
+        assert (block <= self.block_number).all()
+        n_users = len(self.users)
+        if self.migration:
+            return np.zeros(block.shape + (n_users,), dtype=object)
+
+        flat_block, idx = self._find_user_epoch(self.user_blk, block)
+        block_time = self._block_time(flat_block)
+        bias = self.user_bias[idx] - self.user_slope[idx] * (block_time - self.user_ts[idx])
+        bias = np.where(bias < 0, 0, bias).astype(object)
+        return bias.reshape(block.shape + (n_users,))
+
+    def _find_timestamp_epoch(self, t):
+        # Last epoch with `ts <= t`, like `find_timestamp_epoch`, -1 before
+        # the deployment
+        return np.searchsorted(self.point_ts, t, side="right") - 1
+
+    def total_supply(self, t=None):
+        """
+        `totalSupply(t)` for one or many timestamps.
+
+        Times before the last global point start from the point recorded at
+        or before them, times before the deployment are 0.
+        """
+        if t is None:
+            t = self.timestamp
+        t = np.atleast_1d(np.asarray(t, dtype=np.int64))
+        if self.migration:
+            return np.zeros(t.shape, dtype=object)
+
+        epoch = self._find_timestamp_epoch(t)
+        deployed = epoch >= 0
+        epoch = np.maximum(epoch, 0)
+        result = self._supply_at(
+            self.point_bias[epoch], self.point_slope[epoch], self.point_ts[epoch], t
+        )
+        return np.where(deployed, result, 0).astype(object)
+
+    supply_at = total_supply
+
+    def total_supply_at_time(self, t):
+        """
+        `totalSupplyAtTime(t)` for one or many timestamps, not after the
+        snapshot head.
+        """
+        assert (np.asarray(t) <= self.timestamp).all()
+        return self.total_supply(t)
+
+    def total_supply_at(self, block):
+        """
+        `totalSupplyAt(block)` for one or many block numbers.
+        """
+        block = np.atleast_1d(np.asarray(block, dtype=np.int64))
+        assert (block <= self.block_number).all()
+        if self.migration:
+            return np.zeros(block.shape, dtype=object)
+
+        epoch = self._find_block_epoch(block)
+        blk_0 = self.point_blk[epoch]
+        ts_0 = self.point_ts[epoch]
+
+        has_next = epoch < self.epoch
+        nxt = np.minimum(epoch + 1, self.epoch)
+        d_block = np.where(has_next, self.point_blk[nxt] - blk_0, self.block_number - blk_0)
+        d_t = np.where(has_next, self.point_ts[nxt] - ts_0, self.timestamp - ts_0)
+
+        dt = np.zeros(block.shape, dtype=np.int64)
+        moved = d_block != 0
+        dt[moved] = (
+            (block[moved] - blk_0[moved]).astype(object) * d_t[moved].astype(object)
+        ) // d_block[moved].astype(object)
+
+        return self._supply_at(
+            self.point_bias[epoch], self.point_slope[epoch], ts_0, ts_0 + dt
+        )
+
+    def user_index(self, addr) -> int:
+        return self.users.index(addr)
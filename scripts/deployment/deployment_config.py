@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from brownie import accounts
 
 
@@ -5,6 +7,7 @@ DEPLOYMENTS_JSON = "deployments.json"
 REQUIRED_CONFIRMATIONS = 2
 
 
+@lru_cache(maxsize=None)
 def get_live_admin():
     admin = accounts.load('p7m')
     return admin
@@ -0,0 +1,101 @@
+"""
+Move every active lock of the previous `VotingEscrow` to the current one
+(after `one-offs/migrate_ve.py` has pointed the old contract at it).
+
+Lockers are paged out of the old contract's `Deposit` logs, anyone without an
+active lock is dropped and the rest is migrated with `migrate_many`. Each
+batch is the largest prefix of the remaining lockers (up to `MAX_LOCKS`) whose
+gas estimate fits `max_batch_gas`, estimated right before it is sent.
+
+Run with `brownie run deployment/migrate_locks --network <network>`.
+"""
+
+import json
+from . import deployment_config as config
+
+from brownie import (
+    VotingEscrow,
+    VotingEscrowV2,
+    chain,
+    web3,
+)
+from eth_utils import to_checksum_address
+
+
+DEPOSIT_TOPIC = web3.keccak(text="Deposit(address,address,uint256,uint256,int128,uint256)").hex()
+
+# `MAX_LOCKS` of `VotingEscrow.migrate_many`
+MAX_LOCKS = 64
+# blocks per `eth_getLogs` request
+LOG_PAGE_SIZE = 5_000
+MAX_BATCH_GAS = 8_000_000
+
+
+def lockers(voting_escrow, from_block: int = 0, to_block: int = None, page_size: int = LOG_PAGE_SIZE) -> list:
+    """
+    Every address `Deposit` was logged for, in the order they first locked.
+    """
+    if to_block is None:
+        to_block = web3.eth.block_number
+
+    seen = {}
+    for lo in range(from_block, to_block + 1, page_size):
+        logs = web3.eth.get_logs({
+            "address": voting_escrow.address,
+            "fromBlock": lo,
+            "toBlock": min(lo + page_size - 1, to_block),
+            "topics": [DEPOSIT_TOPIC],
+        })
+        for log in logs:
+            # topics: signature, deposit_from, provider, locktime
+            seen.setdefault(to_checksum_address(log["topics"][2][-20:]), None)
+    return list(seen)
+
+
+def active_lockers(voting_escrow, addrs: list) -> list:
+    """
+    `addrs` which can still be migrated, i.e. hold an unexpired lock.
+    """
+    now = chain[-1].timestamp
+    active = []
+    for addr in addrs:
+        amount, end = voting_escrow.locked(addr)
+        if amount > 0 and end > now:
+            active.append(addr)
+    return active
+
+
+def migrate_all(voting_escrow, addrs: list, _tx_params, max_batch_gas: int = MAX_BATCH_GAS) -> list:
+    """
+    Migrate `addrs` in gas-sized batches.
+
+    Returns
+    -------
+    list
+        Transaction receipts, one per batch.
+    """
+    sender = _tx_params()["from"]
+    txs = []
+    while addrs:
+        size = min(len(addrs), MAX_LOCKS)
+        while size > 1 and voting_escrow.migrate_many.estimate_gas(addrs[:size], {"from": sender}) > max_batch_gas:
+            size //= 2
+
+        tx = voting_escrow.migrate_many(addrs[:size], _tx_params(max_batch_gas))
+        print(f"migrated {size} locks, gas used {tx.gas_used}")
+        txs.append(tx)
+        addrs = addrs[size:]
+    return txs
+
+
+def main():
+    with open(config.DEPLOYMENTS_JSON) as fp:
+        deployments = json.load(fp)
+
+    voting_escrow = VotingEscrowV2.at(deployments["VotingEscrow"])
+    old_voting_escrow = VotingEscrow.at(voting_escrow.previous_ve_contract())
+    assert old_voting_escrow.next_ve_contract() == voting_escrow.address
+
+    addrs = active_lockers(old_voting_escrow, lockers(old_voting_escrow))
+    print(f"{len(addrs)} locks to migrate")
+    migrate_all(old_voting_escrow, addrs, config.tx_params)
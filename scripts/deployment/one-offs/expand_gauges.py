@@ -6,7 +6,9 @@ from brownie import (
     GaugeDistributor,
     VotingEscrow,
     GaugeController,
+    LiquidityGaugeFactory,
     LiquidityGaugeV1,
+    ZERO_ADDRESS,
 )
 
 
@@ -14,31 +16,56 @@ from brownie import (
 POOL_TOKENS = {
 }
 
+# `MAX_GAUGES` of `LiquidityGaugeFactory` / `MAX_NEW_GAUGES` of `GaugeController`
+MAX_GAUGES = 32
+
 
 def main():
     deploy_part_one(config.tx_params, config.DEPLOYMENTS_JSON)
 
 
+def deploy_factory(deployments, _tx_params):
+    """
+    The `LiquidityGaugeFactory` of `deployments`, deployed along with its
+    implementation on first use.
+    """
+    if "LiquidityGaugeFactory" in deployments:
+        return LiquidityGaugeFactory.at(deployments["LiquidityGaugeFactory"])
+
+    implementation = LiquidityGaugeV1.deploy(
+        Koyo.at(deployments["Koyo"]),
+        VotingEscrow.at(deployments["VotingEscrow"]),
+        GaugeDistributor.at(deployments["GaugeDistributor"]),
+        GaugeController.at(deployments["GaugeController"]),
+        ZERO_ADDRESS,
+        _tx_params(gas_limit=5_000_000),
+    )
+    gauge_factory = LiquidityGaugeFactory.deploy(implementation, _tx_params(gas_limit=1_000_000))
+
+    deployments["LiquidityGaugeImplementation"] = implementation.address
+    deployments["LiquidityGaugeFactory"] = gauge_factory.address
+    return gauge_factory
+
+
 def deploy_part_one(_tx_params, deployments_json=None):
     with open(config.DEPLOYMENTS_JSON) as fp:
         deployments = json.load(fp)
 
-    token = Koyo.at(deployments["Koyo"])
-    voting_escrow = VotingEscrow.at(deployments["VotingEscrow"])
     gauge_controller = GaugeController.at(deployments["GaugeController"])
-    gauge_distributor = GaugeDistributor.at(deployments["GaugeDistributor"])
-
-    for name, (lp_token, weight) in POOL_TOKENS.items():
-        gauge = LiquidityGaugeV1.deploy(
-            token,
-            voting_escrow,
-            gauge_distributor,
-            gauge_controller,
-            lp_token,
-            _tx_params(gas_limit=5_000_000),
-        )
-        gauge_controller.add_gauge(gauge, 0, weight, _tx_params(gas_limit=5_000_000))
-        deployments["Gauge"][name] = gauge.address
+    gauge_factory = deploy_factory(deployments, _tx_params)
+
+    names = list(POOL_TOKENS)
+    for i in range(0, len(names), MAX_GAUGES):
+        batch = names[i:i + MAX_GAUGES]
+        lp_tokens = [POOL_TOKENS[name][0] for name in batch]
+        weights = [POOL_TOKENS[name][1] for name in batch]
+
+        tx = gauge_factory.deploy_gauges(lp_tokens, _tx_params(gas_limit=400_000 * len(batch)))
+        gauges = [event["gauge"] for event in tx.events["GaugeDeployed"]]
+        gauge_controller.add_gauges(gauges, [0] * len(batch), weights, _tx_params(gas_limit=500_000 + 200_000 * len(batch)))
+
+        for name, gauge in zip(batch, gauges):
+            deployments["Gauge"][name] = gauge
 
     if deployments_json is not None:
         with open(deployments_json, "w") as fp:
@@ -6,6 +6,7 @@ from brownie import (
     Minter,
     SmartWalletWhitelist,
     VotingEscrow,
+    VotingEscrowV2,
 )
 
 
@@ -24,14 +25,16 @@ def deploy_part_one(_tx_params, deployments_json=None):
         deployments["SmartWalletWhitelist"]
     )
 
-    voting_escrow = VotingEscrow.deploy(
+    # packed storage, takes over locks through `migrate_lock`
+    voting_escrow = VotingEscrowV2.deploy(
         token,
         "Vote-escrowed KYO",
         "veKYO",
-        "veKYO_1.1.0",
-        _tx_params(5_000_000),
+        "veKYO_2.0.0",
+        old_voting_escrow,
+        _tx_params(6_000_000),
     )
-    voting_escrow = VotingEscrow.at(voting_escrow.address)
+    voting_escrow = VotingEscrowV2.at(voting_escrow.address)
 
     voting_escrow.commit_smart_wallet_checker(
         smart_wallet_whitelist, _tx_params(5_000_000)
@@ -0,0 +1,403 @@
+"""
+Declarative, resumable deployment of the Koyo stack.
+
+A plan is a list of `Step`s: contract deployments, keyed like
+`deployments.json` (`"Koyo"`, `"Gauge.4Koyo"`), and setup calls on deployed
+contracts. Arguments can point at other steps with `Ref`, which together with
+`target` and `after` makes up the dependency graph, e.g.
+
+    Koyo -> VotingEscrow, Minter -> GaugeController -> GaugeDistributor -> gauges -> add_gauge
+
+The graph is split into layers of steps whose dependencies are all in earlier
+layers. Nonces are handed out up front in layer and plan order, so a run is
+deterministic: deployment addresses are known before anything is sent and the
+same plan from the same account state always yields the same addresses. Every
+layer is sent back to back without waiting in between and then awaited in
+bulk.
+
+Progress is written after every layer: addresses to `deployments.json` under
+their usual keys, and the nonce and transaction hash of every step to a
+journal next to it, `deployments.pipeline.json`. `deployments.json` keeps its
+plain `{name: address}` layout for every other script. A run which stopped halfway (a revert, a dropped transaction,
+a crash) picks up where it left off when started again, without redeploying
+anything which made it on chain.
+
+Run with `brownie run deployment/pipeline --network <network>`.
+"""
+
+import json
+import os
+from typing import NamedTuple
+
+from . import deployment_config as config
+from .deploy_gauges import GAUGE_TYPES, POOL_TOKENS
+from .deploy_token import (
+    ADDRESSES_ADVISORS,
+    ADDRESSES_BOBA_BAR,
+    ADDRESSES_EMISSION,
+    ADDRESSES_TEAM_MEMBERS,
+    ADDRESSES_TREASURY,
+)
+from ..kyo.keeper import NonceManager
+
+from brownie import (
+    GaugeController,
+    GaugeDistributor,
+    Koyo,
+    LiquidityGaugeV1,
+    MerkleDistributor,
+    Minter,
+    Multicall,
+    SmartWalletWhitelist,
+    VotingEscrow,
+    accounts,
+    chain,
+    network,
+    web3,
+)
+from web3.exceptions import TransactionNotFound
+
+
+CONTAINERS = {
+    container._name: container
+    for container in (
+        GaugeController,
+        GaugeDistributor,
+        Koyo,
+        LiquidityGaugeV1,
+        MerkleDistributor,
+        Minter,
+        Multicall,
+        SmartWalletWhitelist,
+        VotingEscrow,
+    )
+}
+
+GAS_LIMIT = 5_000_000
+
+
+class Ref(NamedTuple):
+    """
+    Address of the contract deployed by step `name`.
+    """
+
+    name: str
+
+
+class Step(NamedTuple):
+    """
+    Deploy `contract` with `args` or, if `fn` is set, call `fn(*args)` on the
+    contract deployed by step `target`.
+
+    `name` doubles as the `deployments.json` key of a deployment, with a dot
+    for nested keys (`"Gauge.4Koyo"`). `after` lists dependencies which do not
+    show up in `args`.
+    """
+
+    name: str
+    contract: str
+    args: tuple = ()
+    fn: str = None
+    target: str = None
+    after: tuple = ()
+    gas_limit: int = GAS_LIMIT
+
+    def dependencies(self) -> list:
+        deps = [arg.name for arg in self.args if isinstance(arg, Ref)]
+        if self.target is not None:
+            deps.append(self.target)
+        return deps + list(self.after)
+
+
+def default_plan(
+    gauge_types: list = GAUGE_TYPES,
+    pool_tokens: dict = POOL_TOKENS,
+    ve_version: str = "veKYO_1.0.0",
+    multicall: bool = None,
+) -> list:
+    """
+    What `deploy_token.py` and `deploy_gauges.py` deploy and set up, plus the
+    epoch `MerkleDistributor`.
+
+    With `multicall`, which defaults to development networks only, the test
+    `Multicall` which `kyo/publish_epoch.py` reads through is deployed too.
+    Live networks use the canonical Multicall2 deployment instead, configured
+    under `"Multicall"` in `deployments.json`.
+    """
+    if multicall is None:
+        multicall = network.show_active() == "development"
+
+    plan = [
+        Step("Koyo", "Koyo", ("Kōyō Token", "KYO", 18)),
+        Step("VotingEscrow", "VotingEscrow", (Ref("Koyo"), "Vote-escrowed KYO", "veKYO", ve_version)),
+        Step("SmartWalletWhitelist", "SmartWalletWhitelist"),
+        Step("Minter", "Minter", (
+            Ref("Koyo"),
+            ADDRESSES_EMISSION,
+            ADDRESSES_TREASURY,
+            ADDRESSES_TEAM_MEMBERS,
+            ADDRESSES_ADVISORS,
+            ADDRESSES_BOBA_BAR,
+        )),
+        Step("Koyo.set_minter", "Koyo", (Ref("Minter"),), fn="set_minter", target="Koyo"),
+        Step(
+            "VotingEscrow.commit_smart_wallet_checker", "VotingEscrow", (Ref("SmartWalletWhitelist"),),
+            fn="commit_smart_wallet_checker", target="VotingEscrow",
+        ),
+        Step(
+            "VotingEscrow.apply_smart_wallet_checker", "VotingEscrow",
+            fn="apply_smart_wallet_checker", target="VotingEscrow",
+            after=("VotingEscrow.commit_smart_wallet_checker",),
+        ),
+        Step("GaugeController", "GaugeController", (Ref("Koyo"), Ref("VotingEscrow"))),
+        Step("GaugeDistributor", "GaugeDistributor", (Ref("Koyo"), Ref("Minter"), Ref("GaugeController"))),
+        Step("MerkleDistributor", "MerkleDistributor", (Ref("Koyo"), Ref("GaugeDistributor"))),
+        Step(
+            "GaugeDistributor.set_epoch_distributor", "GaugeDistributor", (Ref("MerkleDistributor"),),
+            fn="set_epoch_distributor", target="GaugeDistributor",
+        ),
+    ]
+    if multicall:
+        plan.append(Step("Multicall", "Multicall"))
+
+    # type ids are handed out in the order the types are added
+    type_steps = []
+    for name, weight in gauge_types:
+        type_steps.append(f"GaugeController.add_type.{name}")
+        plan.append(Step(
+            type_steps[-1], "GaugeController", (name, weight),
+            fn="add_type", target="GaugeController", after=tuple(type_steps[-2:-1]),
+        ))
+
+    for name, (lp_token, weight) in pool_tokens.items():
+        plan.append(Step(f"Gauge.{name}", "LiquidityGaugeV1", (
+            Ref("Koyo"), Ref("VotingEscrow"), Ref("GaugeDistributor"), Ref("GaugeController"), lp_token,
+        )))
+        plan.append(Step(
+            f"GaugeController.add_gauge.{name}", "GaugeController", (Ref(f"Gauge.{name}"), 0, weight),
+            fn="add_gauge", target="GaugeController", after=(type_steps[0],),
+        ))
+
+    return plan
+
+
+def layers(plan: list) -> list:
+    """
+    Split `plan` into lists of steps which only depend on steps of earlier
+    lists, keeping the plan order within each list.
+    """
+    names = [step.name for step in plan]
+    if len(set(names)) != len(names):
+        raise ValueError("step names must be unique")
+    for step in plan:
+        for dep in step.dependencies():
+            if dep not in names:
+                raise ValueError(f"{step.name} depends on unknown step {dep}")
+
+    result = []
+    placed = set()
+    remaining = list(plan)
+    while remaining:
+        layer = [step for step in remaining if placed.issuperset(step.dependencies())]
+        if not layer:
+            raise ValueError(f"dependency cycle between {[step.name for step in remaining]}")
+        result.append(layer)
+        placed.update(step.name for step in layer)
+        remaining = [step for step in remaining if step.name not in placed]
+    return result
+
+
+def journal_path(deployments_json: str) -> str:
+    """
+    Path of the progress journal kept next to `deployments_json`.
+    """
+    root, ext = os.path.splitext(deployments_json)
+    return f"{root}.pipeline{ext}"
+
+
+def _load(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as fp:
+        return json.load(fp)
+
+
+def _dump(path: str, value: dict):
+    with open(path, "w") as fp:
+        json.dump(value, fp, indent="\t")
+
+
+def _get(deployments: dict, name: str):
+    value = deployments
+    for key in name.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def _set(deployments: dict, name: str, address: str):
+    *parents, key = name.split(".")
+    for parent in parents:
+        deployments = deployments.setdefault(parent, {})
+    deployments[key] = address
+
+
+class Pipeline:
+    """
+    Parameters
+    ----------
+    account : Account
+        Deployer, owner of every deployed contract.
+    plan : list
+        `Step`s, see `default_plan`.
+    deployments_json : str
+        Addresses are read from and written to this file.
+    journal_json : str
+        Progress journal, defaults to `journal_path(deployments_json)`.
+    required_confs : int
+        Confirmations every layer waits for.
+    """
+
+    def __init__(
+        self,
+        account,
+        plan: list,
+        deployments_json: str = config.DEPLOYMENTS_JSON,
+        required_confs: int = config.REQUIRED_CONFIRMATIONS,
+        journal_json: str = None,
+    ):
+        self.account = account
+        self.plan = plan
+        self.layers = layers(plan)
+        self.deployments_json = deployments_json
+        self.journal_json = journal_json or journal_path(deployments_json)
+        self.required_confs = required_confs
+
+        self.deployments = _load(deployments_json)
+        self.journal = _load(self.journal_json)
+
+    def save(self):
+        # the journal first, it is what a later run recovers from
+        _dump(self.journal_json, self.journal)
+        _dump(self.deployments_json, self.deployments)
+
+    def is_done(self, step: Step) -> bool:
+        entry = self.journal.get(step.name)
+        return entry is not None and entry.get("confirmed", False)
+
+    def address(self, name: str) -> str:
+        """
+        Address deployed (or about to be deployed) by step `name`.
+        """
+        entry = self.journal.get(name)
+        if entry is not None and "address" in entry:
+            return entry["address"]
+        return _get(self.deployments, name)
+
+    def recover(self):
+        """
+        Settle steps which were sent by an earlier run but never confirmed:
+        confirm those which made it, forget those which reverted or were
+        dropped so they are sent again.
+        """
+        pending = [(name, entry) for name, entry in self.journal.items() if not entry.get("confirmed")]
+        for name, entry in pending:
+            try:
+                tx = chain.get_transaction(entry["tx"])
+                tx.wait(self.required_confs)
+            except TransactionNotFound:
+                tx = None
+
+            if tx is not None and tx.status == 1:
+                self._confirm(name, entry)
+            elif tx is None and web3.eth.get_transaction_count(self.account.address) > entry["nonce"]:
+                raise RuntimeError(f"nonce {entry['nonce']} of {name} was used by another transaction")
+            else:
+                del self.journal[name]
+        self.save()
+
+    def _confirm(self, name: str, entry: dict):
+        entry["confirmed"] = True
+        if "address" in entry:
+            _set(self.deployments, name, entry["address"])
+
+    def _resolve(self, args: tuple) -> tuple:
+        return tuple(self.address(arg.name) if isinstance(arg, Ref) else arg for arg in args)
+
+    def send(self, step: Step, nonce: int):
+        """
+        Send `step` with `nonce` without waiting for it to be mined.
+        """
+        tx_params = {"from": self.account, "gas_limit": step.gas_limit, "nonce": nonce, "required_confs": 0}
+        container = CONTAINERS[step.contract]
+        if step.fn is None:
+            return container.deploy(*self._resolve(step.args), tx_params)
+        contract = container.at(self.address(step.target))
+        return getattr(contract, step.fn)(*self._resolve(step.args), tx_params)
+
+    def run(self) -> list:
+        """
+        Send every step which is not done yet, layer by layer.
+
+        Returns
+        -------
+        list
+            Transaction receipts of this run, in nonce order.
+        """
+        for step in self.plan:
+            if step.fn is None and not self.is_done(step) and _get(self.deployments, step.name) is not None:
+                raise ValueError(f"{step.name} is in {self.deployments_json} but was not deployed by the pipeline")
+
+        self.recover()
+        nonces = NonceManager(self.account.address)
+
+        receipts = []
+        for layer in self.layers:
+            todo = [step for step in layer if not self.is_done(step)]
+            if not todo:
+                continue
+
+            sent = []
+            try:
+                for step in todo:
+                    nonce = nonces.next()
+                    entry = {"nonce": nonce}
+                    if step.fn is None:
+                        entry["address"] = str(self.account.get_deployment_address(nonce))
+                    tx = self.send(step, nonce)
+                    entry["tx"] = tx.txid
+                    self.journal[step.name] = entry
+                    sent.append((step, entry, tx))
+            finally:
+                # whatever went out is recoverable from here on
+                self.save()
+
+            failed = []
+            for step, entry, tx in sent:
+                tx.wait(self.required_confs)
+                if tx.status == 1:
+                    self._confirm(step.name, entry)
+                else:
+                    failed.append(step.name)
+                    del self.journal[step.name]
+            self.save()
+
+            receipts += [tx for _, _, tx in sent]
+            if failed:
+                raise RuntimeError(f"steps failed: {failed}")
+            print(f"layer of {len(sent)} confirmed: {[step.name for step in todo]}")
+
+        return receipts
+
+
+def main():
+    if network.show_active() == "development":
+        # blocks are only mined on demand
+        account, required_confs = accounts[0], 1
+    else:
+        account, required_confs = config.get_live_admin(), config.REQUIRED_CONFIRMATIONS
+
+    pipeline = Pipeline(account, default_plan(), config.DEPLOYMENTS_JSON, required_confs)
+    txs = pipeline.run()
+    print(f"{len(txs)} transactions, deployment addresses saved to {config.DEPLOYMENTS_JSON}")
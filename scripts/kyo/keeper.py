@@ -0,0 +1,232 @@
+"""
+Long-running keeper for `Minter.mint_and_distribute` and gauge checkpoints.
+
+Every cycle the keeper reads the on-chain state and only sends what is due:
+
+  * `Minter.mint_and_distribute` once the KYO accrued since the last mint
+    (what `Koyo._update_emissions` would add) is worth at least
+    `min_mint_interval` seconds of `Koyo.emission_rate`, or when emissions
+    have ended and a remainder is left.
+  * `GaugeController.checkpoint` once a new week starts, followed by a
+    `user_checkpoint` poke of every gauge which was not checkpointed during
+    the current week yet.
+
+Gas limits are estimated per transaction. Transactions of one cycle are sent
+back to back with nonces handed out locally, then awaited together.
+
+Run with `brownie run kyo/keeper --network <network>`.
+"""
+
+import json
+import time
+
+from brownie import (
+    GaugeController,
+    Koyo,
+    LiquidityGaugeV1,
+    Minter,
+    accounts,
+    chain,
+    network,
+    web3,
+)
+from brownie.exceptions import VirtualMachineError
+
+
+DEPLOYMENTS_JSON = "deployments.json"
+REQUIRED_CONFIRMATIONS = 2
+
+WEEK = 7 * 86400
+
+# multiplier on top of `estimate_gas`
+GAS_BUFFER = 1.2
+# seconds of emissions which have to accrue before minting
+MIN_MINT_INTERVAL = 86400
+# seconds between cycles
+POLL_INTERVAL = 600
+
+
+class NonceManager:
+    """
+    Hands out consecutive nonces for `address` without asking the node
+    before every transaction.
+    """
+
+    def __init__(self, address: str):
+        self.address = address
+        self.sync()
+
+    def sync(self) -> int:
+        """
+        Reload the next nonce from the node, including pending transactions.
+        """
+        self.nonce = web3.eth.get_transaction_count(self.address, "pending")
+        return self.nonce
+
+    def next(self) -> int:
+        nonce = self.nonce
+        self.nonce += 1
+        return nonce
+
+
+def send(account, nonces: NonceManager, fn, *args):
+    """
+    Send `fn(*args)` from `account` with an estimated gas limit and the next
+    nonce of `nonces`, without waiting for it to be mined.
+    """
+    gas_limit = int(fn.estimate_gas(*args, {"from": account}) * GAS_BUFFER)
+    tx_params = {"from": account, "gas_limit": gas_limit, "required_confs": 0}
+    try:
+        return fn(*args, dict(tx_params, nonce=nonces.next()))
+    except (ValueError, VirtualMachineError):
+        # e.g. "nonce too low" after something else sent from the account
+        nonces.sync()
+        return fn(*args, dict(tx_params, nonce=nonces.next()))
+
+
+class Keeper:
+    """
+    Parameters
+    ----------
+    account : Account
+        Sending account, pays for all transactions.
+    minter, koyo, gauge_controller
+        `Minter`, `Koyo` and `GaugeController` contracts.
+    gauges : list
+        `LiquidityGaugeV1` contracts to keep checkpointed.
+    min_mint_interval : int
+        Seconds of emissions which make a mint worthwhile.
+    max_gas_price : int
+        Skip the cycle if the network gas price is above this, in wei.
+    required_confs : int
+        Confirmations to wait for at the end of every cycle.
+    """
+
+    def __init__(
+        self,
+        account,
+        minter,
+        koyo,
+        gauge_controller,
+        gauges: list,
+        min_mint_interval: int = MIN_MINT_INTERVAL,
+        max_gas_price: int = None,
+        required_confs: int = REQUIRED_CONFIRMATIONS,
+    ):
+        self.account = account
+        self.minter = minter
+        self.koyo = koyo
+        self.gauge_controller = gauge_controller
+        self.gauges = list(gauges)
+        self.min_mint_interval = min_mint_interval
+        self.max_gas_price = max_gas_price
+        self.required_confs = required_confs
+        self.nonces = NonceManager(account.address)
+
+    def accrued_emissions(self, now: int) -> int:
+        """
+        KYO `Koyo.mint_available` would mint at `now`.
+        """
+        last_time = min(now, self.koyo.emission_end())
+        return max(last_time - self.koyo.emissions_last_update_time(), 0) * self.koyo.emission_rate()
+
+    def should_mint(self, now: int) -> bool:
+        if self.koyo.minter() != self.minter.address:
+            return False
+        accrued = self.accrued_emissions(now)
+        if accrued == 0:
+            return False
+        if now >= self.koyo.emission_end():
+            return True
+        return accrued >= self.min_mint_interval * self.koyo.emission_rate()
+
+    def due_gauges(self, now: int) -> list:
+        """
+        Gauges without a checkpoint since the start of the current week.
+        """
+        week_start = now // WEEK * WEEK
+        return [
+            gauge for gauge in self.gauges
+            if gauge.period_timestamp(gauge.period()) < week_start
+        ]
+
+    def plan(self, now: int = None) -> list:
+        """
+        Calls due at `now` (defaults to the latest block), as
+        `(contract function, args)` pairs in the order they are sent.
+        """
+        if now is None:
+            now = chain[-1].timestamp
+
+        calls = []
+        if self.should_mint(now):
+            calls.append((self.minter.mint_and_distribute, ()))
+
+        due = self.due_gauges(now)
+        if due or self.gauge_controller.time_total() <= now:
+            # fills the weeks shared by all gauges once, so the pokes
+            # below only pay for their own
+            calls.append((self.gauge_controller.checkpoint, ()))
+        for gauge in due:
+            calls.append((gauge.user_checkpoint, (self.account.address,)))
+
+        return calls
+
+    def run_once(self) -> list:
+        """
+        Send everything which is due and wait for it.
+
+        Returns
+        -------
+        list
+            Transaction receipts, empty if nothing was due.
+        """
+        if self.max_gas_price is not None and web3.eth.gas_price > self.max_gas_price:
+            return []
+
+        calls = self.plan()
+        if not calls:
+            return []
+
+        try:
+            txs = [send(self.account, self.nonces, fn, *args) for fn, args in calls]
+            for tx in txs:
+                tx.wait(self.required_confs)
+        except Exception:
+            # anything sent after a failure may hold a nonce which never gets
+            # used, start over from the node's count next cycle
+            self.nonces.sync()
+            raise
+        return txs
+
+    def run(self, poll_interval: int = POLL_INTERVAL, max_cycles: int = None):
+        """
+        Run cycles every `poll_interval` seconds, forever or `max_cycles` times.
+        """
+        cycle = 0
+        while max_cycles is None or cycle < max_cycles:
+            for tx in self.run_once():
+                print(f"{tx.fn_name} {tx.txid} gas used {tx.gas_used}")
+            cycle += 1
+            time.sleep(poll_interval)
+
+
+def main():
+    with open(DEPLOYMENTS_JSON) as fp:
+        deployments = json.load(fp)
+
+    if network.show_active() == "development":
+        # blocks are only mined on demand
+        account, required_confs = accounts[0], 1
+    else:
+        account, required_confs = accounts.load('p7m'), REQUIRED_CONFIRMATIONS
+
+    keeper = Keeper(
+        account,
+        Minter.at(deployments["Minter"]),
+        Koyo.at(deployments["Koyo"]),
+        GaugeController.at(deployments["GaugeController"]),
+        [LiquidityGaugeV1.at(addr) for addr in deployments["Gauge"].values()],
+        required_confs=required_confs,
+    )
+    keeper.run()
@@ -0,0 +1,245 @@
+"""
+Kick stale gauge boosts as soon as `LiquidityGaugeV1.kick` accepts them.
+
+The kicker keeps a `StakerIndex` (see `scripts/analytics/kick_scanner.py`) of
+every gauge staker and their veKYO lock. On every new block it applies the
+gauge and escrow logs of the blocks since the last cycle, finds every
+(staker, gauge) pair which can be kicked in one pass over the index and sends
+them to `kick_many`, at most `max_batch_gas` gas worth of kicks per
+transaction.
+
+The index is bootstrapped from the event store of `scripts/analytics/indexer.py`
+up to its high-water mark, run the indexer first. Pairs `kick_many` skipped
+(the index was behind, see the scanner) are not sent again until one of their
+inputs changes.
+
+Run with `brownie run kyo/kicker --network <network>`.
+"""
+
+import json
+import time
+
+from brownie import LiquidityGaugeV1, VotingEscrow, accounts, network, web3
+from eth_utils import to_checksum_address
+
+from ..analytics.indexer import GAUGE_ABI, EventStore, load_decoders
+from ..analytics.kick_scanner import ESCROW_EVENTS, GAUGE_EVENTS, StakerIndex
+from .keeper import NonceManager, send
+
+
+DEPLOYMENTS_JSON = "deployments.json"
+EVENTS_DIR = "events"
+REQUIRED_CONFIRMATIONS = 2
+
+# `MAX_CHECKPOINTS` of the gauge
+MAX_KICKS = 256
+# upper bounds of `kick_many`, the fixed part covers a few idle weeks
+BATCH_GAS = 500_000
+KICK_GAS = 60_000
+MAX_BATCH_GAS = 8_000_000
+# blocks per `eth_getLogs` call when catching up
+LOG_RANGE = 5_000
+# seconds between polls for a new block
+POLL_INTERVAL = 2
+
+
+class Kicker:
+    """
+    Parameters
+    ----------
+    account : Account
+        Sending account, pays for all transactions.
+    voting_escrow : Contract
+        `VotingEscrow` the gauges read boosts from.
+    gauges : list
+        `LiquidityGaugeV1` contracts to watch.
+    index : StakerIndex
+        Index holding every log up to and including `block`.
+    block : int
+        Last block applied to `index`.
+    max_batch_gas : int
+        Gas a single `kick_many` is sized for.
+    max_gas_price : int
+        Skip the cycle if the network gas price is above this, in wei.
+    required_confs : int
+        Confirmations to wait for at the end of every cycle.
+    """
+
+    def __init__(
+        self,
+        account,
+        voting_escrow,
+        gauges: list,
+        index: StakerIndex,
+        block: int,
+        max_batch_gas: int = MAX_BATCH_GAS,
+        max_gas_price: int = None,
+        required_confs: int = REQUIRED_CONFIRMATIONS,
+    ):
+        self.account = account
+        self.voting_escrow = voting_escrow
+        self.gauges = {gauge.address: gauge for gauge in gauges}
+        self.index = index
+        self.block = block
+        self.batch_size = min(MAX_KICKS, (max_batch_gas - BATCH_GAS) // KICK_GAS)
+        self.max_gas_price = max_gas_price
+        self.required_confs = required_confs
+        self.nonces = NonceManager(account.address)
+
+        decoders = load_decoders()
+        self.decoders = {
+            voting_escrow.address: {
+                t: d for t, d in decoders["VotingEscrow"].items() if d.name in ESCROW_EVENTS
+            },
+        }
+        gauge_decoders = {t: d for t, d in decoders[GAUGE_ABI].items() if d.name in GAUGE_EVENTS}
+        for address in self.gauges:
+            self.decoders[address] = gauge_decoders
+
+    def follow(self, to_block: int) -> int:
+        """
+        Apply the logs of every block after `block` up to `to_block`.
+
+        Returns
+        -------
+        int
+            Number of logs applied.
+        """
+        if to_block <= self.block:
+            return 0
+
+        logs = []
+        for lo in range(self.block + 1, to_block + 1, LOG_RANGE):
+            hi = min(lo + LOG_RANGE - 1, to_block)
+            logs += web3.eth.get_logs({"fromBlock": lo, "toBlock": hi, "address": list(self.decoders)})
+        timestamps = {}
+        applied = 0
+        for log in sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"])):
+            address = to_checksum_address(log["address"])
+            decoder = self.decoders[address].get(bytes(log["topics"][0])) if log["topics"] else None
+            if decoder is None:
+                continue
+            if log["blockNumber"] not in timestamps:
+                timestamps[log["blockNumber"]] = web3.eth.get_block(log["blockNumber"]).timestamp
+            timestamp = timestamps[log["blockNumber"]]
+
+            args = decoder.decode_args(log)
+            if address == self.voting_escrow.address:
+                self.index.apply_escrow_event(decoder.name, args, args.get("ts") or timestamp)
+            else:
+                self.index.apply_gauge_event(address, decoder.name, args, timestamp)
+            applied += 1
+
+        self.block = to_block
+        return applied
+
+    def plan(self, timestamp: int) -> list:
+        """
+        `kick_many` calls which are due at `timestamp`, as `(gauge, [staker, ...])`
+        pairs with the most inflated boosts first.
+        """
+        batches = []
+        for gauge, users in self.index.candidates(timestamp).items():
+            for i in range(0, len(users), self.batch_size):
+                batches.append((self.gauges[gauge], users[i : i + self.batch_size]))
+        return batches
+
+    def run_once(self) -> list:
+        """
+        Catch up with the chain head and kick everything which is due.
+
+        Returns
+        -------
+        list
+            Transaction receipts, empty if nothing was due.
+        """
+        head = web3.eth.get_block("latest")
+        self.follow(head.number)
+
+        if self.max_gas_price is not None and web3.eth.gas_price > self.max_gas_price:
+            return []
+        batches = self.plan(head.timestamp)
+        if not batches:
+            return []
+
+        try:
+            txs = [send(self.account, self.nonces, gauge.kick_many, users) for gauge, users in batches]
+            for tx in txs:
+                tx.wait(self.required_confs)
+        except Exception:
+            self.nonces.sync()
+            raise
+
+        for (gauge, users), tx in zip(batches, txs):
+            kicked = _kicked(tx)
+            for user in users:
+                if user not in kicked:
+                    # checkpointed without a log, wait for the next change of its inputs
+                    self.index.mark_checkpointed(gauge.address, user, tx.timestamp)
+        return txs
+
+    def run(self, poll_interval: int = POLL_INTERVAL, max_cycles: int = None):
+        """
+        Run a cycle on every new block, forever or `max_cycles` times.
+        """
+        cycle = 0
+        while max_cycles is None or cycle < max_cycles:
+            if web3.eth.block_number > self.block:
+                for tx in self.run_once():
+                    print(f"kick_many {tx.txid} kicked {len(_kicked(tx))} gas used {tx.gas_used}")
+                cycle += 1
+            time.sleep(poll_interval)
+
+
+def _kicked(tx) -> set:
+    if "UpdateLiquidityLimit" not in tx.events:
+        return set()
+    return {event["user"] for event in tx.events["UpdateLiquidityLimit"]}
+
+
+def load_index(store: EventStore, voting_escrow: str, gauges: list) -> StakerIndex:
+    """
+    Build a `StakerIndex` from every event in `store`.
+    """
+    decoders = load_decoders()
+    timestamps = {}
+
+    def block_ts(number):
+        if number not in timestamps:
+            timestamps[number] = web3.eth.get_block(number).timestamp
+        return timestamps[number]
+
+    index = StakerIndex()
+    for block_number, _, name, args in store.events(decoders, "VotingEscrow", ESCROW_EVENTS, voting_escrow):
+        index.apply_escrow_event(name, args, args.get("ts") or block_ts(block_number))
+    for gauge in gauges:
+        for block_number, _, name, args in store.events(decoders, GAUGE_ABI, GAUGE_EVENTS, gauge):
+            index.apply_gauge_event(gauge, name, args, block_ts(block_number))
+    return index
+
+
+def main():
+    with open(DEPLOYMENTS_JSON) as fp:
+        deployments = json.load(fp)
+
+    if network.show_active() == "development":
+        account, required_confs = accounts[0], 1
+    else:
+        account, required_confs = accounts.load('p7m'), REQUIRED_CONFIRMATIONS
+
+    store = EventStore(EVENTS_DIR)
+    block = store.load_state()["block"]
+    assert block is not None, "run the indexer first"
+    gauges = [to_checksum_address(addr) for addr in deployments["Gauge"].values()]
+    index = load_index(store, deployments["VotingEscrow"], gauges)
+    print(f"{len(index)} staker / gauge pairs indexed up to block {block}")
+
+    kicker = Kicker(
+        account,
+        VotingEscrow.at(deployments["VotingEscrow"]),
+        [LiquidityGaugeV1.at(addr) for addr in gauges],
+        index,
+        block,
+        required_confs=required_confs,
+    )
+    kicker.run()
@@ -0,0 +1,102 @@
+"""
+Publish the `MerkleDistributor` root of the last finished epoch.
+
+Gauge events are read from the event store of `scripts/analytics/indexer.py`,
+run the indexer past the end of the epoch first. Relative weights and the
+frozen `GaugeDistributor.distributed` amounts are read through the Multicall
+contract of `deployments.json`: the canonical Multicall2 deployment on live
+networks, added to `deployments.json` by hand, or the test one
+`deployment/pipeline.py` deploys on development networks. The
+`MerkleDistributor` is deployed by the pipeline.
+
+The claims with their proofs are written to `epochs/<epoch end>.json` before
+the root is sent, the file has to be published for users to claim.
+
+Run with `brownie run kyo/publish_epoch --network <network>`.
+"""
+
+import json
+import os
+
+from brownie import GaugeDistributor, LiquidityGaugeV1, MerkleDistributor, accounts, chain, web3
+
+from ..analytics.epoch_rewards import EpochRewards, GaugeReplay, MerkleTree, read_distributed, read_weights, WEEK
+from ..analytics.indexer import GAUGE_ABI, EventStore, load_decoders
+from ..analytics.multicall import MulticallReader
+
+
+DEPLOYER = accounts.load('p7m')
+REQUIRED_CONFIRMATIONS = 2
+
+DEPLOYMENTS_JSON = "deployments.json"
+EVENTS_DIR = "events"
+EPOCHS_DIR = "epochs"
+# `GaugeDistributor.distributed` of the epoch gauges, frozen once they switched
+DISTRIBUTED_JSON = os.path.join(EPOCHS_DIR, "distributed.json")
+
+
+def _tx_params(gas_limit: int = None):
+    return {
+        "from": DEPLOYER,
+        "required_confs": REQUIRED_CONFIRMATIONS,
+        "gas_limit": gas_limit
+    }
+
+
+def epoch_rewards(deployments: dict, reader: MulticallReader, end: int) -> EpochRewards:
+    gauge_distributor = GaugeDistributor.at(deployments["GaugeDistributor"])
+    gauges = [gauge for gauge in deployments["Gauge"].values() if gauge_distributor.epoch_gauges(gauge)]
+
+    store = EventStore(EVENTS_DIR)
+    decoders = load_decoders()
+    timestamps = {}
+
+    events = {}
+    for gauge in gauges:
+        events[gauge] = []
+        for block_number, _, name, args in store.events(decoders, GAUGE_ABI, ("UpdateLiquidityLimit", "Transfer"), gauge):
+            if block_number not in timestamps:
+                timestamps[block_number] = web3.eth.get_block(block_number).timestamp
+            if timestamps[block_number] <= end:
+                events[gauge].append((name, args, timestamps[block_number]))
+
+    first = min((e[0][2] for e in events.values() if e), default=end)
+    weeks = list(range(first // WEEK * WEEK, end, WEEK))
+    weights = read_weights(reader, deployments["GaugeController"], gauges, weeks)
+
+    replays = {}
+    for gauge in gauges:
+        replays[gauge] = GaugeReplay(LiquidityGaugeV1.at(gauge).inflation_rate(), weights[gauge])
+        for name, args, timestamp in events[gauge]:
+            replays[gauge].apply_event(name, args, timestamp)
+
+    if os.path.exists(DISTRIBUTED_JSON):
+        with open(DISTRIBUTED_JSON) as fp:
+            distributed = json.load(fp)
+    else:
+        users = sorted({user for replay in replays.values() for user in replay.users})
+        distributed = read_distributed(reader, gauge_distributor.address, gauges, users)
+        with open(DISTRIBUTED_JSON, "w") as fp:
+            json.dump(distributed, fp)
+
+    return EpochRewards(replays, distributed)
+
+
+def main():
+    with open(DEPLOYMENTS_JSON) as fp:
+        deployments = json.load(fp)
+
+    assert "Multicall" in deployments, f"add the Multicall2 address to {DEPLOYMENTS_JSON}"
+    merkle_distributor = MerkleDistributor.at(deployments["MerkleDistributor"])
+    end = chain.time() // WEEK * WEEK
+    assert end > merkle_distributor.epoch(), "epoch already published"
+
+    os.makedirs(EPOCHS_DIR, exist_ok=True)
+    reader = MulticallReader(web3.provider.endpoint_uri, deployments["Multicall"])
+    tree = MerkleTree(epoch_rewards(deployments, reader, end).amounts(end))
+
+    path = os.path.join(EPOCHS_DIR, f"{end}.json")
+    tree.dump(path, end)
+    print(f"{len(tree.accounts)} claims, total {tree.total}, saved to {path}")
+
+    merkle_distributor.update_root(tree.root, end, tree.total, _tx_params(500_000))
@@ -0,0 +1,51 @@
+import pytest
+
+DAY = 86400
+WEEK = 7 * DAY
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+@pytest.fixture(scope="module")
+def holders(accounts, chain, koyo):
+    """
+    Every account but the deployer, funded with KYO.
+    """
+    chain.sleep(DAY)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    for acct in accounts[1:]:
+        koyo.transfer(acct, 10**22, {"from": accounts[0]})
+    yield accounts[1:]
+
+
+@pytest.fixture(scope="module")
+def lock(chain, koyo, voting_escrow):
+    def lock(acct, weeks, amount=10**21):
+        koyo.approve(voting_escrow, amount, {"from": acct})
+        return voting_escrow.create_lock(amount, chain.time() + weeks * WEEK, {"from": acct})
+
+    yield lock
+
+
+@pytest.fixture(scope="module")
+def gauges(LiquidityGaugeV1, accounts, koyo, voting_escrow, gauge_distributor, gauge_controller, mock_lp_token):
+    """
+    16 gauges of a single type with rising weights.
+    """
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+    contracts = []
+    for i in range(16):
+        gauge = LiquidityGaugeV1.deploy(
+            koyo,
+            voting_escrow,
+            gauge_distributor,
+            gauge_controller,
+            mock_lp_token,
+            {"from": accounts[0]},
+        )
+        gauge_controller.add_gauge(gauge, 0, 10**18 * (i + 1), {"from": accounts[0]})
+        contracts.append(gauge)
+    yield contracts
@@ -0,0 +1,94 @@
+import pytest
+
+from scripts.analytics.epoch_rewards import MerkleTree
+
+WEEK = 86400 * 7
+GAUGE_COUNTS = [1, 7, 16]
+# leaves of the epoch tree, a proof of 14 nodes
+MERKLE_LEAVES = 10_000
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(
+    accounts,
+    koyo,
+    minter,
+    gauge_distributor,
+    mock_lp_token,
+    holders,
+    lock,
+    gauges,
+    minter_initial_treasury,
+    minter_initial_team_members,
+    minter_initial_advisors,
+    minter_initial_boba_bar,
+):
+    user = holders[0]
+    lock(user, 30)
+    mock_lp_token.transfer(user, 10**21, {"from": accounts[0]})
+    for gauge in gauges:
+        mock_lp_token.approve(gauge, 2**256 - 1, {"from": user})
+        gauge.deposit(10**18, {"from": user})
+
+    # route the emissions share to the distributor
+    koyo.set_minter(minter, {"from": accounts[0]})
+    minter.set_addresses(
+        [gauge_distributor],
+        minter_initial_treasury,
+        minter_initial_team_members,
+        minter_initial_advisors,
+        minter_initial_boba_bar,
+        {"from": accounts[0]},
+    )
+
+
+def test_mint_and_distribute(accounts, chain, minter, gas_report):
+    chain.sleep(WEEK)
+
+    tx = minter.mint_and_distribute({"from": accounts[0]})
+    gas_report.record("Minter.mint_and_distribute", tx)
+
+
+def test_distribute(chain, gauge_distributor, holders, gauges, gas_report):
+    chain.sleep(WEEK)
+
+    tx = gauge_distributor.distribute(gauges[0], {"from": holders[0]})
+    gas_report.record("GaugeDistributor.distribute", tx)
+
+
+@pytest.mark.parametrize("n_gauges", GAUGE_COUNTS)
+def test_distribute_many(chain, gauge_distributor, holders, gauges, gas_report, n_gauges):
+    chain.sleep(WEEK)
+
+    tx = gauge_distributor.distribute_many(gauges[:n_gauges], {"from": holders[0]})
+    gas_report.record(f"GaugeDistributor.distribute_many[gauges={n_gauges}]", tx)
+
+
+def test_distribute_from_balance(accounts, chain, minter, gauge_distributor, holders, gauges, gas_report):
+    chain.sleep(WEEK)
+    minter.mint_and_distribute({"from": accounts[0]})
+
+    # the emissions share sent to the distributor covers the claim, no mint
+    tx = gauge_distributor.distribute(gauges[0], {"from": holders[0]})
+    gas_report.record("GaugeDistributor.distribute[from balance]", tx)
+
+
+def test_claim(accounts, chain, minter, minter_initial_team_members, gas_report):
+    chain.sleep(WEEK)
+    minter.mint_and_distribute({"from": accounts[0]})
+
+    tx = minter.claim(minter_initial_team_members[0], {"from": accounts[0]})
+    gas_report.record("Minter.claim", tx)
+
+
+def test_merkle_claim(accounts, chain, gauge_distributor, merkle_distributor, holders, gas_report):
+    amounts = {f"0x{i:040x}": 10**18 for i in range(1, MERKLE_LEAVES)}
+    amounts[holders[0].address] = 10**18
+    tree = MerkleTree(amounts)
+
+    gauge_distributor.set_epoch_distributor(merkle_distributor, {"from": accounts[0]})
+    chain.sleep(WEEK)
+    merkle_distributor.update_root(tree.root, chain.time() // WEEK * WEEK, tree.total, {"from": accounts[0]})
+
+    tx = merkle_distributor.claim(holders[0], 10**18, tree.proof(holders[0].address), {"from": holders[0]})
+    gas_report.record(f"MerkleDistributor.claim[leaves={MERKLE_LEAVES}]", tx)
@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+
+import pytest
+
+from tests.conftest import GasReport
+
+
+@pytest.fixture
+def report():
+    yield GasReport({"VotingEscrow.withdraw": 100_000}, 0.05)
+
+
+def test_within_threshold(report):
+    assert report.record("VotingEscrow.withdraw", SimpleNamespace(gas_used=105_000)) == 105_000
+    assert report.results == {"VotingEscrow.withdraw": 105_000}
+
+
+def test_over_threshold(report):
+    with pytest.raises(pytest.fail.Exception, match="5.0% over the baseline of 100000"):
+        report.record_gas("VotingEscrow.withdraw", 105_001)
+
+
+def test_not_in_baseline(report):
+    with pytest.raises(pytest.fail.Exception, match="not in the gas baseline"):
+        report.record_gas("VotingEscrow.checkpoint", 50_000)
+
+
+def test_recorded_twice(report):
+    report.record_gas("VotingEscrow.withdraw", 90_000)
+
+    with pytest.raises(pytest.fail.Exception, match="already recorded"):
+        report.record_gas("VotingEscrow.withdraw", 90_000)
+
+
+def test_update_records_without_baseline():
+    report = GasReport(None, 0.05)
+
+    assert report.record_gas("VotingEscrow.checkpoint", 10**6) == 10**6
+    assert report.results == {"VotingEscrow.checkpoint": 10**6}
@@ -0,0 +1,45 @@
+import pytest
+
+WEEK = 86400 * 7
+IDLE_WEEKS = [1, 10, 50]
+VOTED_GAUGES = [1, 8, 16]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(holders, lock, gauges):
+    # locks ending in different weeks, one slope change each once voted
+    for i, acct in enumerate(holders[:10]):
+        lock(acct, 5 * (i + 2))
+
+
+def _vote_all(gauge_controller, holders, gauges):
+    for i, acct in enumerate(holders[1:10]):
+        gauge_controller.vote_for_gauge_weights(gauges[i % len(gauges)], 10000, {"from": acct})
+
+
+@pytest.mark.parametrize("idle_weeks", IDLE_WEEKS)
+def test_vote_for_gauge_weights(chain, gauge_controller, holders, gauges, gas_report, idle_weeks):
+    _vote_all(gauge_controller, holders, gauges)
+    chain.sleep(idle_weeks * WEEK)
+
+    tx = gauge_controller.vote_for_gauge_weights(gauges[0], 10000, {"from": holders[0]})
+    gas_report.record(f"GaugeController.vote_for_gauge_weights[idle_weeks={idle_weeks}]", tx)
+
+
+@pytest.mark.parametrize("n_gauges", VOTED_GAUGES)
+def test_vote_for_many_gauge_weights(chain, gauge_controller, holders, gauges, gas_report, n_gauges):
+    _vote_all(gauge_controller, holders, gauges)
+    chain.sleep(WEEK)
+
+    weights = [10000 // n_gauges] * n_gauges
+    tx = gauge_controller.vote_for_many_gauge_weights(gauges[:n_gauges], weights, {"from": holders[0]})
+    gas_report.record(f"GaugeController.vote_for_many_gauge_weights[gauges={n_gauges}]", tx)
+
+
+@pytest.mark.parametrize("idle_weeks", IDLE_WEEKS)
+def test_checkpoint_gauge(accounts, chain, gauge_controller, holders, gauges, gas_report, idle_weeks):
+    _vote_all(gauge_controller, holders, gauges)
+    chain.sleep(idle_weeks * WEEK)
+
+    tx = gauge_controller.checkpoint_gauge(gauges[0], {"from": accounts[0]})
+    gas_report.record(f"GaugeController.checkpoint_gauge[idle_weeks={idle_weeks}]", tx)
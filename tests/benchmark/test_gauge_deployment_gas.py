@@ -0,0 +1,42 @@
+import pytest
+
+NEW_GAUGES = [1, 12]
+
+
+@pytest.fixture(scope="module")
+def lp_tokens(ERC20LP, accounts):
+    yield [ERC20LP.deploy(f"Koyo LP {i}", f"LP{i}", 18, 10**9, {"from": accounts[0]}) for i in range(max(NEW_GAUGES))]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, gauge_controller):
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+
+
+@pytest.mark.parametrize("n_gauges", NEW_GAUGES)
+def test_deploy_and_add_gauge(
+    LiquidityGaugeV1, accounts, koyo, voting_escrow, gauge_distributor, gauge_controller, lp_tokens, gas_report, n_gauges
+):
+    gas_used = 0
+    for lp_token in lp_tokens[:n_gauges]:
+        gauge = LiquidityGaugeV1.deploy(
+            koyo, voting_escrow, gauge_distributor, gauge_controller, lp_token, {"from": accounts[0]}
+        )
+        tx = gauge_controller.add_gauge(gauge, 0, 10**18, {"from": accounts[0]})
+        gas_used += gauge.tx.gas_used + tx.gas_used
+
+    gas_report.record_gas(f"LiquidityGaugeV1.deploy+add_gauge[per_gauge,gauges={n_gauges}]", gas_used // n_gauges)
+
+
+@pytest.mark.parametrize("n_gauges", NEW_GAUGES)
+def test_factory_and_add_gauges(accounts, gauge_controller, liquidity_gauge_factory, lp_tokens, gas_report, n_gauges):
+    deploy_tx = liquidity_gauge_factory.deploy_gauges(lp_tokens[:n_gauges], {"from": accounts[0]})
+    gauges = [event["gauge"] for event in deploy_tx.events["GaugeDeployed"]]
+    add_tx = gauge_controller.add_gauges(gauges, [0] * n_gauges, [10**18] * n_gauges, {"from": accounts[0]})
+
+    gas_report.record(f"LiquidityGaugeFactory.deploy_gauges[gauges={n_gauges}]", deploy_tx)
+    gas_report.record(f"GaugeController.add_gauges[gauges={n_gauges}]", add_tx)
+    gas_report.record_gas(
+        f"LiquidityGaugeFactory.deploy_gauges+add_gauges[per_gauge,gauges={n_gauges}]",
+        (deploy_tx.gas_used + add_tx.gas_used) // n_gauges,
+    )
@@ -0,0 +1,129 @@
+import pytest
+
+DAY = 86400
+WEEK = 7 * DAY
+IDLE_WEEKS = [1, 10, 50]
+# up to `MAX_REWARDS`
+REWARD_TOKENS = [0, 1, 8]
+CHECKPOINT_COUNTS = [1, 50, 200]
+
+
+@pytest.fixture(scope="module")
+def reward_tokens(ERC20LP, accounts):
+    yield [
+        ERC20LP.deploy(f"Reward {i}", f"RWD{i}", 18, 10**9, {"from": accounts[0]})
+        for i in range(max(REWARD_TOKENS))
+    ]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, mock_lp_token, holders, lock, gauges):
+    for i, acct in enumerate(holders[:10]):
+        lock(acct, 5 * (i + 2))
+        mock_lp_token.transfer(acct, 10**21, {"from": accounts[0]})
+        mock_lp_token.approve(gauges[0], 2**256 - 1, {"from": acct})
+        gauges[0].deposit(10**20, {"from": acct})
+
+
+def _add_rewards(accounts, gauge, tokens):
+    for token in tokens:
+        gauge.add_reward(token, accounts[0], {"from": accounts[0]})
+        token.approve(gauge, 10**24, {"from": accounts[0]})
+        gauge.deposit_reward_token(token, 10**24, {"from": accounts[0]})
+
+
+@pytest.mark.parametrize("n_rewards", REWARD_TOKENS)
+def test_deposit(accounts, chain, holders, gauges, reward_tokens, gas_report, n_rewards):
+    _add_rewards(accounts, gauges[0], reward_tokens[:n_rewards])
+    chain.sleep(DAY)
+
+    tx = gauges[0].deposit(10**20, {"from": holders[0]})
+    gas_report.record(f"LiquidityGaugeV1.deposit[rewards={n_rewards}]", tx)
+
+
+@pytest.mark.parametrize("n_rewards", REWARD_TOKENS)
+def test_withdraw(accounts, chain, holders, gauges, reward_tokens, gas_report, n_rewards):
+    _add_rewards(accounts, gauges[0], reward_tokens[:n_rewards])
+    chain.sleep(DAY)
+
+    tx = gauges[0].withdraw(10**20, {"from": holders[0]})
+    gas_report.record(f"LiquidityGaugeV1.withdraw[rewards={n_rewards}]", tx)
+
+
+@pytest.mark.parametrize("n_rewards", REWARD_TOKENS[1:])
+def test_claim_rewards(accounts, chain, holders, gauges, reward_tokens, gas_report, n_rewards):
+    _add_rewards(accounts, gauges[0], reward_tokens[:n_rewards])
+    chain.sleep(DAY)
+
+    tx = gauges[0].claim_rewards({"from": holders[0]})
+    gas_report.record(f"LiquidityGaugeV1.claim_rewards[rewards={n_rewards}]", tx)
+
+
+@pytest.mark.parametrize("n_rewards", REWARD_TOKENS)
+def test_transfer(accounts, chain, holders, gauges, reward_tokens, gas_report, n_rewards):
+    _add_rewards(accounts, gauges[0], reward_tokens[:n_rewards])
+    chain.sleep(DAY)
+
+    tx = gauges[0].transfer(holders[1], 10**19, {"from": holders[0]})
+    gas_report.record(f"LiquidityGaugeV1.transfer[rewards={n_rewards}]", tx)
+
+
+@pytest.mark.parametrize("idle_weeks", IDLE_WEEKS)
+def test_deposit_after_idle_weeks(chain, holders, gauges, gas_report, idle_weeks):
+    chain.sleep(idle_weeks * WEEK)
+
+    tx = gauges[0].deposit(10**20, {"from": holders[0]})
+    gas_report.record(f"LiquidityGaugeV1.deposit[idle_weeks={idle_weeks}]", tx)
+
+
+@pytest.mark.parametrize("idle_weeks", IDLE_WEEKS)
+def test_user_checkpoint(chain, holders, gauges, gas_report, idle_weeks):
+    chain.sleep(idle_weeks * WEEK)
+
+    tx = gauges[0].user_checkpoint(holders[0], {"from": holders[0]})
+    gas_report.record(f"LiquidityGaugeV1.user_checkpoint[idle_weeks={idle_weeks}]", tx)
+
+
+def test_deposits_in_busy_week(chain, holders, gauges, gas_report):
+    # start an hour into the next week, one history entry is taken there
+    chain.sleep(WEEK - chain.time() % WEEK + 3600)
+    gauges[0].deposit(10**20, {"from": holders[0]})
+
+    gas_used = []
+    for acct in holders[1:10]:
+        chain.sleep(600)
+        gas_used.append(gauges[0].deposit(10**20, {"from": acct}).gas_used)
+    gas_report.record_gas("LiquidityGaugeV1.deposit[same week]", sum(gas_used) // len(gas_used))
+
+
+@pytest.fixture(scope="module")
+def stakers(accounts, chain, koyo, voting_escrow, mock_lp_token, gauges):
+    """
+    Addresses staked in `gauges[0]`, the first 64 with a boost from a two week lock.
+    """
+    addrs = [accounts.add().address for _ in range(max(CHECKPOINT_COUNTS))]
+    koyo.approve(voting_escrow, 10**20 * 64, {"from": accounts[0]})
+    voting_escrow.create_locks_for(
+        addrs[:64], [10**20] * 64, [chain.time() + 2 * WEEK] * 64, {"from": accounts[0]}
+    )
+    mock_lp_token.approve(gauges[0], 2**256 - 1, {"from": accounts[0]})
+    for addr in addrs:
+        gauges[0].deposit(10**19, addr, {"from": accounts[0]})
+    yield addrs
+
+
+@pytest.mark.parametrize("n_addrs", CHECKPOINT_COUNTS)
+def test_checkpoint_many(accounts, chain, gauges, stakers, gas_report, n_addrs):
+    chain.sleep(DAY)
+
+    tx = gauges[0].checkpoint_many(stakers[:n_addrs], {"from": accounts[0]})
+    gas_report.record(f"LiquidityGaugeV1.checkpoint_many[addrs={n_addrs}]", tx)
+
+
+@pytest.mark.parametrize("n_addrs", CHECKPOINT_COUNTS)
+def test_kick_many(accounts, chain, gauges, stakers, gas_report, n_addrs):
+    # the locks have expired, all boosted stakers can be kicked
+    chain.sleep(3 * WEEK)
+
+    tx = gauges[0].kick_many(stakers[:n_addrs], {"from": accounts[0]})
+    gas_report.record(f"LiquidityGaugeV1.kick_many[addrs={n_addrs}]", tx)
@@ -0,0 +1,129 @@
+import pytest
+
+DAY = 86400
+WEEK = 7 * DAY
+HOLDERS = [1, 10, 40]
+IDLE_WEEKS = [1, 10, 50]
+
+
+def _lock_many(lock, holders, n):
+    # every lock ends in its own week, i.e. one scheduled slope change each
+    for i, acct in enumerate(holders[:n]):
+        lock(acct, i + 2)
+
+
+@pytest.mark.parametrize("n_holders", HOLDERS)
+def test_create_lock(chain, holders, lock, gas_report, n_holders):
+    _lock_many(lock, holders, n_holders - 1)
+    chain.sleep(DAY)
+
+    tx = lock(holders[n_holders - 1], 52)
+    gas_report.record(f"VotingEscrow.create_lock[holders={n_holders}]", tx)
+
+
+@pytest.mark.parametrize("idle_weeks", IDLE_WEEKS)
+def test_checkpoint(accounts, chain, voting_escrow, holders, lock, gas_report, idle_weeks):
+    _lock_many(lock, holders, 10)
+    chain.sleep(idle_weeks * WEEK)
+
+    tx = voting_escrow.checkpoint({"from": accounts[0]})
+    gas_report.record(f"VotingEscrow.checkpoint[idle_weeks={idle_weeks}]", tx)
+
+
+@pytest.mark.parametrize("idle_weeks", IDLE_WEEKS)
+def test_increase_amount(chain, koyo, voting_escrow, holders, lock, gas_report, idle_weeks):
+    _lock_many(lock, holders[1:], 10)
+    lock(holders[0], 60)
+    chain.sleep(idle_weeks * WEEK)
+
+    koyo.approve(voting_escrow, 10**20, {"from": holders[0]})
+    tx = voting_escrow.increase_amount(10**20, {"from": holders[0]})
+    gas_report.record(f"VotingEscrow.increase_amount[idle_weeks={idle_weeks}]", tx)
+
+
+def test_increase_unlock_time(chain, voting_escrow, holders, lock, gas_report):
+    _lock_many(lock, holders[1:], 10)
+    lock(holders[0], 20)
+    chain.sleep(WEEK)
+
+    tx = voting_escrow.increase_unlock_time(chain.time() + 40 * WEEK, {"from": holders[0]})
+    gas_report.record("VotingEscrow.increase_unlock_time", tx)
+
+
+def test_withdraw(chain, voting_escrow, holders, lock, gas_report):
+    _lock_many(lock, holders[1:], 10)
+    lock(holders[0], 2)
+    chain.sleep(3 * WEEK)
+
+    tx = voting_escrow.withdraw({"from": holders[0]})
+    gas_report.record("VotingEscrow.withdraw", tx)
+
+
+def test_force_withdraw(chain, voting_escrow, holders, lock, gas_report):
+    _lock_many(lock, holders[1:], 10)
+    lock(holders[0], 20)
+    chain.sleep(WEEK)
+
+    tx = voting_escrow.force_withdraw({"from": holders[0]})
+    gas_report.record("VotingEscrow.force_withdraw", tx)
+
+
+@pytest.mark.parametrize("n_locks", [1, 10, 50])
+def test_create_locks_for(accounts, chain, koyo, voting_escrow, holders, lock, gas_report, n_locks):
+    _lock_many(lock, holders, 10)
+    chain.sleep(WEEK)
+
+    partners = [accounts.add().address for _ in range(n_locks)]
+    koyo.approve(voting_escrow, 10**21 * n_locks, {"from": accounts[0]})
+    tx = voting_escrow.create_locks_for(
+        partners,
+        [10**21] * n_locks,
+        [chain.time() + (i % 50 + 2) * WEEK for i in range(n_locks)],
+        {"from": accounts[0]},
+    )
+    gas_report.record(f"VotingEscrow.create_locks_for[locks={n_locks}]", tx)
+
+
+def _migrate_to(accounts, voting_escrow, voting_escrow_v2):
+    voting_escrow.commit_next_ve_contract(voting_escrow_v2, {"from": accounts[0]})
+    voting_escrow.apply_next_ve_contract({"from": accounts[0]})
+
+
+def test_migrate(accounts, chain, voting_escrow, voting_escrow_v2, holders, lock, gas_report):
+    _lock_many(lock, holders[1:], 10)
+    lock(holders[0], 20)
+    chain.sleep(WEEK)
+    _migrate_to(accounts, voting_escrow, voting_escrow_v2)
+
+    tx = voting_escrow.migrate({"from": holders[0]})
+    gas_report.record("VotingEscrow.migrate", tx)
+
+
+@pytest.mark.parametrize("n_locks", [1, 10, 30])
+def test_migrate_many(accounts, chain, voting_escrow, voting_escrow_v2, holders, lock, gas_report, n_locks):
+    _lock_many(lock, holders, n_locks)
+    chain.sleep(WEEK)
+    _migrate_to(accounts, voting_escrow, voting_escrow_v2)
+
+    tx = voting_escrow.migrate_many(holders[:n_locks], {"from": accounts[0]})
+    gas_report.record(f"VotingEscrow.migrate_many[locks={n_locks}]", tx)
+
+
+@pytest.mark.parametrize("idle_weeks", IDLE_WEEKS)
+def test_balance_and_supply(chain, voting_escrow, holders, lock, gas_report, idle_weeks):
+    _lock_many(lock, holders, 10)
+    chain.sleep(idle_weeks * WEEK)
+    chain.mine()
+
+    gas_used = voting_escrow.balance_and_supply.estimate_gas(holders[0])
+    gas_report.record_gas(f"VotingEscrow.balance_and_supply[idle_weeks={idle_weeks}]", gas_used)
+
+
+@pytest.mark.parametrize("weeks_ago", [1, 4, 8])
+def test_past_total_supply(accounts, chain, voting_escrow, holders, lock, gas_report, weeks_ago):
+    _lock_many(lock, holders, 10)
+    chain.sleep(10 * WEEK)
+    voting_escrow.checkpoint({"from": accounts[0]})
+
+    gas_used = voting_escrow.totalSupply["uint256"].estimate_gas(chain[-1].timestamp - weeks_ago * WEEK + DAY)
+    gas_report.record_gas(f"VotingEscrow.totalSupply[weeks_ago={weeks_ago}]", gas_used)
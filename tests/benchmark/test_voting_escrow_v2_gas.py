@@ -0,0 +1,50 @@
+import pytest
+
+DAY = 86400
+WEEK = 7 * DAY
+HOLDERS = [1, 10, 40]
+IDLE_WEEKS = [1, 10, 50]
+
+
+@pytest.fixture(scope="module")
+def lock_v2(chain, koyo, voting_escrow_v2):
+    def lock(acct, weeks, amount=10**21):
+        koyo.approve(voting_escrow_v2, amount, {"from": acct})
+        return voting_escrow_v2.create_lock(amount, chain.time() + weeks * WEEK, {"from": acct})
+
+    yield lock
+
+
+def _lock_many(lock, holders, n):
+    # every lock ends in its own week, i.e. one scheduled slope change each
+    for i, acct in enumerate(holders[:n]):
+        lock(acct, i + 2)
+
+
+@pytest.mark.parametrize("n_holders", HOLDERS)
+def test_create_lock(chain, holders, lock_v2, gas_report, n_holders):
+    _lock_many(lock_v2, holders, n_holders - 1)
+    chain.sleep(DAY)
+
+    tx = lock_v2(holders[n_holders - 1], 52)
+    gas_report.record(f"VotingEscrowV2.create_lock[holders={n_holders}]", tx)
+
+
+@pytest.mark.parametrize("idle_weeks", IDLE_WEEKS)
+def test_increase_amount(chain, koyo, voting_escrow_v2, holders, lock_v2, gas_report, idle_weeks):
+    _lock_many(lock_v2, holders[1:], 10)
+    lock_v2(holders[0], 60)
+    chain.sleep(idle_weeks * WEEK)
+
+    koyo.approve(voting_escrow_v2, 10**20, {"from": holders[0]})
+    tx = voting_escrow_v2.increase_amount(10**20, {"from": holders[0]})
+    gas_report.record(f"VotingEscrowV2.increase_amount[idle_weeks={idle_weeks}]", tx)
+
+
+def test_withdraw(chain, voting_escrow_v2, holders, lock_v2, gas_report):
+    _lock_many(lock_v2, holders[1:], 10)
+    lock_v2(holders[0], 2)
+    chain.sleep(3 * WEEK)
+
+    tx = voting_escrow_v2.withdraw({"from": holders[0]})
+    gas_report.record("VotingEscrowV2.withdraw", tx)
@@ -1,4 +1,101 @@
+"""
+The contracts below are deployed once per session (per worker when running
+with `brownie test -n <workers>`, each worker gets its own chain on its own
+port) and every test module starts from a snapshot taken right after.
+"""
+
+import json
+import os
+
 import pytest
+from brownie import ZERO_ADDRESS
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--gas-report", default="build/gas_report.json", help="where to write gas used per benchmark"
+    )
+    parser.addoption(
+        "--gas-baseline", default="tests/benchmark/gas_baseline.json", help="stored gas used per benchmark"
+    )
+    parser.addoption(
+        "--gas-threshold", type=float, default=0.05, help="allowed increase over the baseline"
+    )
+    parser.addoption(
+        "--update-gas-baseline", action="store_true", help="store the measured gas as the new baseline"
+    )
+
+
+class GasReport:
+    """
+    `gas_used` per benchmark key, checked against a stored baseline.
+
+    Every key has to be in the baseline, a missing entry fails like a
+    regression. Pass `baseline=None` to record without checking, when the
+    baseline is being updated.
+    """
+
+    def __init__(self, baseline: dict, threshold: float):
+        self.baseline = baseline
+        self.threshold = threshold
+        self.results = {}
+
+    def record(self, key: str, tx) -> int:
+        return self.record_gas(key, tx.gas_used)
+
+    def record_gas(self, key: str, gas_used: int) -> int:
+        """
+        Record a figure which is not the gas of a single transaction, e.g.
+        gas per item of several transactions.
+        """
+        if key in self.results:
+            pytest.fail(f"{key} was already recorded, every scenario needs its own key")
+        self.results[key] = gas_used
+        if self.baseline is None:
+            return gas_used
+
+        baseline = self.baseline.get(key)
+        if baseline is None:
+            pytest.fail(f"{key} is not in the gas baseline, record it with --update-gas-baseline")
+        if gas_used > baseline * (1 + self.threshold):
+            pytest.fail(f"{key} used {gas_used} gas, {gas_used / baseline - 1:.1%} over the baseline of {baseline}")
+        return gas_used
+
+
+def _load(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as fp:
+        return json.load(fp)
+
+
+def _dump(path: str, data: dict):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as fp:
+        json.dump(dict(sorted(data.items())), fp, indent=2)
+        fp.write("\n")
+
+
+@pytest.fixture(scope="session")
+def gas_report(request):
+    config = request.config
+    baseline_path = config.getoption("gas_baseline")
+    report_path = config.getoption("gas_report")
+    update = config.getoption("update_gas_baseline")
+
+    if hasattr(config, "workerinput"):
+        # one report per xdist worker, the baseline is only written serially
+        if update:
+            raise pytest.UsageError("--update-gas-baseline cannot be combined with -n")
+        root, ext = os.path.splitext(report_path)
+        report_path = f"{root}-{config.workerinput['workerid']}{ext}"
+
+    report = GasReport(None if update else _load(baseline_path), config.getoption("gas_threshold"))
+    yield report
+
+    _dump(report_path, report.results)
+    if update:
+        _dump(baseline_path, {**_load(baseline_path), **report.results})
 
 
 @pytest.fixture(scope="session")
@@ -40,29 +137,41 @@ def minter_initial_boba_bar(accounts):
 # endregion Minter - accounts
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def smart_wallet_whitelist(SmartWalletWhitelist, accounts):
     yield SmartWalletWhitelist.deploy({"from": accounts[0]})
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def koyo(Koyo, accounts):
     yield Koyo.deploy("Kōyō Token", "KYO", 18, {"from": accounts[0]})
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def voting_escrow(VotingEscrow, accounts, koyo):
     yield VotingEscrow.deploy(
         koyo, "Voting-escrowed KYO", "veKYO", "veKOYO_1", {"from": accounts[0]}
     )
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
+def voting_escrow_v2(VotingEscrowV2, accounts, koyo, voting_escrow):
+    yield VotingEscrowV2.deploy(
+        koyo, "Voting-escrowed KYO", "veKYO", "veKOYO_2", voting_escrow, {"from": accounts[0]}
+    )
+
+
+@pytest.fixture(scope="session")
 def mock_lp_token(ERC20LP, accounts):
     yield ERC20LP.deploy("Koyo LP token", "usdKYO", 18, 10**9, {"from": accounts[0]})
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
+def multicall(Multicall, accounts):
+    yield Multicall.deploy({"from": accounts[0]})
+
+
+@pytest.fixture(scope="session")
 def minter(
     Minter,
     koyo,
@@ -84,7 +193,7 @@ def minter(
     )
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def gauge_controller(
     GaugeController,
     koyo,
@@ -98,7 +207,7 @@ def gauge_controller(
     )
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def gauge_distributor(
     GaugeDistributor,
     koyo,
@@ -114,7 +223,21 @@ def gauge_distributor(
     )
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
+def merkle_distributor(
+    MerkleDistributor,
+    koyo,
+    gauge_distributor,
+    accounts,
+):
+    yield MerkleDistributor.deploy(
+        koyo,
+        gauge_distributor,
+        {"from": accounts[0]},
+    )
+
+
+@pytest.fixture(scope="session")
 def three_gauges(
     LiquidityGaugeV1,
     koyo,
@@ -139,6 +262,68 @@ def three_gauges(
     yield contracts
 
 
+@pytest.fixture(scope="session")
+def liquidity_gauge_factory(
+    LiquidityGaugeV1,
+    LiquidityGaugeFactory,
+    koyo,
+    voting_escrow,
+    gauge_distributor,
+    gauge_controller,
+    accounts,
+):
+    implementation = LiquidityGaugeV1.deploy(
+        koyo,
+        voting_escrow,
+        gauge_distributor,
+        gauge_controller,
+        ZERO_ADDRESS,
+        {"from": accounts[0]},
+    )
+    yield LiquidityGaugeFactory.deploy(implementation, {"from": accounts[0]})
+
+
+@pytest.fixture(scope="session")
+def stack_snapshot(
+    chain,
+    koyo,
+    voting_escrow,
+    voting_escrow_v2,
+    smart_wallet_whitelist,
+    mock_lp_token,
+    multicall,
+    minter,
+    gauge_controller,
+    gauge_distributor,
+    merkle_distributor,
+    three_gauges,
+    liquidity_gauge_factory,
+):
+    # depends on every shared deployment so they all happen before the snapshot
+    chain.snapshot()
+    yield {"id": chain._snapshot_id, "height": chain.height, "time": chain.time()}
+
+
+def _revert_to_stack(chain, snapshot):
+    # `chain.revert` reverts to the latest snapshot, which tests and
+    # `fn_isolation` overwrite, so point it back at the deployed stack first
+    chain._snapshot_id = snapshot["id"]
+    chain.revert()
+    # the snapshot was used up, `revert` took a new one of the same state
+    snapshot["id"] = chain._snapshot_id
+
+
+@pytest.fixture(scope="module", autouse=True)
+def module_isolation(chain, stack_snapshot):
+    """
+    Replaces brownie's `module_isolation`, which resets to an empty chain
+    and makes every module redeploy. Reverts to the deployed stack instead.
+    """
+    _revert_to_stack(chain, stack_snapshot)
+    yield
+    _revert_to_stack(chain, stack_snapshot)
+
+
 def approx(a, b, precision=1e-10):
     if a == b == 0:
         return True
@@ -0,0 +1,168 @@
+import json
+
+import pytest
+
+from scripts.analytics.indexer import GAUGE_ABI, load_addresses
+from scripts.deployment.pipeline import Pipeline, Ref, Step, default_plan, journal_path, layers
+
+
+@pytest.fixture(scope="module")
+def plan(mock_lp_token):
+    return default_plan(
+        gauge_types=[("Liquidity", 10**18), ("Stable", 2 * 10**18)],
+        pool_tokens={"usdKYO": (mock_lp_token.address, 100), "usdKYO-2": (mock_lp_token.address, 200)},
+        multicall=True,
+    )
+
+
+@pytest.fixture
+def deployments_json(tmp_path):
+    return str(tmp_path / "deployments.json")
+
+
+def _load(path):
+    with open(path) as fp:
+        return json.load(fp)
+
+
+def test_layers(plan):
+    names = [[step.name for step in layer] for layer in layers(plan)]
+
+    assert names[0] == ["Koyo", "SmartWalletWhitelist", "Multicall"]
+    assert names[1] == ["VotingEscrow", "Minter"]
+    assert "GaugeController.add_type.Stable" in names[4]
+    assert "MerkleDistributor" in names[4]
+    assert names[-1] == [
+        "GaugeDistributor.set_epoch_distributor",
+        "GaugeController.add_gauge.usdKYO",
+        "GaugeController.add_gauge.usdKYO-2",
+    ]
+
+
+def test_live_plan_has_no_multicall(mock_lp_token):
+    live = default_plan(
+        gauge_types=[("Liquidity", 10**18)],
+        pool_tokens={"usdKYO": (mock_lp_token.address, 100)},
+        multicall=False,
+    )
+
+    assert "Multicall" not in [step.name for step in live]
+    assert [step.name for step in layers(live)[0]] == ["Koyo", "SmartWalletWhitelist"]
+
+
+def test_development_plan_has_multicall(mock_lp_token):
+    development = default_plan(
+        gauge_types=[("Liquidity", 10**18)],
+        pool_tokens={"usdKYO": (mock_lp_token.address, 100)},
+    )
+
+    assert "Multicall" in [step.name for step in development]
+
+
+def test_layers_reject_cycles():
+    with pytest.raises(ValueError):
+        layers([Step("A", "Koyo", (Ref("B"),)), Step("B", "Koyo", (Ref("A"),))])
+    with pytest.raises(ValueError):
+        layers([Step("A", "Koyo", (Ref("C"),))])
+
+
+def test_deploys_plan(
+    accounts,
+    plan,
+    deployments_json,
+    mock_lp_token,
+    Koyo,
+    VotingEscrow,
+    GaugeController,
+    GaugeDistributor,
+    MerkleDistributor,
+    LiquidityGaugeV1,
+):
+    start_nonce = accounts[0].nonce
+    txs = Pipeline(accounts[0], plan, deployments_json, required_confs=1).run()
+
+    assert len(txs) == len(plan)
+    assert sorted(tx.nonce for tx in txs) == list(range(start_nonce, start_nonce + len(plan)))
+
+    deployments = _load(deployments_json)
+    # addresses follow from the nonces, in layer and plan order
+    assert deployments["Koyo"] == accounts[0].get_deployment_address(start_nonce)
+    assert deployments["SmartWalletWhitelist"] == accounts[0].get_deployment_address(start_nonce + 1)
+    assert all(entry["confirmed"] for entry in _load(journal_path(deployments_json)).values())
+
+    koyo = Koyo.at(deployments["Koyo"])
+    voting_escrow = VotingEscrow.at(deployments["VotingEscrow"])
+    gauge_controller = GaugeController.at(deployments["GaugeController"])
+    assert koyo.minter() == deployments["Minter"]
+    assert voting_escrow.smart_wallet_checker() == deployments["SmartWalletWhitelist"]
+    assert gauge_controller.n_gauge_types() == 2
+    assert gauge_controller.n_gauges() == 2
+    assert GaugeDistributor.at(deployments["GaugeDistributor"]).epoch_distributor() == deployments["MerkleDistributor"]
+    assert MerkleDistributor.at(deployments["MerkleDistributor"]).gauge_distributor() == deployments["GaugeDistributor"]
+    for name, weight in (("usdKYO", 100), ("usdKYO-2", 200)):
+        gauge = LiquidityGaugeV1.at(deployments["Gauge"][name])
+        assert gauge.lp_token() == mock_lp_token
+        assert gauge_controller.get_gauge_weight(gauge) == weight
+
+    assert Pipeline(accounts[0], plan, deployments_json, required_confs=1).run() == []
+
+
+def test_deployments_load_as_addresses(accounts, plan, deployments_json):
+    Pipeline(accounts[0], plan, deployments_json, required_confs=1).run()
+    deployments = _load(deployments_json)
+
+    addresses = load_addresses(deployments_json)
+
+    assert len(addresses) == len(deployments) - 1 + len(deployments["Gauge"])
+    for name in ("Koyo", "VotingEscrow", "Minter", "GaugeController", "GaugeDistributor", "MerkleDistributor", "Multicall"):
+        assert addresses[deployments[name]] == name
+    for gauge in deployments["Gauge"].values():
+        assert addresses[gauge] == GAUGE_ABI
+
+
+def test_resumes_after_failure(accounts, plan, deployments_json):
+    # a gauge type which is never added, the gauge cannot be added either
+    broken = [
+        step._replace(args=(step.args[0], 7, step.args[2])) if step.name == "GaugeController.add_gauge.usdKYO" else step
+        for step in plan
+    ]
+    with pytest.raises(RuntimeError):
+        Pipeline(accounts[0], broken, deployments_json, required_confs=1).run()
+
+    first = _load(deployments_json)
+    journal = _load(journal_path(deployments_json))
+    assert "GaugeController.add_gauge.usdKYO" not in journal
+    assert journal["GaugeController.add_gauge.usdKYO-2"]["confirmed"]
+
+    txs = Pipeline(accounts[0], plan, deployments_json, required_confs=1).run()
+    assert [tx.fn_name for tx in txs] == ["add_gauge"]
+
+    assert _load(deployments_json) == first
+
+
+def test_recovers_unconfirmed_steps(accounts, plan, deployments_json):
+    token_plan = plan[:5]
+    Pipeline(accounts[0], token_plan, deployments_json, required_confs=1).run()
+
+    # as if the run stopped right after sending the last layer
+    deployments, journal = _load(deployments_json), _load(journal_path(deployments_json))
+    for name in ("Minter", "Koyo.set_minter"):
+        journal[name]["confirmed"] = False
+    minter = deployments.pop("Minter")
+    with open(deployments_json, "w") as fp:
+        json.dump(deployments, fp)
+    with open(journal_path(deployments_json), "w") as fp:
+        json.dump(journal, fp)
+
+    txs = Pipeline(accounts[0], plan, deployments_json, required_confs=1).run()
+
+    assert len(txs) == len(plan) - len(token_plan)
+    assert _load(deployments_json)["Minter"] == minter
+
+
+def test_refuses_foreign_deployments(accounts, plan, deployments_json):
+    with open(deployments_json, "w") as fp:
+        json.dump({"Koyo": accounts[5].address}, fp)
+
+    with pytest.raises(ValueError):
+        Pipeline(accounts[0], plan, deployments_json, required_confs=1).run()
@@ -0,0 +1,117 @@
+import pytest
+
+from scripts.analytics.emissions import EmissionsProjection, read_params
+from scripts.analytics.multicall import MulticallReader
+
+DAY = 86400
+WEEK = 7 * DAY
+
+
+@pytest.fixture(scope="module")
+def projection(web3, chain, accounts, koyo, voting_escrow, minter, gauge_controller, three_gauges, multicall):
+    chain.sleep(DAY)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+    gauge_controller.add_type("Stable", 2 * 10**18, {"from": accounts[0]})
+    for i, gauge in enumerate(three_gauges):
+        gauge_controller.add_gauge(gauge, i % 2, 10**18 * (i + 1), {"from": accounts[0]})
+
+    # votes ending in different weeks, i.e. several slope changes per gauge
+    for i, acct in enumerate(accounts[1:6]):
+        koyo.transfer(acct, 10**22, {"from": accounts[0]})
+        koyo.approve(voting_escrow, 10**22, {"from": acct})
+        voting_escrow.create_lock(10**21 * (i + 1), chain.time() + (5 + 7 * i) * WEEK, {"from": acct})
+        for j, gauge in enumerate(three_gauges):
+            if (i + j) % 3:
+                gauge_controller.vote_for_gauge_weights(gauge, 3000, {"from": acct})
+
+    koyo.set_minter(minter, {"from": accounts[0]})
+    chain.sleep(2 * WEEK + 3 * DAY)
+    minter.mint_and_distribute({"from": accounts[0]})
+
+    reader = MulticallReader(web3.provider.endpoint_uri, multicall.address)
+    params = read_params(reader, koyo, minter, gauge_controller, three_gauges, chain[-1].timestamp)
+
+    yield EmissionsProjection(params)
+
+
+def _relative_weights_on_chain(accounts, chain, gauge_controller, three_gauges, weeks):
+    """
+    `gauge_relative_weight` of every gauge for each of `weeks`, checkpointing
+    the gauges as the chain gets there.
+    """
+    weights = []
+    for week in weeks:
+        if chain.time() < week:
+            chain.sleep(week - chain.time() + 10)
+        for gauge in three_gauges:
+            gauge_controller.checkpoint_gauge(gauge, {"from": accounts[0]})
+        weights.append([gauge_controller.gauge_relative_weight(gauge, week) for gauge in three_gauges])
+    return weights
+
+
+def test_relative_weights(accounts, chain, gauge_controller, three_gauges, projection):
+    weeks = [int(week) for week in projection.weeks[:40]]
+
+    chain.snapshot()
+    expected = _relative_weights_on_chain(accounts, chain, gauge_controller, three_gauges, weeks)
+    chain.revert()
+
+    assert projection.relative_weights[:, :40].T.tolist() == expected
+
+
+def test_change_gauge_weight(accounts, chain, gauge_controller, three_gauges, projection):
+    weeks = [int(week) for week in projection.weeks[:20]]
+    projection = EmissionsProjection(projection.params)
+    projection.change_gauge_weight(three_gauges[2].address, 7 * 10**18)
+
+    chain.snapshot()
+    gauge_controller.change_gauge_weight(three_gauges[2], 7 * 10**18, {"from": accounts[0]})
+    expected = _relative_weights_on_chain(accounts, chain, gauge_controller, three_gauges, weeks)
+    chain.revert()
+
+    assert projection.relative_weights[:, :20].T.tolist() == expected
+
+
+def test_vote(accounts, chain, koyo, voting_escrow, gauge_controller, three_gauges, projection):
+    weeks = [int(week) for week in projection.weeks[:20]]
+    voter = accounts[6]
+
+    chain.snapshot()
+    koyo.transfer(voter, 10**22, {"from": accounts[0]})
+    koyo.approve(voting_escrow, 10**22, {"from": voter})
+    voting_escrow.create_lock(5 * 10**21, chain.time() + 15 * WEEK, {"from": voter})
+    gauge_controller.vote_for_gauge_weights(three_gauges[0], 6000, {"from": voter})
+    slope = voting_escrow.get_last_user_slope(voter) * 6000 // 10000
+    end = voting_escrow.locked__end(voter)
+    expected = _relative_weights_on_chain(accounts, chain, gauge_controller, three_gauges, weeks)
+    chain.revert()
+
+    projection = EmissionsProjection(projection.params)
+    projection.vote(three_gauges[0].address, slope, end)
+
+    assert projection.relative_weights[:, :20].T.tolist() == expected
+
+
+def _received(koyo, minter, recipient):
+    # the emissions share is sent, everything else is claimed from the minter
+    return koyo.balanceOf(recipient) + minter.claimable(recipient)
+
+
+def test_minter_recipients(accounts, chain, koyo, minter, projection):
+    before = {r.address: _received(koyo, minter, r.address) for r in projection.params.recipients}
+
+    chain.sleep(3 * WEEK + 5 * DAY)
+    tx = minter.mint_and_distribute({"from": accounts[0]})
+    totals = projection.totals(tx.timestamp)
+
+    for recipient in projection.params.recipients:
+        assert _received(koyo, minter, recipient.address) - before[recipient.address] == totals[recipient.address]
+
+
+def test_stream_covers_emissions(projection):
+    chunks = list(projection.stream(chunk_weeks=10))
+    params = projection.params
+
+    assert sum(len(chunk.weeks) for chunk in chunks) == len(projection.weeks)
+    assert sum(int(chunk.minted.sum()) for chunk in chunks) == params.emission_rate * (params.emission_end - params.start)
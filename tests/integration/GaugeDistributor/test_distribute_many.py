@@ -0,0 +1,112 @@
+import pytest
+
+WEEK = 86400 * 7
+GAUGE_COUNTS = [1, 7, 16]
+
+
+@pytest.fixture(scope="module")
+def gauges(LiquidityGaugeV1, accounts, koyo, voting_escrow, gauge_distributor, gauge_controller, mock_lp_token):
+    yield [
+        LiquidityGaugeV1.deploy(
+            koyo,
+            voting_escrow,
+            gauge_distributor,
+            gauge_controller,
+            mock_lp_token,
+            {"from": accounts[0]},
+        )
+        for _ in range(max(GAUGE_COUNTS))
+    ]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(
+    accounts,
+    chain,
+    koyo,
+    voting_escrow,
+    minter,
+    gauge_controller,
+    gauge_distributor,
+    gauges,
+    mock_lp_token,
+    minter_initial_treasury,
+    minter_initial_team_members,
+    minter_initial_advisors,
+    minter_initial_boba_bar,
+):
+    user = accounts[1]
+
+    chain.sleep(86400)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+    for i, gauge in enumerate(gauges):
+        gauge_controller.add_gauge(gauge, 0, 10**18 * (i + 1), {"from": accounts[0]})
+
+    mock_lp_token.transfer(user, 10**21, {"from": accounts[0]})
+    koyo.transfer(user, 10**21, {"from": accounts[0]})
+    koyo.approve(voting_escrow, 10**21, {"from": user})
+    voting_escrow.create_lock(10**20, chain.time() + 30 * WEEK, {"from": user})
+    for gauge in gauges:
+        mock_lp_token.approve(gauge, 2**256 - 1, {"from": user})
+        gauge.deposit(10**18, {"from": user})
+
+    # route the emissions share to the distributor
+    koyo.set_minter(minter, {"from": accounts[0]})
+    minter.set_addresses(
+        [gauge_distributor],
+        minter_initial_treasury,
+        minter_initial_team_members,
+        minter_initial_advisors,
+        minter_initial_boba_bar,
+        {"from": accounts[0]},
+    )
+
+    chain.sleep(WEEK)
+    for gauge in gauges:
+        gauge_controller.checkpoint_gauge(gauge, {"from": accounts[0]})
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def test_mints_and_transfers_once(accounts, koyo, minter, gauge_distributor, gauges):
+    user = accounts[1]
+    balance = koyo.balanceOf(user)
+
+    tx = gauge_distributor.distribute_many(gauges, {"from": user})
+
+    assert len([c for c in tx.subcalls if c["to"] == minter]) == 1
+    transfers = [c for c in tx.subcalls if c["to"] == koyo and c["function"].startswith("transfer(")]
+    assert len([c for c in transfers if c["from"] == gauge_distributor]) == 1
+
+    distributed = sum(gauge_distributor.distributed(user, gauge) for gauge in gauges)
+    assert distributed > 0
+    assert koyo.balanceOf(user) - balance == distributed
+    for gauge in gauges:
+        assert gauge_distributor.distributed(user, gauge) == gauge.integrate_fraction(user)
+
+
+def test_nothing_to_distribute(accounts, koyo, minter, gauge_distributor, gauges):
+    balance = koyo.balanceOf(accounts[2])
+
+    tx = gauge_distributor.distribute_many(gauges, {"from": accounts[2]})
+
+    assert not [c for c in tx.subcalls if c["to"] == minter]
+    assert koyo.balanceOf(accounts[2]) == balance
+
+
+def test_distribute_many_gas(accounts, chain, gauge_distributor, gauges):
+    gas_used = {}
+    for count in GAUGE_COUNTS:
+        chain.snapshot()
+        tx = gauge_distributor.distribute_many(gauges[:count], {"from": accounts[1]})
+        gas_used[count] = tx.gas_used
+        chain.revert()
+
+    # only the gauge checkpoint is paid per gauge, minting and splitting
+    # across the minter's recipients happens once
+    per_gauge = (gas_used[16] - gas_used[1]) / 15
+    assert per_gauge < gas_used[1] * 0.4
@@ -0,0 +1,69 @@
+WEEK = 86400 * 7
+
+
+def test_projected_claimable(accounts, chain, koyo, voting_escrow, gauge_controller, gauge_distributor, three_gauges, mock_lp_token):
+    users = accounts[1:4]
+
+    chain.sleep(86400)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+    for i, gauge in enumerate(three_gauges):
+        gauge_controller.add_gauge(gauge, 0, 10**18 * (i + 1), {"from": accounts[0]})
+
+    for i, user in enumerate(users):
+        mock_lp_token.transfer(user, 10**21, {"from": accounts[0]})
+        koyo.transfer(user, 10**21, {"from": accounts[0]})
+        koyo.approve(voting_escrow, 10**21, {"from": user})
+        voting_escrow.create_lock(10**20 * (i + 1), chain.time() + 30 * WEEK, {"from": user})
+        for gauge in three_gauges:
+            mock_lp_token.approve(gauge, 2**256 - 1, {"from": user})
+            gauge.deposit(10**18 * (i + 1), {"from": user})
+
+    # let a few weeks pass without any checkpoint, the controller has to project them
+    chain.sleep(3 * WEEK + 3600)
+    chain.mine()
+
+    for user in users:
+        pending = gauge_distributor.pending_for(user, three_gauges)
+        assert pending == [gauge.claimable_tokens.call(user) for gauge in three_gauges]
+        assert min(pending) > 0
+
+        for gauge in three_gauges:
+            assert gauge.projected_integrate_fraction(user) == gauge.claimable_tokens.call(user)
+
+
+def test_pending_is_net_of_distributed(
+    accounts,
+    chain,
+    koyo,
+    minter,
+    gauge_distributor,
+    three_gauges,
+    minter_initial_treasury,
+    minter_initial_team_members,
+    minter_initial_advisors,
+    minter_initial_boba_bar,
+):
+    user = accounts[1]
+    gauge = three_gauges[0]
+
+    # route the emissions share to the distributor
+    koyo.set_minter(minter, {"from": accounts[0]})
+    minter.set_addresses(
+        [gauge_distributor],
+        minter_initial_treasury,
+        minter_initial_team_members,
+        minter_initial_advisors,
+        minter_initial_boba_bar,
+        {"from": accounts[0]},
+    )
+
+    gauge_distributor.distribute(gauge, {"from": user})
+    distributed = gauge_distributor.distributed(user, gauge)
+    assert distributed > 0
+
+    chain.sleep(3600)
+    chain.mine()
+
+    assert gauge_distributor.pending_for(user, [gauge]) == [gauge.claimable_tokens.call(user)]
+    assert gauge.projected_integrate_fraction(user) == distributed + gauge_distributor.pending_for(user, [gauge])[0]
@@ -0,0 +1,84 @@
+import os
+
+from scripts.analytics.indexer import EventIndexer, EventStore
+
+DAY = 86400
+WEEK = 7 * DAY
+
+
+def test_incremental_indexing(
+    tmp_path,
+    web3,
+    chain,
+    accounts,
+    koyo,
+    voting_escrow,
+    minter,
+    smart_wallet_whitelist,
+    gauge_controller,
+    gauge_distributor,
+    three_gauges,
+    mock_lp_token,
+):
+    deployments = {
+        "Koyo": koyo.address,
+        "VotingEscrow": voting_escrow.address,
+        "Minter": minter.address,
+        "SmartWalletWhitelist": smart_wallet_whitelist.address,
+        "GaugeController": gauge_controller.address,
+        "GaugeDistributor": gauge_distributor.address,
+        "Gauge": {str(i): gauge.address for i, gauge in enumerate(three_gauges[:2])},
+    }
+    alice, bob = accounts[:2]
+    amount = 1000 * 10**18
+
+    chain.sleep(DAY)
+    koyo.mint_available(alice, {"from": alice})
+    koyo.transfer(bob, amount, {"from": alice})
+    koyo.approve(voting_escrow, amount, {"from": alice})
+    voting_escrow.create_lock(amount, chain.time() + 4 * WEEK, {"from": alice})
+
+    gauge_controller.add_type("Liquidity", 10**18, {"from": alice})
+    gauge_controller.add_gauge(three_gauges[0], 0, 100, {"from": alice})
+    mock_lp_token.approve(three_gauges[0], 2**256 - 1, {"from": alice})
+    three_gauges[0].deposit(10**18, {"from": alice})
+
+    indexer = EventIndexer(web3, str(tmp_path), deployments=deployments, batch_size=3)
+    mark = indexer.run()
+    store = EventStore(str(tmp_path))
+
+    assert mark == web3.eth.block_number
+    assert store.load_state()["block"] == mark
+
+    transfers = store.events(indexer.decoders, "Koyo", ["Transfer"])
+    assert [e[3]["_value"] for e in transfers][-1] == amount
+
+    (deposit,) = store.events(indexer.decoders, "VotingEscrow", ["Deposit"])
+    assert deposit[3]["provider"] == alice
+    assert deposit[3]["value"] == amount
+
+    (new_gauge,) = store.events(indexer.decoders, "GaugeController", ["NewGauge"])
+    assert new_gauge[3]["addr"] == three_gauges[0]
+    assert store.table("LiquidityGaugeV1", "Deposit").num_rows == 1
+
+    # second run only fetches the new blocks
+    three_gauges[0].deposit(10**18, {"from": alice})
+    three_gauges[0].withdraw(2 * 10**18, {"from": alice})
+
+    assert indexer.run() == web3.eth.block_number
+    assert store.table("LiquidityGaugeV1", "Deposit").num_rows == 2
+    assert store.table("LiquidityGaugeV1", "Withdraw").num_rows == 1
+
+    parts = os.listdir(tmp_path / "LiquidityGaugeV1" / "Withdraw")
+    assert all(int(part.split("-")[0]) > mark for part in parts)
+
+    # a gauge added to the deployments is backfilled from the start
+    mock_lp_token.approve(three_gauges[2], 2**256 - 1, {"from": alice})
+    three_gauges[2].deposit(10**18, {"from": alice})
+    deployments["Gauge"]["2"] = three_gauges[2].address
+
+    indexer = EventIndexer(web3, str(tmp_path), deployments=deployments, batch_size=3)
+    indexer.run()
+    deposits = store.table("LiquidityGaugeV1", "Deposit").to_pydict()
+    assert deposits["address"].count(three_gauges[2].address) == 1
+    assert len(deposits["address"]) == 3
@@ -0,0 +1,65 @@
+import pytest
+
+from scripts.kyo.keeper import Keeper
+
+DAY = 86400
+WEEK = 7 * DAY
+
+
+@pytest.fixture(scope="module")
+def keeper(accounts, chain, koyo, voting_escrow, minter, gauge_controller, three_gauges, mock_lp_token):
+    chain.sleep(DAY)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+    for i, gauge in enumerate(three_gauges):
+        gauge_controller.add_gauge(gauge, 0, 10**18 * (i + 1), {"from": accounts[0]})
+
+    mock_lp_token.approve(three_gauges[0], 10**18, {"from": accounts[0]})
+    three_gauges[0].deposit(10**18, {"from": accounts[0]})
+    koyo.set_minter(minter, {"from": accounts[0]})
+
+    # mined blocks are final on the development chain
+    yield Keeper(accounts[1], minter, koyo, gauge_controller, three_gauges, min_mint_interval=DAY, required_confs=1)
+
+
+def test_nothing_due_within_the_week(chain, keeper):
+    chain.sleep(3600)
+    chain.mine()
+    keeper.run_once()
+
+    chain.sleep(3600)
+    chain.mine()
+    assert keeper.plan() == []
+    assert keeper.run_once() == []
+
+
+def test_new_week(accounts, chain, web3, koyo, minter, gauge_controller, three_gauges, minter_initial_emissions, keeper):
+    chain.sleep(WEEK)
+    chain.mine()
+
+    balance = koyo.balanceOf(minter_initial_emissions[0])
+    txs = keeper.run_once()
+
+    assert [tx.fn_name for tx in txs] == ["mint_and_distribute", "checkpoint"] + ["user_checkpoint"] * 3
+    assert all(tx.status == 1 for tx in txs)
+    assert koyo.balanceOf(minter_initial_emissions[0]) > balance
+
+    now = chain[-1].timestamp
+    assert gauge_controller.time_total() > now
+    for gauge in three_gauges:
+        assert gauge.period_timestamp(gauge.period()) >= now // WEEK * WEEK
+
+    assert keeper.nonces.nonce == web3.eth.get_transaction_count(accounts[1])
+    assert keeper.run_once() == []
+
+
+def test_resyncs_nonce(accounts, chain, web3, keeper):
+    # something else sends from the keeper's account
+    accounts[1].transfer(accounts[2], 0)
+
+    chain.sleep(WEEK)
+    chain.mine()
+    txs = keeper.run_once()
+
+    assert txs and all(tx.status == 1 for tx in txs)
+    assert keeper.nonces.nonce == web3.eth.get_transaction_count(accounts[1])
@@ -0,0 +1,112 @@
+import pytest
+from brownie.exceptions import VirtualMachineError
+
+from scripts.analytics.kick_scanner import StakerIndex
+from scripts.kyo.kicker import Kicker
+
+DAY = 86400
+WEEK = 7 * DAY
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, chain, koyo, voting_escrow, gauge_controller, three_gauges, mock_lp_token):
+    chain.sleep(DAY)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+    for gauge in three_gauges:
+        gauge_controller.add_gauge(gauge, 0, 10**18, {"from": accounts[0]})
+
+    # accounts 1-2 lock for two weeks, 3-4 for a year, 5-6 have no lock
+    for i, acct in enumerate(accounts[1:7]):
+        if i < 4:
+            koyo.transfer(acct, 10**21, {"from": accounts[0]})
+            koyo.approve(voting_escrow, 2**256 - 1, {"from": acct})
+            voting_escrow.create_lock(10**20, chain.time() + (2 if i < 2 else 52) * WEEK, {"from": acct})
+        mock_lp_token.transfer(acct, 10**21, {"from": accounts[0]})
+        for gauge in three_gauges[:2]:
+            mock_lp_token.approve(gauge, 2**256 - 1, {"from": acct})
+            gauge.deposit(10**18 * (i + 1), {"from": acct})
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+@pytest.fixture
+def kicker(accounts, web3, voting_escrow, three_gauges):
+    index = StakerIndex.from_chain(voting_escrow, three_gauges)
+    yield Kicker(accounts[9], voting_escrow, three_gauges, index, web3.eth.block_number, required_confs=1)
+
+
+def _kickable(accounts, gauges):
+    kickable = {}
+    for gauge in gauges:
+        for acct in accounts[1:7]:
+            try:
+                gauge.kick.call(acct, {"from": accounts[9]})
+            except VirtualMachineError:
+                continue
+            kickable.setdefault(gauge.address, set()).add(acct.address)
+    return kickable
+
+
+def test_nothing_to_kick(chain, kicker):
+    chain.mine()
+    assert kicker.plan(chain[-1].timestamp) == []
+    assert kicker.run_once() == []
+
+
+def test_candidates_match_kick(accounts, chain, voting_escrow, three_gauges, kicker):
+    chain.sleep(3 * WEEK)
+    # a new escrow point after the last checkpoint also allows a kick
+    voting_escrow.increase_amount(10**18, {"from": accounts[3]})
+    chain.mine()
+
+    kicker.follow(chain.height)
+    candidates = kicker.index.candidates(chain[-1].timestamp + 1)
+
+    assert {gauge: set(users) for gauge, users in candidates.items()} == _kickable(accounts, three_gauges)
+    assert set(candidates[three_gauges[0].address]) == {acct.address for acct in accounts[1:4]}
+
+
+def test_index_follows_the_chain(accounts, chain, three_gauges, kicker):
+    gauge = three_gauges[1]
+    gauge.withdraw(10**17, {"from": accounts[2]})
+    gauge.transfer(accounts[8], 10**17, {"from": accounts[2]})
+
+    assert kicker.follow(chain.height) > 0
+    index = kicker.index
+    for acct in (accounts[2], accounts[8]):
+        row = index.pairs[(gauge.address, acct.address)]
+        assert index.balance[row] == gauge.balanceOf(acct)
+        assert index.working_balance[row] == gauge.working_balances(acct)
+        assert index.last_checkpoint[row] == gauge.integrate_checkpoint_of(acct)
+
+
+def test_run_once(accounts, chain, three_gauges, kicker):
+    chain.sleep(3 * WEEK)
+    chain.mine()
+
+    txs = kicker.run_once()
+
+    assert [tx.fn_name for tx in txs] == ["kick_many"] * 2
+    assert all(tx.status == 1 for tx in txs)
+    for gauge in three_gauges[:2]:
+        for acct in accounts[1:3]:
+            assert gauge.working_balances(acct) == gauge.balanceOf(acct) * 40 // 100
+    assert _kickable(accounts, three_gauges) == {}
+
+    chain.mine()
+    assert kicker.run_once() == []
+
+
+def test_batches_are_gas_bounded(accounts, chain, voting_escrow, three_gauges):
+    index = StakerIndex.from_chain(voting_escrow, three_gauges)
+    kicker = Kicker(accounts[9], voting_escrow, three_gauges, index, chain.height, max_batch_gas=620_000)
+    chain.sleep(3 * WEEK)
+    chain.mine()
+
+    assert kicker.batch_size == 2
+    batches = kicker.plan(chain[-1].timestamp)
+    assert [len(users) for _, users in batches] == [2, 2]
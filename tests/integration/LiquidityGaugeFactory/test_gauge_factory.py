@@ -0,0 +1,78 @@
+import brownie
+import pytest
+
+from tests.conftest import approx
+
+DAY = 86400
+WEEK = 7 * DAY
+
+
+@pytest.fixture(scope="module")
+def lp_tokens(ERC20LP, accounts):
+    yield [ERC20LP.deploy(f"Koyo LP {i}", f"LP{i}", 18, 10**9, {"from": accounts[0]}) for i in range(3)]
+
+
+@pytest.fixture(scope="module")
+def proxies(LiquidityGaugeV1, accounts, liquidity_gauge_factory, lp_tokens):
+    tx = liquidity_gauge_factory.deploy_gauges(lp_tokens, {"from": accounts[0]})
+    yield [LiquidityGaugeV1.at(event["gauge"]) for event in tx.events["GaugeDeployed"]]
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def test_proxies_are_initialized(accounts, liquidity_gauge_factory, lp_tokens, proxies, three_gauges):
+    assert liquidity_gauge_factory.gauge_count() == len(lp_tokens)
+    for i, (gauge, lp_token) in enumerate(zip(proxies, lp_tokens)):
+        assert liquidity_gauge_factory.gauges(i) == gauge
+        assert gauge.lp_token() == lp_token
+        assert gauge.name() == f"Koyo.finance LP{i} Gauge Deposit"
+        assert gauge.symbol() == f"LP{i}-gauge"
+        assert gauge.owner() == accounts[0]
+        assert gauge.inflation_rate() == three_gauges[0].inflation_rate()
+
+
+def test_initialize_once(accounts, liquidity_gauge_factory, lp_tokens, proxies):
+    with brownie.reverts("dev: already initialized"):
+        proxies[0].initialize(lp_tokens[1], accounts[1], {"from": accounts[1]})
+
+
+def test_implementation_cannot_be_initialized(LiquidityGaugeV1, accounts, liquidity_gauge_factory, lp_tokens):
+    implementation = LiquidityGaugeV1.at(liquidity_gauge_factory.implementation())
+    with brownie.reverts("dev: already initialized"):
+        implementation.initialize(lp_tokens[0], accounts[1], {"from": accounts[1]})
+
+
+def test_owner_only(accounts, liquidity_gauge_factory, lp_tokens):
+    with brownie.reverts("dev: owner only"):
+        liquidity_gauge_factory.deploy_gauge(lp_tokens[0], {"from": accounts[1]})
+    with brownie.reverts("dev: owner only"):
+        liquidity_gauge_factory.deploy_gauges(lp_tokens, {"from": accounts[1]})
+
+
+def test_proxy_accrues_like_a_gauge(
+    LiquidityGaugeV1, accounts, chain, gauge_controller, mock_lp_token, liquidity_gauge_factory, three_gauges
+):
+    # a proxy and a full deployment of the same LP token with the same weight
+    tx = liquidity_gauge_factory.deploy_gauge(mock_lp_token, {"from": accounts[0]})
+    proxy = LiquidityGaugeV1.at(tx.events["GaugeDeployed"]["gauge"])
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+    gauge_controller.add_gauges([three_gauges[0], proxy], [0, 0], [10**18, 10**18], {"from": accounts[0]})
+    chain.sleep(DAY)
+
+    user = accounts[1]
+    mock_lp_token.transfer(user, 2 * 10**18, {"from": accounts[0]})
+    for gauge in (three_gauges[0], proxy):
+        mock_lp_token.approve(gauge, 10**18, {"from": user})
+        gauge.deposit(10**18, {"from": user})
+
+    chain.sleep(2 * WEEK)
+    chain.mine()
+    for gauge in (three_gauges[0], proxy):
+        gauge.user_checkpoint(user, {"from": user})
+
+    assert proxy.integrate_fraction(user) > 0
+    # deposits and checkpoints are a block apart
+    assert approx(proxy.integrate_fraction(user), three_gauges[0].integrate_fraction(user), 1e-4)
@@ -0,0 +1,164 @@
+import brownie
+import pytest
+
+from scripts.analytics.epoch_rewards import EpochRewards, GaugeReplay, MerkleTree
+
+DAY = 86400
+WEEK = 7 * DAY
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(
+    accounts,
+    chain,
+    koyo,
+    voting_escrow,
+    minter,
+    gauge_controller,
+    gauge_distributor,
+    merkle_distributor,
+    three_gauges,
+    mock_lp_token,
+    minter_initial_treasury,
+    minter_initial_team_members,
+    minter_initial_advisors,
+    minter_initial_boba_bar,
+):
+    chain.sleep(DAY)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+    for i, gauge in enumerate(three_gauges):
+        gauge_controller.add_gauge(gauge, 0, 10**18 * (i + 1), {"from": accounts[0]})
+
+    for i, acct in enumerate(accounts[1:6]):
+        mock_lp_token.transfer(acct, 10**22, {"from": accounts[0]})
+        for gauge in three_gauges:
+            mock_lp_token.approve(gauge, 2**256 - 1, {"from": acct})
+        # boosts of different size for some of the users
+        if i < 3:
+            koyo.transfer(acct, 10**21, {"from": accounts[0]})
+            koyo.approve(voting_escrow, 10**21, {"from": acct})
+            voting_escrow.create_lock(10**20 * (i + 1), chain.time() + (10 + 20 * i) * WEEK, {"from": acct})
+
+    koyo.set_minter(minter, {"from": accounts[0]})
+    minter.set_addresses(
+        [gauge_distributor],
+        minter_initial_treasury,
+        minter_initial_team_members,
+        minter_initial_advisors,
+        minter_initial_boba_bar,
+        {"from": accounts[0]},
+    )
+    gauge_distributor.set_epoch_distributor(merkle_distributor, {"from": accounts[0]})
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def _activity(accounts, chain, gauges, rounds, distributor=None):
+    """
+    Deposits, withdrawals, transfers and checkpoints spread over `rounds` days.
+    """
+    users = accounts[1:6]
+    for i in range(rounds):
+        chain.sleep(DAY + 3600 * i)
+        acct = users[i % len(users)]
+        gauge = gauges[i % len(gauges)]
+        balance = gauge.balanceOf(acct)
+
+        if i % 5 in (0, 3) or balance == 0:
+            gauge.deposit(10**18 * (i + 1), {"from": acct})
+        elif i % 5 == 1:
+            gauge.withdraw(balance // 3, {"from": acct})
+        elif i % 5 == 2:
+            gauge.transfer(users[(i + 2) % len(users)], balance // 2, {"from": acct})
+        elif distributor is not None:
+            distributor.distribute(gauge, {"from": acct})
+        else:
+            gauge.user_checkpoint(acct, {"from": acct})
+
+
+def _replays(accounts, chain, gauge_controller, gauges, start):
+    replays = {}
+    for gauge in gauges:
+        gauge_controller.checkpoint_gauge(gauge, {"from": accounts[0]})
+        weeks = range(start // WEEK * WEEK, chain.time() + 1, WEEK)
+        weights = {week: gauge_controller.gauge_relative_weight(gauge, week) for week in weeks}
+        replays[gauge.address] = GaugeReplay.from_chain(gauge, weights)
+    return replays
+
+
+def test_replay_matches_gauge(accounts, chain, gauge_controller, three_gauges):
+    start = chain.time()
+    _activity(accounts, chain, three_gauges, 30)
+    gauge_controller.change_gauge_weight(three_gauges[0], 5 * 10**18, {"from": accounts[0]})
+    chain.sleep(WEEK)
+    _activity(accounts, chain, three_gauges, 10)
+
+    replays = _replays(accounts, chain, gauge_controller, three_gauges, start)
+    for gauge in three_gauges:
+        replay = replays[gauge.address]
+        assert replay.integrate_inv_supply == gauge.integrate_inv_supply(gauge.period())
+        assert replay.working_supply == gauge.working_supply()
+        for acct in accounts[1:6]:
+            state = replay.users[acct.address]
+            assert state.working_balance == gauge.working_balances(acct)
+            assert state.integrate_fraction == gauge.integrate_fraction(acct)
+
+    # projected amounts match a checkpoint at that time
+    chain.sleep(2 * WEEK)
+    replays = _replays(accounts, chain, gauge_controller, three_gauges, start)
+    for gauge in three_gauges:
+        replay = replays[gauge.address]
+        for acct in accounts[1:6]:
+            tx = gauge.user_checkpoint(acct, {"from": acct})
+            assert replay.integrate_fractions(tx.timestamp)[acct.address] == gauge.integrate_fraction(acct)
+            replay.apply_event("UpdateLiquidityLimit", dict(tx.events["UpdateLiquidityLimit"]), tx.timestamp)
+
+
+def test_epoch_claims(accounts, chain, koyo, gauge_controller, gauge_distributor, merkle_distributor, three_gauges):
+    start = chain.time()
+    _activity(accounts, chain, three_gauges, 15, gauge_distributor)
+
+    for gauge in three_gauges:
+        gauge_distributor.add_epoch_gauge(gauge, {"from": accounts[0]})
+    distributed = {
+        gauge.address: {acct.address: gauge_distributor.distributed(acct, gauge) for acct in accounts[1:6]}
+        for gauge in three_gauges
+    }
+    assert any(amount for amounts in distributed.values() for amount in amounts.values())
+
+    _activity(accounts, chain, three_gauges, 10)
+    end = (chain.time() // WEEK + 1) * WEEK
+    chain.sleep(end - chain.time() + 60)
+
+    amounts = EpochRewards(_replays(accounts, chain, gauge_controller, three_gauges, start), distributed).amounts(end)
+    tree = MerkleTree(amounts)
+    merkle_distributor.update_root(tree.root, end, tree.total, {"from": accounts[0]})
+
+    for acct in accounts[1:6]:
+        balance = koyo.balanceOf(acct)
+        merkle_distributor.claim(acct, amounts[acct.address], tree.proof(acct.address), {"from": acct})
+        assert koyo.balanceOf(acct) - balance == amounts[acct.address]
+
+        # together with what was distributed before, no more than the gauges accrued
+        projected = sum(gauge.projected_integrate_fraction(acct) for gauge in three_gauges)
+        assert sum(distributed[gauge.address][acct.address] for gauge in three_gauges) + amounts[acct.address] <= projected
+
+    assert koyo.balanceOf(merkle_distributor) == 0
+
+
+def test_add_epoch_gauge(accounts, gauge_distributor, three_gauges):
+    gauge = three_gauges[0]
+    with brownie.reverts("dev: owner only"):
+        gauge_distributor.add_epoch_gauge(gauge, {"from": accounts[1]})
+
+    gauge_distributor.add_epoch_gauge(gauge, {"from": accounts[0]})
+
+    assert gauge_distributor.pending_for(accounts[1], [gauge]) == [0]
+    with brownie.reverts("dev: gauge is distributed by epoch"):
+        gauge_distributor.distribute(gauge, {"from": accounts[1]})
+    with brownie.reverts("dev: already distributed by epoch"):
+        gauge_distributor.add_epoch_gauge(gauge, {"from": accounts[0]})
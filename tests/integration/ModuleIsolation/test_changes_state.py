@@ -0,0 +1,23 @@
+"""
+Changes the deployed stack for the whole module, without `fn_isolation`.
+`test_starts_from_stack.py` runs next and has to find none of it.
+"""
+
+WEEK = 86400 * 7
+
+
+def test_add_type(accounts, gauge_controller):
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+
+    assert gauge_controller.n_gauge_types() == 1
+
+
+def test_sleep(chain):
+    chain.sleep(100 * WEEK)
+    chain.mine()
+
+
+def test_changes_last(chain, gauge_controller, stack_snapshot):
+    assert gauge_controller.n_gauge_types() == 1
+    assert chain.height > stack_snapshot["height"]
+    assert chain.time() > stack_snapshot["time"] + 100 * WEEK
@@ -0,0 +1,28 @@
+"""
+Runs after `test_changes_state.py` (on the same worker unless the modules are
+split across `-n` workers) and starts from the deployed stack regardless.
+"""
+
+from tests.conftest import _revert_to_stack
+
+WEEK = 86400 * 7
+
+
+def test_starts_from_stack(chain, gauge_controller, stack_snapshot):
+    assert gauge_controller.n_gauge_types() == 0
+    assert chain.height == stack_snapshot["height"]
+    assert chain.time() < stack_snapshot["time"] + WEEK
+
+
+def test_reverts_more_than_once(accounts, chain, gauge_controller, stack_snapshot):
+    # every revert uses up the snapshot and stores the one taken after it
+    for _ in range(2):
+        gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+        chain.sleep(WEEK)
+        chain.mine()
+
+        _revert_to_stack(chain, stack_snapshot)
+
+        assert gauge_controller.n_gauge_types() == 0
+        assert chain.height == stack_snapshot["height"]
+        assert chain.time() < stack_snapshot["time"] + WEEK
@@ -0,0 +1,75 @@
+from scripts.analytics.multicall import MulticallReader, gauge_snapshot
+
+DAY = 86400
+WEEK = 7 * DAY
+
+
+def test_gauge_snapshot(
+    web3,
+    chain,
+    accounts,
+    koyo,
+    voting_escrow,
+    gauge_controller,
+    gauge_distributor,
+    three_gauges,
+    mock_lp_token,
+    multicall,
+):
+    users = accounts[:5]
+
+    chain.sleep(DAY)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+    for i, gauge in enumerate(three_gauges):
+        gauge_controller.add_gauge(gauge, 0, 100 * (i + 1), {"from": accounts[0]})
+
+    for user in users:
+        if user != accounts[0]:
+            mock_lp_token.transfer(user, 10**21, {"from": accounts[0]})
+            koyo.transfer(user, 10**21, {"from": accounts[0]})
+        koyo.approve(voting_escrow, 10**21, {"from": user})
+        voting_escrow.create_lock(10**20, chain.time() + 20 * WEEK, {"from": user})
+        for gauge in three_gauges:
+            mock_lp_token.approve(gauge, 2**256 - 1, {"from": user})
+            gauge.deposit(10**18, {"from": user})
+
+    chain.sleep(WEEK)
+    chain.mine()
+
+    # small chunks so the snapshot spans several concurrent eth_calls
+    reader = MulticallReader(web3.provider.endpoint_uri, multicall.address, chunk_size=16, pool_size=4)
+    snapshot = gauge_snapshot(reader, three_gauges, users, voting_escrow, gauge_controller, gauge_distributor)
+    block = snapshot["block"]
+
+    assert snapshot["total_supply"] == voting_escrow.totalSupply(block_identifier=block)
+    for user in users:
+        assert snapshot["users"][user]["ve_balance"] == voting_escrow.balanceOf(user, block_identifier=block)
+
+    for gauge in three_gauges:
+        state = snapshot["gauges"][gauge.address]
+        assert state["relative_weight"] == gauge_controller.gauge_relative_weight(gauge, block_identifier=block)
+        assert state["working_supply"] == gauge.working_supply(block_identifier=block)
+
+        for user in users:
+            user_state = state["users"][user]
+            assert user_state["balance"] == gauge.balanceOf(user, block_identifier=block)
+            assert user_state["working_balance"] == gauge.working_balances(user, block_identifier=block)
+            assert user_state["integrate_fraction"] == gauge.integrate_fraction(user, block_identifier=block)
+            assert user_state["claimable_tokens"] == gauge.claimable_tokens.call(user, block_identifier=block)
+            assert user_state["claimable_tokens"] > 0
+
+
+def test_failed_call_is_none(web3, koyo, multicall):
+    reader = MulticallReader(web3.provider.endpoint_uri, multicall.address)
+
+    result = reader.run(
+        [
+            reader.call("Koyo", koyo, "totalSupply", key="supply"),
+            # `Koyo` has no `locked`, the call reverts inside the aggregate
+            reader.call("VotingEscrow", koyo, "locked__end", koyo.address, key="missing"),
+        ]
+    )
+
+    assert result["supply"] == koyo.totalSupply()
+    assert result["missing"] is None
@@ -208,3 +208,12 @@ def test_state_machine(state_machine, accounts, VotingEscrow):
     )
 
     state_machine(StateMachine, accounts[:10], token, voting_escrow, settings={"max_examples": 3})
+
+
+def test_state_machine_v2(state_machine, accounts, VotingEscrowV2):
+    token = ERC20("Koyo", "KOYO", 18)
+    voting_escrow = VotingEscrowV2.deploy(
+        token, "Voting-escrowed KOYO", "veKOYO", "veKOYO_2", brownie.ZERO_ADDRESS, {"from": accounts[0]}
+    )
+
+    state_machine(StateMachine, accounts[:10], token, voting_escrow, settings={"max_examples": 3})
@@ -0,0 +1,145 @@
+import pytest
+
+from scripts.analytics.ve_simulator import VotingEscrowSimulator
+
+DAY = 86400
+WEEK = 7 * DAY
+MAXTIME = 365 * DAY
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def _point_history(voting_escrow):
+    return [voting_escrow.point_history(i) for i in range(voting_escrow.epoch() + 1)]
+
+
+def test_simulator_matches_contract(web3, chain, accounts, koyo, voting_escrow):
+    holders = accounts[:6]
+    amount = 1000 * 10**18
+
+    chain.sleep(DAY)
+    chain.mine()
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    for i, acct in enumerate(holders):
+        if i:
+            koyo.transfer(acct, amount * 4, {"from": accounts[0]})
+        koyo.approve(voting_escrow, amount * 4, {"from": acct})
+
+    blocks = []
+    for i, acct in enumerate(holders):
+        chain.sleep(DAY + i * 3600)
+        voting_escrow.create_lock(
+            amount * (i + 1) // 2, chain.time() + (i + 1) * 5 * WEEK, {"from": acct}
+        )
+        blocks.append(web3.eth.block_number)
+
+    chain.sleep(2 * WEEK)
+    voting_escrow.increase_amount(amount, {"from": holders[0]})
+    blocks.append(web3.eth.block_number)
+    voting_escrow.increase_unlock_time(chain.time() + 40 * WEEK, {"from": holders[1]})
+    blocks.append(web3.eth.block_number)
+    voting_escrow.force_withdraw({"from": holders[2]})
+    blocks.append(web3.eth.block_number)
+
+    chain.sleep(6 * WEEK)
+    voting_escrow.withdraw({"from": holders[0]})
+    blocks.append(web3.eth.block_number)
+    voting_escrow.create_lock(amount, chain.time() + 10 * WEEK, {"from": holders[0]})
+    blocks.append(web3.eth.block_number)
+
+    chain.sleep(3 * DAY)
+    chain.mine()
+
+    head = chain[-1]
+    snapshot = VotingEscrowSimulator.from_chain(voting_escrow).snapshot(
+        head.number, head.timestamp
+    )
+    idx = [snapshot.user_index(acct.address) for acct in holders]
+
+    assert snapshot.epoch == voting_escrow.epoch()
+
+    balances = snapshot.balance_of()
+    assert list(balances[idx]) == [voting_escrow.balanceOf(acct) for acct in holders]
+
+    timestamps = [head.timestamp + i * DAY for i in range(0, 70, 3)]
+    assert list(snapshot.total_supply(timestamps)) == [
+        voting_escrow.totalSupply(t) for t in timestamps
+    ]
+
+    assert list(snapshot.total_supply_at(blocks)) == [
+        voting_escrow.totalSupplyAt(block) for block in blocks
+    ]
+
+    # the points themselves, times between them and one before the deployment
+    event_times = [chain[block].timestamp for block in blocks]
+    past = sorted(event_times + [t - 2 * DAY for t in event_times]) + [voting_escrow.point_history(0)[2] - 1]
+    assert list(snapshot.total_supply(past)) == [voting_escrow.totalSupply(t) for t in past]
+    assert list(snapshot.total_supply_at_time(past)) == [voting_escrow.totalSupplyAtTime(t) for t in past]
+
+    balances_past = snapshot.balance_of(past)
+    balances_at_time = snapshot.balance_of_at_time(past)
+    for t, row, row_at_time in zip(past, balances_past, balances_at_time):
+        expected = [voting_escrow.balanceOf(acct, t) for acct in holders]
+        assert list(row[idx]) == expected
+        assert list(row_at_time[idx]) == [voting_escrow.balanceOfAtTime(acct, t) for acct in holders] == expected
+
+    balances_at = snapshot.balance_of_at(blocks)
+    for row, block in zip(balances_at, blocks):
+        assert list(row[idx]) == [voting_escrow.balanceOfAt(acct, block) for acct in holders]
+
+
+def test_simulator_matches_batched_locks(chain, accounts, koyo, voting_escrow):
+    chain.sleep(DAY)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    koyo.approve(voting_escrow, 2**256 - 1, {"from": accounts[0]})
+
+    batch = accounts[1:9]
+    voting_escrow.create_locks_for(
+        batch,
+        [10**20 * (i + 1) for i in range(len(batch))],
+        [chain.time() + (i % 4 + 1) * 5 * WEEK for i in range(len(batch))],
+        {"from": accounts[0]},
+    )
+    voting_escrow.create_lock_for(accounts[9], 10**21, chain.time() + 30 * WEEK, {"from": accounts[0]})
+    chain.sleep(2 * WEEK)
+    voting_escrow.create_locks_for(accounts[10:13], [10**21] * 3, [chain.time() + 20 * WEEK] * 3, {"from": accounts[0]})
+
+    chain.sleep(DAY)
+    chain.mine()
+
+    head = chain[-1]
+    sim = VotingEscrowSimulator.from_chain(voting_escrow)
+    snapshot = sim.snapshot(head.number, head.timestamp)
+    holders = accounts[1:13]
+    idx = [snapshot.user_index(acct.address) for acct in holders]
+
+    # one global point per batch, like the contract
+    assert snapshot.epoch == voting_escrow.epoch()
+    assert sim.point_history == _point_history(voting_escrow)
+    assert list(snapshot.balance_of()[idx]) == [voting_escrow.balanceOf(acct) for acct in holders]
+
+
+def test_simulator_matches_migrate_many(chain, accounts, koyo, voting_escrow, voting_escrow_v2):
+    chain.sleep(DAY)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    koyo.approve(voting_escrow, 2**256 - 1, {"from": accounts[0]})
+
+    holders = accounts[1:10]
+    for i, acct in enumerate(holders):
+        voting_escrow.create_lock_for(acct, 10**20 * (i + 1), chain.time() + (i % 4 + 1) * 5 * WEEK, {"from": accounts[0]})
+    chain.sleep(7 * WEEK)
+    voting_escrow.commit_next_ve_contract(voting_escrow_v2, {"from": accounts[0]})
+    voting_escrow.apply_next_ve_contract({"from": accounts[0]})
+
+    voting_escrow.migrate({"from": holders[1]})
+    # the five week locks have expired, they and the migrated one are skipped
+    voting_escrow.migrate_many(holders, {"from": accounts[0]})
+    chain.mine()
+
+    sim = VotingEscrowSimulator.from_chain(voting_escrow)
+
+    assert sim.epoch == voting_escrow.epoch()
+    assert sim.point_history == _point_history(voting_escrow)
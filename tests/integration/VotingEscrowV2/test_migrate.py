@@ -0,0 +1,56 @@
+import brownie
+import pytest
+
+DAY = 86400
+WEEK = 7 * DAY
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, chain, koyo, voting_escrow, voting_escrow_v2):
+    chain.sleep(DAY)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    for i, acct in enumerate(accounts[1:5]):
+        koyo.transfer(acct, 10**22, {"from": accounts[0]})
+        koyo.approve(voting_escrow, 2**256 - 1, {"from": acct})
+        koyo.approve(voting_escrow_v2, 2**256 - 1, {"from": acct})
+        voting_escrow.create_lock(10**21 * (i + 1), chain.time() + (i + 2) * 4 * WEEK, {"from": acct})
+    chain.sleep(WEEK)
+
+    voting_escrow.commit_next_ve_contract(voting_escrow_v2, {"from": accounts[0]})
+    voting_escrow.apply_next_ve_contract({"from": accounts[0]})
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def test_migrate(accounts, koyo, voting_escrow, voting_escrow_v2):
+    for acct in accounts[1:5]:
+        locked = voting_escrow.locked(acct)
+        tx = voting_escrow.migrate({"from": acct})
+
+        assert voting_escrow_v2.locked(acct) == locked
+        assert voting_escrow.locked(acct) == (0, 0)
+        assert tx.events["Deposit"]["type"] == 4
+
+    assert koyo.balanceOf(voting_escrow) == 0
+    assert koyo.balanceOf(voting_escrow_v2) == 10**21 * 10
+    assert voting_escrow_v2.supply() == 10**21 * 10
+    assert voting_escrow_v2.totalSupply() == sum(voting_escrow_v2.balanceOf(acct) for acct in accounts[1:5])
+
+
+def test_merges_existing_lock(accounts, chain, voting_escrow, voting_escrow_v2):
+    acct = accounts[1]
+    locked = voting_escrow.locked(acct)
+    voting_escrow_v2.create_lock(10**20, chain.time() + 20 * WEEK, {"from": acct})
+    end = voting_escrow_v2.locked__end(acct)
+
+    voting_escrow.migrate({"from": acct})
+
+    assert voting_escrow_v2.locked(acct) == (locked[0] + 10**20, max(end, locked[1]))
+
+
+def test_previous_ve_only(accounts, voting_escrow_v2):
+    with brownie.reverts("dev: previous ve only"):
+        voting_escrow_v2.migrate_lock(accounts[1], 10**21, {"from": accounts[1]})
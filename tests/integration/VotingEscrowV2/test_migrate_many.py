@@ -0,0 +1,111 @@
+import brownie
+import pytest
+
+from scripts.deployment.migrate_locks import active_lockers, lockers, migrate_all
+
+DAY = 86400
+WEEK = 7 * DAY
+N_LOCKS = 40
+
+
+@pytest.fixture(scope="module")
+def holders(accounts, chain, koyo, voting_escrow, voting_escrow_v2):
+    chain.sleep(DAY)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    koyo.approve(voting_escrow, 2**256 - 1, {"from": accounts[0]})
+    koyo.approve(voting_escrow_v2, 2**256 - 1, {"from": accounts[0]})
+
+    addrs = [accounts.add() for _ in range(N_LOCKS)]
+    for i, addr in enumerate(addrs):
+        voting_escrow.create_lock_for(addr, 10**20 * (i + 1), chain.time() + (i % 25 + 1) * WEEK, {"from": accounts[0]})
+    # a few of them already locked in the new contract
+    for addr in addrs[:5]:
+        voting_escrow_v2.create_lock_for(addr, 10**20, chain.time() + 10 * WEEK, {"from": accounts[0]})
+    chain.sleep(2 * WEEK)
+
+    voting_escrow.commit_next_ve_contract(voting_escrow_v2, {"from": accounts[0]})
+    voting_escrow.apply_next_ve_contract({"from": accounts[0]})
+
+    # the first two weeks worth of locks have expired by now
+    yield addrs
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def _state(chain, koyo, voting_escrow, voting_escrow_v2, addrs):
+    now = chain[-1].timestamp
+    return (
+        [voting_escrow.locked(addr) for addr in addrs],
+        [voting_escrow_v2.locked(addr) for addr in addrs],
+        [voting_escrow_v2.balanceOf(addr) for addr in addrs],
+        [voting_escrow_v2.totalSupply(now + i * WEEK) for i in range(30)],
+        voting_escrow.supply(),
+        voting_escrow_v2.supply(),
+        koyo.balanceOf(voting_escrow),
+        koyo.balanceOf(voting_escrow_v2),
+    )
+
+
+def test_same_as_migrate(accounts, chain, koyo, voting_escrow, voting_escrow_v2, holders):
+    active = active_lockers(voting_escrow, holders)
+    assert 0 < len(active) < len(holders)
+
+    chain.snapshot()
+    for addr in active:
+        voting_escrow.migrate({"from": addr})
+    expected = _state(chain, koyo, voting_escrow, voting_escrow_v2, holders)
+    chain.revert()
+
+    # expired locks and repeated addresses are skipped
+    tx = voting_escrow.migrate_many(holders + holders[:3], {"from": accounts[0]})
+
+    assert _state(chain, koyo, voting_escrow, voting_escrow_v2, holders) == expected
+    assert len(tx.events["Migrate"]) == len(active)
+    assert len([c for c in tx.subcalls if c["to"] == voting_escrow_v2]) == 1
+
+
+def test_owner_only(accounts, voting_escrow, holders):
+    with brownie.reverts("dev: owner only"):
+        voting_escrow.migrate_many(holders[:2], {"from": accounts[1]})
+
+
+def test_previous_ve_only(accounts, voting_escrow_v2, holders):
+    with brownie.reverts("dev: previous ve only"):
+        voting_escrow_v2.migrate_locks(holders[:1], [10**20], [0], {"from": accounts[0]})
+
+
+def test_migrate_many_gas(accounts, chain, voting_escrow, holders):
+    active = active_lockers(voting_escrow, holders)[:30]
+
+    chain.snapshot()
+    single = sum(voting_escrow.migrate({"from": addr}).gas_used for addr in active)
+    chain.revert()
+
+    chain.snapshot()
+    batch = voting_escrow.migrate_many(active, {"from": accounts[0]}).gas_used
+    chain.revert()
+
+    assert batch < single * 0.6
+
+
+def test_script(accounts, voting_escrow, voting_escrow_v2, holders):
+    found = lockers(voting_escrow, page_size=7)
+    assert found == holders
+
+    addrs = active_lockers(voting_escrow, found)
+    txs = migrate_all(
+        voting_escrow,
+        addrs,
+        lambda gas_limit=None: {"from": accounts[0], "gas_limit": gas_limit},
+        max_batch_gas=2_500_000,
+    )
+
+    assert len(txs) > 1
+    assert all(tx.gas_used <= 2_500_000 for tx in txs)
+    assert active_lockers(voting_escrow, found) == []
+    assert voting_escrow.supply() == sum(voting_escrow.locked(addr)[0] for addr in found)
+    for addr in addrs:
+        assert voting_escrow_v2.locked(addr)[0] > 0
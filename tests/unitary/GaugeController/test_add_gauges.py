@@ -0,0 +1,87 @@
+import brownie
+import pytest
+
+WEEK = 86400 * 7
+GAUGES = [f"0x{i:040x}" for i in range(1, 13)]
+TYPES = [i % 2 for i in range(12)]
+WEIGHTS = [0 if i == 3 else 10**18 * (i + 1) for i in range(12)]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, chain, gauge_controller):
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+    gauge_controller.add_type("Stable", 3 * 10**18, {"from": accounts[0]})
+    # a gauge added in an earlier week, its sum and the total are stale
+    gauge_controller.add_gauge(GAUGES[0], 0, 5 * 10**17, {"from": accounts[0]})
+    chain.sleep(3 * WEEK)
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def _state(gauge_controller):
+    return (
+        gauge_controller.n_gauges(),
+        [gauge_controller.gauges(i) for i in range(len(GAUGES))],
+        [gauge_controller.gauge_types(gauge) for gauge in GAUGES],
+        [gauge_controller.get_gauge_weight(gauge) for gauge in GAUGES],
+        [gauge_controller.get_weights_sum_per_type(i) for i in range(2)],
+        gauge_controller.get_total_weight(),
+    )
+
+
+def _relative_weights(accounts, chain, gauge_controller):
+    chain.sleep(WEEK)
+    gauge_controller.checkpoint({"from": accounts[0]})
+    return [gauge_controller.gauge_relative_weight(gauge) for gauge in GAUGES]
+
+
+def test_matches_single_adds(accounts, chain, gauge_controller):
+    chain.snapshot()
+    for gauge, gauge_type, weight in zip(GAUGES[1:], TYPES[1:], WEIGHTS[1:]):
+        gauge_controller.add_gauge(gauge, gauge_type, weight, {"from": accounts[0]})
+    expected = _state(gauge_controller)
+    expected_relative = _relative_weights(accounts, chain, gauge_controller)
+    chain.revert()
+
+    gauge_controller.add_gauges(GAUGES[1:], TYPES[1:], WEIGHTS[1:], {"from": accounts[0]})
+
+    assert _state(gauge_controller) == expected
+    assert _relative_weights(accounts, chain, gauge_controller) == expected_relative
+
+
+def test_gas_per_gauge(accounts, chain, gauge_controller):
+    chain.snapshot()
+    single = sum(
+        gauge_controller.add_gauge(gauge, gauge_type, weight, {"from": accounts[0]}).gas_used
+        for gauge, gauge_type, weight in zip(GAUGES[1:], TYPES[1:], WEIGHTS[1:])
+    )
+    chain.revert()
+
+    tx = gauge_controller.add_gauges(GAUGES[1:], TYPES[1:], WEIGHTS[1:], {"from": accounts[0]})
+
+    assert tx.gas_used < single
+
+
+def test_length_mismatch(accounts, gauge_controller):
+    with brownie.reverts("dev: length mismatch"):
+        gauge_controller.add_gauges(GAUGES[1:3], [0], [1, 2], {"from": accounts[0]})
+
+
+def test_owner_only(accounts, gauge_controller):
+    with brownie.reverts():
+        gauge_controller.add_gauges(GAUGES[1:3], [0, 0], [1, 2], {"from": accounts[1]})
+
+
+def test_same_gauge_twice(accounts, gauge_controller):
+    with brownie.reverts("dev: cannot add the same gauge twice"):
+        gauge_controller.add_gauges([GAUGES[1], GAUGES[1]], [0, 0], [1, 2], {"from": accounts[0]})
+    with brownie.reverts("dev: cannot add the same gauge twice"):
+        gauge_controller.add_gauges([GAUGES[0]], [0], [1], {"from": accounts[0]})
+
+
+def test_unknown_type(accounts, gauge_controller):
+    with brownie.reverts():
+        gauge_controller.add_gauges(GAUGES[1:3], [0, 2], [1, 2], {"from": accounts[0]})
@@ -0,0 +1,30 @@
+import pytest
+
+WEEK = 86400 * 7
+GAUGES = [f"0x{i:040x}" for i in range(1, 4)]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, chain, gauge_controller):
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+    gauge_controller.add_gauge(GAUGES[0], 0, 10**18, {"from": accounts[0]})
+    gauge_controller.add_gauge(GAUGES[1], 0, 3 * 10**18, {"from": accounts[0]})
+    # nobody checkpoints the type for a few weeks
+    chain.sleep(3 * WEEK)
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def test_relative_weights_unchanged(accounts, chain, gauge_controller):
+    gauge_controller.add_gauge(GAUGES[2], 0, 0, {"from": accounts[0]})
+    chain.sleep(3 * WEEK)
+    gauge_controller.checkpoint({"from": accounts[0]})
+
+    start = (chain.time() - 5 * WEEK) // WEEK * WEEK
+    for t in range(start, chain.time() + WEEK, WEEK):
+        assert gauge_controller.gauge_relative_weight(GAUGES[0], t) == 10**18 // 4
+        assert gauge_controller.gauge_relative_weight(GAUGES[1], t) == 3 * 10**18 // 4
+        assert gauge_controller.gauge_relative_weight(GAUGES[2], t) == 0
@@ -0,0 +1,37 @@
+import pytest
+
+WEEK = 86400 * 7
+IDLE_WEEKS = [1, 10, 100]
+
+
+@pytest.fixture(scope="module")
+def voted_gauge(accounts, chain, koyo, voting_escrow, gauge_controller, three_gauges):
+    gauge = three_gauges[0]
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+    gauge_controller.add_gauge(gauge, 0, 10**18, {"from": accounts[0]})
+
+    chain.sleep(86400)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    # three locks -> three scheduled slope changes
+    for i, acct in enumerate(accounts[1:4]):
+        koyo.transfer(acct, 10**21, {"from": accounts[0]})
+        koyo.approve(voting_escrow, 10**21, {"from": acct})
+        voting_escrow.create_lock(10**21, chain.time() + (i + 1) * 15 * WEEK, {"from": acct})
+        gauge_controller.vote_for_gauge_weights(gauge, 10000, {"from": acct})
+
+    yield gauge
+
+
+def test_checkpoint_gas_after_idle_weeks(accounts, chain, gauge_controller, voted_gauge):
+    gas_used = {}
+    for weeks in IDLE_WEEKS:
+        chain.snapshot()
+        chain.sleep(weeks * WEEK)
+        tx = gauge_controller.checkpoint_gauge(voted_gauge, {"from": accounts[0]})
+        gas_used[weeks] = tx.gas_used
+        chain.revert()
+
+    # filling weeks one at a time costs over 100k gas per week, skipping
+    # ahead only pays for the three slope changes
+    assert gas_used[10] < gas_used[1] * 1.25
+    assert gas_used[100] < gas_used[1] * 4
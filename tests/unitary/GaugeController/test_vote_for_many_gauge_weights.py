@@ -0,0 +1,86 @@
+import brownie
+import pytest
+
+WEEK = 86400 * 7
+GAUGES = [f"0x{i:040x}" for i in range(1, 8)]
+WEIGHTS = [1000, 2000, 500, 1500, 1000, 3000, 1000]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, chain, koyo, voting_escrow, gauge_controller):
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+    gauge_controller.add_type("Stable", 2 * 10**18, {"from": accounts[0]})
+    for i, gauge in enumerate(GAUGES):
+        gauge_controller.add_gauge(gauge, i % 2, 10**18, {"from": accounts[0]})
+
+    chain.sleep(86400)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    koyo.transfer(accounts[1], 10**21, {"from": accounts[0]})
+    koyo.approve(voting_escrow, 10**21, {"from": accounts[1]})
+    voting_escrow.create_lock(10**21, chain.time() + 40 * WEEK, {"from": accounts[1]})
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def _state(gauge_controller, voter):
+    return (
+        [gauge_controller.get_gauge_weight(gauge) for gauge in GAUGES],
+        gauge_controller.get_total_weight(),
+        gauge_controller.vote_user_power(voter),
+    )
+
+
+def test_matches_single_votes(accounts, chain, gauge_controller):
+    chain.snapshot()
+    for gauge, weight in zip(GAUGES, WEIGHTS):
+        gauge_controller.vote_for_gauge_weights(gauge, weight, {"from": accounts[1]})
+    expected = _state(gauge_controller, accounts[1])
+    chain.revert()
+
+    gauge_controller.vote_for_many_gauge_weights(GAUGES, WEIGHTS, {"from": accounts[1]})
+
+    assert _state(gauge_controller, accounts[1]) == expected
+
+
+def test_power_checked_over_batch(accounts, chain, gauge_controller):
+    gauge_controller.vote_for_many_gauge_weights(GAUGES[:2], [9000, 1000], {"from": accounts[1]})
+    chain.sleep(WEEK)
+
+    # 9000 + 9000 in between, 10000 once both votes are applied
+    gauge_controller.vote_for_many_gauge_weights(GAUGES[1::-1], [9000, 1000], {"from": accounts[1]})
+    assert gauge_controller.vote_user_power(accounts[1]) == 10000
+
+
+def test_too_much_power(accounts, gauge_controller):
+    with brownie.reverts("Used too much power"):
+        gauge_controller.vote_for_many_gauge_weights(GAUGES[:2], [9000, 1001], {"from": accounts[1]})
+
+
+def test_same_gauge_twice(accounts, gauge_controller):
+    with brownie.reverts("Cannot vote so often"):
+        gauge_controller.vote_for_many_gauge_weights(GAUGES[:1] * 2, [1000, 1000], {"from": accounts[1]})
+
+
+def test_length_mismatch(accounts, gauge_controller):
+    with brownie.reverts():
+        gauge_controller.vote_for_many_gauge_weights(GAUGES, WEIGHTS[:-1], {"from": accounts[1]})
+
+
+@pytest.mark.parametrize("n_gauges", [1, 7])
+def test_gas_against_single_votes(accounts, chain, gauge_controller, n_gauges):
+    chain.snapshot()
+    single = sum(
+        gauge_controller.vote_for_gauge_weights(gauge, weight, {"from": accounts[1]}).gas_used
+        for gauge, weight in zip(GAUGES[:n_gauges], WEIGHTS)
+    )
+    chain.revert()
+
+    batch = gauge_controller.vote_for_many_gauge_weights(
+        GAUGES[:n_gauges], WEIGHTS[:n_gauges], {"from": accounts[1]}
+    ).gas_used
+
+    if n_gauges > 1:
+        assert batch < single
@@ -0,0 +1,121 @@
+import brownie
+import pytest
+
+DAY = 86400
+WEEK = 7 * DAY
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, chain, koyo, voting_escrow, gauge_controller, three_gauges, mock_lp_token):
+    chain.sleep(DAY)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+    gauge_controller.add_gauge(three_gauges[0], 0, 10**18, {"from": accounts[0]})
+
+    # accounts 1-2 lock for two weeks, 3-4 for a year, 5-7 have no lock
+    for i, acct in enumerate(accounts[1:5]):
+        koyo.transfer(acct, 10**21, {"from": accounts[0]})
+        koyo.approve(voting_escrow, 10**21, {"from": acct})
+        voting_escrow.create_lock(10**21, chain.time() + (2 if i < 2 else 52) * WEEK, {"from": acct})
+    for i, acct in enumerate(accounts[1:8]):
+        mock_lp_token.transfer(acct, 10**21, {"from": accounts[0]})
+        mock_lp_token.approve(three_gauges[0], 10**21, {"from": acct})
+        three_gauges[0].deposit(10**18 * (i + 1), {"from": acct})
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def _before(gauge, addrs):
+    return {
+        addr: (gauge.integrate_fraction(addr), gauge.working_balances(addr), gauge.integrate_inv_supply_of(addr))
+        for addr in addrs
+    }
+
+
+def _working_balance(gauge, voting_escrow, addr, timestamp):
+    balance, supply = gauge.balanceOf(addr), gauge.totalSupply()
+    voting_balance = voting_escrow.balanceOf(addr, timestamp)
+    voting_total = voting_escrow.totalSupply(timestamp)
+    lim = balance * 40 // 100 + supply * voting_balance // voting_total * 60 // 100
+    return min(balance, lim)
+
+
+def _assert_checkpointed(gauge, voting_escrow, addr, before, tx):
+    integral = gauge.integrate_inv_supply(gauge.period())
+    fraction, working_balance, integral_of = before
+
+    assert gauge.integrate_checkpoint_of(addr) == tx.timestamp
+    assert gauge.integrate_inv_supply_of(addr) == integral
+    assert gauge.integrate_fraction(addr) == fraction + working_balance * (integral - integral_of) // 10**18
+    assert gauge.working_balances(addr) == _working_balance(gauge, voting_escrow, addr, tx.timestamp)
+
+
+def test_checkpoint_many(accounts, chain, voting_escrow, three_gauges):
+    gauge = three_gauges[0]
+    addrs = accounts[1:8]
+    chain.sleep(WEEK)
+    before = _before(gauge, addrs)
+
+    tx = gauge.checkpoint_many(addrs, {"from": accounts[0]})
+
+    assert gauge.period_timestamp(gauge.period()) == tx.timestamp
+    for addr in addrs:
+        _assert_checkpointed(gauge, voting_escrow, addr, before[addr], tx)
+    # every staker was checkpointed
+    assert gauge.working_supply() == sum(gauge.working_balances(addr) for addr in addrs)
+    assert [e["user"] for e in tx.events["UpdateLiquidityLimit"]] == addrs
+    assert tx.events["UpdateLiquidityLimit"][-1]["working_supply"] == gauge.working_supply()
+
+
+def test_checkpoint_many_duplicates(accounts, chain, voting_escrow, three_gauges):
+    gauge = three_gauges[0]
+    chain.sleep(WEEK)
+    before = _before(gauge, accounts[1:2])
+
+    tx = gauge.checkpoint_many([accounts[1], accounts[1]], {"from": accounts[0]})
+
+    _assert_checkpointed(gauge, voting_escrow, accounts[1], before[accounts[1]], tx)
+    assert gauge.working_supply() == sum(gauge.working_balances(addr) for addr in accounts[1:8])
+
+
+def test_checkpoint_many_unauthorized(accounts, three_gauges):
+    with brownie.reverts("dev: unauthorized"):
+        three_gauges[0].checkpoint_many([accounts[1]], {"from": accounts[1]})
+
+
+def test_kick_many(accounts, chain, voting_escrow, three_gauges):
+    gauge = three_gauges[0]
+    addrs = accounts[1:8]
+    # the two week locks have expired, the others did not change
+    chain.sleep(3 * WEEK)
+    before = _before(gauge, addrs)
+    last_checkpoints = [gauge.integrate_checkpoint_of(addr) for addr in addrs]
+
+    # anyone can kick
+    tx = gauge.kick_many(addrs, {"from": accounts[9]})
+
+    assert tx.return_value == 2
+    assert [e["user"] for e in tx.events["UpdateLiquidityLimit"]] == addrs[:2]
+    for addr in addrs[:2]:
+        _assert_checkpointed(gauge, voting_escrow, addr, before[addr], tx)
+        assert gauge.working_balances(addr) == gauge.balanceOf(addr) * 40 // 100
+    for addr, last in zip(addrs[2:], last_checkpoints[2:]):
+        assert gauge.integrate_checkpoint_of(addr) == last
+    assert gauge.working_supply() == sum(gauge.working_balances(addr) for addr in addrs)
+
+    # nothing left to kick
+    assert gauge.kick_many(addrs, {"from": accounts[9]}).return_value == 0
+
+
+def test_kick_many_skips_like_kick(accounts, chain, three_gauges):
+    gauge = three_gauges[0]
+    chain.sleep(3 * WEEK)
+
+    with brownie.reverts("dev: kick not allowed"):
+        gauge.kick(accounts[3], {"from": accounts[9]})
+    with brownie.reverts("dev: kick not needed"):
+        gauge.kick(accounts[5], {"from": accounts[9]})
+    assert gauge.kick_many([accounts[3], accounts[5]], {"from": accounts[9]}).return_value == 0
@@ -0,0 +1,58 @@
+import pytest
+
+WEEK = 86400 * 7
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, chain, gauge_controller, three_gauges, mock_lp_token):
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+    gauge_controller.add_gauge(three_gauges[0], 0, 10**18, {"from": accounts[0]})
+
+    for acct in accounts[1:4]:
+        mock_lp_token.transfer(acct, 10**21, {"from": accounts[0]})
+        mock_lp_token.approve(three_gauges[0], 10**21, {"from": acct})
+    # start an hour into the next week so the tests stay within one week
+    chain.sleep(WEEK - chain.time() % WEEK + 3600)
+    three_gauges[0].deposit(10**18, {"from": accounts[1]})
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def test_same_week_updates_in_place(accounts, chain, three_gauges):
+    gauge = three_gauges[0]
+    period = gauge.period()
+    integral = gauge.integrate_inv_supply(period)
+
+    for acct in accounts[1:4]:
+        chain.sleep(600)
+        tx = gauge.deposit(10**18, {"from": acct})
+
+        assert gauge.period() == period
+        assert gauge.period_timestamp(period) == tx.timestamp
+        assert gauge.integrate_checkpoint() == tx.timestamp
+        assert gauge.integrate_inv_supply(period) > integral
+        integral = gauge.integrate_inv_supply(period)
+
+    assert gauge.period_timestamp(period + 1) == 0
+
+
+def test_new_week_takes_new_period(accounts, chain, three_gauges):
+    gauge = three_gauges[0]
+    period = gauge.period()
+    chain.sleep(600)
+    last = gauge.user_checkpoint(accounts[1], {"from": accounts[1]})
+    integral = gauge.integrate_inv_supply(period)
+
+    chain.sleep(WEEK)
+    tx = gauge.deposit(10**18, {"from": accounts[2]})
+
+    assert gauge.period() == period + 1
+    assert gauge.period_timestamp(period + 1) == tx.timestamp
+    assert gauge.integrate_inv_supply(period + 1) > integral
+    # the last checkpoint of the previous week is kept
+    assert gauge.period_timestamp(period) == last.timestamp
+    assert gauge.integrate_inv_supply(period) == integral
+
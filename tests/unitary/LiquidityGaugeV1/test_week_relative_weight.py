@@ -0,0 +1,70 @@
+import pytest
+
+WEEK = 86400 * 7
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, chain, gauge_controller, three_gauges, mock_lp_token):
+    gauge_controller.add_type("Liquidity", 10**18, {"from": accounts[0]})
+    for gauge in three_gauges:
+        gauge_controller.add_gauge(gauge, 0, 10**18, {"from": accounts[0]})
+
+    for acct in accounts[1:3]:
+        mock_lp_token.transfer(acct, 10**21, {"from": accounts[0]})
+        mock_lp_token.approve(three_gauges[0], 10**21, {"from": acct})
+    # start an hour into the next week so the tests stay within one week
+    chain.sleep(WEEK - chain.time() % WEEK + 3600)
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def _controller_calls(tx, gauge_controller):
+    return [c for c in tx.subcalls if c["to"] == gauge_controller]
+
+
+def test_first_checkpoint_of_week_reads_controller(accounts, gauge_controller, three_gauges):
+    tx = three_gauges[0].deposit(10**18, {"from": accounts[1]})
+
+    # checkpoint_gauge + gauge_relative_weight for each week since deployment
+    assert len(_controller_calls(tx, gauge_controller)) >= 2
+
+
+def test_busy_week_reads_cache(accounts, chain, gauge_controller, three_gauges):
+    gauge = three_gauges[0]
+    gauge.deposit(10**18, {"from": accounts[1]})
+    chain.sleep(60)
+    deposit = gauge.deposit(10**18, {"from": accounts[2]})
+    chain.sleep(60)
+    withdraw = gauge.withdraw(10**18, {"from": accounts[2]})
+
+    assert not _controller_calls(deposit, gauge_controller)
+    assert not _controller_calls(withdraw, gauge_controller)
+
+
+def test_cached_weight_matches_controller(accounts, chain, gauge_controller, three_gauges):
+    gauge = three_gauges[0]
+    gauge.deposit(10**18, {"from": accounts[1]})
+    chain.sleep(3600)
+    gauge.user_checkpoint(accounts[1], {"from": accounts[1]})
+    before = gauge.integrate_inv_supply(gauge.period())
+    t_before = gauge.period_timestamp(gauge.period())
+
+    chain.sleep(3600)
+    gauge.user_checkpoint(accounts[1], {"from": accounts[1]})
+    dt = gauge.period_timestamp(gauge.period()) - t_before
+    weight = gauge_controller.gauge_relative_weight(gauge, t_before)
+
+    expected = before + gauge.inflation_rate() * weight * dt // gauge.working_supply()
+    assert gauge.integrate_inv_supply(gauge.period()) == expected
+
+
+def test_new_week_reads_controller_again(accounts, chain, gauge_controller, three_gauges):
+    gauge = three_gauges[0]
+    gauge.deposit(10**18, {"from": accounts[1]})
+    chain.sleep(WEEK)
+    tx = gauge.deposit(10**18, {"from": accounts[2]})
+
+    assert len(_controller_calls(tx, gauge_controller)) > 0
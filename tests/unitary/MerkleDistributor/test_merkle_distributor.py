@@ -0,0 +1,144 @@
+import brownie
+import pytest
+
+from scripts.analytics.epoch_rewards import MerkleTree
+
+WEEK = 86400 * 7
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(
+    accounts,
+    chain,
+    koyo,
+    minter,
+    gauge_distributor,
+    merkle_distributor,
+    minter_initial_treasury,
+    minter_initial_team_members,
+    minter_initial_advisors,
+    minter_initial_boba_bar,
+):
+    chain.sleep(86400)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    koyo.set_minter(minter, {"from": accounts[0]})
+    minter.set_addresses(
+        [gauge_distributor],
+        minter_initial_treasury,
+        minter_initial_team_members,
+        minter_initial_advisors,
+        minter_initial_boba_bar,
+        {"from": accounts[0]},
+    )
+    gauge_distributor.set_epoch_distributor(merkle_distributor, {"from": accounts[0]})
+    chain.sleep(WEEK)
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+@pytest.fixture(scope="module")
+def tree(accounts):
+    # an odd number of leaves, one node is carried up unchanged
+    yield MerkleTree({acct.address: 10**18 * (i + 1) for i, acct in enumerate(accounts[1:6])})
+
+
+def _epoch(chain):
+    return chain.time() // WEEK * WEEK
+
+
+def test_update_root(accounts, chain, koyo, gauge_distributor, merkle_distributor, tree):
+    epoch = _epoch(chain)
+    tx = merkle_distributor.update_root(tree.root, epoch, tree.total, {"from": accounts[0]})
+
+    assert merkle_distributor.merkle_root() == "0x" + tree.root.hex()
+    assert merkle_distributor.epoch() == epoch
+    assert merkle_distributor.total() == tree.total
+    assert koyo.balanceOf(merkle_distributor) == tree.total
+    assert tx.events["FundEpoch"]["amount"] == tree.total
+    assert tx.events["UpdateRoot"]["epoch"] == epoch
+
+
+def test_claim(accounts, chain, koyo, merkle_distributor, tree):
+    merkle_distributor.update_root(tree.root, _epoch(chain), tree.total, {"from": accounts[0]})
+
+    for acct in accounts[1:6]:
+        amount = tree.amounts[acct.address]
+        proof = tree.proof(acct.address)
+        assert merkle_distributor.claimable(acct, amount, proof) == amount
+
+        # anyone can claim on behalf of an account
+        tx = merkle_distributor.claim(acct, amount, proof, {"from": accounts[0]})
+
+        assert tx.return_value == amount
+        assert tx.events["Claim"]["account"] == acct
+        assert tx.events["Claim"]["amount"] == amount
+        assert koyo.balanceOf(acct) == amount
+        assert merkle_distributor.claimed(acct) == amount
+
+    assert koyo.balanceOf(merkle_distributor) == 0
+
+
+def test_claim_twice(accounts, chain, koyo, merkle_distributor, tree):
+    merkle_distributor.update_root(tree.root, _epoch(chain), tree.total, {"from": accounts[0]})
+    acct = accounts[1]
+    amount = tree.amounts[acct.address]
+    merkle_distributor.claim(acct, amount, tree.proof(acct.address), {"from": acct})
+
+    tx = merkle_distributor.claim(acct, amount, tree.proof(acct.address), {"from": acct})
+
+    assert tx.return_value == 0
+    assert "Claim" not in tx.events
+    assert koyo.balanceOf(acct) == amount
+
+
+def test_cumulative_roots(accounts, chain, koyo, merkle_distributor, tree):
+    merkle_distributor.update_root(tree.root, _epoch(chain), tree.total, {"from": accounts[0]})
+    acct = accounts[1]
+    merkle_distributor.claim(acct, tree.amounts[acct.address], tree.proof(acct.address), {"from": acct})
+
+    chain.sleep(WEEK)
+    second = MerkleTree({address: 3 * amount for address, amount in tree.amounts.items()})
+    merkle_distributor.update_root(second.root, _epoch(chain), second.total, {"from": accounts[0]})
+
+    # only the amount added to the tree is taken from the distributor
+    assert koyo.balanceOf(merkle_distributor) == second.total - tree.amounts[acct.address]
+
+    merkle_distributor.claim(acct, second.amounts[acct.address], second.proof(acct.address), {"from": acct})
+    assert koyo.balanceOf(acct) == second.amounts[acct.address]
+
+    # proofs of the previous root are no longer valid
+    other = accounts[2]
+    with brownie.reverts("dev: invalid proof"):
+        merkle_distributor.claim(other, tree.amounts[other.address], tree.proof(other.address), {"from": other})
+
+
+def test_invalid_proof(accounts, chain, merkle_distributor, tree):
+    merkle_distributor.update_root(tree.root, _epoch(chain), tree.total, {"from": accounts[0]})
+    acct = accounts[1]
+    amount = tree.amounts[acct.address]
+
+    assert merkle_distributor.claimable(acct, amount + 1, tree.proof(acct.address)) == 0
+    with brownie.reverts("dev: invalid proof"):
+        merkle_distributor.claim(acct, amount + 1, tree.proof(acct.address), {"from": acct})
+    with brownie.reverts("dev: invalid proof"):
+        merkle_distributor.claim(accounts[2], amount, tree.proof(acct.address), {"from": acct})
+
+
+def test_update_root_checks(accounts, chain, merkle_distributor, tree):
+    epoch = _epoch(chain)
+    with brownie.reverts("dev: owner only"):
+        merkle_distributor.update_root(tree.root, epoch, tree.total, {"from": accounts[1]})
+
+    merkle_distributor.update_root(tree.root, epoch, tree.total, {"from": accounts[0]})
+    with brownie.reverts("dev: epoch already published"):
+        merkle_distributor.update_root(tree.root, epoch, tree.total, {"from": accounts[0]})
+    with brownie.reverts("dev: total decreased"):
+        merkle_distributor.update_root(tree.root, epoch + WEEK, tree.total - 1, {"from": accounts[0]})
+
+
+def test_fund_epoch_distributor_only(accounts, gauge_distributor):
+    with brownie.reverts("dev: epoch distributor only"):
+        gauge_distributor.fund_epoch(10**18, {"from": accounts[1]})
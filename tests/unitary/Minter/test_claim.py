@@ -0,0 +1,167 @@
+import brownie
+import pytest
+
+DAY = 86400
+WEEK = 7 * DAY
+
+DENOMINATOR = 10**10
+SHARE_EMISSIONS = 6_400_000_000
+SHARE_TREASURY = 1_000_000_000
+SHARE_TEAM_MEMBER = 600_000_000
+SHARE_ADVISOR = 50_000_000
+SHARE_BOBA_BAR = 100_000_000
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, chain, koyo, minter):
+    chain.sleep(DAY)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    koyo.set_minter(minter, {"from": accounts[0]})
+    chain.sleep(WEEK)
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+@pytest.fixture(scope="module")
+def shares(
+    minter_initial_treasury,
+    minter_initial_team_members,
+    minter_initial_advisors,
+    minter_initial_boba_bar,
+):
+    yield (
+        [(acct, SHARE_TREASURY) for acct in minter_initial_treasury]
+        + [(acct, SHARE_TEAM_MEMBER) for acct in minter_initial_team_members]
+        + [(acct, SHARE_ADVISOR) for acct in minter_initial_advisors]
+        + [(acct, SHARE_BOBA_BAR) for acct in minter_initial_boba_bar]
+    )
+
+
+def test_emissions_are_sent(accounts, koyo, minter, minter_initial_emissions):
+    balance = koyo.balanceOf(minter_initial_emissions[0])
+
+    tx = minter.mint_and_distribute({"from": accounts[0]})
+    amount = tx.events["Distribute"]["amount"]
+
+    assert amount > 0
+    assert koyo.balanceOf(minter_initial_emissions[0]) - balance == amount * SHARE_EMISSIONS // DENOMINATOR
+    assert koyo.balanceOf(minter) == minter.reserved()
+
+
+def test_claimable(accounts, koyo, minter, shares):
+    balances = [koyo.balanceOf(acct) for acct, _ in shares]
+
+    tx = minter.mint_and_distribute({"from": accounts[0]})
+    amount = tx.events["Distribute"]["amount"]
+
+    for (acct, share), balance in zip(shares, balances):
+        assert koyo.balanceOf(acct) == balance
+        assert minter.claimable(acct) == amount * share // DENOMINATOR
+    assert sum(minter.claimable(acct) for acct, _ in shares) <= minter.reserved()
+
+
+def test_reserved_is_not_distributed_again(accounts, chain, minter, shares):
+    first = minter.mint_and_distribute({"from": accounts[0]}).events["Distribute"]["amount"]
+    chain.sleep(DAY)
+    second = minter.mint_and_distribute({"from": accounts[0]}).events["Distribute"]["amount"]
+
+    assert minter.distributed_index() == first + second
+    for acct, share in shares:
+        assert minter.claimable(acct) == (first + second) * share // DENOMINATOR
+
+
+def test_claim_for(accounts, koyo, minter, minter_initial_team_members):
+    member = minter_initial_team_members[0]
+    minter.mint_and_distribute({"from": accounts[0]})
+    claimable = minter.claimable(member)
+    reserved = minter.reserved()
+
+    # anyone can claim on behalf of a recipient, the tokens go to the recipient
+    tx = minter.claim(member, {"from": accounts[1]})
+
+    assert tx.return_value == claimable
+    assert tx.events["Claim"]["recipient"] == member
+    assert koyo.balanceOf(member) == claimable
+    assert minter.claimable(member) == 0
+    assert minter.reserved() == reserved - claimable
+    assert koyo.balanceOf(minter) == minter.reserved()
+
+
+def test_claim_sender(accounts, koyo, minter, minter_initial_treasury):
+    treasury = minter_initial_treasury[0]
+    minter.mint_and_distribute({"from": accounts[0]})
+    claimable = minter.claimable(treasury)
+
+    minter.claim({"from": treasury})
+
+    assert koyo.balanceOf(treasury) == claimable
+    assert minter.claim({"from": treasury}).return_value == 0
+
+
+def test_claim_other(accounts, koyo, minter):
+    minter.mint_and_distribute({"from": accounts[0]})
+
+    tx = minter.claim(accounts[1], {"from": accounts[1]})
+
+    assert tx.return_value == 0
+    assert "Claim" not in tx.events
+
+
+def test_set_addresses_keeps_accrued(
+    accounts,
+    chain,
+    koyo,
+    minter,
+    minter_initial_emissions,
+    minter_initial_treasury,
+    minter_initial_team_members,
+    minter_initial_advisors,
+    minter_initial_boba_bar,
+):
+    member = minter_initial_team_members[0]
+    minter.mint_and_distribute({"from": accounts[0]})
+    accrued = minter.claimable(member)
+
+    changed_team_members = [accounts[11]] + list(minter_initial_team_members[1:])
+    minter.set_addresses(
+        minter_initial_emissions,
+        minter_initial_treasury,
+        changed_team_members,
+        minter_initial_advisors,
+        minter_initial_boba_bar,
+        {"from": accounts[0]},
+    )
+    assert minter.claimable(member) == accrued
+    assert minter.claimable(accounts[11]) == 0
+
+    chain.sleep(DAY)
+    amount = minter.mint_and_distribute({"from": accounts[0]}).events["Distribute"]["amount"]
+
+    assert minter.claimable(member) == accrued
+    assert minter.claimable(accounts[11]) == amount * SHARE_TEAM_MEMBER // DENOMINATOR
+
+    minter.claim(member, {"from": accounts[0]})
+    assert koyo.balanceOf(member) == accrued
+
+
+def test_set_addresses_owner_only(
+    accounts,
+    minter,
+    minter_initial_emissions,
+    minter_initial_treasury,
+    minter_initial_team_members,
+    minter_initial_advisors,
+    minter_initial_boba_bar,
+):
+    with brownie.reverts("dev: owner only"):
+        minter.set_addresses(
+            minter_initial_emissions,
+            minter_initial_treasury,
+            minter_initial_team_members,
+            minter_initial_advisors,
+            minter_initial_boba_bar,
+            {"from": accounts[1]},
+        )
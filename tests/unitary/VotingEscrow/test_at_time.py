@@ -0,0 +1,94 @@
+import brownie
+import pytest
+
+DAY = 86400
+WEEK = 7 * DAY
+
+
+@pytest.fixture(scope="module")
+def history(accounts, chain, koyo, voting_escrow):
+    """
+    Balances and supply as returned at the time of every action.
+    """
+    alice, bob = accounts[1:3]
+    chain.sleep(DAY)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    for acct in (alice, bob):
+        koyo.transfer(acct, 10**22, {"from": accounts[0]})
+        koyo.approve(voting_escrow, 10**22, {"from": acct})
+
+    seen = []
+
+    def record():
+        seen.append((
+            chain[-1].timestamp,
+            voting_escrow.balanceOf(alice),
+            voting_escrow.balanceOf(bob),
+            voting_escrow.totalSupply(),
+        ))
+
+    voting_escrow.create_lock(10**21, chain.time() + 4 * WEEK, {"from": alice})
+    record()
+    chain.sleep(2 * DAY)
+    voting_escrow.create_lock(3 * 10**21, chain.time() + 20 * WEEK, {"from": bob})
+    record()
+    chain.sleep(WEEK)
+    voting_escrow.increase_amount(10**21, {"from": alice})
+    record()
+
+    # alice's lock expires and she locks again
+    chain.sleep(4 * WEEK)
+    voting_escrow.withdraw({"from": alice})
+    record()
+    chain.sleep(3 * DAY)
+    voting_escrow.create_lock(2 * 10**21, chain.time() + 30 * WEEK, {"from": alice})
+    record()
+    chain.sleep(WEEK)
+    voting_escrow.increase_unlock_time(chain.time() + 40 * WEEK, {"from": bob})
+    record()
+
+    chain.sleep(2 * WEEK)
+    voting_escrow.checkpoint({"from": accounts[0]})
+
+    yield seen
+
+
+def test_balance_of_at_time(accounts, voting_escrow, history):
+    alice, bob = accounts[1:3]
+    for ts, alice_balance, bob_balance, _ in history:
+        assert voting_escrow.balanceOfAtTime(alice, ts) == alice_balance
+        assert voting_escrow.balanceOfAtTime(bob, ts) == bob_balance
+
+
+def test_total_supply_at_time(voting_escrow, history):
+    for ts, alice_balance, bob_balance, supply in history:
+        assert voting_escrow.totalSupplyAtTime(ts) == supply
+
+
+def test_balance_of_past_time(accounts, voting_escrow, history):
+    # the latest point is alice's second lock, earlier times used to
+    # revert or be extrapolated from it
+    alice = accounts[1]
+    for ts, alice_balance, _, _ in history:
+        assert voting_escrow.balanceOf(alice, ts) == alice_balance
+
+
+def test_between_actions(accounts, voting_escrow, history):
+    alice = accounts[1]
+    (ts, balance, _, _), (next_ts, *_) = history[:2]
+    # no action of alice's in between, her point only decays
+    assert balance > voting_escrow.balanceOfAtTime(alice, ts + DAY) > 0
+    assert voting_escrow.balanceOfAtTime(alice, ts + DAY) == voting_escrow.balanceOf(alice, ts + DAY)
+    assert ts + DAY < next_ts
+
+
+def test_before_first_lock(accounts, voting_escrow, history):
+    assert voting_escrow.balanceOfAtTime(accounts[2], history[0][0]) == 0
+    assert voting_escrow.balanceOfAtTime(accounts[3], history[-1][0]) == 0
+
+
+def test_future_reverts(accounts, chain, voting_escrow, history):
+    with brownie.reverts():
+        voting_escrow.balanceOfAtTime(accounts[1], chain[-1].timestamp + 1)
+    with brownie.reverts():
+        voting_escrow.totalSupplyAtTime(chain[-1].timestamp + 1)
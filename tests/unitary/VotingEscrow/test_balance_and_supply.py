@@ -0,0 +1,43 @@
+import pytest
+
+WEEK = 86400 * 7
+IDLE_WEEKS = [1, 10, 40]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, chain, koyo, voting_escrow):
+    chain.sleep(86400)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    # three locks -> three scheduled slope changes
+    for i, acct in enumerate(accounts[1:4]):
+        koyo.transfer(acct, 10**21, {"from": accounts[0]})
+        koyo.approve(voting_escrow, 10**21, {"from": acct})
+        voting_escrow.create_lock(10**21, chain.time() + (20 + 15 * i) * WEEK, {"from": acct})
+
+
+@pytest.mark.parametrize("weeks", IDLE_WEEKS)
+def test_matches_balance_and_total_supply(accounts, chain, voting_escrow, weeks):
+    chain.snapshot()
+    chain.sleep(weeks * WEEK)
+    chain.mine()
+
+    for acct in accounts[:4]:
+        assert voting_escrow.balance_and_supply(acct) == (
+            voting_escrow.balanceOf(acct),
+            voting_escrow.totalSupply(),
+        )
+    chain.revert()
+
+
+def test_gas_with_idle_global_checkpoint(accounts, chain, voting_escrow):
+    gas_used = {}
+    for weeks in IDLE_WEEKS:
+        chain.snapshot()
+        chain.sleep(weeks * WEEK)
+        chain.mine()
+        gas_used[weeks] = voting_escrow.balance_and_supply.estimate_gas(accounts[1])
+        chain.revert()
+
+    # walking every idle week costs a cold slope_changes read per week,
+    # only the three weeks with slope changes are visited now
+    assert gas_used[40] < gas_used[1] + 15000
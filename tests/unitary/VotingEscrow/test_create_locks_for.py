@@ -0,0 +1,110 @@
+import brownie
+import pytest
+
+DAY = 86400
+WEEK = 7 * DAY
+LOCK_COUNTS = [1, 10, 50]
+
+
+@pytest.fixture(scope="module")
+def partners(accounts):
+    yield [accounts.add().address for _ in range(max(LOCK_COUNTS))]
+
+
+@pytest.fixture(scope="module")
+def locks(accounts, chain, koyo, voting_escrow, partners):
+    chain.sleep(DAY)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    koyo.approve(voting_escrow, 2**256 - 1, {"from": accounts[0]})
+
+    # existing locks, and a few idle weeks for the global point to catch up on
+    for i, acct in enumerate(accounts[1:5]):
+        voting_escrow.create_lock_for(acct, 10**21, chain.time() + (i + 2) * WEEK, {"from": accounts[0]})
+    chain.sleep(3 * WEEK)
+
+    now = chain.time()
+    # some of the locks share their end week
+    values = [10**20 * (i + 1) for i in range(len(partners))]
+    unlock_times = [now + (i % 20 + 1) * WEEK + i * 3600 for i in range(len(partners))]
+    yield values, unlock_times
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def _state(chain, koyo, voting_escrow, partners):
+    now = chain[-1].timestamp
+    return (
+        [voting_escrow.locked(addr) for addr in partners],
+        [voting_escrow.balanceOf(addr) for addr in partners],
+        [voting_escrow.totalSupply(now + i * WEEK) for i in range(55)],
+        [voting_escrow.slope_changes((now // WEEK + i) * WEEK) for i in range(55)],
+        voting_escrow.supply(),
+        koyo.balanceOf(voting_escrow),
+    )
+
+
+def test_same_as_create_lock_for(accounts, chain, koyo, voting_escrow, partners, locks):
+    values, unlock_times = locks
+
+    chain.snapshot()
+    for addr, value, unlock_time in zip(partners, values, unlock_times):
+        voting_escrow.create_lock_for(addr, value, unlock_time, {"from": accounts[0]})
+    expected = _state(chain, koyo, voting_escrow, partners)
+    chain.revert()
+
+    tx = voting_escrow.create_locks_for(partners, values, unlock_times, {"from": accounts[0]})
+
+    assert _state(chain, koyo, voting_escrow, partners) == expected
+    assert len(tx.events["Deposit"]) == len(partners)
+    assert len([c for c in tx.subcalls if c["to"] == koyo]) == 1
+
+
+def test_owner_only(accounts, voting_escrow, partners, locks):
+    values, unlock_times = locks
+    with brownie.reverts("dev: owner only"):
+        voting_escrow.create_locks_for(partners[:1], values[:1], unlock_times[:1], {"from": accounts[1]})
+
+
+def test_length_mismatch(accounts, voting_escrow, partners, locks):
+    values, unlock_times = locks
+    with brownie.reverts("dev: length mismatch"):
+        voting_escrow.create_locks_for(partners[:2], values[:1], unlock_times[:2], {"from": accounts[0]})
+
+
+def test_existing_lock(accounts, voting_escrow, partners, locks):
+    values, unlock_times = locks
+    with brownie.reverts("W"):
+        voting_escrow.create_locks_for(
+            [partners[0], accounts[1], partners[1]], values[:3], unlock_times[:3], {"from": accounts[0]}
+        )
+    with brownie.reverts("W"):
+        voting_escrow.create_locks_for(
+            [partners[0], partners[0]], values[:2], unlock_times[:2], {"from": accounts[0]}
+        )
+
+
+def test_create_locks_for_gas(accounts, chain, voting_escrow, partners, locks):
+    values, unlock_times = locks
+    gas_used = {}
+    for count in LOCK_COUNTS:
+        chain.snapshot()
+        sequential = 0
+        for addr, value, unlock_time in zip(partners[:count], values, unlock_times):
+            tx = voting_escrow.create_lock_for(addr, value, unlock_time, {"from": accounts[0]})
+            sequential += tx.gas_used
+        chain.revert()
+
+        chain.snapshot()
+        tx = voting_escrow.create_locks_for(partners[:count], values[:count], unlock_times[:count], {"from": accounts[0]})
+        gas_used[count] = (sequential, tx.gas_used)
+        chain.revert()
+
+    # the idle weeks are walked and the tokens transferred once per batch
+    sequential, batch = gas_used[1]
+    assert batch < sequential * 1.01
+    for count in LOCK_COUNTS[1:]:
+        sequential, batch = gas_used[count]
+        assert batch < sequential * 0.8
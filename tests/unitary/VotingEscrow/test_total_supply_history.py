@@ -0,0 +1,82 @@
+import pytest
+
+DAY = 86400
+WEEK = 7 * DAY
+
+
+@pytest.fixture(scope="module")
+def history(accounts, chain, koyo, voting_escrow):
+    """
+    `totalSupply()` as returned at the time of every action and in between,
+    while the global point was stale.
+    """
+    chain.sleep(DAY)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    for acct in accounts[1:5]:
+        koyo.transfer(acct, 10**22, {"from": accounts[0]})
+        koyo.approve(voting_escrow, 10**22, {"from": acct})
+
+    seen = []
+
+    def record():
+        seen.append((chain[-1].timestamp, voting_escrow.totalSupply()))
+
+    for i, acct in enumerate(accounts[1:5]):
+        voting_escrow.create_lock(10**21 * (i + 1), chain.time() + (3 + 4 * i) * WEEK, {"from": acct})
+        record()
+        chain.sleep(2 * DAY)
+
+    # a couple of actions within the same week
+    voting_escrow.increase_amount(10**21, {"from": accounts[1]})
+    record()
+    chain.sleep(3600)
+    voting_escrow.increase_unlock_time(chain.time() + 20 * WEEK, {"from": accounts[2]})
+    record()
+
+    # several idle weeks with slope changes in them, sampled before anyone checkpoints
+    start = chain[-1].timestamp
+    for i in range(1, 12):
+        seen.append((start + i * 3 * DAY, voting_escrow.totalSupply(start + i * 3 * DAY)))
+    chain.sleep(12 * 3 * DAY)
+    voting_escrow.force_withdraw({"from": accounts[4]})
+    record()
+
+    chain.sleep(5 * WEEK)
+    voting_escrow.checkpoint({"from": accounts[0]})
+
+    yield seen
+
+
+def test_past_total_supply(voting_escrow, history):
+    for t, supply in history:
+        assert voting_escrow.totalSupply(t) == supply
+
+
+def test_week_epoch(chain, voting_escrow, history):
+    start = history[0][0] // WEEK * WEEK + WEEK
+    for week in range(start, chain[-1].timestamp, WEEK):
+        point = voting_escrow.point_history(voting_escrow.week_epoch(week))
+        assert point["ts"] == week
+
+
+def test_before_deployment(voting_escrow, history):
+    assert voting_escrow.totalSupply(voting_escrow.point_history(0)["ts"] - 1) == 0
+
+
+def test_gas_is_flat(accounts, chain, voting_escrow, history):
+    now = chain[-1].timestamp
+    gas_used = [
+        voting_escrow.totalSupply["uint256"].estimate_gas(now - weeks * WEEK + DAY)
+        for weeks in (1, 4, 8)
+    ]
+
+    assert max(gas_used) - min(gas_used) < 10000
+
+
+def test_future_is_unchanged(accounts, chain, voting_escrow, history):
+    chain.snapshot()
+    now = chain[-1].timestamp
+    expected = [voting_escrow.totalSupply(now + i * WEEK) for i in range(20)]
+    voting_escrow.checkpoint({"from": accounts[0]})
+    assert [voting_escrow.totalSupply(now + i * WEEK) for i in range(20)] == expected
+    chain.revert()
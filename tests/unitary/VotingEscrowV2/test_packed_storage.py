@@ -0,0 +1,86 @@
+import pytest
+
+DAY = 86400
+WEEK = 7 * DAY
+
+
+@pytest.fixture(scope="module")
+def escrows(accounts, chain, koyo, voting_escrow, voting_escrow_v2):
+    """
+    The same locks in the unpacked and the packed escrow.
+    """
+    chain.sleep(DAY)
+    koyo.mint_available(accounts[0], {"from": accounts[0]})
+    for acct in accounts[:5]:
+        if acct != accounts[0]:
+            koyo.transfer(acct, 10**22, {"from": accounts[0]})
+        for escrow in (voting_escrow, voting_escrow_v2):
+            koyo.approve(escrow, 2**256 - 1, {"from": acct})
+
+    for i, acct in enumerate(accounts[1:5]):
+        unlock_time = chain.time() + (i + 2) * WEEK
+        for escrow in (voting_escrow, voting_escrow_v2):
+            escrow.create_lock(10**21 * (i + 1), unlock_time, {"from": acct})
+    chain.sleep(DAY)
+
+    yield voting_escrow, voting_escrow_v2
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def _both(escrows, fn_name, *args):
+    return [getattr(escrow, fn_name)(*args) for escrow in escrows]
+
+
+def test_same_views(accounts, chain, escrows):
+    for acct in accounts[1:5]:
+        _both(escrows, "increase_amount", 10**20, {"from": acct})
+    chain.sleep(3 * WEEK)
+    _both(escrows, "withdraw", {"from": accounts[1]})
+    _both(escrows, "increase_unlock_time", chain.time() + 30 * WEEK, {"from": accounts[4]})
+    chain.mine()
+
+    now, block = chain[-1].timestamp, chain[-1].number
+    old, new = escrows
+    assert new.epoch() == old.epoch()
+    for epoch in range(old.epoch() + 1):
+        assert new.point_history(epoch) == old.point_history(epoch)
+    for acct in accounts[1:5]:
+        assert new.locked(acct) == old.locked(acct)
+        assert new.locked__end(acct) == old.locked__end(acct)
+        assert new.get_last_user_slope(acct) == old.get_last_user_slope(acct)
+        for idx in range(old.user_point_epoch(acct) + 1):
+            assert new.user_point_history(acct, idx) == old.user_point_history(acct, idx)
+            assert new.user_point_history__ts(acct, idx) == old.user_point_history__ts(acct, idx)
+        assert new.balanceOf(acct) == old.balanceOf(acct)
+        assert new.balanceOfAt(acct, block - 3) == old.balanceOfAt(acct, block - 3)
+        assert new.balanceOfAtTime(acct, now - 2 * WEEK) == old.balanceOfAtTime(acct, now - 2 * WEEK)
+    assert new.totalSupply() == old.totalSupply()
+    assert new.totalSupplyAt(block - 3) == old.totalSupplyAt(block - 3)
+    assert new.totalSupplyAtTime(now - 2 * WEEK) == old.totalSupplyAtTime(now - 2 * WEEK)
+
+
+def test_packed_gas(accounts, chain, escrows):
+    gas_used = {}
+    for escrow in escrows:
+        chain.snapshot()
+        used = {}
+        tx = escrow.create_lock(10**21, chain.time() + 52 * WEEK, {"from": accounts[0]})
+        used["create_lock"] = tx.gas_used
+        chain.sleep(WEEK)
+        tx = escrow.increase_amount(10**20, {"from": accounts[0]})
+        used["increase_amount"] = tx.gas_used
+        chain.sleep(53 * WEEK)
+        escrow.checkpoint({"from": accounts[0]})
+        tx = escrow.withdraw({"from": accounts[0]})
+        used["withdraw"] = tx.gas_used
+        gas_used[escrow._name] = used
+        chain.revert()
+
+    # one slot instead of two per lock, two instead of four per point
+    old, new = gas_used["VotingEscrow"], gas_used["VotingEscrowV2"]
+    for fn_name in old:
+        assert new[fn_name] < old[fn_name] * 0.75